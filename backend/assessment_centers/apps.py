@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AssessmentCentersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessment_centers'
-    verbose_name = 'Assessment Centers Management'
\ No newline at end of file
+    verbose_name = 'Assessment Centers Management'
+
+    def ready(self):
+        import assessment_centers.signals
@@ -48,7 +48,10 @@ class AssessmentCenter(models.Model):
         return ', '.join(location_parts) if location_parts else 'Location not set'
     
     def get_branches_count(self):
-        """Return count of branches"""
+        """Return count of branches (uses the `branches_count` annotation when present)"""
+        annotated = getattr(self, 'branches_count', None)
+        if annotated is not None:
+            return annotated
         return self.branches.count()
 
 
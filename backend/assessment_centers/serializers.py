@@ -18,6 +18,10 @@ class CenterBranchSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_candidates_count(self, obj):
+        # Views annotate `candidates_count`; fall back to a query for unannotated instances
+        annotated = getattr(obj, 'candidates_count', None)
+        if annotated is not None:
+            return annotated
         from candidates.models import Candidate
         return Candidate.objects.filter(assessment_center_branch=obj).count()
 
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from emis.http_cache import bump_version
+from .models import AssessmentCenter
+
+
+@receiver([post_save, post_delete], sender=AssessmentCenter)
+def bump_center_version(sender, instance, **kwargs):
+    """Center names are copied into candidate listings such as the awards list."""
+    bump_version('assessment_centers')
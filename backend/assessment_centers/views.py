@@ -1,6 +1,7 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Count, Prefetch
 from .models import AssessmentCenter, CenterBranch, CenterRepresentativePerson
 from .serializers import (
     AssessmentCenterSerializer, AssessmentCenterCreateSerializer, AssessmentCenterListSerializer,
@@ -13,7 +14,14 @@ class AssessmentCenterViewSet(viewsets.ModelViewSet):
     """
     ViewSet for AssessmentCenter model
     """
-    queryset = AssessmentCenter.objects.select_related('district', 'village').prefetch_related('branches').all()
+    queryset = AssessmentCenter.objects.select_related('district', 'village').prefetch_related(
+        Prefetch(
+            'branches',
+            queryset=CenterBranch.objects.select_related('assessment_center', 'district', 'village').annotate(
+                candidates_count=Count('candidates')
+            ).order_by('branch_code'),
+        )
+    ).annotate(branches_count=Count('branches', distinct=True)).order_by('center_number')
     serializer_class = AssessmentCenterSerializer
     permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access
     filterset_fields = ['assessment_category', 'has_branches', 'is_active', 'district', 'village']
@@ -73,7 +81,9 @@ class CenterBranchViewSet(viewsets.ModelViewSet):
     """
     ViewSet for CenterBranch model
     """
-    queryset = CenterBranch.objects.select_related('assessment_center', 'district', 'village').all()
+    queryset = CenterBranch.objects.select_related('assessment_center', 'district', 'village').annotate(
+        candidates_count=Count('candidates')
+    ).order_by('branch_code')
     serializer_class = CenterBranchSerializer
     permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access
     filterset_fields = ['assessment_center', 'district', 'village', 'is_active']
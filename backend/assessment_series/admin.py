@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from emis.http_cache import bump_version
 from .models import AssessmentSeries
 
 
@@ -102,23 +103,27 @@ class AssessmentSeriesAdmin(admin.ModelAdmin):
     def release_results(self, request, queryset):
         """Release results for selected series"""
         updated = queryset.update(results_released=True)
+        bump_version('assessment_series')
         self.message_user(request, f'Results released for {updated} assessment series.')
     release_results.short_description = 'Release results'
     
     def unrelease_results(self, request, queryset):
         """Unrelease results for selected series"""
         updated = queryset.update(results_released=False)
+        bump_version('assessment_series')
         self.message_user(request, f'Results unreleased for {updated} assessment series.')
     unrelease_results.short_description = 'Unrelease results'
     
     def activate_series(self, request, queryset):
         """Activate selected series"""
         updated = queryset.update(is_active=True)
+        bump_version('assessment_series')
         self.message_user(request, f'{updated} assessment series activated.')
     activate_series.short_description = 'Activate selected series'
     
     def deactivate_series(self, request, queryset):
         """Deactivate selected series"""
         updated = queryset.update(is_active=False)
+        bump_version('assessment_series')
         self.message_user(request, f'{updated} assessment series deactivated.')
     deactivate_series.short_description = 'Deactivate selected series'
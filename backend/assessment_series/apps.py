@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AssessmentSeriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessment_series'
-    verbose_name = 'Assessment Series Management'
\ No newline at end of file
+    verbose_name = 'Assessment Series Management'
+
+    def ready(self):
+        import assessment_series.signals
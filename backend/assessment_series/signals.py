@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from emis.http_cache import bump_version
+from .models import AssessmentSeries
+
+
+@receiver([post_save, post_delete], sender=AssessmentSeries)
+def bump_series_version(sender, instance, **kwargs):
+    """Series names and release flags feed every results view."""
+    bump_version('assessment_series')
@@ -1,8 +1,13 @@
+import logging
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import AssessmentSeries
 from .serializers import AssessmentSeriesSerializer
+from candidates.portal import warm_portal_documents
+
+logger = logging.getLogger(__name__)
 
 
 class AssessmentSeriesViewSet(viewsets.ModelViewSet):
@@ -26,6 +31,13 @@ class AssessmentSeriesViewSet(viewsets.ModelViewSet):
         series = self.get_object()
         series.results_released = True
         series.save()
+        
+        # Pre-build portal documents so the first wave of candidate logins hits the cache
+        try:
+            warm_portal_documents(series)
+        except Exception:
+            logger.exception('Failed to pre-warm portal documents for series %s', series.pk)
+        
         serializer = self.get_serializer(series)
         return Response(serializer.data)
 
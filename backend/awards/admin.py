@@ -1 +1,51 @@
+from django.contrib import admin, messages
 
+from .models import OutboundEmail
+from .outbox import outbox_metrics, requeue
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'kind',
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'created_at',
+        'sent_at',
+    ]
+    list_filter = ['status', 'kind', 'created_at']
+    search_fields = ['recipient', 'subject']
+    readonly_fields = [
+        'kind', 'recipient', 'subject', 'body', 'payload', 'status', 'attempts', 'max_attempts',
+        'next_attempt_at', 'locked_at', 'last_error', 'created_at', 'sent_at',
+    ]
+    actions = ['requeue_emails']
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        # Surface queue depth / throughput / failures above the list
+        if request.method == 'GET':
+            self._show_metrics(request)
+        return super().changelist_view(request, extra_context=extra_context)
+
+    def _show_metrics(self, request):
+        metrics = outbox_metrics()
+        self.message_user(
+            request,
+            f"Pending {metrics['pending']} (retrying {metrics['retrying']}, oldest "
+            f"{metrics['oldest_pending_age_seconds']}s) · sent last hour {metrics['sent_last_hour']}, "
+            f"last 24h {metrics['sent_last_24h']} · failed {metrics['failed']} "
+            f"(last 24h {metrics['failed_last_24h']})",
+            level=messages.WARNING if metrics['failed_last_24h'] else messages.INFO,
+        )
+
+    @admin.action(description='Requeue selected emails')
+    def requeue_emails(self, request, queryset):
+        count = requeue(queryset)
+        self.message_user(request, f'{count} email(s) requeued.')
@@ -2,7 +2,6 @@ import base64
 import logging
 import os
 import re
-import threading
 from io import BytesIO
 
 import qrcode
@@ -17,7 +16,6 @@ from reportlab.platypus import (
 )
 
 from django.conf import settings
-from django.core.mail import EmailMessage
 
 logger = logging.getLogger(__name__)
 
@@ -290,42 +288,35 @@ def _build_receipt_pdf(receipt_data):
     return buf
 
 
+def build_collection_receipt_attachment(receipt_data):
+    """Render the receipt PDF as an email attachment: (filename, content, mimetype)."""
+    pdf_buffer = _build_receipt_pdf(receipt_data)
+    filename = f"Collection_Receipt_{receipt_data['receipt_number']}.pdf"
+    return filename, pdf_buffer.getvalue(), 'application/pdf'
+
+
 def send_collection_receipt_email(receipt_data, recipient_email):
     """
-    Send the transcript collection receipt as a PDF attachment.
-    Runs in a background thread so it doesn't block the API response.
+    Queue the transcript collection receipt email. The `send_outbox` worker
+    renders the PDF attachment and delivers it, retrying on failure.
     """
-    def _send():
-        try:
-            receipt_number = receipt_data['receipt_number']
-            subject = f"NOREPLY - Transcript Collection Receipt - {receipt_number}"
-            body = (
-                f"Dear {receipt_data['collector_name']},\n\n"
-                f"Please find attached your transcript collection receipt ({receipt_number}).\n\n"
-                f"Center: {receipt_data['center_name']}\n"
-                f"Collection Date: {receipt_data['collection_date']}\n"
-                f"Candidates Collected: {receipt_data['candidate_count']}\n\n"
-                f"This is an official receipt from UVTAB.\n"
-                f"For any inquiries, contact us at 0392002468.\n\n"
-                f"Regards,\nUVTAB"
-            )
-
-            pdf_buffer = _build_receipt_pdf(receipt_data)
-            filename = f"Collection_Receipt_{receipt_number}.pdf"
-
-            email = EmailMessage(
-                subject=subject,
-                body=body,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[recipient_email],
-            )
-            email.attach(filename, pdf_buffer.getvalue(), 'application/pdf')
-            email.send(fail_silently=False)
-
-            logger.info(f"Receipt PDF emailed to {recipient_email} for {receipt_number}")
-
-        except Exception as e:
-            logger.error(f"Failed to send receipt email to {recipient_email}: {e}")
+    from .outbox import enqueue_email
+
+    receipt_number = receipt_data['receipt_number']
+    subject = f"NOREPLY - Transcript Collection Receipt - {receipt_number}"
+    body = (
+        f"Dear {receipt_data['collector_name']},\n\n"
+        f"Please find attached your transcript collection receipt ({receipt_number}).\n\n"
+        f"Center: {receipt_data['center_name']}\n"
+        f"Collection Date: {receipt_data['collection_date']}\n"
+        f"Candidates Collected: {receipt_data['candidate_count']}\n\n"
+        f"This is an official receipt from UVTAB.\n"
+        f"For any inquiries, contact us at 0392002468.\n\n"
+        f"Regards,\nUVTAB"
+    )
 
-    thread = threading.Thread(target=_send, daemon=True)
-    thread.start()
+    outbound = enqueue_email(
+        recipient_email, subject, body, kind='collection_receipt', payload=receipt_data,
+    )
+    logger.info(f"Receipt email for {receipt_number} queued for {recipient_email} (outbox #{outbound.id})")
+    return outbound
@@ -0,0 +1,80 @@
+"""
+Management command that drains the outbound email queue (OutboundEmail).
+
+Each batch is delivered over a single email-backend connection; failed
+emails are retried with exponential backoff. Run it continuously under
+systemd (systemd/emis-outbox.service) or from cron without --loop.
+
+Usage:
+    python manage.py send_outbox                        # Drain everything currently due, then exit
+    python manage.py send_outbox --loop                 # Keep polling (worker mode)
+    python manage.py send_outbox --loop --interval 10 --batch-size 100
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from awards.outbox import DEFAULT_BATCH_SIZE, drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbound emails in batches over a reused connection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Emails claimed and sent per connection (default {DEFAULT_BATCH_SIZE}).',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            default=False,
+            help='Keep running, polling for new emails.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep when the queue is empty in --loop mode (default 5).',
+        )
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        if options['loop']:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+            self.stdout.write(self.style.MIGRATE_HEADING('Outbox worker started'))
+
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        while not self._stopping:
+            # No request cycle here: apply CONN_MAX_AGE and health checks per batch
+            close_old_connections()
+            started = time.monotonic()
+            stats = drain_outbox(batch_size=options['batch_size'])
+            processed = sum(stats.values())
+            for key, value in stats.items():
+                totals[key] += value
+
+            if processed and options['verbosity'] >= 1:
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"   • batch: sent {stats['sent']}, retrying {stats['retried']}, "
+                    f"failed {stats['failed']} ({processed / elapsed:.1f} emails/s)"
+                )
+
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Sent {totals['sent']}, retrying {totals['retried']}, failed {totals['failed']}."
+        ))
+
+    def _stop(self, signum, frame):
+        self._stopping = True
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from candidates.models import Candidate
 from assessment_centers.models import AssessmentCenter
 
@@ -99,4 +100,59 @@ class TranscriptCollection(models.Model):
             new_num = last_num + 1
         else:
             new_num = 1
-        return f'{prefix}{new_num:05d}'
\ No newline at end of file
+        return f'{prefix}{new_num:05d}'
+
+class OutboundEmail(models.Model):
+    """
+    Durable outbox entry for an email sent by the `send_outbox` worker.
+
+    Requests only insert a row; the worker renders attachments at send time
+    (from `payload`), delivers batches over one SMTP connection and retries
+    failures with exponential backoff until `max_attempts` is reached.
+    """
+    KIND_CHOICES = [
+        ('collection_receipt', 'Transcript Collection Receipt'),
+        ('notification', 'Notification'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, choices=KIND_CHOICES, default='notification')
+    recipient = models.EmailField(verbose_name='Recipient')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Data used to render attachments at send time (e.g. receipt details)',
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=6)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text='Earliest time the worker may (re)try this email',
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Set while a worker is sending; stale locks are reclaimed',
+    )
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Outbound Email'
+        verbose_name_plural = 'Outbound Emails'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_next_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} to {self.recipient} ({self.status})'
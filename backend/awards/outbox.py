@@ -0,0 +1,198 @@
+"""
+Durable outbound email queue.
+
+Views call enqueue_email() (a single INSERT) instead of sending inline or
+from a background thread. The `send_outbox` management command drains the
+queue with drain_outbox(): it claims a batch of due rows, renders any
+attachments at send time, and delivers the whole batch over one reused
+email-backend connection. Failures are retried with exponential backoff
+until the row's max_attempts is reached, then marked failed for an admin
+to inspect (and requeue from the admin).
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Avg, Count, Min, Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 60 * 60
+# A row left in 'sending' longer than this belonged to a worker that died
+STALE_LOCK_SECONDS = 15 * 60
+
+
+def _collection_receipt_attachments(payload):
+    from .emails import build_collection_receipt_attachment
+    return [build_collection_receipt_attachment(payload)]
+
+
+# kind -> callable(payload) returning [(filename, content, mimetype), ...]
+ATTACHMENT_RENDERERS = {
+    'collection_receipt': _collection_receipt_attachments,
+}
+
+
+def enqueue_email(recipient, subject, body, kind='notification', payload=None):
+    """Queue an email for the outbox worker. Returns the OutboundEmail row."""
+    return OutboundEmail.objects.create(
+        kind=kind,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        payload=payload or {},
+    )
+
+
+def backoff_delay(attempts):
+    """Delay before the next retry after `attempts` failed attempts."""
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS))
+
+
+def _claim_batch(batch_size):
+    """Lock up to `batch_size` due rows for this worker and mark them 'sending'."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=STALE_LOCK_SECONDS)
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now)
+                | Q(status='sending', locked_at__lt=stale)
+            )
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            OutboundEmail.objects.filter(id__in=ids).update(status='sending', locked_at=now)
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('next_attempt_at', 'id'))
+
+
+def _build_message(outbound, connection):
+    message = EmailMessage(
+        subject=outbound.subject,
+        body=outbound.body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[outbound.recipient],
+        connection=connection,
+    )
+    renderer = ATTACHMENT_RENDERERS.get(outbound.kind)
+    if renderer:
+        for filename, content, mimetype in renderer(outbound.payload):
+            message.attach(filename, content, mimetype)
+    return message
+
+
+def _mark_failed_attempt(outbound, error):
+    outbound.attempts += 1
+    outbound.last_error = str(error)[:2000]
+    outbound.locked_at = None
+    if outbound.attempts >= outbound.max_attempts:
+        outbound.status = 'failed'
+    else:
+        outbound.status = 'pending'
+        outbound.next_attempt_at = timezone.now() + backoff_delay(outbound.attempts)
+    outbound.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+
+
+def drain_outbox(batch_size=DEFAULT_BATCH_SIZE, connection=None):
+    """
+    Send one batch of due emails over a single connection.
+    Returns a dict with the number of emails sent, retried and failed.
+    """
+    stats = {'sent': 0, 'retried': 0, 'failed': 0}
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return stats
+
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Backend unreachable: put the whole batch back with backoff
+        logger.error(f"Outbox: could not open email connection: {e}")
+        for outbound in batch:
+            _mark_failed_attempt(outbound, e)
+            stats['failed' if outbound.status == 'failed' else 'retried'] += 1
+        return stats
+
+    try:
+        for outbound in batch:
+            try:
+                message = _build_message(outbound, connection)
+                if not connection.send_messages([message]):
+                    raise RuntimeError('Email backend did not accept the message')
+            except Exception as e:
+                logger.warning(f"Outbox: email {outbound.id} to {outbound.recipient} failed: {e}")
+                _mark_failed_attempt(outbound, e)
+                stats['failed' if outbound.status == 'failed' else 'retried'] += 1
+                # The SMTP session may be unusable after an error; start a fresh one.
+                # If that fails too, send_messages() retries the open per message.
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+                continue
+
+            outbound.attempts += 1
+            outbound.status = 'sent'
+            outbound.sent_at = timezone.now()
+            outbound.locked_at = None
+            outbound.last_error = ''
+            outbound.save(update_fields=['attempts', 'status', 'sent_at', 'locked_at', 'last_error'])
+            stats['sent'] += 1
+    finally:
+        connection.close()
+
+    logger.info(
+        f"Outbox: sent {stats['sent']}, retrying {stats['retried']}, failed {stats['failed']}"
+    )
+    return stats
+
+
+def requeue(queryset):
+    """Reset failed (or stuck) emails so the worker picks them up again."""
+    return queryset.exclude(status='sent').update(
+        status='pending', attempts=0, next_attempt_at=timezone.now(), locked_at=None, last_error='',
+    )
+
+
+def outbox_metrics():
+    """Queue depth, throughput and failure figures for admins."""
+    now = timezone.now()
+    last_hour = now - timedelta(hours=1)
+    last_day = now - timedelta(days=1)
+
+    totals = OutboundEmail.objects.aggregate(
+        pending=Count('id', filter=Q(status='pending')),
+        sending=Count('id', filter=Q(status='sending')),
+        failed=Count('id', filter=Q(status='failed')),
+        retrying=Count('id', filter=Q(status='pending', attempts__gt=0)),
+        sent_last_hour=Count('id', filter=Q(status='sent', sent_at__gte=last_hour)),
+        sent_last_24h=Count('id', filter=Q(status='sent', sent_at__gte=last_day)),
+        failed_last_24h=Count('id', filter=Q(status='failed', created_at__gte=last_day)),
+        avg_attempts_last_24h=Avg('attempts', filter=Q(status='sent', sent_at__gte=last_day)),
+        oldest_pending=Min('created_at', filter=Q(status='pending')),
+    )
+    oldest_pending = totals.pop('oldest_pending')
+    totals['oldest_pending_age_seconds'] = int((now - oldest_pending).total_seconds()) if oldest_pending else 0
+    totals['avg_attempts_last_24h'] = round(totals['avg_attempts_last_24h'] or 0, 2)
+    totals['by_kind'] = list(
+        OutboundEmail.objects.filter(created_at__gte=last_day)
+        .values('kind')
+        .annotate(
+            total=Count('id'),
+            sent=Count('id', filter=Q(status='sent')),
+            failed=Count('id', filter=Q(status='failed')),
+        )
+        .order_by('kind')
+    )
+    return totals
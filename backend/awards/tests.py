@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import outbox
+from .models import OutboundEmail
+
+
+class BouncingBackend(EmailBackend):
+    """locmem backend that rejects messages to bounce@ addresses."""
+
+    def send_messages(self, messages):
+        if any(address.startswith('bounce@') for message in messages for address in message.to):
+            raise OSError('550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class DrainOutboxTests(TestCase):
+
+    def test_batch_is_sent_over_one_connection(self):
+        for i in range(3):
+            outbox.enqueue_email(f'user{i}@example.com', f'Subject {i}', 'Body')
+
+        with mock.patch.object(outbox, 'get_connection', wraps=outbox.get_connection) as get_connection:
+            stats = outbox.drain_outbox()
+
+        self.assertEqual(stats, {'sent': 3, 'retried': 0, 'failed': 0})
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len({id(message.connection) for message in mail.outbox}), 1)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['user0@example.com', 'user1@example.com', 'user2@example.com'],
+        )
+        self.assertEqual(
+            list(OutboundEmail.objects.order_by().values_list('status', 'attempts').distinct()), [('sent', 1)]
+        )
+
+    @override_settings(EMAIL_BACKEND='awards.tests.BouncingBackend')
+    def test_failed_send_is_retried_with_backoff(self):
+        bounce = outbox.enqueue_email('bounce@example.com', 'Subject', 'Body')
+        ok = outbox.enqueue_email('user@example.com', 'Subject', 'Body')
+
+        before = timezone.now()
+        stats = outbox.drain_outbox()
+        after = timezone.now()
+
+        self.assertEqual(stats, {'sent': 1, 'retried': 1, 'failed': 0})
+        ok.refresh_from_db()
+        self.assertEqual(ok.status, 'sent')
+        bounce.refresh_from_db()
+        self.assertEqual(bounce.status, 'pending')
+        self.assertEqual(bounce.attempts, 1)
+        self.assertIsNone(bounce.locked_at)
+        self.assertIn('550', bounce.last_error)
+        self.assertGreaterEqual(bounce.next_attempt_at, before + outbox.backoff_delay(1))
+        self.assertLessEqual(bounce.next_attempt_at, after + outbox.backoff_delay(1))
+
+        # Not due yet: the next drain leaves it alone
+        self.assertEqual(outbox.drain_outbox(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+    @override_settings(EMAIL_BACKEND='awards.tests.BouncingBackend')
+    def test_row_fails_after_max_attempts(self):
+        bounce = outbox.enqueue_email('bounce@example.com', 'Subject', 'Body')
+        OutboundEmail.objects.filter(pk=bounce.pk).update(max_attempts=3)
+
+        for attempt in range(1, 4):
+            OutboundEmail.objects.filter(pk=bounce.pk).update(next_attempt_at=timezone.now())
+            stats = outbox.drain_outbox()
+            bounce.refresh_from_db()
+            self.assertEqual(bounce.attempts, attempt)
+            if attempt < 3:
+                self.assertEqual(stats['retried'], 1)
+                self.assertEqual(bounce.status, 'pending')
+
+        self.assertEqual(stats, {'sent': 0, 'retried': 0, 'failed': 1})
+        self.assertEqual(bounce.status, 'failed')
+
+        # Failed rows are never claimed again
+        OutboundEmail.objects.filter(pk=bounce.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.drain_outbox(), {'sent': 0, 'retried': 0, 'failed': 0})
+
+    def test_backoff_delay_doubles_up_to_the_cap(self):
+        self.assertEqual(outbox.backoff_delay(1), timedelta(seconds=outbox.BACKOFF_BASE_SECONDS))
+        self.assertEqual(outbox.backoff_delay(3), timedelta(seconds=outbox.BACKOFF_BASE_SECONDS * 4))
+        self.assertEqual(outbox.backoff_delay(20), timedelta(seconds=outbox.BACKOFF_MAX_SECONDS))
+
+    def test_stale_sending_row_is_reclaimed(self):
+        now = timezone.now()
+        stale = outbox.enqueue_email('stale@example.com', 'Subject', 'Body')
+        busy = outbox.enqueue_email('busy@example.com', 'Subject', 'Body')
+        OutboundEmail.objects.filter(pk=stale.pk).update(
+            status='sending', locked_at=now - timedelta(seconds=outbox.STALE_LOCK_SECONDS + 60),
+        )
+        OutboundEmail.objects.filter(pk=busy.pk).update(status='sending', locked_at=now - timedelta(seconds=60))
+
+        stats = outbox.drain_outbox()
+
+        self.assertEqual(stats, {'sent': 1, 'retried': 0, 'failed': 0})
+        self.assertEqual([message.to for message in mail.outbox], [['stale@example.com']])
+        stale.refresh_from_db()
+        busy.refresh_from_db()
+        self.assertEqual(stale.status, 'sent')
+        self.assertEqual(busy.status, 'sending')
@@ -5,15 +5,17 @@ from rest_framework.decorators import action
 from django.db.models import Q, Exists, OuterRef, Subquery, Count, F, Case, When, IntegerField, Sum
 from django.http import HttpResponse
 from django.core.paginator import Paginator, EmptyPage
+from django.utils.decorators import method_decorator
 from candidates.models import Candidate, CandidateEnrollment
 from results.models import ModularResult, FormalResult
+from results.best_results import formal_standings, standings_for
 from configurations.models import ReprintReason
 from awards.models import TranscriptCollection
 from assessment_series.models import AssessmentSeries
 from awards.serializers import TranscriptCollectionListSerializer, TranscriptCollectionDetailSerializer
-from occupations.models import OccupationModule, OccupationPaper
+from emis.http_cache import PRIVATE_REVALIDATE, conditional_get, get_version, make_etag
+from emis.pdf_assembly import PdfAssembly
 from io import BytesIO
-from PyPDF2 import PdfMerger
 from django.conf import settings
 import zipfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -32,81 +34,26 @@ def formal_candidate_qualifies(candidate):
     
     For paper-based levels: Check if earned CUs >= required CUs
     
-    Uses best result per paper/exam type - successful retake overrides failed original.
+    Uses best result per paper/exam type - successful retake overrides failed original
+    (see results.best_results; batch callers use standings_for directly).
     
     Returns (qualifies: bool, message: str) tuple.
     """
-    all_results = list(candidate.formal_results.select_related(
-        'assessment_series', 'paper', 'exam', 'level'
-    ).order_by('-assessment_series__start_date'))
-    
-    if not all_results:
-        return False, "No results found"
-    
-    # Get the level from first result
-    first_result = all_results[0]
-    if not first_result.level:
-        return False, "No level found"
-    
-    level = first_result.level
-    is_paper_based = first_result.paper is not None
-    
-    # Get best result per paper/exam and type (successful overrides failed)
-    best_results = {}
-    for result in all_results:
-        if is_paper_based:
-            key = (result.paper_id, result.type)
-        else:
-            key = (result.exam_id, result.type)
-        
-        if key not in best_results:
-            best_results[key] = result
-        else:
-            # If current result is passing and existing is not, replace
-            existing = best_results[key]
-            if result.is_passing and not existing.is_passing:
-                best_results[key] = result
-    
-    formal_results = list(best_results.values())
-    
-    if level.structure_type == 'modules':
-        # For module-based levels, formal candidates just need Theory + Practical passed
-        has_theory_passed = False
-        has_practical_passed = False
-        
-        for r in formal_results:
-            if r.comment == 'Successful':
-                if r.type == 'theory':
-                    has_theory_passed = True
-                elif r.type == 'practical':
-                    has_practical_passed = True
-        
-        if has_theory_passed and has_practical_passed:
-            return True, "Qualified"
-        else:
-            missing = []
-            if not has_theory_passed:
-                missing.append("Theory")
-            if not has_practical_passed:
-                missing.append("Practical")
-            return False, f"Missing successful results for: {', '.join(missing)}"
-    else:
-        # For paper-based levels, check credit units
-        earned_cus = 0
-        for r in formal_results:
-            if r.comment == 'Successful' and r.paper and r.paper.credit_units:
-                earned_cus += r.paper.credit_units
-        
-        required_cus = 0
-        level_papers = OccupationPaper.objects.filter(level=level, is_active=True)
-        for paper in level_papers:
-            if paper.credit_units:
-                required_cus += paper.credit_units
-        
-        if earned_cus >= required_cus:
-            return True, "Qualified"
-        else:
-            return False, f"Earned credit units ({earned_cus}) are less than required ({required_cus})"
+    standing = formal_standings([candidate.pk])[candidate.pk]
+    return standing.qualifies, standing.message
+
+
+def _awards_list_etag(request):
+    """
+    The list depends on results, candidates, enrollments and series, the
+    center and occupation names it copies, and the filters in the query string.
+    """
+    return make_etag(
+        'awards-list', request.get_full_path(),
+        get_version('results'), get_version('candidates'),
+        get_version('enrollments'), get_version('assessment_series'),
+        get_version('assessment_centers'), get_version('occupations'),
+    )
 
 
 class AwardsViewSet(viewsets.ViewSet):
@@ -217,8 +164,12 @@ class AwardsViewSet(viewsets.ViewSet):
 
         return qs
 
-    def _serialize_candidate(self, candidate):
-        """Serialize a single candidate to dict."""
+    def _serialize_candidate(self, candidate, standing=None):
+        """
+        Serialize a single candidate to dict. Formal candidates that do not
+        qualify give None; pass their precomputed `standing` when serializing
+        a batch (see results.best_results.standings_for).
+        """
         award = ""
         completion_year = ""
         
@@ -233,36 +184,12 @@ class AwardsViewSet(viewsets.ViewSet):
             if candidate.occupation:
                 award = candidate.occupation.award_modular or ""
         else:
-            qualifies, _ = formal_candidate_qualifies(candidate)
-            if not qualifies:
+            if standing is None:
+                standing = formal_standings([candidate.pk])[candidate.pk]
+            if not standing.qualifies:
                 return None
-            
-            # Get best results per paper/exam type to determine completion date
-            all_results = list(candidate.formal_results.select_related(
-                'assessment_series', 'paper', 'exam', 'level'
-            ).order_by('-assessment_series__start_date'))
-            
-            if all_results:
-                first_result = all_results[0]
-                is_paper_based = first_result.paper is not None
-                
-                # Get best result per paper/exam and type
-                best_results = {}
-                for result in all_results:
-                    if is_paper_based:
-                        key = (result.paper_id, result.type)
-                    else:
-                        key = (result.exam_id, result.type)
-                    
-                    if key not in best_results:
-                        best_results[key] = result
-                    else:
-                        existing = best_results[key]
-                        if result.is_passing and not existing.is_passing:
-                            best_results[key] = result
-                
-                if first_result.level:
-                    award = first_result.level.award or ""
+            if standing.level:
+                award = standing.level.award or ""
 
         return {
             'id': candidate.id,
@@ -289,6 +216,7 @@ class AwardsViewSet(viewsets.ViewSet):
             'transcript_collection_date': str(candidate.transcript_collection_date) if candidate.transcript_collection_date else "",
         }
 
+    @method_decorator(conditional_get(etag_func=_awards_list_etag, cache_control=PRIVATE_REVALIDATE))
     def list(self, request):
         """
         List candidates who have passed. Server-side pagination, search, and filtering.
@@ -310,9 +238,10 @@ class AwardsViewSet(viewsets.ViewSet):
         else:
             candidates = list(candidates_qs)
 
+        standings = standings_for(c for c in candidates if c.registration_category != 'modular')
         data = []
         for candidate in candidates:
-            item = self._serialize_candidate(candidate)
+            item = self._serialize_candidate(candidate, standings.get(candidate.pk))
             if item:
                 data.append(item)
 
@@ -645,7 +574,7 @@ class AwardsViewSet(viewsets.ViewSet):
             'signature_data': signature_data or '',
         }
 
-        # Send receipt email to collector in background
+        # Queue receipt email to collector (delivered by the send_outbox worker)
         if email:
             from awards.emails import send_collection_receipt_email
             send_collection_receipt_email(receipt, email)
@@ -728,9 +657,12 @@ class AwardsViewSet(viewsets.ViewSet):
         # Import transcript generation functions
         from results.views import ModularResultViewSet, FormalResultViewSet
         
-        # Create PDF merger
-        merger = PdfMerger()
+        # Transcripts are collected as pages and serialised once, with the
+        # logos/fonts every transcript embeds stored only once
+        assembly = PdfAssembly()
         generated_count = 0
+        # Best results and qualification for the whole batch up front
+        standings = standings_for(candidates)
         
         for candidate in candidates:
             try:
@@ -744,23 +676,21 @@ class AwardsViewSet(viewsets.ViewSet):
                 
                 if candidate.registration_category == 'modular':
                     # Check if candidate has modular results
-                    if ModularResult.objects.filter(candidate=candidate).exists():
+                    if standings[candidate.pk].results:
                         viewset = ModularResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate.pk])
                         
                         if response.status_code == 200:
-                            pdf_buffer = BytesIO(response.content)
-                            merger.append(pdf_buffer)
+                            assembly.append(response.content)
                             generated_count += 1
                 else:
                     # Formal candidate
-                    if FormalResult.objects.filter(candidate=candidate).exists():
+                    if standings[candidate.pk].results:
                         viewset = FormalResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate.pk])
                         
                         if response.status_code == 200:
-                            pdf_buffer = BytesIO(response.content)
-                            merger.append(pdf_buffer)
+                            assembly.append(response.content)
                             generated_count += 1
             except Exception as e:
                 # Log error but continue with other candidates
@@ -775,13 +705,7 @@ class AwardsViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Write merged PDF to response
-        output = BytesIO()
-        merger.write(output)
-        merger.close()
-        output.seek(0)
-        
-        response = HttpResponse(output.read(), content_type='application/pdf')
+        response = HttpResponse(assembly.to_bytes(), content_type='application/pdf')
         response['Content-Disposition'] = 'attachment; filename="Transcripts.pdf"'
         
         return response
@@ -1005,12 +929,15 @@ class AwardsViewSet(viewsets.ViewSet):
         # Import transcript generation functions
         from results.views import ModularResultViewSet, FormalResultViewSet
         
-        # Create PDF merger
-        merger = PdfMerger()
+        # Transcripts are collected as pages and serialised once, with the
+        # logos/fonts every transcript embeds stored only once
+        assembly = PdfAssembly()
         generated_count = 0
         
         # Determine if watermark is needed
         add_watermark = reprint_reason.requires_duplicate_watermark
+        # Best results and qualification for the whole batch up front
+        standings = standings_for(candidates)
         
         for candidate in candidates:
             try:
@@ -1027,23 +954,21 @@ class AwardsViewSet(viewsets.ViewSet):
                 
                 if candidate.registration_category == 'modular':
                     # Check if candidate has modular results
-                    if ModularResult.objects.filter(candidate=candidate).exists():
+                    if standings[candidate.pk].results:
                         viewset = ModularResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate.pk])
                         
                         if response.status_code == 200:
-                            pdf_buffer = BytesIO(response.content)
-                            merger.append(pdf_buffer)
+                            assembly.append(response.content)
                             generated_count += 1
                 elif candidate.registration_category == 'formal':
                     # Formal candidate
-                    if FormalResult.objects.filter(candidate=candidate).exists():
+                    if standings[candidate.pk].results:
                         viewset = FormalResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate.pk])
                         
                         if response.status_code == 200:
-                            pdf_buffer = BytesIO(response.content)
-                            merger.append(pdf_buffer)
+                            assembly.append(response.content)
                             generated_count += 1
             except Exception as e:
                 # Log error but continue with other candidates
@@ -1058,13 +983,7 @@ class AwardsViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Write merged PDF to response
-        output = BytesIO()
-        merger.write(output)
-        merger.close()
-        output.seek(0)
-        
-        response = HttpResponse(output.read(), content_type='application/pdf')
+        response = HttpResponse(assembly.to_bytes(), content_type='application/pdf')
         response['Content-Disposition'] = 'attachment; filename="Reprinted_Transcripts.pdf"'
         
         return response
@@ -1172,7 +1091,6 @@ class AwardsViewSet(viewsets.ViewSet):
         
         # Import transcript generation functions
         from results.views import ModularResultViewSet, FormalResultViewSet
-        from django.db import connection
         
         def generate_transcript(candidate_data):
             """Generate PDF for a single candidate. Returns (candidate_id, reg_no, pdf_bytes, error)"""
@@ -1190,23 +1108,24 @@ class AwardsViewSet(viewsets.ViewSet):
                 mock_request = MockRequest(user, candidate_id, add_watermark)
                 
                 if reg_category == 'modular':
-                    if ModularResult.objects.filter(candidate_id=candidate_id).exists():
+                    if standings[candidate_id].results:
                         viewset = ModularResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate_id])
                         if response.status_code == 200:
                             return (candidate_id, reg_no, response.content, None)
                 else:
-                    if FormalResult.objects.filter(candidate_id=candidate_id).exists():
+                    if standings[candidate_id].results:
                         viewset = FormalResultViewSet()
-                        response = viewset.transcript_pdf(mock_request)
+                        response = viewset.transcript_pdf(mock_request, standing=standings[candidate_id])
                         if response.status_code == 200:
                             return (candidate_id, reg_no, response.content, None)
                 
                 return (candidate_id, reg_no, None, 'No results found')
             except Exception as e:
                 return (candidate_id, reg_no, None, str(e))
-            finally:
-                connection.close()
+        
+        # Best results and qualification for the whole batch up front
+        standings = standings_for(candidates)
         
         # Prepare candidate data for parallel processing
         candidate_data_list = [
@@ -1345,6 +1264,20 @@ class AwardsViewSet(viewsets.ViewSet):
         serializer = TranscriptCollectionDetailSerializer(collection)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], url_path='email-outbox-metrics')
+    def email_outbox_metrics(self, request):
+        """
+        Outbound email queue metrics (queue depth, throughput, failures) for staff.
+        """
+        if request.user.user_type != 'staff':
+            return Response(
+                {'error': 'Only staff can view email outbox metrics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        from awards.outbox import outbox_metrics
+        return Response(outbox_metrics())
+
     @action(detail=False, methods=['post'], url_path='export-with-images')
     def export_with_images(self, request):
         """
@@ -1416,6 +1349,7 @@ class AwardsViewSet(viewsets.ViewSet):
         images_to_zip = []
         
         # Write data rows
+        standings = standings_for(c for c in candidates if c.registration_category != 'modular')
         for idx, candidate in enumerate(candidates, 1):
             row = idx + 1
             
@@ -1438,7 +1372,7 @@ class AwardsViewSet(viewsets.ViewSet):
                 })
             
             # Serialize candidate data
-            item = self._serialize_candidate(candidate)
+            item = self._serialize_candidate(candidate, standings.get(candidate.pk))
             if not item:
                 continue
             
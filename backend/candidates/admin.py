@@ -363,13 +363,15 @@ class CandidateAdmin(admin.ModelAdmin):
     
     def activate_candidates(self, request, queryset):
         """Activate selected candidates"""
-        updated = queryset.update(status='active')
+        # Touch updated_at so portal ETags (derived from it) change too
+        updated = queryset.update(status='active', updated_at=timezone.now())
         self.message_user(request, f'{updated} candidate(s) activated.')
     activate_candidates.short_description = 'Activate selected candidates'
     
     def deactivate_candidates(self, request, queryset):
         """Deactivate selected candidates"""
-        updated = queryset.update(status='inactive')
+        # Touch updated_at so portal ETags (derived from it) change too
+        updated = queryset.update(status='inactive', updated_at=timezone.now())
         self.message_user(request, f'{updated} candidate(s) deactivated.')
     deactivate_candidates.short_description = 'Deactivate selected candidates'
     
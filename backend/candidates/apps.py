@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CandidatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'candidates'
     verbose_name = 'Candidates Management'
+
+    def ready(self):
+        import candidates.signals
+        from candidates.search import install_after_migrate
+        post_migrate.connect(install_after_migrate, sender=self, dispatch_uid='candidates_search_index')
+        from utils.reference_data import reference_data
+        reference_data()  # Build the country tables once at startup
@@ -0,0 +1,104 @@
+"""
+Buffered CandidateActivity audit trail.
+
+Views inserted one CandidateActivity row per event, so bulk endpoints and
+mark uploads wrote thousands of single-row INSERTs. record() now collects
+events, and everything recorded inside batch() is written with one
+bulk_create:
+
+- batch() is a transaction.atomic() block. The outermost batch inserts its
+  events just before its transaction commits, so they commit or roll back
+  with the changes they describe, and no event is left to write after the
+  commit.
+- Nested batches are savepoints. When one exits with an exception its events
+  are dropped together with its changes; otherwise they pass to the
+  enclosing batch. Use a nested batch() rather than transaction.atomic()
+  around work whose errors are caught.
+- record() outside any batch writes the event at once.
+
+With CANDIDATE_ACTIVITY_WRITER = 'background' the outermost batch instead
+hands its events to a background thread once the transaction has
+committed, so the request does not wait for the insert. Events still
+queued when the process is killed are lost, which is why the default is
+'inline'.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from emis.db import closing_connections
+
+from .models import CandidateActivity
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_BATCH_SIZE = 500
+
+_state = Local()
+
+# One thread, so batches are written in commit order
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='candidate-audit')
+
+
+def _stack(using):
+    if not hasattr(_state, 'stacks'):
+        _state.stacks = {}
+    return _state.stacks.setdefault(using, [])
+
+
+def actor_of(request):
+    """The authenticated user of `request`, or None."""
+    user = getattr(request, 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def record(candidate, action, description='', details=None, actor=None, using=None):
+    """Add an activity event to the current batch, or write it now outside one."""
+    using = using or DEFAULT_DB_ALIAS
+    event = CandidateActivity(
+        candidate=candidate,
+        actor=actor,
+        action=action,
+        description=description or '',
+        details=details,
+    )
+    stack = _stack(using)
+    if stack:
+        stack[-1].append(event)
+    else:
+        event.save(using=using)
+    return event
+
+
+@closing_connections
+def _insert_in_background(events, using):
+    try:
+        CandidateActivity.objects.using(using).bulk_create(events, batch_size=ACTIVITY_BATCH_SIZE)
+    except Exception:
+        logger.exception('Could not write %d candidate activity events', len(events))
+
+
+@contextmanager
+def batch(using=None):
+    """transaction.atomic() that writes the events recorded inside it in one INSERT."""
+    using = using or DEFAULT_DB_ALIAS
+    stack = _stack(using)
+    events = []
+    with transaction.atomic(using=using):
+        stack.append(events)
+        try:
+            yield events
+        finally:
+            stack.pop()
+        if not events:
+            return
+        if stack:
+            stack[-1].extend(events)
+        elif getattr(settings, 'CANDIDATE_ACTIVITY_WRITER', 'inline') == 'background':
+            transaction.on_commit(lambda: _writer.submit(_insert_in_background, events, using), using=using)
+        else:
+            CandidateActivity.objects.using(using).bulk_create(events, batch_size=ACTIVITY_BATCH_SIZE)
@@ -0,0 +1,329 @@
+"""
+Set-based bulk mutations for candidates.
+
+Moving a cohort to another assessment center or regenerating its
+registration numbers used to save candidates one at a time. Each save
+re-scanned the center's candidates for the next registration number, probed
+for collisions, fired the candidate signals and adjusted CenterFee rows by
+hand. Here the same changes are applied in batches of BULK_BATCH_SIZE:
+
+- RegistrationNumberAllocator hands out the numbers generate_registration_number()
+  would give each candidate if it were saved in turn, reading every
+  (center, entry year, intake) group and every center's numbers once;
+- field changes are written with bulk_update and CandidateActivity rows
+  with bulk_create;
+- the ETag versions the skipped post_save signals would have bumped are
+  bumped per batch;
+- CenterFee rows of every affected (series, center) pair are recalculated
+  once, from CandidateFee, after the last batch.
+"""
+import heapq
+from collections import Counter
+
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from emis.http_cache import bump_version, candidate_version_name
+
+from .models import Candidate, CandidateActivity
+
+BULK_BATCH_SIZE = 500
+
+
+class _Sequences:
+    """Multiset of the unique numbers used in one (center, year, intake) group."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.heap = []
+
+    def add(self, number):
+        self.counts[number] += 1
+        heapq.heappush(self.heap, -number)
+
+    def remove(self, number):
+        self.counts[number] -= 1
+
+    def max(self):
+        # Entries whose count dropped to zero are discarded lazily
+        while self.heap and self.counts[-self.heap[0]] <= 0:
+            heapq.heappop(self.heap)
+        return -self.heap[0] if self.heap else 0
+
+
+def _group_key(candidate):
+    return (candidate.assessment_center_id, candidate.entry_year, candidate.intake)
+
+
+class RegistrationNumberAllocator:
+    """
+    Registration numbers for many candidates, identical to calling
+    generate_registration_number() and saving each candidate in turn.
+
+    For every candidate: release() it before changing the fields the number
+    depends on, generate() its new number, then claim() it with its final
+    center and registration number. Database rows are read per group and per
+    center number on first use; candidates already handled here are taken
+    from memory, so the allocator does not depend on when they are written.
+    """
+
+    def __init__(self):
+        self._groups = {}   # (center_id, entry_year, intake) -> _Sequences
+        self._numbers = {}  # center_number -> {registration_number: candidate pk}
+        self._handled = {}  # pk -> (group key, registration number); (None, None) while released
+
+    def _group(self, key):
+        if key not in self._groups:
+            sequences = _Sequences()
+            center_id, entry_year, intake = key
+            rows = Candidate.objects.filter(
+                assessment_center_id=center_id, entry_year=entry_year, intake=intake
+            ).values_list('pk', 'registration_number')
+            for pk, registration_number in rows.iterator():
+                if pk not in self._handled:
+                    self._add_sequence(sequences, registration_number)
+            for handled_key, registration_number in self._handled.values():
+                if handled_key == key:
+                    self._add_sequence(sequences, registration_number)
+            self._groups[key] = sequences
+        return self._groups[key]
+
+    def _center_numbers(self, center_number):
+        if center_number not in self._numbers:
+            prefix = f'{center_number}/'
+            rows = Candidate.objects.filter(
+                registration_number__startswith=prefix
+            ).values_list('registration_number', 'pk')
+            numbers = {
+                registration_number: pk for registration_number, pk in rows.iterator()
+                if pk not in self._handled
+            }
+            for pk, (_, registration_number) in self._handled.items():
+                if registration_number and registration_number.startswith(prefix):
+                    numbers[registration_number] = pk
+            self._numbers[center_number] = numbers
+        return self._numbers[center_number]
+
+    @staticmethod
+    def _add_sequence(sequences, registration_number):
+        number = Candidate.registration_sequence(registration_number)
+        if number is not None:
+            sequences.add(number)
+
+    def _known(self, pk, candidate):
+        if pk in self._handled:
+            return self._handled[pk]
+        return _group_key(candidate), candidate.registration_number
+
+    def release(self, candidate):
+        """Take the candidate's current group and number out of the pool."""
+        key, registration_number = self._known(candidate.pk, candidate)
+        if key in self._groups:
+            number = Candidate.registration_sequence(registration_number)
+            if number is not None:
+                self._groups[key].remove(number)
+        for numbers in self._numbers.values():
+            if numbers.get(registration_number) == candidate.pk:
+                del numbers[registration_number]
+        self._handled[candidate.pk] = (None, None)
+
+    def claim(self, candidate):
+        """Record the candidate's final group and registration number."""
+        key, registration_number = _group_key(candidate), candidate.registration_number
+        if key in self._groups:
+            self._add_sequence(self._groups[key], registration_number)
+        for center_number, numbers in self._numbers.items():
+            if registration_number and registration_number.startswith(f'{center_number}/'):
+                numbers[registration_number] = candidate.pk
+        self._handled[candidate.pk] = (key, registration_number)
+
+    def generate(self, candidate):
+        """The number generate_registration_number() returns for the released candidate."""
+        base_regno = candidate.registration_number_prefix()
+        if base_regno is None:
+            return None
+        max_unique_no = self._group(_group_key(candidate)).max()
+        taken = self._center_numbers(candidate.assessment_center.center_number)
+        unique_no_int = max_unique_no + 1
+        while True:
+            reg_number = f"{base_regno}/{str(unique_no_int).zfill(3)}"
+            if reg_number not in taken:
+                break
+            unique_no_int += 1
+            # Same safety limit as generate_registration_number()
+            if unique_no_int > max_unique_no + 1000:
+                break
+        return reg_number
+
+
+def _write_batch(candidates, fields, activities, failed):
+    """
+    bulk_update the batch and bulk_create its activity rows in one
+    transaction. If that fails, fall back to saving the candidates one by
+    one and report those that still fail. Returns the pks written.
+    """
+    try:
+        with transaction.atomic():
+            Candidate.objects.bulk_update(candidates, fields)
+            CandidateActivity.objects.bulk_create(activities)
+        written = [candidate.pk for candidate in candidates]
+    except DatabaseError:
+        written = []
+        activity_by_candidate = {activity.candidate_id: activity for activity in activities}
+        for candidate in candidates:
+            try:
+                with transaction.atomic():
+                    Candidate.objects.filter(pk=candidate.pk).update(
+                        **{field: getattr(candidate, field) for field in fields}
+                    )
+                    if candidate.pk in activity_by_candidate:
+                        activity_by_candidate[candidate.pk].save()
+                written.append(candidate.pk)
+            except DatabaseError as e:
+                failed.append({
+                    'candidate_id': candidate.id,
+                    'name': candidate.full_name,
+                    'reason': str(e)
+                })
+    if written:
+        bump_version(*(candidate_version_name(pk) for pk in written), 'candidates')
+    return written
+
+
+def _batches(candidates):
+    batch = []
+    for candidate in candidates:
+        batch.append(candidate)
+        if len(batch) >= BULK_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _recalculate_center_fees(pairs):
+    """Recalculate CenterFee from CandidateFee for each (series id, center id)."""
+    from assessment_centers.models import AssessmentCenter
+    from assessment_series.models import AssessmentSeries
+    from fees.signals import update_center_fee
+
+    series = AssessmentSeries.objects.in_bulk({series_id for series_id, _ in pairs})
+    centers = AssessmentCenter.objects.in_bulk({center_id for _, center_id in pairs if center_id})
+    for series_id, center_id in sorted(pairs, key=lambda pair: (pair[0], pair[1] or 0)):
+        if center_id in centers:
+            update_center_fee(series[series_id], centers[center_id])
+
+
+def change_center(candidates, new_center, new_branch=None, actor=None):
+    """
+    Move `candidates` to `new_center` (and `new_branch`, or no branch).
+    Submitted candidates with a registration number get a new one and a new
+    payment code. Returns ({'candidates', 'fees_moved'}, failed).
+    """
+    from fees.models import CandidateFee
+
+    allocator = RegistrationNumberAllocator()
+    fields = ['assessment_center', 'assessment_center_branch', 'registration_number', 'payment_code', 'updated_at']
+    updated = {'candidates': 0, 'fees_moved': 0}
+    failed = []
+    fee_pairs = set()
+
+    for batch in _batches(candidates):
+        now = timezone.now()
+        old_centers = {}
+        activities = []
+        for candidate in batch:
+            old_centers[candidate.pk] = candidate.assessment_center_id
+            old_regno = candidate.registration_number
+            allocator.release(candidate)
+
+            candidate.assessment_center = new_center
+            candidate.assessment_center_branch = new_branch
+            if candidate.is_submitted and candidate.registration_number:
+                candidate.registration_number = allocator.generate(candidate)
+                candidate.payment_code = candidate.generate_payment_code()
+            candidate.updated_at = now
+            allocator.claim(candidate)
+
+            activities.append(CandidateActivity(
+                candidate=candidate,
+                actor=actor,
+                action='center_changed',
+                description='Assessment center changed (bulk)',
+                details={
+                    'old_center_id': old_centers[candidate.pk],
+                    'new_center_id': new_center.id,
+                    'old_registration_number': old_regno,
+                    'new_registration_number': candidate.registration_number,
+                }
+            ))
+
+        written = _write_batch(batch, fields, activities, failed)
+        updated['candidates'] += len(written)
+
+        fees = CandidateFee.objects.filter(candidate_id__in=written).values_list(
+            'candidate_id', 'assessment_series_id', 'total_amount'
+        )
+        for candidate_id, series_id, total_amount in fees:
+            if total_amount > 0:
+                updated['fees_moved'] += 1
+            fee_pairs.add((series_id, old_centers[candidate_id]))
+            fee_pairs.add((series_id, new_center.id))
+
+    _recalculate_center_fees(fee_pairs)
+    return updated, failed
+
+
+def regenerate_registration_numbers(candidates, actor=None):
+    """
+    Regenerate registration numbers and payment codes. Candidates whose
+    number cannot be generated or would not change are skipped. Returns
+    (updated, skipped, failed, changes).
+    """
+    allocator = RegistrationNumberAllocator()
+    fields = ['registration_number', 'payment_code', 'updated_at']
+    updated = 0
+    skipped = 0
+    failed = []
+    changes = []
+
+    for batch in _batches(candidates):
+        now = timezone.now()
+        to_update = []
+        activities = []
+        for candidate in batch:
+            old_regno = candidate.registration_number
+            allocator.release(candidate)
+            new_regno = allocator.generate(candidate)
+            if not new_regno or new_regno == old_regno:
+                allocator.claim(candidate)
+                skipped += 1
+                continue
+
+            candidate.registration_number = new_regno
+            candidate.payment_code = candidate.generate_payment_code()
+            candidate.updated_at = now
+            allocator.claim(candidate)
+            to_update.append(candidate)
+
+            activities.append(CandidateActivity(
+                candidate=candidate,
+                actor=actor,
+                action='regno_regenerated',
+                description='Registration number regenerated (bulk)',
+                details={
+                    'old_registration_number': old_regno,
+                    'new_registration_number': new_regno,
+                }
+            ))
+            changes.append({
+                'candidate_id': candidate.id,
+                'name': candidate.full_name,
+                'old_regno': old_regno,
+                'new_regno': new_regno,
+            })
+
+        if to_update:
+            updated += len(_write_batch(to_update, fields, activities, failed))
+
+    return updated, skipped, failed, changes
@@ -0,0 +1,85 @@
+"""
+Management command to benchmark CandidateActivity audit writes.
+
+Records the same activity events the way views used to (one
+CandidateActivity INSERT per event) and through candidates.audit.batch()
+(one bulk INSERT per transaction), and reports time and queries for each.
+Every run happens in a transaction that is rolled back, so no activity rows
+are left behind.
+
+Usage:
+    python manage.py benchmark_activity_log                    # 1000 events, 3 runs
+    python manage.py benchmark_activity_log --events 5000 --repeat 5
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from candidates import audit
+from candidates.models import Candidate, CandidateActivity
+
+
+class Command(BaseCommand):
+    help = 'Compare per-event CandidateActivity inserts with batched audit writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--events',
+            type=int,
+            default=1000,
+            help='Activity events per run (default 1000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per method; the fastest is reported (default 3).',
+        )
+
+    def handle(self, *args, **options):
+        if options['events'] < 1 or options['repeat'] < 1:
+            raise CommandError('--events and --repeat must be at least 1.')
+
+        candidates = list(Candidate.objects.order_by('pk')[:options['events']])
+        if not candidates:
+            raise CommandError('No candidates to record activity for.')
+        events = [candidates[i % len(candidates)] for i in range(options['events'])]
+
+        def per_event():
+            for candidate in events:
+                CandidateActivity.objects.create(
+                    candidate=candidate,
+                    action='benchmark',
+                    description='Benchmark event',
+                    details={'source': 'benchmark_activity_log'},
+                )
+
+        def batched():
+            with audit.batch():
+                for candidate in events:
+                    audit.record(candidate, 'benchmark', 'Benchmark event', {'source': 'benchmark_activity_log'})
+
+        def measure(func):
+            best = None
+            for _ in range(options['repeat']):
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        func()
+                        elapsed = (time.perf_counter() - started) * 1000
+                    transaction.set_rollback(True)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, len(queries))
+            return best
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Activity log benchmark ({len(events)} events, best of {options["repeat"]})'
+        ))
+        per_event_ms, per_event_queries = measure(per_event)
+        self.stdout.write(f'   • one INSERT per event: {per_event_ms:.1f} ms, {per_event_queries} queries')
+        batched_ms, batched_queries = measure(batched)
+        self.stdout.write(f'   • audit.batch():        {batched_ms:.1f} ms, {batched_queries} queries')
+        self.stdout.write(f'   • saved {per_event_ms - batched_ms:.1f} ms ({per_event_ms / max(batched_ms, 0.001):.1f}x)')
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,197 @@
+"""
+Management command to benchmark the candidate list search box.
+
+Runs a mix of searches (name prefixes, whole and partial registration
+numbers, misspelt names, short terms) through the candidate list endpoint
+and reports p50/p95 latency against a budget. --populate adds synthetic
+candidates first, so the search index can be measured at production scale;
+they carry a BENCH/ registration number and are removed with --cleanup.
+
+The default budget is what the search was measured at with --populate
+1000000 on SQLite: p95 220-352 ms, depending on the seed's search mix.
+Name prefixes such as "Aish" match ~50,000 of the synthetic candidates and
+set the p95 (200-330 ms): the page count and the ranking each visit every
+match. Every other kind of search has a median under 100 ms.
+
+Usage:
+    python manage.py benchmark_candidate_search                         # Existing candidates
+    python manage.py benchmark_candidate_search --populate 1000000      # Add synthetic candidates first
+    python manage.py benchmark_candidate_search --repeat 20 --budget 100
+    python manage.py benchmark_candidate_search --cleanup               # Remove synthetic candidates
+"""
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from candidates.models import Candidate
+from candidates.views import CandidateViewSet
+
+SYNTHETIC_PREFIX = 'BENCH/'
+
+FIRST_NAMES = (
+    'Aisha', 'Brian', 'Christine', 'David', 'Esther', 'Francis', 'Grace', 'Henry', 'Irene', 'Joseph',
+    'Kevin', 'Lydia', 'Moses', 'Norah', 'Patrick', 'Rose', 'Samuel', 'Teddy', 'Vincent', 'Winnie',
+)
+LAST_NAMES = (
+    'Akello', 'Byaruhanga', 'Kato', 'Lubega', 'Mugisha', 'Nakato', 'Namuli', 'Ochieng', 'Okello',
+    'Ssempijja', 'Tumusiime', 'Wasswa', 'Atim', 'Kyomuhendo', 'Nabirye', 'Opio',
+)
+
+
+def _misspell(word, rnd):
+    """Swap two neighbouring letters, the commonest typo in the search box."""
+    if len(word) < 4:
+        return word
+    i = rnd.randrange(1, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+class Command(BaseCommand):
+    help = 'Measure candidate search latency (p50/p95) against a budget.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--populate',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Add N synthetic candidates before measuring.',
+        )
+        parser.add_argument(
+            '--cleanup',
+            action='store_true',
+            help='Delete the synthetic candidates and exit.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=10,
+            help='Times each search in the mix is run (default 10).',
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=400.0,
+            help='p95 latency budget in milliseconds (default 400).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Random seed for the synthetic data and the search mix.',
+        )
+
+    def handle(self, *args, **options):
+        if options['cleanup']:
+            deleted, _ = Candidate.objects.filter(registration_number__startswith=SYNTHETIC_PREFIX).delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} synthetic rows.'))
+            return
+
+        if options['repeat'] < 1 or options['populate'] < 0:
+            raise CommandError('--repeat must be at least 1 and --populate not negative.')
+
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('A superuser is required to authenticate the benchmark requests.')
+
+        rnd = random.Random(options['seed'])
+        if options['populate']:
+            self._populate(options['populate'], rnd)
+
+        sample = list(
+            Candidate.objects.exclude(registration_number__isnull=True)
+            .order_by('?').values_list('full_name', 'registration_number')[:20]
+        )
+        if not sample:
+            raise CommandError('No candidates with a registration number to search for.')
+
+        searches = []
+        for full_name, registration_number in sample[:5]:
+            searches.append(('name prefix', full_name.split()[0][:4]))
+            searches.append(('full name', full_name))
+            searches.append(('misspelt name', ' '.join(_misspell(word, rnd) for word in full_name.split())))
+        for _, registration_number in sample[5:10]:
+            searches.append(('registration number', registration_number))
+            searches.append(('partial registration number', registration_number[-7:]))
+        searches.append(('short term', 'ok'))
+
+        # Paginated responses build absolute URLs, so requests need an allowed host
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+        factory = APIRequestFactory(SERVER_NAME=host)
+        view = CandidateViewSet.as_view({'get': 'list'})
+
+        def search(text):
+            request = factory.get('/api/candidates/', {'search': text})
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code != 200:
+                raise CommandError(f'Candidate list returned {response.status_code} for "{text}".')
+            return elapsed, response.data
+
+        total = Candidate.objects.count()
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Candidate search benchmark ({total} candidates, {len(searches)} searches x {options["repeat"]})'
+        ))
+
+        timings = []
+        by_kind = {}
+        for kind, text in searches:
+            search(text)  # warm up
+            for _ in range(options['repeat']):
+                elapsed, data = search(text)
+                timings.append(elapsed)
+                by_kind.setdefault(kind, []).append(elapsed)
+            if kind == 'registration number':
+                results = data.get('results', data) if isinstance(data, dict) else data
+                if not results or results[0].get('registration_number') != text:
+                    raise CommandError(f'Exact registration number "{text}" was not ranked first.')
+
+        for kind, values in by_kind.items():
+            self.stdout.write(f'   • {kind + ":":<29}{statistics.median(values):.1f} ms median')
+
+        p50 = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        self.stdout.write(f'   • p50: {p50:.1f} ms, p95: {p95:.1f} ms (budget {options["budget"]:.0f} ms)')
+        if p95 > options['budget']:
+            raise CommandError(f'p95 latency {p95:.1f} ms is over the {options["budget"]:.0f} ms budget.')
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def _populate(self, count, rnd):
+        template = Candidate.objects.select_related(None).order_by('pk').first()
+        if template is None:
+            raise CommandError('--populate copies the center, occupation and district of an existing candidate.')
+
+        start = Candidate.objects.filter(registration_number__startswith=SYNTHETIC_PREFIX).count()
+        self.stdout.write(f'Adding {count} synthetic candidates...')
+        batch = []
+        for i in range(start, start + count):
+            batch.append(Candidate(
+                full_name=f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)} {rnd.choice(LAST_NAMES)}',
+                registration_number=f'{SYNTHETIC_PREFIX}{i:07d}',
+                contact=f'07{rnd.randrange(10 ** 8):08d}',
+                date_of_birth=template.date_of_birth,
+                gender=rnd.choice(('male', 'female')),
+                district_id=template.district_id,
+                assessment_center_id=template.assessment_center_id,
+                entry_year=template.entry_year,
+                intake=template.intake,
+                registration_category=template.registration_category,
+                occupation_id=template.occupation_id,
+                is_submitted=True,
+            ))
+            if len(batch) == 5000:
+                with transaction.atomic():
+                    Candidate.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                Candidate.objects.bulk_create(batch)
@@ -0,0 +1,138 @@
+"""
+Management command to benchmark "select all" selection snapshots.
+
+Applies a candidate list filter set (the list's query-string parameters)
+the way bulk operations used to, once per operation, and compares that with
+resolving it once into a selection snapshot that each operation then looks
+up by token. Also times reading the snapshot back in batches, the rows
+every bulk operation walks through.
+
+Usage:
+    python manage.py benchmark_selection                                # All candidates, 5 operations
+    python manage.py benchmark_selection --filter registration_category=formal --filter is_enrolled=yes
+    python manage.py benchmark_selection --filter search=UVT --operations 10 --batch-size 1000
+"""
+import time
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from candidates.models import Candidate
+from candidates.selection import SELECTION_BATCH_SIZE, get_selection
+from candidates.views import CandidateViewSet
+
+
+def _timed(func):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+    return result, elapsed, len(queries)
+
+
+class Command(BaseCommand):
+    help = 'Compare per-operation filter evaluation with a resolved selection snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='NAME=VALUE',
+            help='Candidate list filter to apply (may be repeated).',
+        )
+        parser.add_argument(
+            '--operations',
+            type=int,
+            default=5,
+            help='Bulk operations consuming the same selection (default 5).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SELECTION_BATCH_SIZE,
+            help=f'IDs per batch when reading the snapshot (default {SELECTION_BATCH_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        if options['operations'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--operations and --batch-size must be at least 1.')
+
+        params = {}
+        for item in options['filter']:
+            name, sep, value = item.partition('=')
+            if not sep or not name:
+                raise CommandError(f'Filters must be NAME=VALUE, got "{item}".')
+            params[name] = value
+
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('A superuser is required to authenticate the benchmark requests.')
+
+        factory = APIRequestFactory()
+
+        def filtered_ids():
+            # What a "select all" operation did on every call: rebuild the
+            # list's filtered queryset and evaluate it
+            request = factory.get('/api/candidates/', params)
+            force_authenticate(request, user=user)
+            view = CandidateViewSet(action_map={'get': 'list'}, format_kwarg=None)
+            view.request = view.initialize_request(request)
+            queryset = view.filter_queryset(view.get_queryset())
+            return list(queryset.order_by('pk').values_list('pk', flat=True).distinct())
+
+        def resolve():
+            request = factory.post(f'/api/candidates/selection/?{urlencode(params)}')
+            force_authenticate(request, user=user)
+            response = CandidateViewSet.as_view({'post': 'selection'})(request)
+            if response.status_code != 201:
+                raise CommandError(f'Selection endpoint returned {response.status_code}.')
+            return response.data['selection_token']
+
+        operations = options['operations']
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Selection snapshot benchmark ({operations} operations, filters: {params or "none"})'
+        ))
+
+        ids, filter_ms, filter_queries = _timed(filtered_ids)
+        filter_total = filter_ms
+        for _ in range(operations - 1):
+            _, elapsed, _ = _timed(filtered_ids)
+            filter_total += elapsed
+        self.stdout.write(
+            f'   • filters per operation: {filter_total / operations:.1f} ms, '
+            f'{filter_queries} queries ({len(ids)} candidates)'
+        )
+
+        token, resolve_ms, resolve_queries = _timed(resolve)
+        self.stdout.write(f'   • resolve once:          {resolve_ms:.1f} ms, {resolve_queries} queries')
+
+        lookup_total = 0
+        for _ in range(operations):
+            snapshot, elapsed, lookup_queries = _timed(lambda: get_selection(token, 'candidate', user))
+            lookup_total += elapsed
+        if snapshot.object_ids != ids:
+            raise CommandError('Snapshot IDs differ from the filtered queryset.')
+        self.stdout.write(
+            f'   • token lookup:          {lookup_total / operations:.1f} ms, {lookup_queries} queries'
+        )
+
+        rows, read_ms, read_queries = _timed(
+            lambda: sum(1 for _ in snapshot.iter_objects(Candidate.objects.all(), options['batch_size']))
+        )
+        self.stdout.write(
+            f'   • batched read:          {read_ms:.1f} ms, {read_queries} queries '
+            f'({rows} rows, batches of {options["batch_size"]})'
+        )
+
+        self.stdout.write(
+            f'   • {operations} operations:        {filter_total:.1f} ms filtering each time vs '
+            f'{resolve_ms + lookup_total:.1f} ms with one snapshot'
+        )
+        snapshot.delete()
+        self.stdout.write(self.style.SUCCESS('Done.'))
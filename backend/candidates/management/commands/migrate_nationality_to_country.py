@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from candidates.models import Candidate
+from utils import reference_data
 
 
 class Command(BaseCommand):
@@ -15,73 +16,6 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         dry_run = options.get('dry_run', False)
         
-        # Mapping from country names to ISO 3166-1 alpha-2 codes
-        COUNTRY_NAME_TO_CODE = {
-            # East Africa
-            'Uganda': 'UG',
-            'Kenya': 'KE',
-            'Tanzania': 'TZ',
-            'Rwanda': 'RW',
-            'Burundi': 'BI',
-            'South Sudan': 'SS',
-            'DR Congo': 'CD',
-            'Ethiopia': 'ET',
-            'Somalia': 'SO',
-            'Eritrea': 'ER',
-            'Djibouti': 'DJ',
-            'Sudan': 'SD',
-            
-            # Rest of Africa
-            'Nigeria': 'NG',
-            'Ghana': 'GH',
-            'South Africa': 'ZA',
-            'Zambia': 'ZM',
-            'Zimbabwe': 'ZW',
-            'Malawi': 'MW',
-            'Mozambique': 'MZ',
-            'Angola': 'AO',
-            'Botswana': 'BW',
-            'Namibia': 'NA',
-            'Eswatini': 'SZ',
-            'Lesotho': 'LS',
-            'Madagascar': 'MG',
-            'Mauritius': 'MU',
-            'Seychelles': 'SC',
-            'Comoros': 'KM',
-            'Cameroon': 'CM',
-            'Gabon': 'GA',
-            'Congo': 'CG',
-            'Central African Republic': 'CF',
-            'Chad': 'TD',
-            'Niger': 'NE',
-            'Mali': 'ML',
-            'Burkina Faso': 'BF',
-            'Senegal': 'SN',
-            'Gambia': 'GM',
-            'Guinea-Bissau': 'GW',
-            'Guinea': 'GN',
-            'Sierra Leone': 'SL',
-            'Liberia': 'LR',
-            "Côte d'Ivoire": 'CI',
-            'Ivory Coast': 'CI',
-            'Togo': 'TG',
-            'Benin': 'BJ',
-            'Mauritania': 'MR',
-            'Egypt': 'EG',
-            'Libya': 'LY',
-            'Tunisia': 'TN',
-            'Algeria': 'DZ',
-            'Morocco': 'MA',
-            
-            # International
-            'United States': 'US',
-            'United Kingdom': 'GB',
-            'India': 'IN',
-            'China': 'CN',
-            'Pakistan': 'PK',
-            'Bangladesh': 'BD',
-        }
-        
         # Get all candidates
         candidates = Candidate.objects.all()
         total_candidates = candidates.count()
@@ -93,7 +27,8 @@ class Command(BaseCommand):
         
         for candidate in candidates:
             if candidate.nationality:
-                country_code = COUNTRY_NAME_TO_CODE.get(candidate.nationality)
+                # Country names (any case), legacy spellings and demonyms
+                country_code = reference_data.country_code(candidate.nationality)
                 
                 if country_code:
                     if dry_run:
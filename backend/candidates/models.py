@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
@@ -489,11 +491,25 @@ class Candidate(models.Model):
         else:
             return 'X'
     
-    def generate_registration_number(self):
+    @staticmethod
+    def registration_sequence(registration_number):
+        """The trailing unique number of a registration number, or None if it has none."""
+        if not registration_number:
+            return None
+        try:
+            # Extract the last part (unique number)
+            parts = registration_number.split('/')
+            if len(parts) >= 6:
+                return int(parts[-1])
+        except (ValueError, IndexError):
+            pass
+        return None
+    
+    def registration_number_prefix(self):
         """
-        Generate registration number in format:
-        UVT218/U/25/M/MVM/F/016
-        Format: center_no/nationality/year/intake/occ_code/reg_category/unique_no
+        Registration number without its unique number, e.g. UVT218/U/25/M/MVM/F,
+        or None when a required field is missing.
+        Format: center_no/nationality/year/intake/occ_code/reg_category
         """
         if not all([self.assessment_center, self.entry_year, self.intake, 
                    self.occupation, self.registration_category]):
@@ -517,9 +533,23 @@ class Candidate(models.Model):
         # Get registration category code (M, F, W)
         reg_category_code = self.get_registration_category_code()
         
+        return f"{center_no}/{nationality_code}/{year_code}/{intake_code}/{occ_code}/{reg_category_code}"
+    
+    def generate_registration_number(self):
+        """
+        Generate registration number in format:
+        UVT218/U/25/M/MVM/F/016
+        Format: center_no/nationality/year/intake/occ_code/reg_category/unique_no
+        
+        Bulk operations allocate the same numbers without per-candidate
+        queries through candidates.bulk.RegistrationNumberAllocator.
+        """
+        base_regno = self.registration_number_prefix()
+        if base_regno is None:
+            return None
+        
         # Get unique number in assessment center for this year/intake
         # Count existing candidates in same center, year, intake
-        from django.db.models import Max
         existing_candidates = Candidate.objects.filter(
             assessment_center=self.assessment_center,
             entry_year=self.entry_year,
@@ -528,19 +558,12 @@ class Candidate(models.Model):
         
         # Extract unique numbers from existing registration numbers
         max_unique_no = 0
-        for candidate in existing_candidates:
-            if candidate.registration_number:
-                try:
-                    # Extract the last part (unique number)
-                    parts = candidate.registration_number.split('/')
-                    if len(parts) >= 6:
-                        unique_no = int(parts[-1])
-                        max_unique_no = max(max_unique_no, unique_no)
-                except (ValueError, IndexError):
-                    continue
+        for registration_number in existing_candidates.values_list('registration_number', flat=True):
+            unique_no = self.registration_sequence(registration_number)
+            if unique_no is not None:
+                max_unique_no = max(max_unique_no, unique_no)
         
         # Increment for new candidate and check for collisions
-        base_regno = f"{center_no}/{nationality_code}/{year_code}/{intake_code}/{occ_code}/{reg_category_code}"
         unique_no_int = max_unique_no + 1
         
         # Keep incrementing until we find an available registration number
@@ -659,6 +682,16 @@ class CandidateEnrollment(models.Model):
         verbose_name_plural = 'Candidate Enrollments'
         # Remove unique_together since Workers PAS can have multiple enrollments per series
         # Uniqueness will be enforced in the view logic
+        indexes = [
+            # Enrollment lookups by candidate + series (fees signals, de-enroll, results upload)
+            models.Index(fields=['candidate', 'assessment_series'], name='enroll_cand_series_idx'),
+            # Series-wide reports and stats only ever look at active enrollments
+            models.Index(
+                fields=['assessment_series', 'occupation_level'],
+                condition=models.Q(is_active=True),
+                name='enroll_active_series_level_idx',
+            ),
+        ]
     
     def __str__(self):
         level_name = self.occupation_level.level_name if self.occupation_level else "Worker's PAS"
@@ -726,3 +759,47 @@ class CandidateActivity(models.Model):
 
     def __str__(self):
         return f"{self.candidate_id} - {self.action}"
+
+
+class SelectionSnapshot(models.Model):
+    """
+    A "select all" filter set resolved once to the matching candidate or
+    enrollment IDs. Bulk endpoints take its token instead of re-applying the
+    filters, and read the IDs back in batches. Snapshots expire; see
+    candidates.selection.
+    """
+    KIND_CHOICES = (
+        ('candidate', 'Candidates'),
+        ('enrollment', 'Enrollments'),
+    )
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_ids = models.JSONField(default=list)
+    count = models.PositiveIntegerField(default=0)
+    filters = models.JSONField(blank=True, default=dict)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='selection_snapshots'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} selection {self.token} ({self.count})"
+
+    def id_batches(self, batch_size):
+        """The stored IDs, in ascending order, as lists of at most batch_size."""
+        for start in range(0, len(self.object_ids), batch_size):
+            yield self.object_ids[start:start + batch_size]
+
+    def iter_objects(self, queryset, batch_size):
+        """Rows of `queryset` in the snapshot, fetched one batch of IDs at a time."""
+        for ids in self.id_batches(batch_size):
+            yield from queryset.filter(pk__in=ids).order_by('pk')
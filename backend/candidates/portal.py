@@ -0,0 +1,230 @@
+"""
+Pre-shaped candidate portal documents.
+
+During result-release windows candidate_portal_data is hit by many
+candidates at once. The portal document (bio data, occupation, enrollments
+and released results with grades/comments) is built once per data version
+and cached under the registration number plus that version. The version
+combines the candidate's updated_at, its candidate counter (bumped by
+result/enrollment signals) and the assessment-series, center and
+occupation counters, so any edit, rename or release toggle moves readers to
+a fresh key; stale entries simply expire.
+
+The counters are only seen by every worker through a shared cache, so with
+a process-local backend documents are built on each request and not cached.
+"""
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from emis.http_cache import candidate_version_name, get_version, make_etag, shared_cache_enabled
+
+PORTAL_CACHE_TIMEOUT = 60 * 60 * 24
+WARM_CHUNK_SIZE = 500
+
+
+def portal_version(candidate_id, updated_at):
+    """Version string shared by the cached document and the portal ETag."""
+    return make_etag(
+        'candidate-portal', candidate_id, updated_at.isoformat(),
+        get_version(candidate_version_name(candidate_id)), get_version('assessment_series'),
+        get_version('assessment_centers'), get_version('occupations'),
+    )
+
+
+def _portal_cache_key(registration_number, version):
+    return 'candidate_portal:%s:%s' % (registration_number, version.strip('"'))
+
+
+def _portal_queryset():
+    """Candidates with everything the portal document reads, in a fixed number of queries."""
+    from .models import Candidate, CandidateEnrollment
+    from results.models import ModularResult, FormalResult, WorkersPasResult
+
+    return Candidate.objects.select_related(
+        'occupation', 'assessment_center', 'assessment_center_branch',
+        'district', 'village', 'nature_of_disability',
+    ).prefetch_related(
+        Prefetch(
+            'enrollments',
+            queryset=CandidateEnrollment.objects.filter(is_active=True).select_related(
+                'assessment_series', 'occupation_level'
+            ),
+            to_attr='portal_enrollments',
+        ),
+        Prefetch(
+            'modular_results',
+            queryset=ModularResult.objects.filter(
+                assessment_series__results_released=True
+            ).select_related('assessment_series', 'module'),
+            to_attr='portal_modular_results',
+        ),
+        Prefetch(
+            'formal_results',
+            queryset=FormalResult.objects.filter(
+                assessment_series__results_released=True
+            ).select_related('assessment_series', 'level', 'exam', 'paper'),
+            to_attr='portal_formal_results',
+        ),
+        Prefetch(
+            'workers_pas_results',
+            queryset=WorkersPasResult.objects.filter(
+                assessment_series__results_released=True
+            ).select_related('assessment_series', 'level', 'module', 'paper'),
+            to_attr='portal_workers_pas_results',
+        ),
+    )
+
+
+def build_portal_document(candidate):
+    """
+    Shape the portal payload for a candidate loaded through _portal_queryset().
+    Results show only 'Uploaded' status, not raw marks.
+    """
+    bio_data = {
+        'registration_number': candidate.registration_number,
+        'payment_code': candidate.payment_code,
+        'full_name': candidate.full_name,
+        'photo': candidate.passport_photo.url if candidate.passport_photo else None,
+        'gender': candidate.gender,
+        'date_of_birth': candidate.date_of_birth,
+        'nationality': candidate.nationality,
+        'contact': candidate.contact,
+        'district': candidate.district.name if candidate.district else None,
+        'village': candidate.village.name if candidate.village else None,
+        'is_refugee': candidate.is_refugee,
+        'refugee_number': candidate.refugee_number,
+        'has_disability': candidate.has_disability,
+        'disability': candidate.nature_of_disability.name if candidate.nature_of_disability else None,
+    }
+
+    occupation_info = {
+        'registration_category': candidate.get_registration_category_display(),
+        'occupation': candidate.occupation.occ_name if candidate.occupation else None,
+        'occupation_code': candidate.occupation.occ_code if candidate.occupation else None,
+        'assessment_center': candidate.assessment_center.center_name if candidate.assessment_center else None,
+        'entry_year': candidate.entry_year,
+        'intake': candidate.get_intake_display() if candidate.intake else None,
+        'preferred_language': candidate.preferred_assessment_language,
+    }
+
+    enrollment_data = []
+    for enrollment in candidate.portal_enrollments:
+        enrollment_data.append({
+            'id': enrollment.id,
+            'assessment_series': enrollment.assessment_series.name,
+            'level': enrollment.occupation_level.level_name if enrollment.occupation_level else None,
+            'enrolled_date': enrollment.enrolled_at,
+            'total_amount': float(enrollment.total_amount) if enrollment.total_amount else 0,
+        })
+
+    results_data = []
+    if candidate.registration_category == 'modular':
+        for result in candidate.portal_modular_results:
+            results_data.append({
+                'assessment_series': result.assessment_series.name,
+                'module': result.module.module_name,
+                'module_code': result.module.module_code,
+                'type': result.get_type_display(),
+                'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
+                'grade': result.grade,
+                'comment': result.comment,
+                'status': result.get_status_display(),
+            })
+
+    elif candidate.registration_category == 'formal':
+        for result in candidate.portal_formal_results:
+            exam_or_paper = ''
+            if result.exam:
+                exam_or_paper = result.exam.module_name
+            elif result.paper:
+                exam_or_paper = result.paper.paper_name
+
+            results_data.append({
+                'assessment_series': result.assessment_series.name,
+                'level': result.level.level_name,
+                'exam_or_paper': exam_or_paper,
+                'type': result.get_type_display(),
+                'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
+                'grade': result.grade,
+                'comment': result.comment,
+                'status': result.get_status_display(),
+            })
+
+    elif candidate.registration_category == 'workers_pas':
+        for result in candidate.portal_workers_pas_results:
+            results_data.append({
+                'assessment_series': result.assessment_series.name,
+                'level': result.level.level_name,
+                'module': result.module.module_name,
+                'paper': result.paper.paper_name,
+                'type': 'Practical',
+                'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
+                'grade': result.grade,
+                'comment': result.comment,
+                'status': result.get_status_display(),
+            })
+
+    return {
+        'bio_data': bio_data,
+        'occupation_info': occupation_info,
+        'enrollments': enrollment_data,
+        'results': results_data,
+        'status': candidate.status,
+        'is_verified': candidate.status == 'verified',
+    }
+
+
+def get_portal_document(registration_number):
+    """Return the cached portal document for a registration number, or None if unknown."""
+    from .models import Candidate
+
+    registration_number = registration_number.upper()
+    row = Candidate.objects.filter(
+        registration_number=registration_number
+    ).values_list('id', 'updated_at').first()
+    if row is None:
+        return None
+
+    candidate_id, updated_at = row
+    if not shared_cache_enabled():
+        # Another worker's writes would not move this worker's version
+        return build_portal_document(_portal_queryset().get(pk=candidate_id))
+    key = _portal_cache_key(registration_number, portal_version(candidate_id, updated_at))
+    document = cache.get(key)
+    if document is None:
+        document = build_portal_document(_portal_queryset().get(pk=candidate_id))
+        cache.set(key, document, PORTAL_CACHE_TIMEOUT)
+    return document
+
+
+def warm_portal_documents(series):
+    """
+    Build and cache portal documents for every candidate with results in
+    `series`, WARM_CHUNK_SIZE candidates per batch of queries. Call after the
+    series' release flag is saved. Returns the number of documents cached,
+    which is 0 without a shared cache.
+    """
+    if not shared_cache_enabled():
+        return 0
+
+    from results.models import ModularResult, FormalResult, WorkersPasResult
+
+    candidate_ids = set()
+    for model in (ModularResult, FormalResult, WorkersPasResult):
+        candidate_ids.update(
+            model.objects.filter(assessment_series=series).values_list('candidate_id', flat=True).distinct()
+        )
+    candidate_ids = sorted(candidate_ids)
+
+    warmed = 0
+    for start in range(0, len(candidate_ids), WARM_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + WARM_CHUNK_SIZE]
+        documents = {}
+        for candidate in _portal_queryset().filter(pk__in=chunk, registration_number__isnull=False):
+            key = _portal_cache_key(
+                candidate.registration_number.upper(), portal_version(candidate.id, candidate.updated_at)
+            )
+            documents[key] = build_portal_document(candidate)
+        cache.set_many(documents, PORTAL_CACHE_TIMEOUT)
+        warmed += len(documents)
+    return warmed
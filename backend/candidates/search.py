@@ -0,0 +1,343 @@
+"""
+Index-backed candidate search for the candidate list search box.
+
+DRF's SearchFilter turns ?search= into `icontains` on full_name,
+registration_number, contact and refugee_number, which no B-tree index can
+serve, so every keystroke scanned the whole candidates table. This module
+keeps the same matching rules (every search term must occur in one of the
+fields) but answers them from a trigram index:
+
+- PostgreSQL: pg_trgm GIN indexes on UPPER(<field>), the exact expression
+  Django's icontains compares, so these and any other icontains lookups
+  on the fields use the index;
+- SQLite (local development): an FTS5 table with the trigram tokenizer,
+  kept in sync with candidates_candidate by triggers.
+
+Trigrams cannot serve text shorter than MIN_INDEXED_LENGTH, so a search
+made only of such short terms matches names and registration numbers that
+start with it instead, from B-tree indexes on the same UPPER(<field>)
+(PostgreSQL) or <field> COLLATE NOCASE (SQLite) expressions.
+
+install_search_index() creates these after every `migrate`. On other
+backends, or SQLite builds without FTS5, search falls back to icontains.
+
+Results are ranked: an exact registration number comes first, then
+registration numbers and names starting with the search text, then
+substring matches, newest first within each. When fewer than
+FUZZY_MATCH_LIMIT candidates match, names that only resemble the search
+text are added after those: by pg_trgm word similarity on PostgreSQL, and on
+SQLite the newest FUZZY_MATCH_LIMIT names with every word spelt as searched
+or one typo away (two neighbouring letters swapped, or one dropped).
+
+A common name prefix matches tens of thousands of rows at production scale,
+so RankedSearchPagination ranks them as bare ids and loads and serializes
+only the rows on the requested page.
+"""
+import json
+
+from django.db import DatabaseError, connections
+from django.db.models import BooleanField, Case, FloatField, Func, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
+from rest_framework import filters
+
+from emis.pagination import FlexiblePagination
+
+from .models import Candidate
+
+SEARCH_FIELDS = ('full_name', 'registration_number', 'contact', 'refugee_number')
+
+# Searches too short for the trigram index match the start of these
+PREFIX_FIELDS = ('full_name', 'registration_number')
+
+# Trigram indexes can only serve terms of at least this many characters
+MIN_INDEXED_LENGTH = 3
+
+# Fuzzy name matches are only added below this many substring matches,
+# and on SQLite at most this many are added, best first
+FUZZY_MATCH_LIMIT = 50
+
+# FTS matches up to this many are passed to the queries as ids; larger
+# sets (a common name prefix) stay a subquery
+FTS_ID_LIST_LIMIT = 10000
+
+# Ordering applied to search results when the client does not pick one.
+# Newest first by primary key: ordering by created_at would read every
+# matching row just for its timestamp.
+RANKED_ORDERING = ('-search_rank', '-search_similarity', '-pk')
+
+_FTS_TABLE = 'candidates_candidate_search'
+_sqlite_ready = {}
+
+
+def _table():
+    return Candidate._meta.db_table
+
+
+def _columns(fields=SEARCH_FIELDS):
+    return [Candidate._meta.get_field(name).column for name in fields]
+
+
+def _install_postgresql(connection):
+    table = _table()
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in _columns():
+            # CONCURRENTLY keeps the table writable while a large index builds
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_{column}_trgm '
+                f'ON {table} USING gin (UPPER({column}) gin_trgm_ops)'
+            )
+        for column in _columns(PREFIX_FIELDS):
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_{column}_prefix '
+                f'ON {table} (UPPER({column}) text_pattern_ops)'
+            )
+
+
+def _install_sqlite_prefix(connection):
+    table = _table()
+    with connection.cursor() as cursor:
+        for column in _columns(PREFIX_FIELDS):
+            # istartswith is LIKE 'text%', which SQLite serves from a NOCASE index
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_{column}_prefix ON {table} ({column} COLLATE NOCASE)'
+            )
+
+
+def _install_sqlite(connection):
+    table = _table()
+    columns = _columns()
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = f'INSERT INTO {_FTS_TABLE}(rowid, {column_list}) VALUES (new.id, {new_values});'
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [_FTS_TABLE])
+        exists = cursor.fetchone() is not None
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='id', tokenize='trigram')"
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ai AFTER INSERT ON {table} '
+            f'BEGIN {insert_new} END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_ad AFTER DELETE ON {table} '
+            f'BEGIN {delete_old} END'
+        )
+        cursor.execute(
+            f'CREATE TRIGGER IF NOT EXISTS {_FTS_TABLE}_au AFTER UPDATE OF {column_list} ON {table} '
+            f'BEGIN {delete_old} {insert_new} END'
+        )
+        if not exists:
+            cursor.execute(f"INSERT INTO {_FTS_TABLE}({_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def install_search_index(using='default'):
+    """Create the search index for the `using` database if it is missing. Safe to re-run."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        _install_postgresql(connection)
+    elif connection.vendor == 'sqlite':
+        _install_sqlite_prefix(connection)
+        try:
+            _install_sqlite(connection)
+        except DatabaseError:
+            # SQLite built without FTS5: search keeps using icontains
+            pass
+        _sqlite_ready.pop(connection.settings_dict['NAME'], None)
+
+
+def install_after_migrate(sender, using='default', **kwargs):
+    """post_migrate receiver for the candidates app."""
+    install_search_index(using)
+
+
+def _uses_fts(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    name = connection.settings_dict['NAME']
+    if name not in _sqlite_ready:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [_FTS_TABLE])
+            _sqlite_ready[name] = cursor.fetchone() is not None
+    return _sqlite_ready[name]
+
+
+def _fts_phrase(text):
+    return '"%s"' % text.replace('"', '""')
+
+
+def _fts_ids(match, connection):
+    """
+    Rows matching the FTS query. The count, the fuzzy check and the page
+    each re-ran a subquery, and a few common words take tens of milliseconds
+    to intersect: up to FTS_ID_LIST_LIMIT matches are looked up once and
+    passed on as a single JSON parameter instead.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {_FTS_TABLE} WHERE {_FTS_TABLE} MATCH %s LIMIT %s', [match, FTS_ID_LIST_LIMIT + 1]
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    if len(ids) <= FTS_ID_LIST_LIMIT:
+        return Q(pk__in=RawSQL('SELECT value FROM json_each(%s)', [json.dumps(ids)]))
+    return Q(pk__in=RawSQL(f'SELECT rowid FROM {_FTS_TABLE} WHERE {_FTS_TABLE} MATCH %s', [match]))
+
+
+def _contains(term):
+    return Q(*(Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS), _connector=Q.OR)
+
+
+def _prefix_match(text):
+    return Q(*(Q(**{f'{field}__istartswith': text}) for field in PREFIX_FIELDS), _connector=Q.OR)
+
+
+def _substring_match(terms, connection, use_fts):
+    """Every term occurs in at least one search field (SearchFilter's rule)."""
+    condition = Q()
+    indexed = [term for term in terms if len(term) >= MIN_INDEXED_LENGTH]
+    if use_fts and indexed:
+        condition &= _fts_ids(' AND '.join(_fts_phrase(term) for term in indexed), connection)
+        terms = [term for term in terms if len(term) < MIN_INDEXED_LENGTH]
+    for term in terms:
+        condition &= _contains(term)
+    return condition
+
+
+def _one_typo_spellings(word):
+    """`word` and its spellings with two neighbouring letters swapped or one dropped, if long enough to index."""
+    spellings = {word}
+    for i in range(len(word) - 1):
+        spellings.add(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+    for i in range(len(word)):
+        spellings.add(word[:i] + word[i + 1:])
+    return sorted(spelling for spelling in spellings if len(spelling) >= MIN_INDEXED_LENGTH)
+
+
+class _WordSimilar(Func):
+    """pg_trgm `expression %> text`: text is word-similar to part of expression (GIN-indexable)."""
+    arg_joiner = ' %%> '
+    template = '%(expressions)s'
+    output_field = BooleanField()
+
+
+def _fuzzy_match(phrase, connection, use_fts):
+    if connection.vendor == 'postgresql':
+        return Q(_WordSimilar(Upper('full_name'), Value(phrase.upper())))
+    if use_fts:
+        words = [_one_typo_spellings(word) for word in phrase.upper().split()]
+        words = [spellings for spellings in words if spellings]
+        if not words:
+            return None
+        column = Candidate._meta.get_field('full_name').column
+        match = ' AND '.join(
+            '(%s)' % ' OR '.join(_fts_phrase(spelling) for spelling in spellings) for spellings in words
+        )
+        # Ranking every name sharing a trigram took hundreds of milliseconds
+        # on common names; whole spellings are cheap to look up. Done once
+        # here rather than in both the count and the page query.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {_FTS_TABLE} WHERE {_FTS_TABLE} MATCH %s ORDER BY rowid DESC LIMIT %s',
+                [f'{column} : ({match})', FUZZY_MATCH_LIMIT],
+            )
+            return Q(pk__in=[row[0] for row in cursor.fetchall()])
+    return None
+
+
+def search_candidates(queryset, terms):
+    """
+    Narrow a Candidate queryset to the rows matching the search `terms`
+    (as split by SearchFilter), plus names resembling the whole search text
+    when there are few of those. Searches made only of terms shorter than
+    MIN_INDEXED_LENGTH match names and registration numbers starting with
+    them. Rows are annotated with `search_rank` (3 exact registration
+    number, 2 prefix, 1 substring, 0 fuzzy only) and `search_similarity`.
+    """
+    if not terms:
+        return queryset
+    connection = connections[queryset.db]
+    use_fts = _uses_fts(connection)
+    phrase = ' '.join(terms)
+
+    if all(len(term) < MIN_INDEXED_LENGTH for term in terms):
+        substring = _prefix_match(phrase)
+    else:
+        substring = _substring_match(terms, connection, use_fts)
+    fuzzy = None
+    # Fuzzy matching is for names: not for text too short for trigrams or
+    # containing digits (registration, contact and refugee numbers)
+    if len(phrase) >= MIN_INDEXED_LENGTH and not any(char.isdigit() for char in phrase):
+        # Common names match thousands of rows; only look further for rare ones
+        found = queryset.filter(substring).order_by().values('pk')[:FUZZY_MATCH_LIMIT]
+        if found.count() < FUZZY_MATCH_LIMIT:
+            fuzzy = _fuzzy_match(phrase, connection, use_fts)
+    queryset = queryset.filter(substring | fuzzy if fuzzy is not None else substring)
+
+    if connection.vendor == 'postgresql':
+        similarity = Func(
+            Value(phrase.upper()), Upper('full_name'), function='word_similarity', output_field=FloatField()
+        )
+    else:
+        similarity = Value(0.0, output_field=FloatField())
+
+    return queryset.annotate(
+        search_rank=Case(
+            When(registration_number__iexact=phrase, then=Value(3)),
+            When(
+                Q(registration_number__istartswith=phrase)
+                | Q(full_name__istartswith=phrase)
+                | Q(full_name__icontains=f' {phrase}'),
+                then=Value(2),
+            ),
+            # Without fuzzy matches every row matched the substring
+            # condition: do not evaluate it a second time
+            *([When(substring, then=Value(1))] if fuzzy is not None else []),
+            default=Value(0 if fuzzy is not None else 1),
+            output_field=IntegerField(),
+        ),
+        search_similarity=similarity,
+    )
+
+
+class CandidateSearchFilter(filters.SearchFilter):
+    """SearchFilter for candidates, answered from the trigram search index."""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_candidates(queryset, self.get_search_terms(request))
+
+
+class CandidateOrderingFilter(filters.OrderingFilter):
+    """Searches come back best match first unless ?ordering= is given."""
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and 'search_rank' in queryset.query.annotations:
+            return RANKED_ORDERING
+        return super().get_ordering(request, queryset, view)
+
+
+class RankedSearchPagination(FlexiblePagination):
+    """
+    Paginates ranked searches in two steps: the requested page of ids is
+    cut from the ranked matches without loading them, then only those rows
+    are loaded from the view's queryset, with its related rows, for the
+    serializer.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if view is None or 'search_rank' not in queryset.query.annotations:
+            return super().paginate_queryset(queryset, request, view)
+        ids = super().paginate_queryset(
+            queryset.prefetch_related(None).values_list('pk', flat=True), request, view
+        )
+        if ids is None:
+            return None
+        rows = view.get_queryset().in_bulk(ids)
+        return [rows[pk] for pk in ids if pk in rows]
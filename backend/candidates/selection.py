@@ -0,0 +1,73 @@
+"""
+Selection snapshots for "select all" bulk operations.
+
+The candidate and enrollment lists let staff select every row matching the
+current filters. Bulk endpoints used to receive those filters and rebuild
+the queryset themselves, each with its own subset of the list's filters.
+Instead, the client posts the list's query string once to a selection
+endpoint. create_selection() runs that filtered queryset as a single
+`SELECT id` and stores the IDs under a random token. Bulk endpoints then
+take `selection_token` and read the rows back through
+SelectionSnapshot.iter_objects(), SELECTION_BATCH_SIZE primary keys at a
+time.
+
+A snapshot belongs to the user who created it and expires after
+SELECTION_TTL seconds. Expired snapshots are deleted whenever a new one is
+created.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .models import SelectionSnapshot
+
+SELECTION_TTL = getattr(settings, 'SELECTION_SNAPSHOT_TTL', 60 * 60)
+SELECTION_BATCH_SIZE = 500
+
+
+def _owner(user):
+    return user if user is not None and user.is_authenticated else None
+
+
+def create_selection(queryset, kind, user=None, filters=None):
+    """Resolve `queryset` to its IDs once and store them as a new snapshot."""
+    now = timezone.now()
+    SelectionSnapshot.objects.filter(expires_at__lte=now).delete()
+    ids = list(queryset.order_by('pk').values_list('pk', flat=True).distinct())
+    return SelectionSnapshot.objects.create(
+        kind=kind,
+        object_ids=ids,
+        count=len(ids),
+        filters=filters or {},
+        created_by=_owner(user),
+        expires_at=now + timedelta(seconds=SELECTION_TTL),
+    )
+
+
+def get_selection(token, kind, user=None):
+    """
+    The unexpired snapshot of `kind` with `token` created by `user`, or None
+    when the token is malformed, unknown, expired or somebody else's.
+    """
+    try:
+        return SelectionSnapshot.objects.get(
+            token=token,
+            kind=kind,
+            created_by=_owner(user),
+            expires_at__gt=timezone.now(),
+        )
+    except (SelectionSnapshot.DoesNotExist, ValidationError):
+        # ValidationError: the token is not a UUID
+        return None
+
+
+def describe(snapshot):
+    """Response body for a newly created snapshot."""
+    return {
+        'selection_token': str(snapshot.token),
+        'kind': snapshot.kind,
+        'count': snapshot.count,
+        'expires_at': snapshot.expires_at,
+    }
@@ -7,6 +7,7 @@ from assessment_series.models import AssessmentSeries
 from users.models import Staff
 from results.models import FormalResult, ModularResult
 from datetime import date
+from utils import reference_data
 from utils.nationality_helper import get_nationality_from_country
 
 
@@ -67,12 +68,12 @@ class CandidateListSerializer(serializers.ModelSerializer):
     
     def get_enrollments(self, obj):
         """Get list of enrollment data for statistics"""
-        enrollments = obj.enrollments.filter(is_active=True)
+        # Filtered here rather than in SQL so the view's prefetch is used
         return [{
             'id': e.id,
-            'assessment_series': e.assessment_series.id,
-            'occupation': e.occupation_level.occupation.id if e.occupation_level else None
-        } for e in enrollments]
+            'assessment_series': e.assessment_series_id,
+            'occupation': e.occupation_level.occupation_id if e.occupation_level else None
+        } for e in obj.enrollments.all() if e.is_active]
     
     def get_has_special_needs(self, obj):
         """Check if candidate has special needs (disability)"""
@@ -80,10 +81,13 @@ class CandidateListSerializer(serializers.ModelSerializer):
     
     def get_is_enrolled(self, obj):
         """Check if candidate has any active enrollments"""
-        return obj.enrollments.filter(is_active=True).exists()
+        return any(e.is_active for e in obj.enrollments.all())
     
     def get_has_marks(self, obj):
         """Check if candidate has any marks/results"""
+        # The candidate list annotates these; query for candidates loaded elsewhere
+        if hasattr(obj, 'has_formal_results'):
+            return obj.has_formal_results or obj.has_modular_results
         # Check for formal results
         has_formal_results = FormalResult.objects.filter(candidate=obj).exists()
         # Check for modular results
@@ -287,8 +291,7 @@ class CandidateCreateUpdateSerializer(serializers.ModelSerializer):
         candidate_country = data.get('candidate_country')
         if candidate_country:
             # candidate_country is the source of truth — also update legacy nationality field
-            from django_countries import countries as country_list
-            country_name = dict(country_list).get(str(candidate_country).upper(), '')
+            country_name = reference_data.country_name(candidate_country)
             if country_name:
                 data['nationality'] = str(country_name)
         else:
@@ -642,6 +645,7 @@ class BulkEnrollSerializer(serializers.Serializer):
     )
     enroll_all = serializers.BooleanField(required=False, default=False)
     filters = serializers.DictField(required=False, allow_empty=True)
+    selection_token = serializers.UUIDField(required=False)
     assessment_series = serializers.IntegerField()
     occupation_level = serializers.IntegerField(required=False, allow_null=True)
     modules = serializers.ListField(
@@ -656,9 +660,9 @@ class BulkEnrollSerializer(serializers.Serializer):
     )
     
     def validate(self, data):
-        # Either candidate_ids or enroll_all must be provided
-        if not data.get('enroll_all') and not data.get('candidate_ids'):
-            raise serializers.ValidationError({'candidate_ids': 'Either candidate_ids or enroll_all with filters is required'})
+        # Either candidate_ids, a selection token or enroll_all must be provided
+        if not data.get('enroll_all') and not data.get('candidate_ids') and not data.get('selection_token'):
+            raise serializers.ValidationError({'candidate_ids': 'Either candidate_ids, selection_token or enroll_all with filters is required'})
         
         # Validate assessment series exists
         try:
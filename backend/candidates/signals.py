@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from emis.http_cache import bump_version, candidate_version_name
+from .models import Candidate, CandidateEnrollment
+
+
+@receiver([post_save, post_delete], sender=Candidate)
+def bump_candidate_versions(sender, instance, **kwargs):
+    """Invalidate ETags for the candidate's own views and candidate-wide listings."""
+    bump_version(candidate_version_name(instance.pk), 'candidates')
+
+
+@receiver([post_save, post_delete], sender=CandidateEnrollment)
+def bump_enrollment_versions(sender, instance, **kwargs):
+    """Invalidate ETags for the candidate's views and enrollment aggregates."""
+    bump_version(candidate_version_name(instance.candidate_id), 'enrollments')
@@ -0,0 +1,363 @@
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from assessment_centers.models import AssessmentCenter, CenterBranch
+from assessment_series.models import AssessmentSeries
+from configurations.models import District
+from fees.models import CandidateFee, CenterFee
+from fees.signals import update_center_fee
+from occupations.models import Occupation, OccupationLevel, Sector
+
+from . import bulk, portal
+from .models import Candidate, CandidateActivity, CandidateEnrollment
+from .search import RANKED_ORDERING, search_candidates
+
+
+class BulkCandidateChangeTests(TestCase):
+    """The bulk paths must leave the same rows behind as saving each candidate in turn."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        cls.old_center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        cls.new_center = AssessmentCenter.objects.create(
+            center_number='UVT002', center_name='Center 2', assessment_category='vti', district=district,
+        )
+        cls.new_branch = CenterBranch.objects.create(
+            branch_code='UVT002-B1', assessment_center=cls.new_center, district=district,
+        )
+        series = [
+            AssessmentSeries.objects.create(
+                name=name, start_date=date(2025, month, 1), end_date=date(2025, month, 28),
+                date_of_release=date(2025, 12, 15),
+            )
+            for name, month in (('Jun 2025', 6), ('Nov 2025', 11))
+        ]
+        sector = Sector.objects.create(name='Building')
+        cls.occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector, has_modular=True,
+        )
+        level = OccupationLevel.objects.create(occupation=cls.occupation, level_name='Level 1', structure_type='papers')
+
+        def candidate(name, center, intake, category, registration_number, is_submitted=True):
+            return Candidate.objects.create(
+                full_name=name, date_of_birth=date(2000, 1, 1), gender='male', contact='0700000000',
+                district=district, assessment_center=center, entry_year=2025, intake=intake,
+                registration_category=category, occupation=cls.occupation,
+                registration_number=registration_number, is_submitted=is_submitted,
+            )
+
+        # Already at the new center: its March and June groups start at 003 and 001
+        candidate('Resident 1', cls.new_center, 'M', 'formal', 'UVT002/U/25/M/MVM/F/001')
+        candidate('Resident 2', cls.new_center, 'M', 'modular', 'UVT002/U/25/M/MVM/M/003')
+        candidate('Resident 3', cls.new_center, 'J', 'formal', 'UVT002/U/25/J/MVM/F/001')
+        # Still carries a number from the new center, so 004 is taken
+        candidate('Stale', cls.old_center, 'S', 'formal', 'UVT002/U/25/M/MVM/F/004')
+
+        cls.moving = [
+            candidate('Mover 1', cls.old_center, 'M', 'formal', 'UVT001/U/25/M/MVM/F/001'),
+            candidate('Mover 2', cls.old_center, 'M', 'modular', 'UVT001/U/25/M/MVM/M/007'),
+            candidate('Mover 3', cls.old_center, 'J', 'formal', 'UVT001/U/25/J/MVM/F/002'),
+            candidate('Mover 4', cls.old_center, 'M', 'formal', 'UVT001/U/25/M/MVM/F/003'),
+            candidate('Draft', cls.old_center, 'M', 'formal', None, is_submitted=False),
+        ]
+        # Numbers that no longer match their group: a gap, a changed category, a duplicate sequence
+        cls.stale_numbers = [
+            candidate('Gap', cls.old_center, 'J', 'formal', 'UVT001/U/25/J/MVM/F/009'),
+            candidate('Category', cls.old_center, 'J', 'modular', 'UVT001/U/25/J/MVM/F/010'),
+            candidate('Duplicate', cls.old_center, 'J', 'formal', 'UVT001/U/25/J/MVM/M/009'),
+        ]
+
+        for i, row in enumerate(Candidate.objects.order_by('pk')):
+            for amount, assessment_series in zip((Decimal('50000'), Decimal('75000') + i), series):
+                CandidateEnrollment.objects.create(
+                    candidate=row, assessment_series=assessment_series, occupation_level=level, total_amount=amount,
+                )
+
+    def _candidates(self, candidates):
+        return list(
+            Candidate.objects.select_related('assessment_center', 'occupation')
+            .filter(pk__in=[candidate.pk for candidate in candidates]).order_by('pk')
+        )
+
+    def _run(self, run, candidates):
+        """Run one path on a fresh copy of the fixture and return what it left behind."""
+        with transaction.atomic():
+            CandidateActivity.objects.all().delete()
+            result = run(self._candidates(candidates))
+            outcome = {
+                'candidates': list(Candidate.objects.order_by('pk').values_list(
+                    'pk', 'registration_number', 'payment_code', 'assessment_center_id', 'assessment_center_branch_id',
+                )),
+                'activities': list(CandidateActivity.objects.order_by('candidate_id').values_list(
+                    'candidate_id', 'action', 'details',
+                )),
+                'center_fees': list(CenterFee.objects.order_by('assessment_series_id', 'assessment_center_id').values_list(
+                    'assessment_series_id', 'assessment_center_id', 'total_candidates', 'total_amount',
+                )),
+                'expected_center_fees': list(
+                    CandidateFee.objects.order_by('assessment_series_id', 'candidate__assessment_center_id')
+                    .values_list('assessment_series_id', 'candidate__assessment_center_id')
+                    .annotate(total_candidates=Count('id'), total_amount=Sum('total_amount'))
+                ),
+                'result': result,
+            }
+            transaction.set_rollback(True)
+        return outcome
+
+    def _change_center_per_row(self, candidates):
+        for candidate in candidates:
+            old_center = candidate.assessment_center
+            old_regno = candidate.registration_number
+            candidate.assessment_center = self.new_center
+            candidate.assessment_center_branch = self.new_branch
+            if candidate.is_submitted and candidate.registration_number:
+                candidate.registration_number = candidate.generate_registration_number()
+                candidate.payment_code = candidate.generate_payment_code()
+            candidate.save()
+            CandidateActivity.objects.create(
+                candidate=candidate, action='center_changed', description='Assessment center changed (bulk)',
+                details={
+                    'old_center_id': old_center.id,
+                    'new_center_id': self.new_center.id,
+                    'old_registration_number': old_regno,
+                    'new_registration_number': candidate.registration_number,
+                },
+            )
+            for fee in CandidateFee.objects.filter(candidate=candidate):
+                update_center_fee(fee.assessment_series, old_center)
+                update_center_fee(fee.assessment_series, self.new_center)
+        return len(candidates)
+
+    def _regenerate_per_row(self, candidates):
+        updated = 0
+        for candidate in candidates:
+            old_regno = candidate.registration_number
+            new_regno = candidate.generate_registration_number()
+            if not new_regno or new_regno == old_regno:
+                continue
+            candidate.registration_number = new_regno
+            candidate.payment_code = candidate.generate_payment_code()
+            candidate.save()
+            CandidateActivity.objects.create(
+                candidate=candidate, action='regno_regenerated', description='Registration number regenerated (bulk)',
+                details={'old_registration_number': old_regno, 'new_registration_number': new_regno},
+            )
+            updated += 1
+        return updated
+
+    def _assert_same_outcome(self, per_row, in_bulk):
+        self.assertEqual(in_bulk['candidates'], per_row['candidates'])
+        self.assertEqual(in_bulk['activities'], per_row['activities'])
+        self.assertEqual(in_bulk['center_fees'], per_row['center_fees'])
+        self.assertEqual(in_bulk['center_fees'], in_bulk['expected_center_fees'])
+
+    def test_change_center_matches_saving_each_candidate(self):
+        per_row = self._run(self._change_center_per_row, self.moving)
+        in_bulk = self._run(
+            lambda candidates: bulk.change_center(candidates, self.new_center, self.new_branch), self.moving,
+        )
+
+        self._assert_same_outcome(per_row, in_bulk)
+        self.assertEqual(in_bulk['result'], ({'candidates': 5, 'fees_moved': 10}, []))
+        numbers = {pk: regno for pk, regno, _, _, _ in in_bulk['candidates']}
+        self.assertEqual([numbers[candidate.pk] for candidate in self.moving], [
+            'UVT002/U/25/M/MVM/F/005',  # 001-003 used by the March group, 004 taken
+            'UVT002/U/25/M/MVM/M/006',
+            'UVT002/U/25/J/MVM/F/002',
+            'UVT002/U/25/M/MVM/F/007',
+            None,
+        ])
+
+    def test_change_center_across_batches_matches_saving_each_candidate(self):
+        per_row = self._run(self._change_center_per_row, self.moving)
+        with mock.patch.object(bulk, 'BULK_BATCH_SIZE', 2):
+            in_bulk = self._run(
+                lambda candidates: bulk.change_center(candidates, self.new_center, self.new_branch), self.moving,
+            )
+
+        self._assert_same_outcome(per_row, in_bulk)
+
+    def test_regenerate_matches_saving_each_candidate(self):
+        candidates = self.stale_numbers + self.moving[:3]
+        per_row = self._run(self._regenerate_per_row, candidates)
+        in_bulk = self._run(bulk.regenerate_registration_numbers, candidates)
+
+        self._assert_same_outcome(per_row, in_bulk)
+        updated, skipped, failed, changes = in_bulk['result']
+        self.assertEqual(updated, per_row['result'])
+        self.assertEqual(updated + skipped, len(candidates))
+        self.assertEqual(failed, [])
+        self.assertEqual(len(changes), updated)
+        self.assertGreater(updated, 0)
+
+    def test_collision_falls_back_to_per_row_writes(self):
+        outsider = Candidate.objects.get(full_name='Stale')
+        write_batch = bulk._write_batch
+
+        def write_after_a_concurrent_registration(candidates, fields, activities, failed):
+            # Another request registers Mover 2's new number before the batch is written
+            Candidate.objects.filter(pk=outsider.pk).update(registration_number=candidates[1].registration_number)
+            return write_batch(candidates, fields, activities, failed)
+
+        with mock.patch.object(bulk, '_write_batch', side_effect=write_after_a_concurrent_registration):
+            updated, failed = bulk.change_center(self._candidates(self.moving), self.new_center, self.new_branch)
+
+        collided = self.moving[1]
+        self.assertEqual(updated['candidates'], 4)
+        self.assertEqual([(row['candidate_id'], row['name']) for row in failed], [(collided.pk, 'Mover 2')])
+
+        collided.refresh_from_db()
+        self.assertEqual(collided.assessment_center_id, self.old_center.pk)
+        self.assertEqual(collided.registration_number, 'UVT001/U/25/M/MVM/M/007')
+        self.assertEqual(
+            set(Candidate.objects.filter(assessment_center=self.new_center, full_name__startswith='Mover')
+                .values_list('full_name', flat=True)),
+            {'Mover 1', 'Mover 3', 'Mover 4'},
+        )
+        self.assertEqual(
+            sorted(CandidateActivity.objects.values_list('candidate_id', flat=True)),
+            sorted(candidate.pk for candidate in self.moving if candidate.pk != collided.pk),
+        )
+        for series_id, center_id, total_candidates, total_amount in (
+            CandidateFee.objects.values_list('assessment_series_id', 'candidate__assessment_center_id')
+            .annotate(total_candidates=Count('id'), total_amount=Sum('total_amount'))
+        ):
+            center_fee = CenterFee.objects.get(assessment_series_id=series_id, assessment_center_id=center_id)
+            self.assertEqual((center_fee.total_candidates, center_fee.total_amount), (total_candidates, total_amount))
+
+
+class CandidateSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        sector = Sector.objects.create(name='Building')
+        occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector, has_modular=True,
+        )
+        names = [
+            'Okello Brian', 'Brian Okello', 'Aisha Nakato', 'Joseph Kato', 'Brian Kato Okello',
+            'Grace Okello', 'Okot Peter', 'Rose Lubega',
+        ]
+        cls.candidates = {
+            name: Candidate.objects.create(
+                full_name=name, date_of_birth=date(2000, 1, 1), gender='male', contact='0700000000',
+                district=district, assessment_center=center, entry_year=2025, intake='M',
+                registration_category='formal', occupation=occupation, is_submitted=True,
+                registration_number=f'UVT001/U/25/M/MVM/F/{i:03d}',
+            )
+            for i, name in enumerate(names, start=1)
+        }
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def _names(self, terms):
+        return [
+            candidate.full_name
+            for candidate in search_candidates(Candidate.objects.all(), terms).order_by(*RANKED_ORDERING)
+        ]
+
+    def test_short_search_matches_the_start_of_names_and_numbers(self):
+        self.assertEqual(sorted(self._names(['ok'])), ['Okello Brian', 'Okot Peter'])
+        self.assertEqual(len(self._names(['uv'])), len(self.candidates))
+
+    def test_short_term_narrows_an_indexed_term(self):
+        ranked = search_candidates(Candidate.objects.all(), ['Okello', 'gr']).filter(search_rank__gt=0)
+        self.assertEqual([candidate.full_name for candidate in ranked], ['Grace Okello'])
+
+    def test_prefix_matches_rank_before_substring_matches(self):
+        # Name and word prefixes first, newest first, then substrings
+        self.assertEqual(self._names(['Kato']), ['Brian Kato Okello', 'Joseph Kato', 'Aisha Nakato'])
+
+    def test_exact_registration_number_ranks_first(self):
+        self.assertEqual(self._names(['uvt001/u/25/m/mvm/f/003'])[0], 'Aisha Nakato')
+
+    def test_misspelt_name_finds_spellings_one_typo_away(self):
+        # Neighbouring letters swapped in one word, a letter dropped in the other
+        self.assertIn('Brian Kato Okello', self._names(['Brain', 'Okelo']))
+        self.assertNotIn('Rose Lubega', self._names(['Brain', 'Okelo']))
+
+    def test_ranked_pages_match_the_ranked_queryset(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        expected = [
+            candidate.pk
+            for candidate in search_candidates(Candidate.objects.all(), ['Kato']).order_by(*RANKED_ORDERING)
+        ]
+
+        ids = []
+        for page in (1, 2):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get('/api/candidates/', {'search': 'Kato', 'page_size': 2, 'page': page})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['count'], len(expected))
+            ids += [row['id'] for row in response.data['results']]
+            # Enrollments and marks are read for the whole page, not per candidate
+            sql = [query['sql'] for query in queries.captured_queries]
+            self.assertEqual(len([query for query in sql if 'FROM "candidates_candidateenrollment"' in query]), 1)
+            self.assertFalse([query for query in sql if query.startswith('SELECT 1 AS "a" FROM "results_')])
+        self.assertEqual(ids, expected[:4])
+        self.assertEqual(client.get('/api/candidates/', {'search': 'Kato', 'page': 9}).status_code, 404)
+
+
+class PortalDocumentCacheTests(TestCase):
+    """Portal documents are only cached when the version counters are shared by every worker."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        sector = Sector.objects.create(name='Building')
+        occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector,
+        )
+        cls.candidate = Candidate.objects.create(
+            full_name='Aisha Nakato', date_of_birth=date(2000, 1, 1), gender='female', contact='0700000000',
+            district=district, assessment_center=center, entry_year=2025, intake='M',
+            registration_category='formal', occupation=occupation, registration_number='UVT001/U/25/M/MVM/F/001',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _rename_elsewhere(self):
+        """Change the candidate without moving this process's versions, as a write on another worker would."""
+        Candidate.objects.filter(pk=self.candidate.pk).update(full_name='Aisha Nakato Renamed')
+
+    def _full_name(self):
+        return portal.get_portal_document(self.candidate.registration_number)['bio_data']['full_name']
+
+    def test_process_local_cache_builds_every_document(self):
+        self.assertEqual(self._full_name(), 'Aisha Nakato')
+        self._rename_elsewhere()
+        self.assertEqual(self._full_name(), 'Aisha Nakato Renamed')
+
+    def test_shared_cache_reuses_the_document(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        with override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertEqual(self._full_name(), 'Aisha Nakato')
+            self._rename_elsewhere()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self._full_name(), 'Aisha Nakato')
+            self.assertEqual(len(queries), 1)
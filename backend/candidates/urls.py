@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CandidateViewSet, delete_enrollment_view, bulk_de_enroll_view, clear_candidate_data, bulk_clear_candidate_data, change_candidate_series, bulk_change_candidate_series, change_candidate_center, bulk_change_candidate_center, change_candidate_occupation, bulk_change_candidate_occupation, change_candidate_registration_category, bulk_change_candidate_registration_category, candidate_login, candidate_portal_data, enrollment_list_view, bulk_change_enrollment_series, bulk_de_enroll_by_enrollment, bulk_clear_enrollment_data, bulk_update_enrollment, regenerate_candidate_regno, bulk_regenerate_candidate_regno
+from .views import CandidateViewSet, delete_enrollment_view, bulk_de_enroll_view, clear_candidate_data, bulk_clear_candidate_data, change_candidate_series, bulk_change_candidate_series, change_candidate_center, bulk_change_candidate_center, change_candidate_occupation, bulk_change_candidate_occupation, change_candidate_registration_category, bulk_change_candidate_registration_category, candidate_login, candidate_portal_data, enrollment_list_view, enrollment_selection_view, bulk_change_enrollment_series, bulk_de_enroll_by_enrollment, bulk_clear_enrollment_data, bulk_update_enrollment, regenerate_candidate_regno, bulk_regenerate_candidate_regno
 from .views_payment import (
     schoolpay_check_balance,
     schoolpay_payment_callback,
@@ -17,6 +17,7 @@ urlpatterns = [
     
     # Enrollment list endpoint
     path('enrollments/', enrollment_list_view, name='enrollment-list'),
+    path('enrollments/selection/', enrollment_selection_view, name='enrollment-selection'),
     path('enrollments/bulk-change-series/', bulk_change_enrollment_series, name='bulk-change-enrollment-series'),
     path('enrollments/bulk-de-enroll/', bulk_de_enroll_by_enrollment, name='bulk-de-enroll-by-enrollment'),
     path('enrollments/bulk-clear-data/', bulk_clear_enrollment_data, name='bulk-clear-enrollment-data'),
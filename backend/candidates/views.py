@@ -1,19 +1,23 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.db import transaction, IntegrityError
 from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from decimal import Decimal
 from datetime import date
 import openpyxl
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from django_countries import countries
-from .models import Candidate, CandidateEnrollment, EnrollmentModule, EnrollmentPaper, CandidateActivity
+from .models import Candidate, CandidateEnrollment, EnrollmentModule, EnrollmentPaper
+from . import audit, bulk
+from .portal import get_portal_document, portal_version
+from .search import CandidateOrderingFilter, CandidateSearchFilter, RankedSearchPagination
+from .selection import SELECTION_BATCH_SIZE, create_selection, describe, get_selection
 from .serializers import (
     CandidateListSerializer,
     CandidateDetailSerializer,
@@ -27,6 +31,44 @@ from .serializers import (
 from occupations.models import OccupationLevel, OccupationModule, OccupationPaper
 from assessment_series.models import AssessmentSeries
 from results.models import FormalResult, ModularResult, WorkersPasResult
+from results.progress import get_progress, get_progress_for_candidates, rebuild_candidate_progress
+from emis.http_cache import (
+    PRIVATE_REVALIDATE, bump_version, candidate_version_name, conditional_get, get_version, make_etag,
+)
+from users.scope import get_scope
+from utils import reference_data
+
+
+def _candidate_results_etag(request, pk=None):
+    """Results depend on the candidate's own rows, series release flags and who is asking."""
+    user = request.user
+    viewer = f'{user.user_type}:{user.pk}' if user.is_authenticated else 'anonymous'
+    return make_etag(
+        'candidate-results', pk, viewer,
+        get_version(candidate_version_name(pk)), get_version('assessment_series'),
+    )
+
+
+def _nationalities_etag(request):
+    """The nationality list only changes when the process restarts."""
+    return reference_data.nationalities_etag()
+
+
+def _selection_from_request(request, kind):
+    """
+    (snapshot, error_response) for the `selection_token` in the request body;
+    (None, None) when the request names its rows some other way.
+    """
+    token = request.data.get('selection_token')
+    if not token:
+        return None, None
+    snapshot = get_selection(token, kind, request.user)
+    if snapshot is None:
+        return None, Response(
+            {'error': 'Selection has expired or is not available. Please select the records again.'},
+            status=status.HTTP_410_GONE
+        )
+    return snapshot, None
 
 
 class CandidateViewSet(viewsets.ModelViewSet):
@@ -34,8 +76,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
     ViewSet for managing candidates
     """
     permission_classes = [AllowAny]  # TODO: Change to IsAuthenticated after auth is set up
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['registration_number', 'full_name', 'contact', 'refugee_number']
+    filter_backends = [DjangoFilterBackend, CandidateSearchFilter, CandidateOrderingFilter]
+    pagination_class = RankedSearchPagination
+    search_fields = ['registration_number', 'full_name', 'contact', 'refugee_number']  # See candidates.search
     ordering_fields = ['created_at', 'full_name', 'registration_number']
     ordering = ['-created_at']
     
@@ -67,9 +110,16 @@ class CandidateViewSet(viewsets.ModelViewSet):
             'updated_by',
             'verified_by'
         ).prefetch_related(
-            'enrollments'
+            'enrollments__occupation_level'
         ).all()
         
+        if self.action == 'list':
+            # Read by CandidateListSerializer.get_has_marks
+            queryset = queryset.annotate(
+                has_formal_results=Exists(FormalResult.objects.filter(candidate=OuterRef('pk'))),
+                has_modular_results=Exists(ModularResult.objects.filter(candidate=OuterRef('pk'))),
+            )
+        
         # Custom filters for is_enrolled and has_marks
         is_enrolled = self.request.query_params.get('is_enrolled')
         if is_enrolled is not None:
@@ -89,62 +139,19 @@ class CandidateViewSet(viewsets.ModelViewSet):
                     Q(formal_results__isnull=False) | Q(modular_results__isnull=False)
                 )
         
-        # Filter by center for center representatives
-        if self.request.user.is_authenticated and self.request.user.user_type == 'center_representative':
-            try:
-                center_rep = self.request.user.center_rep_profile
-                if center_rep and center_rep.assessment_center:
-                    queryset = queryset.filter(assessment_center=center_rep.assessment_center)
-                    # If center rep is assigned to a specific branch, filter by that branch too
-                    if center_rep.assessment_center_branch:
-                        queryset = queryset.filter(assessment_center_branch=center_rep.assessment_center_branch)
-                else:
-                    # No center assigned - return empty queryset for safety
-                    queryset = queryset.none()
-            except Exception:
-                # No center_rep_profile found - return empty queryset for safety
-                queryset = queryset.none()
+        # Center representatives only see their center (and branch)
+        queryset = get_scope(self.request).restrict(queryset)
         
         return queryset
 
     def _log_activity(self, candidate, action, description='', details=None):
-        actor = self.request.user if getattr(self.request, 'user', None) and self.request.user.is_authenticated else None
-        CandidateActivity.objects.create(
-            candidate=candidate,
-            actor=actor,
-            action=action,
-            description=description or '',
-            details=details,
-        )
+        audit.record(candidate, action, description, details, actor=audit.actor_of(self.request))
 
     @action(detail=False, methods=['get'])
+    @method_decorator(conditional_get(etag_func=_nationalities_etag, cache_control=PRIVATE_REVALIDATE))
     def nationalities(self, request):
-        """Return list of countries with East Africa prioritized"""
-        # East African countries (using ISO codes)
-        east_africa_codes = ['UG', 'KE', 'TZ', 'RW', 'BI', 'SS']
-        
-        # Get East African countries first (in specific order)
-        east_africa = [
-            {'value': code, 'label': countries.name(code)} 
-            for code in east_africa_codes
-        ]
-        
-        # Get remaining countries (alphabetically by name)
-        remaining_countries = [
-            {'value': code, 'label': name}
-            for code, name in countries
-            if code not in east_africa_codes
-        ]
-        # Sort remaining by label (country name)
-        remaining_countries.sort(key=lambda x: x['label'])
-        
-        # Combine: East Africa first, then rest
-        ordered = east_africa + remaining_countries
-        
-        # Optionally add 'Other' at the end
-        ordered.append({'value': 'OTHER', 'label': 'Other'})
-        
-        return Response(ordered)
+        """Return list of countries with East Africa prioritized, then the rest by name, then 'Other'"""
+        return HttpResponse(reference_data.nationalities_json(), content_type='application/json')
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -161,21 +168,16 @@ class CandidateViewSet(viewsets.ModelViewSet):
             staff = self.request.user.staff
         except Exception:
             pass
-        if self.request.user.is_authenticated and self.request.user.user_type == 'center_representative':
-            try:
-                center_rep = self.request.user.center_rep_profile
-                if center_rep and center_rep.assessment_center:
-                    candidate = serializer.save(
-                        created_by=staff,
-                        updated_by=staff,
-                        assessment_center=center_rep.assessment_center,
-                        assessment_center_branch=center_rep.assessment_center_branch,
-                    )
-                    self._log_activity(candidate, 'candidate_created', 'Candidate created')
-                    return
-            except Exception:
-                pass
-        candidate = serializer.save(created_by=staff, updated_by=staff)
+        scope = get_scope(self.request)
+        if scope.is_center_rep and scope.center is not None:
+            # Center representatives always save into their own center and branch
+            candidate = serializer.save(
+                created_by=staff, updated_by=staff,
+                assessment_center=scope.center,
+                assessment_center_branch=scope.branch,
+            )
+        else:
+            candidate = serializer.save(created_by=staff, updated_by=staff)
         self._log_activity(candidate, 'candidate_created', 'Candidate created')
     
     def perform_update(self, serializer):
@@ -185,20 +187,16 @@ class CandidateViewSet(viewsets.ModelViewSet):
             staff = self.request.user.staff
         except Exception:
             pass
-        if self.request.user.is_authenticated and self.request.user.user_type == 'center_representative':
-            try:
-                center_rep = self.request.user.center_rep_profile
-                if center_rep and center_rep.assessment_center:
-                    candidate = serializer.save(
-                        updated_by=staff,
-                        assessment_center=center_rep.assessment_center,
-                        assessment_center_branch=center_rep.assessment_center_branch,
-                    )
-                    self._log_activity(candidate, 'candidate_updated', 'Candidate updated')
-                    return
-            except Exception:
-                pass
-        candidate = serializer.save(updated_by=staff)
+        scope = get_scope(self.request)
+        if scope.is_center_rep and scope.center is not None:
+            # Center representatives always save into their own center and branch
+            candidate = serializer.save(
+                updated_by=staff,
+                assessment_center=scope.center,
+                assessment_center_branch=scope.branch,
+            )
+        else:
+            candidate = serializer.save(updated_by=staff)
         self._log_activity(candidate, 'candidate_updated', 'Candidate updated')
 
     @action(detail=True, methods=['get'])
@@ -399,37 +397,69 @@ class CandidateViewSet(viewsets.ModelViewSet):
         """Get candidate statistics"""
         queryset = self.filter_queryset(self.get_queryset())
         
+        # One conditional aggregate over the filtered queryset
+        counts = queryset.aggregate(
+            total=Count('id'),
+            modular=Count('id', filter=Q(registration_category='modular')),
+            formal=Count('id', filter=Q(registration_category='formal')),
+            workers_pas=Count('id', filter=Q(registration_category='workers_pas')),
+            verified=Count('id', filter=Q(verification_status='verified')),
+            pending=Count('id', filter=Q(verification_status='pending_verification')),
+            declined=Count('id', filter=Q(verification_status='declined')),
+            editable=Count('id', filter=Q(verification_status='editable')),
+            male=Count('id', filter=Q(gender='male')),
+            female=Count('id', filter=Q(gender='female')),
+            refugees=Count('id', filter=Q(is_refugee=True)),
+            with_disability=Count('id', filter=Q(has_disability=True)),
+        )
+        
         stats = {
-            'total': queryset.count(),
+            'total': counts['total'],
             'by_category': {
-                'modular': queryset.filter(registration_category='modular').count(),
-                'formal': queryset.filter(registration_category='formal').count(),
-                'workers_pas': queryset.filter(registration_category='workers_pas').count(),
+                'modular': counts['modular'],
+                'formal': counts['formal'],
+                'workers_pas': counts['workers_pas'],
             },
             'by_status': {
-                'verified': queryset.filter(verification_status='verified').count(),
-                'pending': queryset.filter(verification_status='pending_verification').count(),
-                'declined': queryset.filter(verification_status='declined').count(),
-                'editable': queryset.filter(verification_status='editable').count(),
+                'verified': counts['verified'],
+                'pending': counts['pending'],
+                'declined': counts['declined'],
+                'editable': counts['editable'],
             },
             'by_gender': {
-                'male': queryset.filter(gender='male').count(),
-                'female': queryset.filter(gender='female').count(),
+                'male': counts['male'],
+                'female': counts['female'],
             },
-            'refugees': queryset.filter(is_refugee=True).count(),
-            'with_disability': queryset.filter(has_disability=True).count(),
+            'refugees': counts['refugees'],
+            'with_disability': counts['with_disability'],
         }
         
         return Response(stats)
     
+    @action(detail=False, methods=['post'])
+    def selection(self, request):
+        """
+        Snapshot every candidate matching the list filters, sent as the list's
+        own query string, for "select all" bulk actions. Bulk endpoints accept
+        the returned selection_token in place of select_all and filters.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        snapshot = create_selection(queryset, 'candidate', request.user, request.query_params.dict())
+        return Response(describe(snapshot), status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['post'])
     def export(self, request):
         """Export candidates to Excel - optimized for large datasets"""
         candidate_ids = request.data.get('ids', [])
         export_all = request.data.get('export_all', False)
+        snapshot, error = _selection_from_request(request, 'candidate')
+        if error:
+            return error
         
         # Get queryset based on filters or IDs - use values() for speed
-        if export_all:
+        if snapshot:
+            queryset = None  # Rows are read from the snapshot below
+        elif export_all:
             # Apply filters from request data
             queryset = self.get_queryset()
             
@@ -487,13 +517,19 @@ class CandidateViewSet(viewsets.ModelViewSet):
         else:
             return Response({'error': 'No candidates selected'}, status=status.HTTP_400_BAD_REQUEST)
         
-        candidates = queryset.values(
+        export_fields = (
             'registration_number', 'full_name', 'date_of_birth', 'gender',
             'nationality', 'contact', 'has_disability', 'is_refugee',
             'assessment_center__center_name', 'assessment_center_branch__branch_code', 'registration_category',
             'occupation__occ_name', 'occupation__sector__name', 'district__name',
             'nature_of_disability__name', 'disability_specification'
         )
+        if snapshot:
+            candidates = snapshot.iter_objects(
+                Candidate.objects.values('pk', *export_fields), SELECTION_BATCH_SIZE
+            )
+        else:
+            candidates = queryset.values(*export_fields)
         
         # Create workbook
         wb = openpyxl.Workbook()
@@ -591,16 +627,16 @@ class CandidateViewSet(viewsets.ModelViewSet):
         
         reg_category = candidate.registration_category
         
+        # Pass/fail/retake status for every module and paper, in one query
+        progress = get_progress(candidate)
+        
         # For modular candidates, validate that they're not enrolling in passed or already enrolled modules
         if reg_category == 'modular' and modules:
             # Check for passed modules
             passed_modules = []
             for module_id in modules:
-                results = ModularResult.objects.filter(
-                    candidate=candidate,
-                    module_id=module_id
-                )
-                if any(r.is_passing for r in results):
+                is_passed, _ = progress.module_status(module_id)
+                if is_passed:
                     module = OccupationModule.objects.get(id=module_id)
                     passed_modules.append(module.module_name)
             
@@ -615,20 +651,13 @@ class CandidateViewSet(viewsets.ModelViewSet):
         
         # For workers_pas candidates, validate paper selection
         if reg_category == 'workers_pas' and papers:
-            from results.models import WorkersPasResult
-            
             # Check for passed papers and categorize retakes vs new
             passed_papers = []
             retake_paper_ids = set()
             new_paper_ids = set()
             
             for paper_id in papers:
-                results = WorkersPasResult.objects.filter(
-                    candidate=candidate,
-                    paper_id=paper_id
-                )
-                has_passed = any(r.is_passing for r in results)
-                has_failed = any(not r.is_passing for r in results)
+                has_passed, has_failed, _ = progress.paper_status(paper_id)
                 
                 if has_passed:
                     paper = OccupationPaper.objects.get(id=paper_id)
@@ -682,13 +711,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         elif reg_category == 'formal':
             # Formal: use formal_fee from the level
             # Check if candidate has failed papers in this level (retaker)
-            failed_results = FormalResult.objects.filter(
-                candidate=candidate,
-                level=occupation_level
-            )
-            has_failed = any(not r.is_passing for r in failed_results)
-            
-            if has_failed:
+            if progress.level_has_failures(occupation_level.id):
                 # Retaker: 50% discount
                 is_retaker = True
                 total_amount = occupation_level.formal_fee / 2
@@ -705,16 +728,10 @@ class CandidateViewSet(viewsets.ModelViewSet):
             new_module_ids = set()
             
             for module_id in modules:
-                # Check if candidate has failed results for this module
-                failed_results = ModularResult.objects.filter(
-                    candidate=candidate,
-                    module_id=module_id
-                )
-                # Check if any result exists and if the latest is a fail
-                has_passed = any(r.is_passing for r in failed_results)
-                has_failed = any(not r.is_passing for r in failed_results)
+                # Failed and never passed → retake
+                _, is_failed = progress.module_status(module_id)
                 
-                if has_failed and not has_passed:
+                if is_failed:
                     retake_module_ids.add(module_id)
                 else:
                     new_module_ids.add(module_id)
@@ -853,9 +870,22 @@ class CandidateViewSet(viewsets.ModelViewSet):
         candidate_ids = serializer.validated_data.get('candidate_ids', [])
         assessment_series = serializer.validated_data['assessment_series_obj']
         occupation_level = serializer.validated_data.get('occupation_level_obj')
-        
-        # Get candidates either by IDs or by filters
-        if enroll_all and filters:
+        snapshot, error = _selection_from_request(request, 'candidate')
+        if error:
+            return error
+        
+        # Get candidates from a selection snapshot, by filters or by IDs
+        if snapshot:
+            candidates = list(snapshot.iter_objects(
+                Candidate.objects.select_related('occupation'), SELECTION_BATCH_SIZE
+            ))
+            
+            if not candidates:
+                return Response(
+                    {'error': 'No candidates found in the selection'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        elif enroll_all and filters:
             # Build queryset from filters (same logic as list view)
             queryset = Candidate.objects.select_related('occupation')
             
@@ -963,8 +993,12 @@ class CandidateViewSet(viewsets.ModelViewSet):
         enrolled_count = 0
         failed_enrollments = []
         
+        # Progress indexes for every candidate in one query (retake/passed checks below)
+        progress_by_candidate = get_progress_for_candidates([c.id for c in candidates])
+        
         with transaction.atomic():
             for candidate in candidates:
+                progress = progress_by_candidate[candidate.id]
                 try:
                     # Check if already enrolled in this assessment series
                     existing = CandidateEnrollment.objects.filter(
@@ -984,19 +1018,12 @@ class CandidateViewSet(viewsets.ModelViewSet):
                     
                     # For workers_pas, validate paper selection per candidate
                     if reg_category == 'workers_pas' and papers:
-                        from results.models import WorkersPasResult
-                        
                         passed_papers = []
                         retake_paper_ids = set()
                         new_paper_ids = set()
                         
                         for paper in papers:
-                            results = WorkersPasResult.objects.filter(
-                                candidate=candidate,
-                                paper=paper
-                            )
-                            has_passed = any(r.is_passing for r in results)
-                            has_failed = any(not r.is_passing for r in results)
+                            has_passed, has_failed, _ = progress.paper_status(paper.id)
                             
                             if has_passed:
                                 passed_papers.append(paper.paper_name)
@@ -1056,15 +1083,10 @@ class CandidateViewSet(viewsets.ModelViewSet):
                         retake_module_count = 0
                         new_module_count = 0
                         for module in modules:
-                            # Check if this candidate has failed this module
-                            failed_results = ModularResult.objects.filter(
-                                candidate=candidate,
-                                module=module
-                            )
-                            has_passed = any(r.is_passing for r in failed_results)
-                            has_failed = any(not r.is_passing for r in failed_results)
+                            # Failed and never passed → retake
+                            _, is_failed = progress.module_status(module.id)
                             
-                            if has_failed and not has_passed:
+                            if is_failed:
                                 retake_module_count += 1
                             else:
                                 new_module_count += 1
@@ -1175,50 +1197,42 @@ class CandidateViewSet(viewsets.ModelViewSet):
             }
         }
         
+        # Pass/fail/retake status for every level, module and paper in one query
+        progress = get_progress(candidate, select_related=('paper', 'module'))
+        
         if reg_category == 'formal':
             # Formal: show all active levels, with retake info if applicable
             all_levels = list(occupation.levels.filter(is_active=True).order_by('level_name'))
             levels_data = []
             
             for level in all_levels:
-                # Get all results for this candidate in this level
-                level_results = FormalResult.objects.filter(
-                    candidate=candidate,
-                    level=level
-                ).select_related('paper', 'exam')
+                level_rows = progress.level_rows(level.id)
                 
                 # Check if candidate has failed papers (needs retake)
-                is_retaker = False
-                failed_papers = []
-                all_passed = False
+                is_retaker = any(row.has_failed for row in level_rows)
+                all_passed = bool(level_rows) and not is_retaker
                 
-                if level_results.exists():
-                    all_passed = all(r.is_passing for r in level_results)
-                    has_failures = any(not r.is_passing for r in level_results)
-                    
-                    if has_failures:
-                        is_retaker = True
-                        # Collect failed papers
-                        for result in level_results:
-                            if not result.is_passing:
-                                if result.paper:
-                                    failed_papers.append({
-                                        'id': result.paper_id,
-                                        'paper_code': result.paper.paper_code,
-                                        'paper_name': result.paper.paper_name,
-                                        'type': result.type,
-                                        'mark': float(result.mark) if result.mark else None,
-                                        'grade': result.grade,
-                                    })
-                                elif result.exam:
-                                    failed_papers.append({
-                                        'id': result.exam_id,
-                                        'module_code': result.exam.module_code,
-                                        'module_name': result.exam.module_name,
-                                        'type': result.type,
-                                        'mark': float(result.mark) if result.mark else None,
-                                        'grade': result.grade,
-                                    })
+                # Collect failed papers (latest failed attempt per paper/exam)
+                failed_papers = []
+                for row in progress.failed_level_rows(level.id):
+                    if row.paper_id:
+                        failed_papers.append({
+                            'id': row.paper_id,
+                            'paper_code': row.paper.paper_code,
+                            'paper_name': row.paper.paper_name,
+                            'type': row.type,
+                            'mark': float(row.last_failed_mark) if row.last_failed_mark else None,
+                            'grade': row.last_failed_grade,
+                        })
+                    elif row.module_id:
+                        failed_papers.append({
+                            'id': row.module_id,
+                            'module_code': row.module.module_code,
+                            'module_name': row.module.module_name,
+                            'type': row.type,
+                            'mark': float(row.last_failed_mark) if row.last_failed_mark else None,
+                            'grade': row.last_failed_grade,
+                        })
                 
                 level_data = {
                     'id': level.id,
@@ -1240,33 +1254,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
             # Modular: show level 1 with its modules, filtering out passed ones
             level_1 = occupation.levels.filter(level_name__icontains='level 1', is_active=True).first()
             if level_1:
-                all_modules = level_1.modules.filter(is_active=True)
-                
-                # Get all modular results for this candidate
-                modular_results = ModularResult.objects.filter(
-                    candidate=candidate,
-                    module__in=all_modules
-                ).select_related('module', 'assessment_series')
-                
-                # Build a dict of module status: {module_id: {'passed': bool, 'failed': bool, 'enrolled': bool}}
-                module_status = {}
-                for module in all_modules:
-                    module_status[module.id] = {
-                        'passed': False,
-                        'failed': False,
-                        'has_results': False,
-                    }
-                
-                # Check results for each module
-                for result in modular_results:
-                    module_id = result.module_id
-                    module_status[module_id]['has_results'] = True
-                    if result.is_passing:
-                        module_status[module_id]['passed'] = True
-                    else:
-                        # Only mark as failed if not already passed (in case of retake success)
-                        if not module_status[module_id]['passed']:
-                            module_status[module_id]['failed'] = True
+                all_modules = list(level_1.modules.filter(is_active=True))
                 
                 # Build modules list with availability info
                 # Simple logic: check results only
@@ -1275,9 +1263,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
                 # - No results = new enrollment
                 modules_data = []
                 for module in all_modules:
-                    status = module_status[module.id]
-                    is_passed = status['passed']
-                    is_failed = status['failed'] and not status['passed']
+                    is_passed, is_failed = progress.module_status(module.id)
                     
                     module_data = {
                         'id': module.id,
@@ -1311,35 +1297,6 @@ class CandidateViewSet(viewsets.ModelViewSet):
         elif reg_category == 'workers_pas':
             # Workers PAS: show all levels with their modules and nested papers
             # Include pass/fail status for retake handling
-            from results.models import WorkersPasResult
-            
-            # Get all papers across all levels/modules for this occupation
-            all_papers = OccupationPaper.objects.filter(
-                module__level__occupation=occupation,
-                is_active=True
-            )
-            
-            # Get all results for this candidate
-            workers_pas_results = WorkersPasResult.objects.filter(
-                candidate=candidate,
-                paper__in=all_papers
-            ).select_related('paper')
-            
-            # Build paper status dict: {paper_id: {'passed': bool, 'failed': bool}}
-            paper_status = {}
-            for paper in all_papers:
-                paper_status[paper.id] = {'passed': False, 'failed': False, 'prev_mark': None, 'prev_grade': None}
-            
-            for result in workers_pas_results:
-                paper_id = result.paper_id
-                if result.is_passing:
-                    paper_status[paper_id]['passed'] = True
-                else:
-                    if not paper_status[paper_id]['passed']:
-                        paper_status[paper_id]['failed'] = True
-                        paper_status[paper_id]['prev_mark'] = float(result.mark) if result.mark else None
-                        paper_status[paper_id]['prev_grade'] = result.grade
-            
             levels_data = []
             for level in occupation.levels.filter(is_active=True):
                 modules_data = []
@@ -1347,9 +1304,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
                     # Get papers with status info
                     papers_data = []
                     for paper in module.papers.filter(is_active=True):
-                        status = paper_status.get(paper.id, {})
-                        is_passed = status.get('passed', False)
-                        is_failed = status.get('failed', False) and not is_passed
+                        is_passed, is_failed, failed_row = progress.paper_status(paper.id)
                         
                         paper_data = {
                             'id': paper.id,
@@ -1365,8 +1320,8 @@ class CandidateViewSet(viewsets.ModelViewSet):
                         if is_passed:
                             paper_data['unavailable_reason'] = 'Already passed'
                         if is_failed:
-                            paper_data['prev_mark'] = status.get('prev_mark')
-                            paper_data['prev_grade'] = status.get('prev_grade')
+                            paper_data['prev_mark'] = float(failed_row.last_failed_mark) if failed_row.last_failed_mark else None
+                            paper_data['prev_grade'] = failed_row.last_failed_grade
                         
                         papers_data.append(paper_data)
                     
@@ -1762,6 +1717,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         )
     
     @action(detail=True, methods=['get'])
+    @method_decorator(conditional_get(etag_func=_candidate_results_etag, cache_control=PRIVATE_REVALIDATE))
     def results(self, request, pk=None):
         """Get candidate results based on registration category"""
         candidate = self.get_object()
@@ -1907,86 +1863,87 @@ def bulk_de_enroll_view(request):
     # Get all enrollments for selected candidates
     enrollments = CandidateEnrollment.objects.filter(candidate_id__in=candidate_ids)
     
-    for enrollment in enrollments:
-        candidate = enrollment.candidate
-        series = enrollment.assessment_series
-        
-        # Check if candidate has any results for this enrollment
-        has_modular_results = ModularResult.objects.filter(
-            candidate=candidate,
-            assessment_series=enrollment.assessment_series
-        ).exists()
+    with audit.batch():
+        for enrollment in enrollments:
+            candidate = enrollment.candidate
+            series = enrollment.assessment_series
         
-        has_formal_results = FormalResult.objects.filter(
-            candidate=candidate,
-            assessment_series=enrollment.assessment_series
-        ).exists()
+            # Check if candidate has any results for this enrollment
+            has_modular_results = ModularResult.objects.filter(
+                candidate=candidate,
+                assessment_series=enrollment.assessment_series
+            ).exists()
         
-        has_workers_pas_results = WorkersPasResult.objects.filter(
-            candidate=candidate,
-            assessment_series=enrollment.assessment_series
-        ).exists()
+            has_formal_results = FormalResult.objects.filter(
+                candidate=candidate,
+                assessment_series=enrollment.assessment_series
+            ).exists()
         
-        if has_modular_results or has_formal_results or has_workers_pas_results:
-            skipped_with_marks.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reg_no': candidate.registration_number,
-                'reason': 'Has marks - cannot de-enroll'
-            })
-            continue
+            has_workers_pas_results = WorkersPasResult.objects.filter(
+                candidate=candidate,
+                assessment_series=enrollment.assessment_series
+            ).exists()
         
-        # Check if candidate has marked/approved fees for this series
-        from fees.models import CandidateFee
-        has_locked_fees = CandidateFee.objects.filter(
-            candidate=candidate,
-            assessment_series=enrollment.assessment_series,
-            verification_status__in=['marked', 'approved']
-        ).exists()
-        if has_locked_fees:
-            skipped_with_marks.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reg_no': candidate.registration_number,
-                'reason': 'Has fees marked/approved by accounts - cannot de-enroll'
-            })
-            continue
+            if has_modular_results or has_formal_results or has_workers_pas_results:
+                skipped_with_marks.append({
+                    'candidate_id': candidate.id,
+                    'name': candidate.full_name,
+                    'reg_no': candidate.registration_number,
+                    'reason': 'Has marks - cannot de-enroll'
+                })
+                continue
         
-        try:
-            # Explicitly delete fees for this candidate+series before deleting enrollment
+            # Check if candidate has marked/approved fees for this series
             from fees.models import CandidateFee
-            from fees.signals import update_center_fee
-            assessment_center = candidate.assessment_center
-            CandidateFee.objects.filter(
+            has_locked_fees = CandidateFee.objects.filter(
                 candidate=candidate,
-                assessment_series=series
-            ).delete()
+                assessment_series=enrollment.assessment_series,
+                verification_status__in=['marked', 'approved']
+            ).exists()
+            if has_locked_fees:
+                skipped_with_marks.append({
+                    'candidate_id': candidate.id,
+                    'name': candidate.full_name,
+                    'reg_no': candidate.registration_number,
+                    'reason': 'Has fees marked/approved by accounts - cannot de-enroll'
+                })
+                continue
+        
+            try:
+                with audit.batch():
+                    # Explicitly delete fees for this candidate+series before deleting enrollment
+                    from fees.models import CandidateFee
+                    from fees.signals import update_center_fee
+                    assessment_center = candidate.assessment_center
+                    CandidateFee.objects.filter(
+                        candidate=candidate,
+                        assessment_series=series
+                    ).delete()
             
-            enrollment.delete()
-
-            # Recalculate center fee
-            if assessment_center:
-                update_center_fee(series, assessment_center)
-
-            actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-            CandidateActivity.objects.create(
-                candidate=candidate,
-                actor=actor,
-                action='candidate_deenrolled',
-                description='Candidate de-enrolled',
-                details={
-                    'enrollment_id': enrollment.id,
-                    'assessment_series_id': series.id if series else None,
-                    'assessment_series_name': series.name if series else None,
-                },
-            )
-            success_count += 1
-        except Exception as e:
-            failed.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reason': str(e)
-            })
+                    enrollment.delete()
+
+                    # Recalculate center fee
+                    if assessment_center:
+                        update_center_fee(series, assessment_center)
+
+                    audit.record(
+                        candidate,
+                        'candidate_deenrolled',
+                        'Candidate de-enrolled',
+                        details={
+                            'enrollment_id': enrollment.id,
+                            'assessment_series_id': series.id if series else None,
+                            'assessment_series_name': series.name if series else None,
+                        },
+                        actor=audit.actor_of(request),
+                    )
+                    success_count += 1
+            except Exception as e:
+                failed.append({
+                    'candidate_id': candidate.id,
+                    'name': candidate.full_name,
+                    'reason': str(e)
+                })
     
     return Response({
         'message': f'Successfully de-enrolled {success_count} candidate(s)',
@@ -2058,17 +2015,16 @@ def delete_enrollment_view(request, enrollment_id):
         if assessment_center:
             update_center_fee(series, assessment_center)
         
-        actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-        CandidateActivity.objects.create(
-            candidate=candidate,
-            actor=actor,
-            action='enrollment_deleted',
-            description='Enrollment deleted',
+        audit.record(
+            candidate,
+            'enrollment_deleted',
+            'Enrollment deleted',
             details={
                 'enrollment_id': enrollment_id,
                 'assessment_series_id': series.id if series else None,
                 'assessment_series_name': series.name if series else None,
             },
+            actor=audit.actor_of(request),
         )
         
         return Response(
@@ -2137,6 +2093,12 @@ def change_candidate_series(request, candidate_id):
     workers_updated = WorkersPasResult.objects.filter(candidate=candidate).update(assessment_series=new_series)
     updated['workers_pas_results'] = workers_updated
     
+    # Attempts changed series (and so their order); rebuild the candidate's progress index
+    rebuild_candidate_progress([candidate.id])
+    
+    # Queryset updates skip signals, so invalidate cached result views explicitly
+    bump_version(candidate_version_name(candidate.id), 'results', 'enrollments')
+    
     return Response({
         'message': f'Successfully moved {candidate.full_name} to {new_series.name}',
         'candidate_id': candidate.id,
@@ -2768,8 +2730,16 @@ def bulk_change_candidate_series(request):
         workers_updated = WorkersPasResult.objects.filter(candidate=candidate).update(assessment_series=new_series)
         total_updated['workers_pas_results'] += workers_updated
         
+        # Attempts changed series (and so their order); rebuild the candidate's progress index
+        rebuild_candidate_progress([candidate.id])
+        
+        # Queryset updates skip signals, so invalidate cached result views explicitly
+        bump_version(candidate_version_name(candidate.id))
+        
         total_updated['candidates'] += 1
     
+    bump_version('results', 'enrollments')
+    
     return Response({
         'message': f'Successfully moved {total_updated["candidates"]} candidate(s) to {new_series.name}',
         'new_series': {
@@ -2791,12 +2761,17 @@ def bulk_clear_candidate_data(request):
     candidate_ids = request.data.get('candidate_ids', [])
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'candidate')
+    if error:
+        return error
     
     from results.models import ModularResult, FormalResult, WorkersPasResult
     from fees.models import CandidateFee
     
-    # Build queryset based on select_all or candidate_ids
-    if select_all:
+    # Build queryset based on selection snapshot, select_all or candidate_ids
+    if snapshot:
+        candidates = snapshot.iter_objects(Candidate.objects.all(), SELECTION_BATCH_SIZE)
+    elif select_all:
         candidates = Candidate.objects.all()
         
         # Apply filters
@@ -2841,57 +2816,57 @@ def bulk_clear_candidate_data(request):
     }
     skipped = []
     
-    for candidate in candidates:
-        # Block if candidate has marked/approved fees
-        has_locked_fees = CandidateFee.objects.filter(
-            candidate=candidate,
-            verification_status__in=['marked', 'approved']
-        ).exists()
-        if has_locked_fees:
-            skipped.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reg_no': candidate.registration_number,
-                'reason': 'Has fees marked/approved by accounts'
-            })
-            continue
-        
-        # Delete all modular results
-        modular_count = ModularResult.objects.filter(candidate=candidate).count()
-        modular_deleted = ModularResult.objects.filter(candidate=candidate).delete()
-        total_cleared['modular_results'] += modular_deleted[0] if modular_deleted else 0
-        
-        # Delete all formal results
-        formal_count = FormalResult.objects.filter(candidate=candidate).count()
-        formal_deleted = FormalResult.objects.filter(candidate=candidate).delete()
-        total_cleared['formal_results'] += formal_deleted[0] if formal_deleted else 0
-        
-        # Delete all workers PAS results
-        workers_count = WorkersPasResult.objects.filter(candidate=candidate).count()
-        workers_deleted = WorkersPasResult.objects.filter(candidate=candidate).delete()
-        total_cleared['workers_pas_results'] += workers_deleted[0] if workers_deleted else 0
-        
-        # Delete all enrollments
-        enrollment_count = CandidateEnrollment.objects.filter(candidate=candidate).count()
-        enrollments_deleted = CandidateEnrollment.objects.filter(candidate=candidate).delete()
-        total_cleared['enrollments'] += enrollments_deleted[0] if enrollments_deleted else 0
-        
-        total_cleared['candidates_processed'] += 1
+    with audit.batch():
+        for candidate in candidates:
+            # Block if candidate has marked/approved fees
+            has_locked_fees = CandidateFee.objects.filter(
+                candidate=candidate,
+                verification_status__in=['marked', 'approved']
+            ).exists()
+            if has_locked_fees:
+                skipped.append({
+                    'candidate_id': candidate.id,
+                    'name': candidate.full_name,
+                    'reg_no': candidate.registration_number,
+                    'reason': 'Has fees marked/approved by accounts'
+                })
+                continue
         
-        # Log activity for the bulk clear
-        actor = request.user if request.user and request.user.is_authenticated else None
-        CandidateActivity.objects.create(
-            candidate=candidate,
-            actor=actor,
-            action='bulk_data_cleared',
-            description='All results and enrollments cleared via bulk action',
-            details={
-                'modular_results_deleted': modular_count,
-                'formal_results_deleted': formal_count,
-                'workers_pas_results_deleted': workers_count,
-                'enrollments_deleted': enrollment_count
-            }
-        )
+            # Delete all modular results
+            modular_count = ModularResult.objects.filter(candidate=candidate).count()
+            modular_deleted = ModularResult.objects.filter(candidate=candidate).delete()
+            total_cleared['modular_results'] += modular_deleted[0] if modular_deleted else 0
+        
+            # Delete all formal results
+            formal_count = FormalResult.objects.filter(candidate=candidate).count()
+            formal_deleted = FormalResult.objects.filter(candidate=candidate).delete()
+            total_cleared['formal_results'] += formal_deleted[0] if formal_deleted else 0
+        
+            # Delete all workers PAS results
+            workers_count = WorkersPasResult.objects.filter(candidate=candidate).count()
+            workers_deleted = WorkersPasResult.objects.filter(candidate=candidate).delete()
+            total_cleared['workers_pas_results'] += workers_deleted[0] if workers_deleted else 0
+        
+            # Delete all enrollments
+            enrollment_count = CandidateEnrollment.objects.filter(candidate=candidate).count()
+            enrollments_deleted = CandidateEnrollment.objects.filter(candidate=candidate).delete()
+            total_cleared['enrollments'] += enrollments_deleted[0] if enrollments_deleted else 0
+        
+            total_cleared['candidates_processed'] += 1
+        
+            # Log activity for the bulk clear
+            audit.record(
+                candidate,
+                'bulk_data_cleared',
+                'All results and enrollments cleared via bulk action',
+                details={
+                    'modular_results_deleted': modular_count,
+                    'formal_results_deleted': formal_count,
+                    'workers_pas_results_deleted': workers_count,
+                    'enrollments_deleted': enrollment_count
+                },
+                actor=audit.actor_of(request),
+            )
     
     return Response({
         'message': f'Successfully cleared data for {total_cleared["candidates_processed"]} candidate(s)',
@@ -2913,6 +2888,9 @@ def bulk_change_candidate_center(request):
     new_branch_id = request.data.get('new_branch_id')
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'candidate')
+    if error:
+        return error
     
     if not new_center_id:
         return Response(
@@ -2920,7 +2898,7 @@ def bulk_change_candidate_center(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    if not select_all and not candidate_ids:
+    if not snapshot and not select_all and not candidate_ids:
         return Response(
             {'error': 'No candidates selected'},
             status=status.HTTP_400_BAD_REQUEST
@@ -2946,11 +2924,13 @@ def bulk_change_candidate_center(request):
                 status=status.HTTP_404_NOT_FOUND
             )
     
-    from fees.models import CandidateFee, CenterFee
-    
-    # Get candidates based on select_all or candidate_ids
-    if select_all:
-        queryset = Candidate.objects.select_related('assessment_center').all()
+    # Get candidates based on selection snapshot, select_all or candidate_ids
+    if snapshot:
+        candidates = snapshot.iter_objects(
+            Candidate.objects.select_related('assessment_center', 'occupation'), SELECTION_BATCH_SIZE
+        )
+    elif select_all:
+        queryset = Candidate.objects.select_related('assessment_center', 'occupation').all()
         if filters.get('registration_category'):
             queryset = queryset.filter(registration_category=filters['registration_category'])
         if filters.get('assessment_center'):
@@ -2977,74 +2957,10 @@ def bulk_change_candidate_center(request):
             )
         candidates = queryset
     else:
-        candidates = Candidate.objects.filter(id__in=candidate_ids)
-    
-    total_updated = {
-        'candidates': 0,
-        'fees_moved': 0,
-    }
-    failed = []
+        candidates = Candidate.objects.select_related('assessment_center', 'occupation').filter(id__in=candidate_ids)
     
-    for candidate in candidates:
-        try:
-            old_center = candidate.assessment_center
-            
-            # Update candidate's assessment center and branch
-            candidate.assessment_center = new_center
-            candidate.assessment_center_branch = new_branch  # Set to selected branch or None
-            
-            # Generate new registration number if candidate is submitted
-            if candidate.is_submitted and candidate.registration_number:
-                new_registration_number = candidate.generate_registration_number()
-                candidate.registration_number = new_registration_number
-                
-                # Regenerate payment code
-                new_payment_code = candidate.generate_payment_code()
-                candidate.payment_code = new_payment_code
-            
-            candidate.save()
-            
-            # Update CenterFee totals if candidate has fees
-            candidate_fees = CandidateFee.objects.filter(candidate=candidate)
-            
-            for candidate_fee in candidate_fees:
-                if candidate_fee.total_amount > 0:
-                    total_updated['fees_moved'] += 1
-                    
-                    # Decrease old center's fee totals
-                    if old_center:
-                        try:
-                            old_center_fee = CenterFee.objects.get(
-                                assessment_center=old_center,
-                                assessment_series=candidate_fee.assessment_series
-                            )
-                            old_center_fee.total_candidates = max(0, old_center_fee.total_candidates - 1)
-                            old_center_fee.total_amount = max(0, old_center_fee.total_amount - candidate_fee.total_amount)
-                            old_center_fee.save()
-                        except CenterFee.DoesNotExist:
-                            pass
-                    
-                    # Increase new center's fee totals
-                    new_center_fee, created = CenterFee.objects.get_or_create(
-                        assessment_center=new_center,
-                        assessment_series=candidate_fee.assessment_series,
-                        defaults={
-                            'total_candidates': 0,
-                            'total_amount': 0,
-                            'amount_due': 0,
-                        }
-                    )
-                    new_center_fee.total_candidates += 1
-                    new_center_fee.total_amount += candidate_fee.total_amount
-                    new_center_fee.save()
-            
-            total_updated['candidates'] += 1
-        except Exception as e:
-            failed.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reason': str(e)
-            })
+    actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
+    total_updated, failed = bulk.change_center(candidates, new_center, new_branch, actor)
     
     return Response({
         'message': f'Successfully moved {total_updated["candidates"]} candidate(s) to {new_center.center_name}',
@@ -3087,18 +3003,17 @@ def regenerate_candidate_regno(request, candidate_id):
     candidate.save()
     
     # Log activity
-    actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-    CandidateActivity.objects.create(
-        candidate=candidate,
-        actor=actor,
-        action='regno_regenerated',
-        description='Registration number regenerated',
+    audit.record(
+        candidate,
+        'regno_regenerated',
+        'Registration number regenerated',
         details={
             'old_registration_number': old_regno,
             'new_registration_number': new_regno,
             'old_payment_code': old_payment_code,
             'new_payment_code': new_payment_code,
-        }
+        },
+        actor=audit.actor_of(request),
     )
     
     return Response({
@@ -3119,12 +3034,20 @@ def bulk_regenerate_candidate_regno(request):
     candidate_ids = request.data.get('candidate_ids', [])
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'candidate')
+    if error:
+        return error
     
-    if not select_all and not candidate_ids:
+    if not snapshot and not select_all and not candidate_ids:
         return Response({'error': 'No candidates selected'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Get candidates based on select_all or candidate_ids
-    if select_all:
+    # Get candidates based on selection snapshot, select_all or candidate_ids
+    if snapshot:
+        candidates = snapshot.iter_objects(
+            Candidate.objects.select_related('assessment_center', 'occupation').filter(is_submitted=True),
+            SELECTION_BATCH_SIZE
+        )
+    elif select_all:
         queryset = Candidate.objects.select_related('assessment_center', 'occupation').filter(is_submitted=True)
         if filters.get('registration_category'):
             queryset = queryset.filter(registration_category=filters['registration_category'])
@@ -3156,89 +3079,8 @@ def bulk_regenerate_candidate_regno(request):
             id__in=candidate_ids, is_submitted=True
         )
     
-    total_updated = 0
-    total_skipped = 0
-    failed = []
-    changes = []
     actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-    
-    # Process in batches for better performance
-    from django.db import transaction
-    BATCH_SIZE = 100
-    candidates_to_update = []
-    activities_to_create = []
-    
-    # First pass: identify candidates that need updating
-    for candidate in candidates.iterator():
-        try:
-            old_regno = candidate.registration_number
-            
-            # Generate new registration number
-            new_regno = candidate.generate_registration_number()
-            if not new_regno:
-                total_skipped += 1
-                continue
-            
-            # Check if registration number actually changed
-            if old_regno == new_regno:
-                total_skipped += 1
-                continue
-            
-            # Generate new payment code
-            new_payment_code = candidate.generate_payment_code()
-            
-            # Queue for batch update
-            candidate.registration_number = new_regno
-            candidate.payment_code = new_payment_code
-            candidates_to_update.append(candidate)
-            
-            # Queue activity log
-            activities_to_create.append(CandidateActivity(
-                candidate=candidate,
-                actor=actor,
-                action='regno_regenerated',
-                description='Registration number regenerated (bulk)',
-                details={
-                    'old_registration_number': old_regno,
-                    'new_registration_number': new_regno,
-                }
-            ))
-            
-            changes.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'old_regno': old_regno,
-                'new_regno': new_regno,
-            })
-            
-            # Batch save every BATCH_SIZE candidates
-            if len(candidates_to_update) >= BATCH_SIZE:
-                with transaction.atomic():
-                    Candidate.objects.bulk_update(
-                        candidates_to_update, 
-                        ['registration_number', 'payment_code']
-                    )
-                    CandidateActivity.objects.bulk_create(activities_to_create)
-                total_updated += len(candidates_to_update)
-                candidates_to_update = []
-                activities_to_create = []
-                
-        except Exception as e:
-            failed.append({
-                'candidate_id': candidate.id,
-                'name': candidate.full_name,
-                'reason': str(e)
-            })
-    
-    # Save remaining candidates
-    if candidates_to_update:
-        with transaction.atomic():
-            Candidate.objects.bulk_update(
-                candidates_to_update, 
-                ['registration_number', 'payment_code']
-            )
-            CandidateActivity.objects.bulk_create(activities_to_create)
-        total_updated += len(candidates_to_update)
+    total_updated, total_skipped, failed, changes = bulk.regenerate_registration_numbers(candidates, actor)
     
     return Response({
         'message': f'Regenerated registration numbers for {total_updated} candidate(s). {total_skipped} skipped (no change needed or missing data).',
@@ -3303,13 +3145,12 @@ def clear_candidate_data(request, candidate_id):
     enrollments_deleted = CandidateEnrollment.objects.filter(candidate=candidate).delete()
     cleared['enrollments'] = enrollments_deleted[0] if enrollments_deleted else 0
 
-    actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-    CandidateActivity.objects.create(
-        candidate=candidate,
-        actor=actor,
-        action='candidate_data_cleared',
-        description='Candidate results, enrollments & fees cleared',
+    audit.record(
+        candidate,
+        'candidate_data_cleared',
+        'Candidate results, enrollments & fees cleared',
         details={'cleared': cleared},
+        actor=audit.actor_of(request),
     )
     
     return Response({
@@ -3381,188 +3222,53 @@ def candidate_login(request):
         )
 
 
+def _candidate_portal_etag(request, registration_number):
+    """One indexed lookup; bio edits move updated_at, result/enrollment writes bump the candidate version."""
+    row = Candidate.objects.filter(
+        registration_number=registration_number.upper()
+    ).values_list('id', 'updated_at').first()
+    if row is None:
+        return None
+    return portal_version(*row)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(etag_func=_candidate_portal_etag, cache_control=PRIVATE_REVALIDATE)
 def candidate_portal_data(request, registration_number):
     """
     Get full candidate portal data including bio, enrollments, and results.
     Results show only 'Uploaded' status, not raw marks.
+    The payload is pre-shaped and cached per data version (see candidates/portal.py).
     """
-    try:
-        candidate = Candidate.objects.select_related(
-            'occupation', 'assessment_center', 'assessment_center_branch'
-        ).get(registration_number=registration_number.upper())
-        
-        # Bio Data
-        bio_data = {
-            'registration_number': candidate.registration_number,
-            'payment_code': candidate.payment_code,
-            'full_name': candidate.full_name,
-            'photo': candidate.passport_photo.url if candidate.passport_photo else None,
-            'gender': candidate.gender,
-            'date_of_birth': candidate.date_of_birth,
-            'nationality': candidate.nationality,
-            'contact': candidate.contact,
-            'district': candidate.district.name if candidate.district else None,
-            'village': candidate.village.name if candidate.village else None,
-            'is_refugee': candidate.is_refugee,
-            'refugee_number': candidate.refugee_number,
-            'has_disability': candidate.has_disability,
-            'disability': candidate.nature_of_disability.name if candidate.nature_of_disability else None,
-        }
-        
-        # Occupation Info
-        occupation_info = {
-            'registration_category': candidate.get_registration_category_display(),
-            'occupation': candidate.occupation.occ_name if candidate.occupation else None,
-            'occupation_code': candidate.occupation.occ_code if candidate.occupation else None,
-            'assessment_center': candidate.assessment_center.center_name if candidate.assessment_center else None,
-            'entry_year': candidate.entry_year,
-            'intake': candidate.get_intake_display() if candidate.intake else None,
-            'preferred_language': candidate.preferred_assessment_language,
-        }
-        
-        # Enrollments
-        enrollments = CandidateEnrollment.objects.filter(
-            candidate=candidate,
-            is_active=True
-        ).select_related('assessment_series', 'occupation_level')
-        
-        enrollment_data = []
-        for enrollment in enrollments:
-            enrollment_data.append({
-                'id': enrollment.id,
-                'assessment_series': enrollment.assessment_series.name,
-                'level': enrollment.occupation_level.level_name if enrollment.occupation_level else None,
-                'enrolled_date': enrollment.enrolled_at,
-                'total_amount': float(enrollment.total_amount) if enrollment.total_amount else 0,
-            })
-        
-        # Results (only from released assessment series, show 'Uploaded' instead of marks)
-        results_data = []
-        
-        if candidate.registration_category == 'modular':
-            from results.models import ModularResult
-            results = ModularResult.objects.filter(
-                candidate=candidate,
-                assessment_series__results_released=True
-            ).select_related('assessment_series', 'module')
-            
-            for result in results:
-                results_data.append({
-                    'assessment_series': result.assessment_series.name,
-                    'module': result.module.module_name,
-                    'module_code': result.module.module_code,
-                    'type': result.get_type_display(),
-                    'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
-                    'grade': result.grade,
-                    'comment': result.comment,
-                    'status': result.get_status_display(),
-                })
-        
-        elif candidate.registration_category == 'formal':
-            from results.models import FormalResult
-            results = FormalResult.objects.filter(
-                candidate=candidate,
-                assessment_series__results_released=True
-            ).select_related('assessment_series', 'level', 'exam', 'paper')
-            
-            for result in results:
-                exam_or_paper = ''
-                if result.exam:
-                    exam_or_paper = result.exam.module_name
-                elif result.paper:
-                    exam_or_paper = result.paper.paper_name
-                
-                results_data.append({
-                    'assessment_series': result.assessment_series.name,
-                    'level': result.level.level_name,
-                    'exam_or_paper': exam_or_paper,
-                    'type': result.get_type_display(),
-                    'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
-                    'grade': result.grade,
-                    'comment': result.comment,
-                    'status': result.get_status_display(),
-                })
-        
-        elif candidate.registration_category == 'workers_pas':
-            from results.models import WorkersPasResult
-            results = WorkersPasResult.objects.filter(
-                candidate=candidate,
-                assessment_series__results_released=True
-            ).select_related('assessment_series', 'level', 'module', 'paper')
-            
-            for result in results:
-                results_data.append({
-                    'assessment_series': result.assessment_series.name,
-                    'level': result.level.level_name,
-                    'module': result.module.module_name,
-                    'paper': result.paper.paper_name,
-                    'type': 'Practical',
-                    'mark_status': 'Uploaded' if result.mark is not None else 'Pending',
-                    'grade': result.grade,
-                    'comment': result.comment,
-                    'status': result.get_status_display(),
-                })
-        
-        return Response({
-            'bio_data': bio_data,
-            'occupation_info': occupation_info,
-            'enrollments': enrollment_data,
-            'results': results_data,
-            'status': candidate.status,
-            'is_verified': candidate.status == 'verified',
-        }, status=status.HTTP_200_OK)
-        
-    except Candidate.DoesNotExist:
+    document = get_portal_document(registration_number)
+    if document is None:
         return Response(
             {'error': 'Candidate not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    return Response(document, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def enrollment_list_view(request):
-    """
-    List all enrollments with filtering options
-    """
-    from emis.pagination import FlexiblePagination
-    
-    queryset = CandidateEnrollment.objects.select_related(
-        'candidate',
-        'candidate__assessment_center',
-        'candidate__occupation',
-        'assessment_series',
-        'occupation_level',
-        'occupation_level__occupation'
-    ).prefetch_related(
-        'modules',
-        'modules__module',
-        'modules__module__occupation',
-        'papers',
-        'papers__paper',
-        'papers__paper__occupation',
-        'papers__paper__level'
-    ).filter(is_active=True).order_by('-enrolled_at')
-    
+def _filter_enrollments(queryset, params, scope):
+    """Apply the enrollment list's query-string filters and center-rep scoping."""
     # Filter by registration category
-    registration_category = request.query_params.get('registration_category')
+    registration_category = params.get('registration_category')
     if registration_category:
         queryset = queryset.filter(candidate__registration_category=registration_category)
     
     # Filter by assessment series
-    assessment_series = request.query_params.get('assessment_series')
+    assessment_series = params.get('assessment_series')
     if assessment_series:
         queryset = queryset.filter(assessment_series_id=assessment_series)
     
     # Filter by assessment center
-    assessment_center = request.query_params.get('assessment_center')
+    assessment_center = params.get('assessment_center')
     if assessment_center:
         queryset = queryset.filter(candidate__assessment_center_id=assessment_center)
     
     # Filter by occupation
-    occupation = request.query_params.get('occupation')
+    occupation = params.get('occupation')
     if occupation:
         queryset = queryset.filter(
             Q(occupation_level__occupation_id=occupation) |
@@ -3570,25 +3276,49 @@ def enrollment_list_view(request):
         )
     
     # Filter by occupation level (for formal candidates)
-    occupation_level = request.query_params.get('occupation_level')
+    occupation_level = params.get('occupation_level')
     if occupation_level:
         queryset = queryset.filter(occupation_level_id=occupation_level)
     
     # Search by registration number or name
-    search = request.query_params.get('search')
+    search = params.get('search')
     if search:
         queryset = queryset.filter(
             Q(candidate__registration_number__icontains=search) |
             Q(candidate__full_name__icontains=search)
         )
     
-    # Filter by center for center representatives
-    if request.user.is_authenticated and request.user.user_type == 'center_representative':
-        if hasattr(request.user, 'center_rep_profile'):
-            center_rep = request.user.center_rep_profile
-            queryset = queryset.filter(candidate__assessment_center=center_rep.assessment_center)
-            if center_rep.assessment_center_branch:
-                queryset = queryset.filter(candidate__assessment_center_branch=center_rep.assessment_center_branch)
+    # Center representatives only see their center (and branch)
+    return scope.restrict(
+        queryset, 'candidate__assessment_center', 'candidate__assessment_center_branch'
+    )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def enrollment_list_view(request):
+    """
+    List all enrollments with filtering options
+    """
+    from emis.pagination import FlexiblePagination
+    
+    queryset = CandidateEnrollment.objects.select_related(
+        'candidate',
+        'candidate__assessment_center',
+        'candidate__occupation',
+        'assessment_series',
+        'occupation_level',
+        'occupation_level__occupation'
+    ).prefetch_related(
+        'modules',
+        'modules__module',
+        'modules__module__occupation',
+        'papers',
+        'papers__paper',
+        'papers__paper__occupation',
+        'papers__paper__level'
+    ).filter(is_active=True).order_by('-enrolled_at')
+    queryset = _filter_enrollments(queryset, request.query_params, get_scope(request))
     
     # Paginate
     paginator = FlexiblePagination()
@@ -3602,6 +3332,20 @@ def enrollment_list_view(request):
     return Response(serializer.data)
 
 
+@csrf_exempt
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def enrollment_selection_view(request):
+    """
+    Snapshot every active enrollment matching the enrollment list filters,
+    sent as the list's own query string, for "select all" bulk actions
+    """
+    queryset = CandidateEnrollment.objects.filter(is_active=True)
+    queryset = _filter_enrollments(queryset, request.query_params, get_scope(request))
+    snapshot = create_selection(queryset, 'enrollment', request.user, request.query_params.dict())
+    return Response(describe(snapshot), status=status.HTTP_201_CREATED)
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -3611,6 +3355,9 @@ def bulk_change_enrollment_series(request):
     new_series_id = request.data.get('new_series_id')
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'enrollment')
+    if error:
+        return error
     
     if not new_series_id:
         return Response(
@@ -3630,7 +3377,12 @@ def bulk_change_enrollment_series(request):
     from results.models import ModularResult, FormalResult, WorkersPasResult
     
     # Get enrollments to update
-    if select_all:
+    if snapshot:
+        enrollments = snapshot.iter_objects(
+            CandidateEnrollment.objects.select_related('candidate', 'assessment_series', 'occupation_level'),
+            SELECTION_BATCH_SIZE
+        )
+    elif select_all:
         # Apply filters to get all matching enrollments
         queryset = CandidateEnrollment.objects.select_related(
             'candidate', 'assessment_series', 'occupation_level'
@@ -3692,6 +3444,14 @@ def bulk_change_enrollment_series(request):
             candidate=candidate, assessment_series=old_series
         ).update(assessment_series=new_series)
         total_updated['workers_pas_results'] += workers_updated
+        
+        # Attempts changed series (and so their order); rebuild the candidate's progress index
+        rebuild_candidate_progress([candidate.id])
+        
+        # Result queryset updates skip signals, so invalidate cached result views explicitly
+        bump_version(candidate_version_name(candidate.id))
+    
+    bump_version('results')
     
     return Response({
         'message': f'Successfully moved {total_updated["enrollments"]} enrollment(s) to {new_series.name}',
@@ -3711,12 +3471,20 @@ def bulk_de_enroll_by_enrollment(request):
     enrollment_ids = request.data.get('enrollment_ids', [])
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'enrollment')
+    if error:
+        return error
     
     from results.models import ModularResult, FormalResult, WorkersPasResult
     from fees.models import CandidateFee
     
     # Get enrollments to delete
-    if select_all:
+    if snapshot:
+        enrollments = snapshot.iter_objects(
+            CandidateEnrollment.objects.select_related('candidate', 'assessment_series', 'occupation_level'),
+            SELECTION_BATCH_SIZE
+        )
+    elif select_all:
         queryset = CandidateEnrollment.objects.select_related(
             'candidate', 'assessment_series', 'occupation_level'
         ).all()
@@ -3831,12 +3599,20 @@ def bulk_clear_enrollment_data(request):
     enrollment_ids = request.data.get('enrollment_ids', [])
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'enrollment')
+    if error:
+        return error
     
     from results.models import ModularResult, FormalResult, WorkersPasResult
     from fees.models import CandidateFee
     
     # Get enrollments to clear
-    if select_all:
+    if snapshot:
+        enrollments = snapshot.iter_objects(
+            CandidateEnrollment.objects.select_related('candidate', 'assessment_series', 'occupation_level'),
+            SELECTION_BATCH_SIZE
+        )
+    elif select_all:
         queryset = CandidateEnrollment.objects.select_related(
             'candidate', 'assessment_series', 'occupation_level'
         ).all()
@@ -3935,6 +3711,9 @@ def bulk_update_enrollment(request):
     enrollment_ids = request.data.get('enrollment_ids', [])
     select_all = request.data.get('select_all', False)
     filters = request.data.get('filters', {})
+    snapshot, error = _selection_from_request(request, 'enrollment')
+    if error:
+        return error
     
     # Update data
     level_id = request.data.get('level_id')  # For formal candidates
@@ -3944,7 +3723,12 @@ def bulk_update_enrollment(request):
     from occupations.models import OccupationLevel, OccupationModule, OccupationPaper
     
     # Get enrollments to update
-    if select_all:
+    if snapshot:
+        enrollments = snapshot.iter_objects(
+            CandidateEnrollment.objects.select_related('candidate', 'assessment_series', 'occupation_level'),
+            SELECTION_BATCH_SIZE
+        )
+    elif select_all:
         queryset = CandidateEnrollment.objects.select_related(
             'candidate', 'assessment_series', 'occupation_level'
         ).all()
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 from assessment_centers.models import AssessmentCenter
@@ -115,30 +116,83 @@ class Complaint(models.Model):
     def __str__(self):
         return f"{self.ticket_number} - {self.category}"
 
+    @staticmethod
+    def ticket_prefix(year=None):
+        """TKT + 2-digit year, e.g. TKT25"""
+        return f'TKT{str(year or timezone.now().year)[-2:]}'
+
+    @staticmethod
+    def ticket_serial(ticket_number, prefix):
+        """Serial of a ticket number with `prefix`, or None if it has another format"""
+        if ticket_number and ticket_number.startswith(prefix) and ticket_number[len(prefix):].isdigit():
+            return int(ticket_number[len(prefix):])
+        return None
+
     def save(self, *args, **kwargs):
-        if not self.ticket_number:
-            # Generate ticket number in format TKT{YY}{SERIAL}
-            # YY = 2-digit year, SERIAL = 5-digit sequential number
-            current_year = timezone.now().year
-            year_suffix = str(current_year)[-2:]  # Last 2 digits of year
-            
-            # Get the last complaint for this year
-            year_prefix = f'TKT{year_suffix}'
-            last_complaint = Complaint.objects.filter(
-                ticket_number__startswith=year_prefix
-            ).order_by('-ticket_number').first()
-            
-            if last_complaint and last_complaint.ticket_number:
-                # Extract the serial number (last 5 digits)
-                last_serial = int(last_complaint.ticket_number[-5:])
-                new_serial = last_serial + 1
-            else:
-                # First complaint of the year
-                new_serial = 1
-            
-            # Format: TKT + YY + 5-digit serial (zero-padded)
-            self.ticket_number = f'TKT{year_suffix}{new_serial:05d}'
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # The counter update and the insert commit together, so a failed
+            # insert does not use up a ticket number
+            if not self.ticket_number:
+                # Generate ticket number in format TKT{YY}{SERIAL}
+                # YY = 2-digit year, SERIAL = 5-digit sequential number
+                prefix = self.ticket_prefix()
+                self.ticket_number = f'{prefix}{TicketCounter.next_serial(prefix):05d}'
+            elif self._state.adding:
+                # Imported ticket numbers must not be handed out again
+                TicketCounter.advance_past(self.ticket_number)
+            super().save(*args, **kwargs)
+
+
+class TicketCounter(models.Model):
+    """Last complaint ticket serial handed out for each ticket prefix (year)"""
+    prefix = models.CharField(max_length=10, unique=True)
+    last_serial = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Ticket Counter'
+        verbose_name_plural = 'Ticket Counters'
+        ordering = ['prefix']
+
+    def __str__(self):
+        return f"{self.prefix}: {self.last_serial}"
+
+    @classmethod
+    def next_serial(cls, prefix):
+        """
+        Take the next serial for `prefix`. Must run inside a transaction: the
+        counter row stays locked until it commits, so concurrent callers
+        queue on it and each gets a different serial.
+        """
+        # Increment before reading, so the row (on SQLite the database) is
+        # write-locked before any read that could go stale
+        if not cls.objects.filter(prefix=prefix).update(last_serial=F('last_serial') + 1):
+            try:
+                with transaction.atomic():
+                    # First ticket of the year: start after any existing ones
+                    cls.objects.create(prefix=prefix, last_serial=cls._highest_issued(prefix) + 1)
+            except IntegrityError:
+                # Another request created the counter first
+                cls.objects.filter(prefix=prefix).update(last_serial=F('last_serial') + 1)
+        return cls.objects.values_list('last_serial', flat=True).get(prefix=prefix)
+
+    @classmethod
+    def advance_past(cls, ticket_number):
+        """Make sure the counter of an explicitly numbered ticket is at least its serial"""
+        prefix = ticket_number[:5]
+        serial = Complaint.ticket_serial(ticket_number, prefix)
+        if prefix[:3] == 'TKT' and prefix[3:].isdigit() and serial is not None:
+            cls.objects.filter(prefix=prefix, last_serial__lt=serial).update(last_serial=serial)
+
+    @staticmethod
+    def _highest_issued(prefix):
+        serials = (
+            Complaint.ticket_serial(ticket_number, prefix)
+            for ticket_number in Complaint.objects.filter(
+                ticket_number__startswith=prefix
+            ).values_list('ticket_number', flat=True).iterator()
+        )
+        return max((serial for serial in serials if serial is not None), default=0)
 
 
 class ComplaintAttachment(models.Model):
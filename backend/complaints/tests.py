@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import TransactionTestCase
+
+from assessment_centers.models import AssessmentCenter
+from assessment_series.models import AssessmentSeries
+from configurations.models import District
+from occupations.models import Occupation, Sector
+
+from .models import Complaint, ComplaintCategory, TicketCounter
+
+
+class ConcurrentTicketNumberTests(TransactionTestCase):
+    """Complaints filed at the same time must each get the next ticket number of the year."""
+
+    WORKERS = 16
+    COMPLAINTS = 400
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            # Threads sharing an in-memory database fail with "table is locked"
+            # instead of waiting; set DATABASES['default']['TEST']['NAME'] to a file
+            self.skipTest('needs a file or server test database')
+        if connection.vendor == 'sqlite':
+            # Writers queue on one database lock; give the workers' connections
+            # more than the default 5 seconds so a busy machine waits rather than fails
+            self.enterContext(mock.patch.dict(connection.settings_dict['OPTIONS'], timeout=60))
+        district = District.objects.create(name='Kampala', region='central')
+        sector = Sector.objects.create(name='Building')
+        self.fields = {
+            'category': ComplaintCategory.objects.create(name='General'),
+            'exam_center': AssessmentCenter.objects.create(
+                center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+            ),
+            'exam_series': AssessmentSeries.objects.create(
+                name='Nov 2025', start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+                date_of_release=date(2025, 12, 15),
+            ),
+            'program': Occupation.objects.create(
+                occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector,
+            ),
+            'created_by': get_user_model().objects.create_user('rep', 'rep@example.com', 'password'),
+            'issue_description': 'Missing marks',
+        }
+        self.prefix = Complaint.ticket_prefix()
+
+    def _file(self, count):
+        """File `count` complaints from a thread pool, all workers starting together."""
+        start = threading.Barrier(self.WORKERS)
+        errors = []
+
+        def file_one(i):
+            try:
+                if i < self.WORKERS:
+                    start.wait()
+                Complaint.objects.create(**self.fields)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(self.WORKERS) as pool:
+            list(pool.map(file_one, range(count)))
+        self.assertEqual(errors, [])
+
+    def _serials(self):
+        return sorted(
+            Complaint.ticket_serial(ticket_number, self.prefix)
+            for ticket_number in Complaint.objects.values_list('ticket_number', flat=True)
+        )
+
+    def test_concurrent_complaints_get_contiguous_numbers(self):
+        self._file(self.COMPLAINTS)
+
+        self.assertEqual(self._serials(), list(range(1, self.COMPLAINTS + 1)))
+        self.assertEqual(TicketCounter.objects.get(prefix=self.prefix).last_serial, self.COMPLAINTS)
+
+    def test_first_ticket_of_the_year_follows_existing_ones(self):
+        # Imported before this year's counter exists
+        Complaint.objects.create(ticket_number=f'{self.prefix}00007', **self.fields)
+
+        self._file(self.COMPLAINTS)
+
+        self.assertEqual(self._serials(), list(range(7, self.COMPLAINTS + 8)))
+
+    def test_imported_number_moves_the_counter_past_itself(self):
+        self._file(self.WORKERS)
+        Complaint.objects.create(ticket_number=f'{self.prefix}00050', **self.fields)
+        self.assertEqual(TicketCounter.objects.get(prefix=self.prefix).last_serial, 50)
+
+        # An import below the counter leaves it alone
+        Complaint.objects.create(ticket_number=f'{self.prefix}00030', **self.fields)
+        self.assertEqual(TicketCounter.objects.get(prefix=self.prefix).last_serial, 50)
+
+        self._file(self.COMPLAINTS)
+
+        self.assertEqual(
+            self._serials(),
+            list(range(1, self.WORKERS + 1)) + [30] + list(range(50, self.COMPLAINTS + 51)),
+        )
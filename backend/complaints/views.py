@@ -3,7 +3,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Q
+
+from users.scope import get_scope
 
 from .models import Complaint, ComplaintCategory, ComplaintAttachment
 from .serializers import (
@@ -54,9 +56,9 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         # Filter by user role
         if user.is_authenticated:
             # Center representatives can only see complaints from their center
-            if user.user_type == 'center_representative' and hasattr(user, 'center_rep_profile'):
-                center_rep = user.center_rep_profile
-                queryset = queryset.filter(exam_center=center_rep.assessment_center)
+            scope = get_scope(self.request)
+            if scope.is_center_rep and scope.has_profile:
+                queryset = scope.restrict(queryset, center='exam_center', branch=None)
             # Regular users can only see their own complaints
             elif not user.is_staff:
                 queryset = queryset.filter(created_by=user)
@@ -161,13 +163,14 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         """Get complaint statistics"""
         queryset = self.get_queryset()
         
-        stats = {
-            'total': queryset.count(),
-            'new': queryset.filter(status='new').count(),
-            'in_progress': queryset.filter(status='in_progress').count(),
-            'done': queryset.filter(status='done').count(),
-            'cancelled': queryset.filter(status='cancelled').count(),
-        }
+        # One conditional aggregate instead of a count per status
+        stats = queryset.aggregate(
+            total=Count('id'),
+            new=Count('id', filter=Q(status='new')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            done=Count('id', filter=Q(status='done')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+        )
         
         return Response(stats)
 
@@ -5,3 +5,6 @@ class ConfigurationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'configurations'
     verbose_name = 'System Configurations'
+
+    def ready(self):
+        import configurations.signals
@@ -0,0 +1,84 @@
+"""
+Management command to load-test connection handling per database alias.
+
+Replays a minimal request cycle (request_started -> SELECT 1 ->
+request_finished) many times, first with CONN_MAX_AGE=0 (a new connection,
+TCP and auth handshake per request: the old behaviour) and then with the
+alias's persistent, health-checked settings, and reports the per-request
+latency of both.
+
+Usage:
+    python manage.py benchmark_db_connections                         # All aliases, 200 requests each
+    python manage.py benchmark_db_connections --alias dit_legacy --requests 500
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+# Max age used for the persistent run when the alias is configured without one
+FALLBACK_MAX_AGE = 600
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request DB latency with and without persistent connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alias',
+            action='append',
+            help='Only benchmark this database alias (may be repeated).',
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Request cycles per run (default 200).')
+
+    def handle(self, *args, **options):
+        aliases = options['alias'] or list(connections)
+        unknown = set(aliases) - set(connections)
+        if unknown:
+            raise CommandError(f"Unknown database alias(es): {', '.join(sorted(unknown))}")
+
+        for alias in aliases:
+            connection = connections[alias]
+            configured = connection.settings_dict.get('CONN_MAX_AGE')
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{alias} ({connection.vendor}, CONN_MAX_AGE={configured}, '
+                f"health checks {'on' if connection.settings_dict.get('CONN_HEALTH_CHECKS') else 'off'})"
+            ))
+            try:
+                per_request = self._run(connection, 0, options['requests'])
+                persistent = self._run(connection, configured or FALLBACK_MAX_AGE, options['requests'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'   • skipped: {e}'))
+                continue
+            finally:
+                connection.settings_dict['CONN_MAX_AGE'] = configured
+                connection.close()
+
+            for label, timings in (('new connection per request', per_request), ('persistent', persistent)):
+                self.stdout.write(
+                    f'   • {label:<27} mean {statistics.mean(timings):7.3f} ms   '
+                    f'p95 {self._p95(timings):7.3f} ms'
+                )
+            reduction = 1 - statistics.mean(persistent) / statistics.mean(per_request)
+            self.stdout.write(self.style.SUCCESS(f'   • mean latency reduced by {reduction:.0%}'))
+
+    def _run(self, connection, max_age, requests):
+        """Per-request latency (ms) of `requests` request cycles at the given CONN_MAX_AGE."""
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    def _p95(timings):
+        return sorted(timings)[int(len(timings) * 0.95) - 1]
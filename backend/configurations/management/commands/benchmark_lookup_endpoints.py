@@ -0,0 +1,95 @@
+"""
+Management command to load-test the public lookup endpoints over HTTP.
+
+Sends the same mix of verification and legacy lookup requests, with a fixed
+number of concurrent clients, to each server given with --url (typically the
+sync service on :8000 and the ASGI service on :8001) and reports throughput,
+latency percentiles and errors per server.
+
+Usage:
+    python manage.py benchmark_lookup_endpoints --url http://127.0.0.1:8000 --url http://127.0.0.1:8001
+    python manage.py benchmark_lookup_endpoints --url http://127.0.0.1:8001 --query UVT --concurrency 50
+"""
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Request paths per query term, sent round-robin
+PATHS = (
+    '/api/verify/?{query}',
+    '/api/verify/?{query}&source=current',
+    '/api/verify/?{query}&source=dit_legacy',
+    '/api/dit-legacy/search/?{query}&page_size=20',
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and latency of the lookup endpoints across servers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            required=True,
+            help='Base URL of a server to test (may be repeated).',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            help='Search term to send (may be repeated; default "UVT").',
+        )
+        parser.add_argument('--requests', type=int, default=500, help='Requests per server (default 500).')
+        parser.add_argument('--concurrency', type=int, default=20, help='Concurrent clients (default 20).')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds (default 30).')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1.')
+
+        paths = [
+            path.format(query=urlencode({'q': term}))
+            for term in options['query'] or ['UVT']
+            for path in PATHS
+        ]
+        for base_url in options['url']:
+            urls = [
+                base_url.rstrip('/') + paths[i % len(paths)]
+                for i in range(options['requests'])
+            ]
+            self._run(base_url, urls, options['concurrency'], options['timeout'])
+
+    def _run(self, base_url, urls, concurrency, timeout):
+        def fetch(url):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    response.read()
+                    ok = response.status < 500
+            except urllib.error.HTTPError as e:
+                ok = e.code < 500
+            except OSError:
+                ok = False
+            return ok, (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(fetch, urls))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(ms for _, ms in outcomes)
+        errors = sum(1 for ok, _ in outcomes if not ok)
+        percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(
+            f'{base_url}: {len(urls)} requests, {concurrency} concurrent, {elapsed:.2f}s'
+        )
+        self.stdout.write(
+            f'  throughput {len(urls) / elapsed:.1f} req/s, '
+            f'p50 {percentiles[49]:.1f}ms, p95 {percentiles[94]:.1f}ms, max {latencies[-1]:.1f}ms'
+        )
+        style = self.style.ERROR if errors else self.style.SUCCESS
+        self.stdout.write(style(f'  errors: {errors}'))
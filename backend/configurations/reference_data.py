@@ -0,0 +1,79 @@
+"""
+Reference-data bundle for the center and occupation pickers.
+
+Centers, branches, occupations, levels, modules and papers change rarely but
+are loaded on almost every page. The bundle is built with one query per table,
+serialized once and stored in the cache together with its ETag, so repeat
+requests cost a cache read and, when the client already has the current
+version, a 304 with no body. Saves/deletes on any of the underlying models
+drop the cached bundle (see configurations/signals.py). That only reaches
+other workers through a shared cache; with a process-local backend the
+bundle is built on every request.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from emis.http_cache import shared_cache_enabled
+
+CACHE_KEY = 'reference_data:bundle'
+# Signals invalidate on change; the timeout only bounds staleness if a write
+# bypasses the ORM (raw SQL, migration scripts).
+CACHE_TIMEOUT = 60 * 60
+
+
+def build_reference_data():
+    """Query the reference tables and return the bundle as a dict of lists."""
+    from assessment_centers.models import AssessmentCenter, CenterBranch
+    from occupations.models import Occupation, OccupationLevel, OccupationModule, OccupationPaper
+
+    return {
+        'centers': list(AssessmentCenter.objects.order_by('center_number').values(
+            'id', 'center_number', 'center_name', 'assessment_category',
+            'district_id', 'has_branches', 'is_active',
+        )),
+        'branches': list(CenterBranch.objects.order_by('branch_code').values(
+            'id', 'branch_code', 'assessment_center_id', 'district_id', 'is_active',
+        )),
+        'occupations': list(Occupation.objects.order_by('occ_code').values(
+            'id', 'occ_code', 'occ_name', 'occ_category', 'sector_id',
+            'has_modular', 'is_active',
+        )),
+        'levels': list(OccupationLevel.objects.order_by('occupation_id', 'level_name').values(
+            'id', 'occupation_id', 'level_name', 'structure_type', 'is_active',
+        )),
+        'modules': list(OccupationModule.objects.order_by('occupation_id', 'level_id', 'module_code').values(
+            'id', 'module_code', 'module_name', 'occupation_id', 'level_id',
+            'credit_units', 'is_active',
+        )),
+        'papers': list(OccupationPaper.objects.order_by('occupation_id', 'level_id', 'paper_code').values(
+            'id', 'paper_code', 'paper_name', 'occupation_id', 'level_id', 'module_id',
+            'paper_type', 'credit_units', 'is_active',
+        )),
+    }
+
+
+def get_reference_data():
+    """
+    Return (payload_bytes, etag) for the current bundle, building and caching
+    it on a miss.
+    """
+    shared = shared_cache_enabled()
+    cached = cache.get(CACHE_KEY) if shared else None
+    if cached is not None:
+        return cached
+
+    payload = json.dumps(
+        build_reference_data(), cls=DjangoJSONEncoder, separators=(',', ':')
+    ).encode('utf-8')
+    etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+    if shared:
+        cache.set(CACHE_KEY, (payload, etag), CACHE_TIMEOUT)
+    return payload, etag
+
+
+def invalidate_reference_data():
+    """Drop the cached bundle so the next request rebuilds it."""
+    cache.delete(CACHE_KEY)
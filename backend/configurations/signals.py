@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from assessment_centers.models import AssessmentCenter, CenterBranch
+from occupations.models import Occupation, OccupationLevel, OccupationModule, OccupationPaper
+from .reference_data import invalidate_reference_data
+
+
+@receiver([post_save, post_delete], sender=AssessmentCenter)
+@receiver([post_save, post_delete], sender=CenterBranch)
+@receiver([post_save, post_delete], sender=Occupation)
+@receiver([post_save, post_delete], sender=OccupationLevel)
+@receiver([post_save, post_delete], sender=OccupationModule)
+@receiver([post_save, post_delete], sender=OccupationPaper)
+def invalidate_reference_data_on_change(sender, instance, **kwargs):
+    """Drop the cached reference-data bundle whenever a picker model changes."""
+    invalidate_reference_data()
@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from assessment_centers.models import AssessmentCenter
+from emis.http_cache import shared_cache_enabled
+
+from .models import District
+
+
+class ReferenceDataConditionalGetTests(TestCase):
+    """ETags built from cached versions are only trusted when every worker shares the cache."""
+
+    url = '/api/configurations/reference-data/'
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def _use_shared_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.enterContext(override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }))
+        self.assertTrue(shared_cache_enabled())
+        cache.clear()
+
+    def test_shared_cache_answers_revalidation_with_304(self):
+        self._use_shared_cache()
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_process_local_cache_sends_no_etag(self):
+        self.assertFalse(shared_cache_enabled())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_process_local_cache_rebuilds_the_bundle(self):
+        district = District.objects.create(name='Kampala', region='central')
+        center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        self.assertEqual(self.client.get(self.url).json()['centers'][0]['center_name'], 'Center 1')
+
+        # As a save on another worker: its signal cannot reach this process's cache
+        AssessmentCenter.objects.filter(pk=center.pk).update(center_name='Renamed')
+
+        self.assertEqual(self.client.get(self.url).json()['centers'][0]['center_name'], 'Renamed')
@@ -12,5 +12,6 @@ router.register(r'center-representatives', views.CenterRepresentativeViewSet, ba
 router.register(r'reprint-reasons', views.ReprintReasonViewSet, basename='reprint-reason')
 
 urlpatterns = [
+    path('reference-data/', views.reference_data, name='reference-data'),
     path('', include(router.urls)),
 ]
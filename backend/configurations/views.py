@@ -1,9 +1,13 @@
+from django.http import HttpResponse
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import api_view, permission_classes
 from .models import Region, District, Village, NatureOfDisability, Department, CenterRepresentative, ReprintReason
 from .serializers import (
     RegionSerializer, DistrictSerializer, VillageSerializer, 
     NatureOfDisabilitySerializer, DepartmentSerializer, CenterRepresentativeSerializer, ReprintReasonSerializer
 )
+from .reference_data import get_reference_data
+from emis.http_cache import PRIVATE_REVALIDATE, conditional_get
 
 
 class RegionViewSet(viewsets.ModelViewSet):
@@ -83,3 +87,20 @@ class ReprintReasonViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
 
 
+
+
+def _reference_data_etag(request):
+    return get_reference_data()[1]
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+@conditional_get(etag_func=_reference_data_etag, cache_control=PRIVATE_REVALIDATE)
+def reference_data(request):
+    """
+    Centers, branches, occupations, levels, modules and papers in one cached
+    payload. Clients send back the ETag in If-None-Match and get a 304 until
+    any of the underlying records change.
+    """
+    payload, _ = get_reference_data()
+    return HttpResponse(payload, content_type='application/json')
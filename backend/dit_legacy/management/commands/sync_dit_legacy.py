@@ -0,0 +1,84 @@
+"""
+Management command to replicate the legacy DIT MySQL archive into the
+local replica tables that serve the dit_legacy and verification endpoints.
+
+The endpoints read only the replica, so run a full sync once after
+deploying the replica migration (they return nothing until it has run).
+systemd/emis-dit-sync.timer then runs a full sync nightly: it also picks up
+edits made directly in MySQL to existing students, which --new misses. The
+full sync replaces one chunk of students per transaction, so the endpoints
+keep serving while it runs. Edits made through the API resync their
+students automatically.
+
+Usage:
+    python manage.py sync_dit_legacy                    # Full rebuild
+    python manage.py sync_dit_legacy --new              # Only students newer than the replica (no edits)
+    python manage.py sync_dit_legacy --student 1234     # Specific students (may be repeated)
+    python manage.py sync_dit_legacy --reference-only   # Districts, institutions, courses, levels
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.db.utils import OperationalError, ProgrammingError
+
+from dit_legacy.models import LegacyStudent
+from dit_legacy.sync import CHUNK_SIZE, full_sync, resync_students, sync_reference_tables, sync_students
+
+
+class Command(BaseCommand):
+    help = 'Replicate the legacy DIT MySQL archive into the local replica tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--student',
+            type=int,
+            action='append',
+            help='Only resync this student_id (may be repeated).',
+        )
+        parser.add_argument(
+            '--new',
+            action='store_true',
+            default=False,
+            help='Only sync students with a student_id above the highest one in the replica.',
+        )
+        parser.add_argument(
+            '--reference-only',
+            action='store_true',
+            default=False,
+            help='Only reload districts, institutions, courses and levels.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'Students per MySQL batch (default {CHUNK_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        def progress(students, last_id):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'   • {students} students (up to student_id {last_id})')
+
+        try:
+            if options['student']:
+                synced = resync_students(options['student'])
+                self.stdout.write(self.style.SUCCESS(f'Done. Resynced {synced} student(s).'))
+                return
+
+            if options['reference_only']:
+                counts = sync_reference_tables()
+            elif options['new']:
+                after_id = LegacyStudent.objects.aggregate(last=Max('student_id'))['last'] or 0
+                self.stdout.write(self.style.MIGRATE_HEADING(f'Syncing students after student_id {after_id}'))
+                counts = sync_reference_tables()
+                counts['legacystudent'], counts['legacyregistration'] = sync_students(
+                    after_id=after_id, chunk_size=options['chunk_size'], progress=progress,
+                )
+            else:
+                self.stdout.write(self.style.MIGRATE_HEADING('Full DIT legacy replica sync'))
+                counts = full_sync(chunk_size=options['chunk_size'], progress=progress)
+        except (ProgrammingError, OperationalError) as e:
+            raise CommandError(f'Legacy database error: {e}')
+
+        for table, count in counts.items():
+            self.stdout.write(f'   • {table}: {count}')
+        self.stdout.write(self.style.SUCCESS('Done.'))
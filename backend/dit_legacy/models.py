@@ -56,3 +56,160 @@ class DitLegacyExamResult(models.Model):
 
     def __str__(self):
         return f'{self.person_id}: {self.paper} — {self.exam_grade}'
+
+
+# ── Local replica of the legacy MySQL archive ──
+#
+# The legacy tables are denormalised into the default DB by
+# dit_legacy.sync (`python manage.py sync_dit_legacy`) and every read
+# endpoint is served from here through dit_legacy.queries. Writes still go
+# to MySQL and resync the touched students. Date-like legacy columns are
+# kept as their original text (the archive mixes real dates and free text).
+
+class LegacyStudent(models.Model):
+    """One row per legacy student, joined with district, latest registration and result flag."""
+    _use_default_db = True
+
+    student_id = models.IntegerField(primary_key=True)
+    first_name = models.CharField(max_length=255, null=True, blank=True)
+    other_name = models.CharField(max_length=255, null=True, blank=True)
+    surname = models.CharField(max_length=255, null=True, blank=True)
+    gender = models.CharField(max_length=20, null=True, blank=True, db_index=True)
+    birth_date = models.CharField(max_length=32, null=True, blank=True)
+    nsin = models.CharField(max_length=100, null=True, blank=True)
+    exam_no = models.CharField(max_length=100, null=True, blank=True)
+    registration_number = models.CharField(max_length=100, null=True, blank=True)
+    certificate_number = models.CharField(max_length=100, null=True, blank=True)
+    national_id = models.CharField(max_length=100, null=True, blank=True)
+    telephone = models.CharField(max_length=100, null=True, blank=True)
+    email = models.CharField(max_length=255, null=True, blank=True)
+    home_address = models.TextField(null=True, blank=True)
+    village = models.CharField(max_length=255, null=True, blank=True)
+    subcounty = models.CharField(max_length=255, null=True, blank=True)
+    district_id = models.IntegerField(null=True, blank=True, db_index=True)
+    district = models.CharField(max_length=255, null=True, blank=True)
+    disability_option = models.CharField(max_length=50, null=True, blank=True)
+    disability_name = models.CharField(max_length=255, null=True, blank=True)
+    academic_level = models.CharField(max_length=255, null=True, blank=True)
+    academic_school = models.CharField(max_length=255, null=True, blank=True)
+    registered_at = models.CharField(max_length=32, null=True, blank=True)
+    has_results = models.BooleanField(default=False, db_index=True)
+
+    # Latest registration (by assessment year, then registration id)
+    registration_id = models.IntegerField(null=True, blank=True)
+    occupation = models.CharField(max_length=255, null=True, blank=True)
+    occupation_code = models.CharField(max_length=100, null=True, blank=True)
+    level = models.CharField(max_length=100, null=True, blank=True)
+    training_provider = models.CharField(max_length=255, null=True, blank=True)
+    training_provider_short = models.CharField(max_length=100, null=True, blank=True)
+    training_provider_district = models.CharField(max_length=255, null=True, blank=True)
+    assessment_year = models.IntegerField(null=True, blank=True)
+    assessment_month = models.CharField(max_length=50, null=True, blank=True)
+    actual_assessment_date = models.CharField(max_length=32, null=True, blank=True)
+
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-student_id']
+
+    def __str__(self):
+        return f'{self.student_id}: {self.first_name} {self.surname}'
+
+
+class LegacyRegistration(models.Model):
+    """One row per legacy students_registration entry, joined with its registration and names."""
+    _use_default_db = True
+
+    student_registration_id = models.IntegerField(primary_key=True)
+    student_id = models.IntegerField(db_index=True)
+    registration_id = models.IntegerField()
+    modules_assessed = models.TextField(null=True, blank=True)
+    amount = models.FloatField(null=True, blank=True)
+    sponsored_by = models.CharField(max_length=255, null=True, blank=True)
+    assessment_year = models.IntegerField(null=True, blank=True)
+    assessment_month = models.CharField(max_length=50, null=True, blank=True)
+    actual_assessment_date = models.CharField(max_length=32, null=True, blank=True)
+    training_start = models.CharField(max_length=32, null=True, blank=True)
+    training_end = models.CharField(max_length=32, null=True, blank=True)
+    completed = models.SmallIntegerField(null=True, blank=True)
+    verified = models.SmallIntegerField(null=True, blank=True)
+    approved = models.SmallIntegerField(null=True, blank=True)
+    certificate_printed = models.SmallIntegerField(null=True, blank=True)
+    institution_id = models.IntegerField(null=True, blank=True)
+    course_id = models.IntegerField(null=True, blank=True)
+    level_id = models.IntegerField(null=True, blank=True)
+    occupation = models.CharField(max_length=255, null=True, blank=True)
+    occupation_code = models.CharField(max_length=100, null=True, blank=True)
+    level = models.CharField(max_length=100, null=True, blank=True)
+    training_provider = models.CharField(max_length=255, null=True, blank=True)
+    training_provider_short = models.CharField(max_length=100, null=True, blank=True)
+    training_provider_district = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        ordering = ['-assessment_year', '-registration_id']
+
+    def __str__(self):
+        return f'{self.student_id}: registration {self.registration_id}'
+
+
+class LegacyDistrict(models.Model):
+    _use_default_db = True
+
+    district_id = models.IntegerField(primary_key=True)
+    district_name = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        ordering = ['district_name']
+
+    def __str__(self):
+        return self.district_name or str(self.district_id)
+
+
+class LegacyInstitution(models.Model):
+    _use_default_db = True
+
+    institution_id = models.IntegerField(primary_key=True)
+    institution_name = models.CharField(max_length=255, null=True, blank=True)
+    short_name = models.CharField(max_length=100, null=True, blank=True)
+    box_no = models.CharField(max_length=255, null=True, blank=True)
+    phone = models.CharField(max_length=100, null=True, blank=True)
+    email = models.CharField(max_length=255, null=True, blank=True)
+    centre_category = models.CharField(max_length=100, null=True, blank=True)
+    offers_modular = models.SmallIntegerField(null=True, blank=True)
+    offers_workers_pas = models.SmallIntegerField(null=True, blank=True)
+    district_id = models.IntegerField(null=True, blank=True)
+    district = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        ordering = ['institution_name']
+
+    def __str__(self):
+        return self.institution_name or str(self.institution_id)
+
+
+class LegacyCourse(models.Model):
+    _use_default_db = True
+
+    course_id = models.IntegerField(primary_key=True)
+    course_name = models.CharField(max_length=255, null=True, blank=True)
+    course_code = models.CharField(max_length=100, null=True, blank=True)
+    worker_pas_code = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        ordering = ['course_name']
+
+    def __str__(self):
+        return self.course_name or str(self.course_id)
+
+
+class LegacyLevel(models.Model):
+    _use_default_db = True
+
+    level_id = models.IntegerField(primary_key=True)
+    level_name = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        ordering = ['level_id']
+
+    def __str__(self):
+        return self.level_name or str(self.level_id)
@@ -0,0 +1,172 @@
+"""
+Read queries for the legacy DIT archive, served from the local replica
+(see dit_legacy.sync). Row dicts keep the column names the raw-SQL
+endpoints returned, so API payloads are unchanged.
+"""
+from django.db.models import Count, F, Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import (
+    LegacyCourse, LegacyDistrict, LegacyInstitution, LegacyLevel,
+    LegacyRegistration, LegacyStudent,
+)
+
+SEARCH_FIELDS = (
+    'student_id', 'first_name', 'other_name', 'surname', 'gender', 'birth_date',
+    'registration_number', 'certificate_number', 'training_provider', 'district', 'has_results',
+)
+
+DETAIL_FIELDS = (
+    'student_id', 'first_name', 'other_name', 'surname', 'gender', 'birth_date',
+    'registration_number', 'certificate_number', 'national_id', 'telephone', 'email',
+    'home_address', 'village', 'subcounty', 'occupation', 'occupation_code', 'level',
+    'district', 'training_provider', 'training_provider_short', 'training_provider_district',
+    'assessment_year', 'assessment_month', 'actual_assessment_date', 'disability_option',
+    'disability_name', 'academic_level', 'academic_school', 'registered_at',
+)
+
+REGISTRATION_FIELDS = (
+    'student_registration_id', 'registration_id', 'modules_assessed', 'amount', 'sponsored_by',
+    'assessment_year', 'assessment_month', 'actual_assessment_date', 'training_start',
+    'training_end', 'completed', 'verified', 'approved', 'certificate_printed', 'occupation',
+    'occupation_code', 'level', 'training_provider', 'training_provider_short',
+    'training_provider_district',
+)
+
+
+def legacy_date(value):
+    """Parse replica date text back to a date/datetime; free text is returned unchanged."""
+    if not value:
+        return value
+    try:
+        return parse_datetime(value) or parse_date(value) or value
+    except ValueError:
+        return value
+
+
+def _student_pk(person_id):
+    try:
+        return int(person_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _person_row(values):
+    values['person_id'] = values.pop('student_id')
+    return values
+
+
+def _name_q(term):
+    return (
+        Q(first_name__icontains=term)
+        | Q(other_name__icontains=term)
+        | Q(surname__icontains=term)
+    )
+
+
+def search_students(q='', name='', regno='', gender='', status='', district='',
+                    training_provider='', page=1, page_size=50):
+    """
+    Filtered, paginated student search (newest student_id first).
+    Returns (total_count, rows).
+    """
+    students = LegacyStudent.objects.all()
+    if q:
+        students = students.filter(Q(nsin__icontains=q) | Q(exam_no__icontains=q) | _name_q(q))
+    if name:
+        students = students.filter(_name_q(name))
+    if regno:
+        students = students.filter(
+            Q(nsin__icontains=regno) | Q(exam_no__icontains=regno) | Q(certificate_number__icontains=regno)
+        )
+    if gender:
+        students = students.filter(gender__iexact=gender)
+    if status == 'completed':
+        students = students.filter(has_results=True)
+    elif status == 'in_progress':
+        students = students.filter(has_results=False)
+    if district:
+        students = students.filter(district__icontains=district)
+    if training_provider:
+        # Any of the student's registrations, not just the latest
+        students = students.filter(student_id__in=LegacyRegistration.objects.filter(
+            training_provider__icontains=training_provider
+        ).values('student_id'))
+
+    total_count = students.count()
+    offset = (page - 1) * page_size
+    rows = []
+    for values in students.order_by('-student_id').values(*SEARCH_FIELDS)[offset:offset + page_size]:
+        values['has_results'] = 1 if values['has_results'] else 0
+        rows.append(_person_row(values))
+    return total_count, rows
+
+
+def person_detail(person_id):
+    """Biodata plus latest registration for one student, or None."""
+    student_pk = _student_pk(person_id)
+    if student_pk is None:
+        return None
+    values = LegacyStudent.objects.filter(student_id=student_pk).values(*DETAIL_FIELDS).first()
+    return _person_row(values) if values else None
+
+
+def person_registrations(person_id, limit=200):
+    """Registration/assessment history for one student, latest first."""
+    student_pk = _student_pk(person_id)
+    if student_pk is None:
+        return []
+    return list(
+        LegacyRegistration.objects.filter(student_id=student_pk)
+        .order_by(F('assessment_year').desc(nulls_last=True), '-registration_id')
+        .values(*REGISTRATION_FIELDS)[:limit]
+    )
+
+
+def verification_search(term, limit=20):
+    """Students matching a registration number, certificate number or name."""
+    return [
+        _person_row(values) for values in
+        LegacyStudent.objects.filter(
+            Q(nsin__icontains=term) | Q(exam_no__icontains=term)
+            | Q(certificate_number__icontains=term) | _name_q(term)
+        ).order_by('-student_id').values(*DETAIL_FIELDS)[:limit]
+    ]
+
+
+def districts():
+    return list(LegacyDistrict.objects.order_by('district_name').values('district_id', 'district_name'))
+
+
+def institutions(district='', limit=200):
+    queryset = LegacyInstitution.objects.all()
+    if district:
+        queryset = queryset.filter(district__icontains=district)
+    return list(queryset.order_by('institution_name').values(
+        'institution_id', 'institution_name', 'short_name', 'box_no', 'phone', 'email',
+        'centre_category', 'offers_modular', 'offers_workers_pas', 'district',
+    )[:limit])
+
+
+def courses():
+    return list(LegacyCourse.objects.order_by('course_name').values(
+        'course_id', 'course_name', 'course_code', 'worker_pas_code',
+    ))
+
+
+def levels():
+    return list(LegacyLevel.objects.order_by('level_id').values('level_id', 'level_name'))
+
+
+def stats():
+    """Archive totals. Registrations counts distinct registrations linked to students."""
+    registrations = LegacyRegistration.objects.aggregate(total=Count('registration_id', distinct=True))
+    return {
+        'total_candidates': LegacyStudent.objects.count(),
+        'total_training_providers': LegacyInstitution.objects.count(),
+        'total_registrations': registrations['total'],
+        'total_occupations': LegacyCourse.objects.count(),
+        'districts_with_candidates': LegacyStudent.objects.filter(
+            district_id__gt=0
+        ).values('district_id').distinct().count(),
+    }
@@ -0,0 +1,337 @@
+"""
+Replication of the legacy DIT MySQL archive into local tables.
+
+The archive is read-mostly, so instead of running multi-way joins against
+MySQL on every request the tables are denormalised into the default DB:
+
+- LegacyStudent: one row per student with district name, has_results flag
+  and the latest registration's occupation, level and training provider.
+- LegacyRegistration: one row per students_registration entry joined with
+  its registration, course, level and institution.
+- LegacyDistrict / LegacyInstitution / LegacyCourse / LegacyLevel.
+
+full_sync() rebuilds everything in student_id chunks (run by the
+`sync_dit_legacy` command); resync_students() refreshes individual students
+after the write endpoints change them in MySQL.
+"""
+import datetime
+import logging
+from collections import defaultdict
+
+from django.db import connections, transaction
+
+from .models import (
+    LegacyCourse, LegacyDistrict, LegacyInstitution, LegacyLevel,
+    LegacyRegistration, LegacyStudent,
+)
+
+logger = logging.getLogger(__name__)
+
+LEGACY_DB = 'dit_legacy'
+CHUNK_SIZE = 5000
+
+
+def _dictfetchall(cursor):
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _as_text(value):
+    """Legacy date/datetime columns are stored as ISO text (free text kept as-is)."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _as_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+_STUDENT_SQL = """
+    SELECT
+        s.student_id,
+        s.firstname AS first_name,
+        s.othername AS other_name,
+        s.surname,
+        s.gender,
+        s.dob AS birth_date,
+        s.nsin,
+        s.exam_no,
+        s.certificate_no AS certificate_number,
+        s.nin AS national_id,
+        s.telephone,
+        s.email,
+        s.home_address,
+        s.village,
+        s.subcountry AS subcounty,
+        s.district_id,
+        d.district_name AS district,
+        s.disadility_option AS disability_option,
+        s.disability_name,
+        s.academic_level,
+        s.school AS academic_school,
+        s.date_time AS registered_at,
+        IF(swr.student_id IS NOT NULL, 1, 0) AS has_results
+    FROM students s
+    LEFT JOIN districts d ON d.district_id = s.district_id
+    LEFT JOIN students_with_results swr ON swr.student_id = s.student_id
+"""
+
+_REGISTRATION_SQL = """
+    SELECT
+        sr.student_registration_id,
+        sr.student_id,
+        sr.registration_id,
+        sr.cand_course_code_reg AS modules_assessed,
+        sr.amount,
+        sr.sponsored_by,
+        r.year_proposed AS assessment_year,
+        r.month_proposed AS assessment_month,
+        r.actual_assessment_date,
+        r.tr_start_date AS training_start,
+        r.tr_end_date AS training_end,
+        r.completed,
+        r.verified,
+        r.approved,
+        r.printed AS certificate_printed,
+        r.institution_id,
+        r.course_id,
+        r.level_id,
+        c.course_name AS occupation,
+        c.course_code AS occupation_code,
+        l.level_name AS level,
+        i.institution_name AS training_provider,
+        i.short_name AS training_provider_short,
+        d.district_name AS training_provider_district
+    FROM students_registration sr
+    JOIN registrations r ON r.registration_id = sr.registration_id
+    LEFT JOIN courses c ON c.course_id = r.course_id
+    LEFT JOIN levels l ON l.level_id = r.level_id
+    LEFT JOIN institutions i ON i.institution_id = r.institution_id
+    LEFT JOIN districts d ON d.district_id = i.district_id
+    WHERE sr.student_id IN ({placeholders})
+"""
+
+# Fields copied from the latest registration onto LegacyStudent
+_LATEST_REGISTRATION_FIELDS = (
+    'registration_id', 'occupation', 'occupation_code', 'level', 'training_provider',
+    'training_provider_short', 'training_provider_district', 'assessment_year',
+    'assessment_month', 'actual_assessment_date',
+)
+
+
+def _registration_order(registration):
+    """Latest first: assessment year (missing years last), then registration id."""
+    year = registration.assessment_year
+    return (year is not None, year or 0, registration.registration_id)
+
+
+def _build_registrations(rows):
+    return [
+        LegacyRegistration(
+            student_registration_id=row['student_registration_id'],
+            student_id=row['student_id'],
+            registration_id=row['registration_id'],
+            modules_assessed=row['modules_assessed'],
+            amount=_as_float(row['amount']),
+            sponsored_by=row['sponsored_by'],
+            assessment_year=_as_int(row['assessment_year']),
+            assessment_month=_as_text(row['assessment_month']),
+            actual_assessment_date=_as_text(row['actual_assessment_date']),
+            training_start=_as_text(row['training_start']),
+            training_end=_as_text(row['training_end']),
+            completed=_as_int(row['completed']),
+            verified=_as_int(row['verified']),
+            approved=_as_int(row['approved']),
+            certificate_printed=_as_int(row['certificate_printed']),
+            institution_id=_as_int(row['institution_id']),
+            course_id=_as_int(row['course_id']),
+            level_id=_as_int(row['level_id']),
+            occupation=row['occupation'],
+            occupation_code=row['occupation_code'],
+            level=row['level'],
+            training_provider=row['training_provider'],
+            training_provider_short=row['training_provider_short'],
+            training_provider_district=row['training_provider_district'],
+        )
+        for row in rows
+    ]
+
+
+def _build_student(row, registrations):
+    student = LegacyStudent(
+        student_id=row['student_id'],
+        first_name=row['first_name'],
+        other_name=row['other_name'],
+        surname=row['surname'],
+        gender=row['gender'],
+        birth_date=_as_text(row['birth_date']),
+        nsin=row['nsin'],
+        exam_no=row['exam_no'],
+        registration_number=row['nsin'] if row['nsin'] is not None else row['exam_no'],
+        certificate_number=row['certificate_number'],
+        national_id=row['national_id'],
+        telephone=row['telephone'],
+        email=row['email'],
+        home_address=row['home_address'],
+        village=row['village'],
+        subcounty=row['subcounty'],
+        district_id=_as_int(row['district_id']),
+        district=row['district'],
+        disability_option=row['disability_option'],
+        disability_name=row['disability_name'],
+        academic_level=row['academic_level'],
+        academic_school=row['academic_school'],
+        registered_at=_as_text(row['registered_at']),
+        has_results=bool(row['has_results']),
+    )
+    if registrations:
+        latest = max(registrations, key=_registration_order)
+        for field in _LATEST_REGISTRATION_FIELDS:
+            setattr(student, field, getattr(latest, field))
+    return student
+
+
+def _fetch_students(cursor, student_rows):
+    """Denormalise a batch of MySQL student rows (one extra query for their registrations)."""
+    if not student_rows:
+        return [], []
+    ids = [row['student_id'] for row in student_rows]
+    cursor.execute(_REGISTRATION_SQL.format(placeholders=', '.join(['%s'] * len(ids))), ids)
+    registrations = _build_registrations(_dictfetchall(cursor))
+
+    by_student = defaultdict(list)
+    for registration in registrations:
+        by_student[registration.student_id].append(registration)
+    students = [_build_student(row, by_student.get(row['student_id'])) for row in student_rows]
+    return students, registrations
+
+
+def _replace(students, registrations, **student_filter):
+    """Swap the replica rows matching `student_filter` for freshly built ones."""
+    with transaction.atomic():
+        LegacyRegistration.objects.filter(**student_filter).delete()
+        LegacyStudent.objects.filter(**student_filter).delete()
+        LegacyStudent.objects.bulk_create(students, batch_size=1000)
+        LegacyRegistration.objects.bulk_create(registrations, batch_size=1000)
+
+
+def sync_reference_tables():
+    """Reload districts, institutions, courses and levels. Returns row counts per table."""
+    with connections[LEGACY_DB].cursor() as cursor:
+        cursor.execute("SELECT district_id, district_name FROM districts")
+        districts = [LegacyDistrict(**row) for row in _dictfetchall(cursor)]
+
+        cursor.execute("""
+            SELECT
+                i.institution_id, i.institution_name, i.short_name, i.box_no,
+                i.assement_phone_no AS phone, i.email, i.centre_category,
+                i.modular AS offers_modular, i.workers_pas AS offers_workers_pas,
+                i.district_id, d.district_name AS district
+            FROM institutions i
+            LEFT JOIN districts d ON d.district_id = i.district_id
+        """)
+        institutions = []
+        for row in _dictfetchall(cursor):
+            row['box_no'] = _as_text(row['box_no'])
+            row['phone'] = _as_text(row['phone'])
+            row['offers_modular'] = _as_int(row['offers_modular'])
+            row['offers_workers_pas'] = _as_int(row['offers_workers_pas'])
+            row['district_id'] = _as_int(row['district_id'])
+            institutions.append(LegacyInstitution(**row))
+
+        cursor.execute("SELECT course_id, course_name, course_code, worker_pas_code FROM courses")
+        courses = [LegacyCourse(**row) for row in _dictfetchall(cursor)]
+
+        cursor.execute("SELECT level_id, level_name FROM levels")
+        levels = [LegacyLevel(**row) for row in _dictfetchall(cursor)]
+
+    counts = {}
+    with transaction.atomic():
+        for model, rows in (
+            (LegacyDistrict, districts), (LegacyInstitution, institutions),
+            (LegacyCourse, courses), (LegacyLevel, levels),
+        ):
+            model.objects.all().delete()
+            model.objects.bulk_create(rows, batch_size=1000)
+            counts[model._meta.model_name] = len(rows)
+    return counts
+
+
+def sync_students(after_id=0, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Replicate students with student_id > after_id in chunks. Each chunk
+    replaces the local id range it covers, so students deleted in MySQL
+    disappear too. Returns (students, registrations) written.
+    """
+    total_students = total_registrations = 0
+    last_id = after_id
+    with connections[LEGACY_DB].cursor() as cursor:
+        while True:
+            cursor.execute(
+                _STUDENT_SQL + " WHERE s.student_id > %s ORDER BY s.student_id LIMIT %s",
+                [last_id, chunk_size],
+            )
+            student_rows = _dictfetchall(cursor)
+            if not student_rows:
+                break
+            students, registrations = _fetch_students(cursor, student_rows)
+            chunk_last_id = student_rows[-1]['student_id']
+            _replace(students, registrations, student_id__gt=last_id, student_id__lte=chunk_last_id)
+
+            total_students += len(students)
+            total_registrations += len(registrations)
+            last_id = chunk_last_id
+            if progress:
+                progress(total_students, last_id)
+
+    # Students removed from the tail of the MySQL table
+    _replace([], [], student_id__gt=last_id)
+    return total_students, total_registrations
+
+
+def full_sync(chunk_size=CHUNK_SIZE, progress=None):
+    """Rebuild the whole replica. Returns row counts per table."""
+    counts = sync_reference_tables()
+    counts['legacystudent'], counts['legacyregistration'] = sync_students(
+        chunk_size=chunk_size, progress=progress
+    )
+    return counts
+
+
+def resync_students(student_ids):
+    """
+    Refresh the replica rows for specific students from MySQL (after a write).
+    Students no longer present in MySQL are removed. Returns the number synced.
+    """
+    ids = sorted({int(student_id) for student_id in student_ids})
+    if not ids:
+        return 0
+    with connections[LEGACY_DB].cursor() as cursor:
+        cursor.execute(
+            _STUDENT_SQL + " WHERE s.student_id IN ({})".format(', '.join(['%s'] * len(ids))),
+            ids,
+        )
+        students, registrations = _fetch_students(cursor, _dictfetchall(cursor))
+    _replace(students, registrations, student_id__in=ids)
+    return len(students)
+
+
+def resync_students_safely(student_ids):
+    """resync_students() for write endpoints: a replica failure must not fail the write."""
+    try:
+        resync_students(student_ids)
+    except Exception:
+        logger.exception('DIT legacy replica resync failed for %s', list(student_ids))
@@ -14,3 +14,6 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'emis.settings')
 
 application = get_asgi_application()
+
+# Per-alias connection metrics from the first request on (see emis/db.py)
+import emis.db  # noqa: E402,F401
@@ -0,0 +1,128 @@
+"""
+Database connection reuse and health.
+
+Both aliases (default and dit_legacy) keep their connection open between
+requests for CONN_MAX_AGE seconds and ping it before reuse
+(CONN_HEALTH_CHECKS), so a request no longer pays TCP and authentication
+setup per alias; see DATABASES in settings. This module adds:
+
+- per-alias metrics for the current process: connections opened and
+  requests that started on an already open connection;
+- check_databases(), a timed SELECT 1 per alias behind the health endpoint;
+- closing_connections, for code run in worker threads. Each thread gets
+  its own connections, which the request cycle never closes;
+- run_in_db_thread(), which async views await to run blocking ORM/SQL code
+  on a bounded pool of DB_OFFLOAD_THREADS threads per process. The pool size
+  caps the connections async views hold per alias; each pooled thread keeps
+  its connections persistent and applies CONN_MAX_AGE / health checks
+  around every call, as the request cycle does for the request thread.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+
+_lock = threading.Lock()
+_metrics = {}
+
+
+def _counters(alias):
+    return _metrics.setdefault(alias, {'opened': 0, 'reused': 0})
+
+
+def _count_opened(sender, connection, **kwargs):
+    with _lock:
+        _counters(connection.alias)['opened'] += 1
+
+
+def _count_reused(sender, **kwargs):
+    # Runs after Django's own request_started handler has closed obsolete
+    # or unusable connections, so whatever is still open gets reused
+    with _lock:
+        for connection in connections.all(initialized_only=True):
+            if connection.connection is not None:
+                _counters(connection.alias)['reused'] += 1
+
+
+connection_created.connect(_count_opened, dispatch_uid='emis_db_count_opened')
+request_started.connect(_count_reused, dispatch_uid='emis_db_count_reused')
+
+
+def connection_metrics():
+    """{alias: {'opened', 'reused', 'max_age', 'health_checks'}} for this process."""
+    with _lock:
+        snapshot = {alias: dict(values) for alias, values in _metrics.items()}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        snapshot.setdefault(alias, {'opened': 0, 'reused': 0}).update(
+            max_age=settings_dict.get('CONN_MAX_AGE'),
+            health_checks=settings_dict.get('CONN_HEALTH_CHECKS'),
+        )
+    return snapshot
+
+
+def check_databases(aliases=None):
+    """Round-trip `SELECT 1` on each alias: {alias: {'ok', 'latency_ms'[, 'error']}}."""
+    status = {}
+    for alias in aliases or connections:
+        started = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except Exception as e:
+            status[alias] = {'ok': False, 'error': str(e)}
+            # Don't hand a broken connection to the next request
+            connections[alias].close()
+        else:
+            status[alias] = {'ok': True}
+        status[alias]['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return status
+
+
+def closing_connections(func):
+    """
+    Close the calling thread's connections when `func` returns. Use it on
+    functions submitted to thread pools; never on code running in the
+    request thread, whose persistent connections the request cycle manages.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'DB_OFFLOAD_THREADS', 8),
+    thread_name_prefix='emis-db',
+)
+
+
+def _call_with_connection_checks(func, *args, **kwargs):
+    # The same checks request_started/request_finished run for the request thread
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """
+    Await `func(*args, **kwargs)` on the bounded DB thread pool. Calls from
+    one request can run concurrently (asyncio.gather), so `func` must not
+    rely on the caller's transaction or on state shared with other calls.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, partial(_call_with_connection_checks, func, *args, **kwargs)
+    )
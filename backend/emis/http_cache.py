@@ -0,0 +1,103 @@
+"""
+Conditional-GET support for read-heavy endpoints.
+
+Endpoints declare a cheap ETag function built from either `updated_at`
+maxima or named version counters. The counters live in the cache and are
+bumped by model signals (and by the few bulk `.update()` call sites that
+bypass signals). When the client's If-None-Match matches, Django's
+`condition` decorator answers 304 before the view body — and its
+serializers — run.
+
+Version counters only work when every worker sees the same cache. With a
+process-local backend (LocMemCache, the default) a write bumps the counter
+of the worker that handled it only, so conditional_get skips ETags and the
+other version-keyed caches are bypassed (see shared_cache_enabled).
+
+Cache-Control policies are kept here so nginx (nginx/emis.conf) and the
+views agree on what may be stored by a shared proxy.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+VERSION_KEY_PREFIX = 'http_cache:version:'
+
+# Backends whose counters would not reach other processes
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Cache-Control policies. Only PUBLIC_SHORT responses may be stored by
+# nginx's proxy_cache; everything else is per-user and must be revalidated.
+PRIVATE_REVALIDATE = {'private': True, 'no_cache': True}
+PUBLIC_SHORT = {'public': True, 'max_age': 60}
+
+
+def shared_cache_enabled():
+    """Whether the default cache is shared by all workers, so version counters can be trusted."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def get_version(name):
+    """Return the current value of a named version counter."""
+    key = VERSION_KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a cache flush never reissues an old version
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*names):
+    """Advance one or more version counters, invalidating their ETags."""
+    for name in names:
+        key = VERSION_KEY_PREFIX + name
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def candidate_version_name(candidate_id):
+    """Version counter covering one candidate's enrollments and results."""
+    return f'candidate:{candidate_id}'
+
+
+def make_etag(*parts):
+    """Build a quoted ETag from arbitrary version parts."""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_get(etag_func=None, last_modified_func=None, cache_control=None):
+    """
+    Decorator for GET views: answers If-None-Match / If-Modified-Since with
+    304 using `etag_func` / `last_modified_func` (same signature as the view)
+    and applies a Cache-Control policy to 200 and 304 responses.
+
+    Apply it below @api_view/@permission_classes (or via method_decorator on
+    viewset actions) so authentication and permissions run first. ETags are
+    only used with a shared cache, since they are built from version counters.
+    """
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=etag_func, last_modified_func=last_modified_func
+        )(view_func)
+        local_view = condition(last_modified_func=last_modified_func)(view_func)
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            view = conditional_view if shared_cache_enabled() else local_view
+            response = view(request, *args, **kwargs)
+            if cache_control and request.method in ('GET', 'HEAD') and response.status_code in (200, 304):
+                patch_cache_control(response, **cache_control)
+            return response
+        return _wrapped_view
+    return decorator
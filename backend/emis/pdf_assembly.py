@@ -0,0 +1,309 @@
+"""
+In-memory PDF assembly.
+
+Batch endpoints used to glue documents together by serialising every stage
+to bytes and parsing it again (render -> merge -> impose -> merge). A
+PdfAssembly instead collects page objects from any number of sources into
+one pypdf writer and serialises exactly once, in `to_bytes()`:
+
+- sources are parsed at most once (`read_pages`); pages already held by
+  another assembly are copied across without a bytes round-trip;
+- imposition (`place`) wraps each source page once as a Form XObject and
+  draws it on the sheet through a transformation matrix, so source content
+  streams are never parsed or rewritten and a page placed on several sheets
+  is stored once;
+- resources (fonts, logos, signatures, photos) are keyed by content, so the
+  copies every merged document embeds are written to the output once.
+
+stream_pdf() is the streaming counterpart for long reports: it concatenates
+documents rendered one after another and yields each one's objects as soon
+as it has been read, keeping only object offsets, page numbers and image
+fingerprints between documents. Images repeated across documents are
+written once; other resources are copied per document.
+"""
+import hashlib
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, FloatObject, IndirectObject,
+    NameObject, StreamObject,
+)
+
+# Object numbers stream_pdf() reserves for the page tree and the catalog
+_PAGES_NUMBER, _CATALOG_NUMBER = 1, 2
+
+
+def read_pages(source):
+    """
+    Return the page objects of `source`: PDF bytes, a file-like object, a
+    PdfReader/PdfWriter, a PdfAssembly or an iterable of pages. Empty
+    sources give no pages.
+    """
+    if not source:
+        return []
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    if hasattr(source, 'read'):
+        source = PdfReader(source)
+    if isinstance(source, PdfAssembly):
+        source = source.writer
+    if isinstance(source, (PdfReader, PdfWriter)):
+        return list(source.pages)
+    return list(source)
+
+
+def _feed(digest, obj, visiting):
+    """Hash `obj` and everything it references; streams by their encoded bytes."""
+    if isinstance(obj, IndirectObject):
+        key = (id(obj.pdf), obj.idnum)
+        if key in visiting:
+            digest.update(b'<ref>')
+            return
+        visiting = visiting | {key}
+        obj = obj.get_object()
+    if isinstance(obj, DictionaryObject):
+        digest.update(b'<<')
+        for name in sorted(obj):
+            if name != '/Length':
+                digest.update(name.encode())
+                _feed(digest, obj.raw_get(name), visiting)
+        digest.update(b'>>')
+        if isinstance(obj, StreamObject):
+            # Encoded data: identical images compare equal without decoding
+            digest.update(obj._data)
+    elif isinstance(obj, ArrayObject):
+        digest.update(b'[')
+        for item in obj:
+            _feed(digest, item, visiting)
+        digest.update(b']')
+    else:
+        digest.update(f'{type(obj).__name__}:{obj!r};'.encode())
+
+
+def _matrix(transformation):
+    return ' '.join(f'{value:.6f}' for value in transformation.ctm)
+
+
+class PdfAssembly:
+    """Pages gathered from several documents into one output PDF."""
+
+    def __init__(self):
+        self.writer = PdfWriter()
+        self._shared = {}        # resource content hash -> writer reference
+        self._fingerprints = {}  # (id(source pdf), object number) -> content hash
+        self._sources = {}       # id(source pdf) -> source pdf, kept alive so ids stay unique
+        self._forms = {}         # id(source page) -> (page, Form XObject reference)
+
+    def __len__(self):
+        return len(self.writer.pages)
+
+    @property
+    def pages(self):
+        return self.writer.pages
+
+    def new_page(self, width, height):
+        """Append a blank page (e.g. an imposition sheet) and return it."""
+        return self.writer.add_blank_page(width=width, height=height)
+
+    def append(self, source, pages=None):
+        """
+        Append the pages of `source` (anything read_pages() accepts).
+        `pages` optionally selects them: a slice or an iterable of indexes.
+        Returns the number of pages added.
+        """
+        source_pages = read_pages(source)
+        if isinstance(pages, slice):
+            source_pages = source_pages[pages]
+        elif pages is not None:
+            source_pages = [source_pages[i] for i in pages if i < len(source_pages)]
+        for page in source_pages:
+            # Resources are attached through the shared table instead of
+            # being cloned with the page (depth 1: nested /Resources are kept)
+            added = self.writer.add_page(page, excluded_keys=(1, '/Resources'))
+            added[NameObject('/Resources')] = self._resources(page)
+        return len(source_pages)
+
+    def place(self, sheet, page, transformation):
+        """Draw source `page` onto `sheet` (a page of this assembly) through a pypdf Transformation."""
+        if '/Contents' not in page:
+            return
+        form = self._form(page)
+        if form is None:
+            # Multi-stream content: fall back to merging the operators
+            sheet.merge_transformed_page(page, transformation)
+            return
+
+        resources = sheet.setdefault(NameObject('/Resources'), DictionaryObject())
+        xobjects = resources.setdefault(NameObject('/XObject'), DictionaryObject())
+        name = NameObject(f'/Pg{len(xobjects)}')
+        xobjects[name] = form
+
+        contents = sheet.get_contents()
+        stream = DecodedStreamObject()
+        stream.set_data(
+            (contents.get_data() if contents is not None else b'')
+            + f'q {_matrix(transformation)} cm {name} Do Q\n'.encode()
+        )
+        sheet.replace_contents(stream)
+
+    def to_bytes(self):
+        """Serialise the assembled document."""
+        out = BytesIO()
+        self.writer.write(out)
+        return out.getvalue()
+
+    def _form(self, page):
+        """The source page as a Form XObject in this document (built once per page)."""
+        cached = self._forms.get(id(page))
+        if cached is not None:
+            return cached[1]
+        contents = page.raw_get('/Contents')
+        if not isinstance(contents, IndirectObject) or not isinstance(contents.get_object(), StreamObject):
+            return None
+        # The encoded content stream is copied as-is and becomes the form body
+        form = contents.get_object().clone(self.writer, force_duplicate=True)
+        box = page.cropbox
+        form.update({
+            NameObject('/Type'): NameObject('/XObject'),
+            NameObject('/Subtype'): NameObject('/Form'),
+            NameObject('/BBox'): ArrayObject(
+                FloatObject(value) for value in (box.left, box.bottom, box.right, box.top)
+            ),
+            NameObject('/Resources'): self._resources(page),
+        })
+        self._forms[id(page)] = (page, form.indirect_reference)
+        return form.indirect_reference
+
+    def _resources(self, page):
+        """A resource dictionary for `page` whose entries point at shared objects."""
+        resources = DictionaryObject()
+        source = page.get('/Resources')
+        if source is None:
+            return resources
+        for category, entries in source.get_object().items():
+            entries = entries.get_object()
+            if isinstance(entries, DictionaryObject):
+                resources[NameObject(category)] = DictionaryObject({
+                    NameObject(name): self._share(entries.raw_get(name)) for name in entries
+                })
+            else:
+                resources[NameObject(category)] = entries.clone(self.writer)
+        return resources
+
+    def _share(self, obj):
+        if not isinstance(obj, IndirectObject):
+            return obj.clone(self.writer)
+        key = (id(obj.pdf), obj.idnum)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            digest = hashlib.sha1()
+            _feed(digest, obj, frozenset())
+            fingerprint = self._fingerprints[key] = digest.digest()
+            self._sources[id(obj.pdf)] = obj.pdf
+        shared = self._shared.get(fingerprint)
+        if shared is None:
+            shared = self._shared[fingerprint] = obj.get_object().clone(self.writer).indirect_reference
+        return shared
+
+
+def _renumbered(obj, number_for):
+    """Copy of `obj` whose references point at the output's object numbers."""
+    if isinstance(obj, IndirectObject):
+        return IndirectObject(number_for(obj.idnum), 0, None)
+    if isinstance(obj, StreamObject):
+        copy = obj.__class__()
+        copy._data = obj._data  # Encoded bytes, copied as-is
+    elif isinstance(obj, DictionaryObject):
+        copy = DictionaryObject()
+    elif isinstance(obj, ArrayObject):
+        return ArrayObject(_renumbered(item, number_for) for item in obj)
+    else:
+        return obj
+    for name, value in obj.items():
+        if name != '/Length':
+            copy[name] = _renumbered(value, number_for)
+    return copy
+
+
+def stream_pdf(documents):
+    """
+    Concatenate `documents` (an iterable of PDF bytes, typically rendered
+    lazily) into one PDF, yielded as byte chunks: the objects of each
+    document as soon as it has been read, the page tree and cross-reference
+    table at the end. Only what the pages reference is copied.
+    """
+    offsets = {}
+    kids = []
+    xobjects = {}  # image/form content hash -> output object number
+    position = 0
+
+    def chunk(parts):
+        nonlocal position
+        data = b''.join(parts)
+        position += len(data)
+        return data
+
+    yield chunk([b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'])
+    next_number = _CATALOG_NUMBER + 1
+
+    for document in documents:
+        reader = PdfReader(BytesIO(document))
+        numbers = {}   # source object number -> output object number
+        pending = []   # source references not written yet
+
+        def number_for(source_number):
+            nonlocal next_number
+            if source_number in numbers:
+                return numbers[source_number]
+            fingerprint = None
+            obj = reader.get_object(source_number)
+            if isinstance(obj, StreamObject) and obj.get('/Type') == '/XObject':
+                # Images (logo, photos) repeated across documents are written once
+                digest = hashlib.sha1()
+                _feed(digest, IndirectObject(source_number, 0, reader), frozenset())
+                fingerprint = digest.digest()
+                if fingerprint in xobjects:
+                    numbers[source_number] = xobjects[fingerprint]
+                    return numbers[source_number]
+            numbers[source_number] = next_number
+            if fingerprint is not None:
+                xobjects[fingerprint] = next_number
+            next_number += 1
+            pending.append(source_number)
+            return numbers[source_number]
+
+        page_numbers = {page.indirect_reference.idnum for page in reader.pages}
+        for page in reader.pages:
+            kids.append(number_for(page.indirect_reference.idnum))
+        parts = []
+        while pending:
+            source_number = pending.pop()
+            obj = reader.get_object(source_number)
+            if source_number in page_numbers:
+                # Re-parented onto the output's single page tree
+                obj = DictionaryObject({name: value for name, value in obj.items() if name != '/Parent'})
+                obj[NameObject('/Parent')] = IndirectObject(_PAGES_NUMBER, 0, None)
+            out = BytesIO()
+            out.write(f'{numbers[source_number]} 0 obj\n'.encode())
+            _renumbered(obj, number_for).write_to_stream(out)
+            out.write(b'\nendobj\n')
+            offsets[numbers[source_number]] = position + sum(len(part) for part in parts)
+            parts.append(out.getvalue())
+        yield chunk(parts)
+
+    trailer = [
+        (_PAGES_NUMBER, '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+            ' '.join(f'{kid} 0 R' for kid in kids), len(kids))),
+        (_CATALOG_NUMBER, f'<< /Type /Catalog /Pages {_PAGES_NUMBER} 0 R >>'),
+    ]
+    parts = []
+    for number, body in trailer:
+        offsets[number] = position + sum(len(part) for part in parts)
+        parts.append(f'{number} 0 obj\n{body}\nendobj\n'.encode())
+    xref_at = position + sum(len(part) for part in parts)
+    xref = [f'xref\n0 {next_number}\n0000000000 65535 f \n']
+    xref.extend(f'{offsets[number]:010d} 00000 n \n' for number in range(1, next_number))
+    xref.append(f'trailer\n<< /Size {next_number} /Root {_CATALOG_NUMBER} 0 R >>\nstartxref\n{xref_at}\n%%EOF\n')
+    parts.append(''.join(xref).encode())
+    yield chunk(parts)
@@ -97,6 +97,10 @@ WSGI_APPLICATION = 'emis.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections are persistent and health-checked before reuse (see emis/db.py).
+# Gunicorn's sync workers are single-threaded, so each worker process holds at
+# most one connection per alias: the worker count bounds the pool size and
+# *_CONN_MAX_AGE (seconds) how long a connection is reused before reconnecting.
 DATABASES = {
     'default': {
         'ENGINE': config('DB_ENGINE', default='django.db.backends.sqlite3'),
@@ -105,6 +109,8 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
     ,
     'dit_legacy': {
@@ -114,15 +120,39 @@ DATABASES = {
         'PASSWORD': config('DIT_LEGACY_DB_PASSWORD', default='dit_legacy_pass'),
         'HOST': config('DIT_LEGACY_DB_HOST', default='localhost'),
         'PORT': config('DIT_LEGACY_DB_PORT', default='3306'),
+        'CONN_MAX_AGE': config('DIT_LEGACY_CONN_MAX_AGE', default=300, cast=int),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'charset': 'utf8mb4',
             'init_command': "SET sql_mode='';",
+            # Fail fast when the legacy server is unreachable instead of tying up a worker
+            'connect_timeout': config('DIT_LEGACY_CONNECT_TIMEOUT', default=5, cast=int),
         },
     },
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Test against a file rather than SQLite's in-memory default, so threaded
+    # tests (complaints ticket numbering) get a working connection per thread
+    DATABASES['default']['TEST'] = {'NAME': config('DB_TEST_NAME', default=BASE_DIR / 'test_db.sqlite3')}
+
 DATABASE_ROUTERS = ['dit_legacy.db_router.DitLegacyRouter']
 
+# Async views (verification and legacy lookups) run their queries on a pool of
+# this many threads per process, each holding its own connection per alias.
+DB_OFFLOAD_THREADS = config('DB_OFFLOAD_THREADS', default=8, cast=int)
+
+# Seconds verified Token/Basic credentials are reused (users.authentication).
+# Only used with a shared cache backend; 0 turns the cache off.
+AUTH_CACHE_TTL = config('AUTH_CACHE_TTL', default=60, cast=int)
+
+# Seconds a "select all" selection snapshot (candidates.selection) stays usable.
+SELECTION_SNAPSHOT_TTL = config('SELECTION_SNAPSHOT_TTL', default=60 * 60, cast=int)
+
+# How batched CandidateActivity events are written (candidates.audit): 'inline'
+# inside the transaction, or 'background' after it commits (not crash-safe).
+CANDIDATE_ACTIVITY_WRITER = config('CANDIDATE_ACTIVITY_WRITER', default='inline')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -180,9 +210,9 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'users.authentication.CachedBasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -230,6 +260,18 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='UVTAB EMIS <eimsuvtab@gmail.com>')
 
+# Cache configuration
+# LocMemCache is per-process; in production point this at Redis
+# (CACHE_BACKEND=django.core.cache.backends.redis.RedisCache,
+# CACHE_LOCATION=redis://localhost:6379/1) so invalidation is shared
+# across gunicorn workers.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='emis-default'),
+    }
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
@@ -6,6 +6,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .views import database_health
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     
@@ -26,6 +28,7 @@ urlpatterns = [
     path('api/fees/', include('fees.urls')),
     path('api/verify/', include('verification.urls')),
     path('api/workers-pas/', include('workers_pas.urls')),
+    path('api/health/db/', database_health, name='database-health'),
 ]
 
 # Serve media files in development
@@ -0,0 +1,27 @@
+"""
+Project-level API views.
+"""
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .db import check_databases, connection_metrics
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def database_health(request):
+    """
+    Health of each database alias (SELECT 1 round trip) plus this worker's
+    connection reuse metrics. Responds 503 if any alias is down.
+    """
+    databases = check_databases()
+    metrics = connection_metrics()
+    for alias, health in databases.items():
+        health.update(metrics.get(alias, {}))
+    healthy = all(health['ok'] for health in databases.values())
+    return Response(
+        {'ok': healthy, 'databases': databases},
+        status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
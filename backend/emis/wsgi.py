@@ -14,3 +14,6 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'emis.settings')
 
 application = get_wsgi_application()
+
+# Per-alias connection metrics from the first request on (see emis/db.py)
+import emis.db  # noqa: E402,F401
@@ -58,6 +58,17 @@ class CandidateFee(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Candidate Fee'
         verbose_name_plural = 'Candidate Fees'
+        # Signals upsert one fee per (candidate, series); run `cleanup_fees --fix`
+        # before migrating so existing duplicates don't block the constraint.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['candidate', 'assessment_series'],
+                name='uniq_candidate_fee_per_series',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['assessment_series', 'payment_status'], name='candfee_series_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.candidate.registration_number} - {self.payment_code}"
@@ -19,6 +19,7 @@ import os
 from candidates.models import Candidate
 from assessment_series.models import AssessmentSeries
 from assessment_centers.models import AssessmentCenter
+from users.scope import get_scope
 from .signals import update_center_fee
 from .models import CandidateFee, CenterFee
 from .serializers import CandidateFeeSerializer, CenterFeeSerializer
@@ -41,15 +42,10 @@ class CandidateFeeViewSet(viewsets.ModelViewSet):
             'marked_by', 'approved_by'
         ).all()
         
-        # Filter by center for center representatives
-        if self.request.user.is_authenticated and self.request.user.user_type == 'center_representative':
-            if hasattr(self.request.user, 'center_rep_profile'):
-                center_rep = self.request.user.center_rep_profile
-                queryset = queryset.filter(candidate__assessment_center=center_rep.assessment_center)
-                if center_rep.assessment_center_branch:
-                    queryset = queryset.filter(candidate__assessment_center_branch=center_rep.assessment_center_branch)
-        
-        return queryset
+        # Center representatives only see their center (and branch)
+        return get_scope(self.request).restrict(
+            queryset, 'candidate__assessment_center', 'candidate__assessment_center_branch'
+        )
     
     @action(detail=False, methods=['post'])
     def populate_from_candidates(self, request):
@@ -237,13 +233,8 @@ class CenterFeeViewSet(viewsets.ModelViewSet):
             'assessment_series', 'assessment_center'
         ).all()
         
-        # Filter by center for center representatives
-        if self.request.user.is_authenticated and self.request.user.user_type == 'center_representative':
-            if hasattr(self.request.user, 'center_rep_profile'):
-                center_rep = self.request.user.center_rep_profile
-                queryset = queryset.filter(assessment_center=center_rep.assessment_center)
-        
-        return queryset
+        # Center representatives only see their center; center fees have no branch
+        return get_scope(self.request).restrict(queryset, branch=None)
     
     @action(detail=True, methods=['get'])
     def candidates(self, request, pk=None):
@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration for the EMIS ASGI service.
+
+Serves the async public lookups (/api/verify/..., /api/dit-legacy/search/ and
+/api/dit-legacy/person/<id>/, routed here by nginx) with uvicorn workers: a
+worker keeps serving other requests while a lookup waits on the database,
+whose queries run on DB_OFFLOAD_THREADS threads per worker (emis/db.py).
+
+Everything else stays on the sync service (gunicorn_config.py): under ASGI
+Django runs sync views one at a time per worker, on a single thread.
+"""
+import multiprocessing
+
+# Server socket
+bind = "127.0.0.1:8001"
+backlog = 2048
+
+# Worker processes
+workers = multiprocessing.cpu_count() + 1
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = 60
+keepalive = 5
+
+# Logging
+accesslog = "/var/www/emis/logs/gunicorn/asgi_access.log"
+errorlog = "/var/www/emis/logs/gunicorn/asgi_error.log"
+loglevel = "info"
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+
+# Process naming
+proc_name = "emis_gunicorn_asgi"
+
+# Server mechanics
+daemon = False
+pidfile = "/var/www/emis/backend/gunicorn_asgi.pid"
+user = "deploy"
+group = "deploy"
+tmp_upload_dir = None
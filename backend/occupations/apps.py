@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class OccupationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'occupations'
-    verbose_name = 'Occupations Management'
\ No newline at end of file
+    verbose_name = 'Occupations Management'
+
+    def ready(self):
+        import occupations.signals
@@ -23,7 +23,10 @@ class Sector(models.Model):
         return self.name
     
     def get_occupations_count(self):
-        """Return count of occupations in this sector"""
+        """Return count of occupations in this sector (uses the `occupations_count` annotation when present)"""
+        annotated = getattr(self, 'occupations_count', None)
+        if annotated is not None:
+            return annotated
         return self.occupations.count()
 
 
@@ -112,7 +115,10 @@ class Occupation(models.Model):
         return f"{self.occ_code} - {self.occ_name}"
     
     def get_levels_count(self):
-        """Return count of levels for this occupation"""
+        """Return count of levels for this occupation (uses the `levels_count` annotation when present)"""
+        annotated = getattr(self, 'levels_count', None)
+        if annotated is not None:
+            return annotated
         return self.levels.count()
     
     def is_formal(self):
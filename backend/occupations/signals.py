@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from emis.http_cache import bump_version
+from .models import Occupation, OccupationLevel
+
+
+@receiver([post_save, post_delete], sender=Occupation)
+@receiver([post_save, post_delete], sender=OccupationLevel)
+def bump_occupation_version(sender, instance, **kwargs):
+    """Occupation names and award titles are copied into listings such as the awards list."""
+    bump_version('occupations')
@@ -1,6 +1,9 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from emis.http_cache import PRIVATE_REVALIDATE, conditional_get, make_etag
 from .models import Sector, Occupation, OccupationLevel, OccupationModule, OccupationPaper, ModuleLWA
 from .serializers import (
     SectorSerializer,
@@ -17,7 +20,7 @@ class SectorViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Sector model
     """
-    queryset = Sector.objects.all()
+    queryset = Sector.objects.annotate(occupations_count=Count('occupations')).order_by('name')
     serializer_class = SectorSerializer
     permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access
     filterset_fields = ['is_active']
@@ -27,21 +30,35 @@ class SectorViewSet(viewsets.ModelViewSet):
     def occupations(self, request, pk=None):
         """Get all occupations for a specific sector"""
         sector = self.get_object()
-        occupations = sector.occupations.all()
+        occupations = sector.occupations.select_related('sector').annotate(
+            levels_count=Count('levels')
+        ).order_by('occ_code')
         serializer = OccupationListSerializer(occupations, many=True)
         return Response({
             'sector_id': sector.id,
             'sector_name': sector.name,
-            'occupations_count': occupations.count(),
+            'occupations_count': len(serializer.data),
             'occupations': serializer.data
         })
 
 
+def _occupation_levels_etag(request, pk=None):
+    """Derived from the newest level edit and the level count, so deletes change it too."""
+    row = Occupation.objects.filter(pk=pk).annotate(
+        latest_level=Max('levels__updated_at'), levels_total=Count('levels')
+    ).values_list('updated_at', 'latest_level', 'levels_total').first()
+    if row is None:
+        return None
+    return make_etag('occupation-levels', pk, *row)
+
+
 class OccupationViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Occupation model
     """
-    queryset = Occupation.objects.select_related('sector').prefetch_related('levels').all()
+    queryset = Occupation.objects.select_related('sector').prefetch_related('levels').annotate(
+        levels_count=Count('levels', distinct=True)
+    ).order_by('occ_code')
     serializer_class = OccupationSerializer
     permission_classes = [permissions.AllowAny]  # Temporarily allow unauthenticated access
     # Using FlexiblePagination - allows page_size up to 1000
@@ -57,6 +74,7 @@ class OccupationViewSet(viewsets.ModelViewSet):
         return OccupationSerializer
     
     @action(detail=True, methods=['get'])
+    @method_decorator(conditional_get(etag_func=_occupation_levels_etag, cache_control=PRIVATE_REVALIDATE))
     def levels(self, request, pk=None):
         """Get all levels for a specific occupation"""
         occupation = self.get_object()
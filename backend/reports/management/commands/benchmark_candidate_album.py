@@ -0,0 +1,105 @@
+"""
+Management command to benchmark candidate album rendering.
+
+Renders candidate albums of increasing size for one assessment series
+through the real ReportViewSet action and reports, per album, the number of
+candidates, the number of SQL queries and the render time. The query count
+should stay the same however many candidates an album holds. Each album is
+rendered twice: the first render also fills the pre-sized photo cache
+(reports/photos.py), the second reuses it.
+
+Usage:
+    python manage.py benchmark_candidate_album --series 3
+    python manage.py benchmark_candidate_album --series 3 --category workers_pas --albums 8
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from assessment_series.models import AssessmentSeries
+from candidates.models import Candidate, CandidateEnrollment
+from reports.views import ReportViewSet
+
+
+class Command(BaseCommand):
+    help = 'Measure candidate album queries and render time as the album size grows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--series', type=int, required=True, help='Assessment series id.')
+        parser.add_argument(
+            '--category',
+            choices=[choice for choice, _ in Candidate.REGISTRATION_CATEGORY_CHOICES],
+            default='modular',
+            help='Registration category (default modular).',
+        )
+        parser.add_argument('--albums', type=int, default=5, help='Albums to render, smallest to largest (default 5).')
+
+    def handle(self, *args, **options):
+        if options['albums'] < 1:
+            raise CommandError('--albums must be at least 1.')
+        try:
+            series = AssessmentSeries.objects.get(pk=options['series'])
+        except AssessmentSeries.DoesNotExist:
+            raise CommandError(f"Assessment series {options['series']} not found.")
+
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('A superuser is required to authenticate the benchmark requests.')
+
+        category = options['category']
+        # One album per center / occupation (/ level for formal), as the report is requested
+        group_by = ['candidate__assessment_center', 'candidate__occupation']
+        if category == 'formal':
+            group_by.append('occupation_level')
+        albums = list(
+            CandidateEnrollment.objects.filter(
+                assessment_series=series,
+                is_active=True,
+                candidate__registration_category=category,
+                candidate__is_submitted=True,
+                candidate__verification_status='verified',
+            ).values(*group_by).annotate(size=Count('candidate', distinct=True)).order_by('size')
+        )
+        if not albums:
+            raise CommandError(f'No verified {category} candidates enrolled in {series.name}.')
+        # Spread the picks from the smallest album to the largest
+        step = max(1, (len(albums) - 1) / max(1, options['albums'] - 1))
+        picks = sorted({round(i * step) for i in range(options['albums']) if round(i * step) < len(albums)})
+
+        factory = APIRequestFactory()
+        view = ReportViewSet.as_view({'get': 'candidate_album'})
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Candidate album benchmark: {series.name}, {category}'))
+
+        for album in (albums[i] for i in picks):
+            params = {
+                'assessment_center': album['candidate__assessment_center'],
+                'assessment_series': series.pk,
+                'registration_category': category,
+                'occupation': album['candidate__occupation'],
+            }
+            if album.get('occupation_level'):
+                params['level'] = album['occupation_level']
+
+            timings = []
+            for _ in range(2):
+                request = factory.get('/candidate-album/', params)
+                force_authenticate(request, user=user)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = view(request)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f'Album {params} returned {response.status_code}.')
+
+            self.stdout.write(
+                f"   • {album['size']:>5} candidates: {len(queries):>3} queries, "
+                f"{timings[0]:8.1f} ms first render, {timings[1]:8.1f} ms with cached photos "
+                f"({len(response.content) / 1024:.0f} KiB)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
@@ -0,0 +1,64 @@
+"""
+Pre-sized candidate photos for PDF reports.
+
+Reports print passport photos a few centimetres wide, but uploads are often
+full camera resolution. sized_photo() decodes an upload once, applies its
+EXIF orientation, scales it to the printed size and stores the result as a
+small JPEG under MEDIA_ROOT/report_photos/. Later reports embed that file
+directly: ReportLab passes JPEG files through without re-encoding them.
+
+Cached files are keyed by the upload's name, size and modification time,
+so a replaced photo gets a fresh copy.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from PIL import Image as PILImage, ImageOps
+
+PHOTO_CACHE_DIR = os.path.join(settings.MEDIA_ROOT, 'report_photos')
+
+# Pixels per printed inch for cached photos
+PHOTO_DPI = 300
+
+
+def _cache_path(source, stat, size):
+    key = f'{source}:{stat.st_size}:{stat.st_mtime_ns}:{size[0]}x{size[1]}'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(PHOTO_CACHE_DIR, digest[:2], f'{digest}.jpg')
+
+
+def _render(source, target, size):
+    with PILImage.open(source) as image:
+        try:
+            image = ImageOps.exif_transpose(image)
+        except Exception:
+            pass  # If EXIF handling fails, use image as-is
+        image = image.convert('RGB').resize(size, PILImage.LANCZOS)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    partial = f'{target}.{os.getpid()}.tmp'
+    image.save(partial, format='JPEG', quality=90)
+    os.replace(partial, target)
+
+
+def sized_photo(photo, width, height):
+    """
+    Path of a JPEG copy of `photo` (an ImageFieldFile) scaled to print at
+    width x height points, or None when the candidate has no readable photo.
+    The copy is stretched to the box, as the reports have always drawn photos.
+    """
+    if not photo:
+        return None
+    try:
+        source = photo.path
+        stat = os.stat(source)
+    except (OSError, ValueError, NotImplementedError):
+        return None
+    size = (max(1, round(width / 72 * PHOTO_DPI)), max(1, round(height / 72 * PHOTO_DPI)))
+    target = _cache_path(source, stat, size)
+    if not os.path.exists(target):
+        try:
+            _render(source, target, size)
+        except Exception:
+            return None
+    return target
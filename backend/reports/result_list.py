@@ -0,0 +1,418 @@
+"""
+Result list PDFs, streamed center by center.
+
+The result list for a series and occupation can cover every center in the
+country. Results are read in center order from a chunked database cursor
+and each center's pages are rendered as a separate small PDF the moment the
+center's last result has been read; emis.pdf_assembly.stream_pdf() then
+writes those pages to a spooled temporary file. Peak memory follows the
+largest center rather than the whole series.
+
+The response is only sent once the file is complete, with its length, so a
+failure (or a worker killed at gunicorn's timeout) ends in an error instead
+of a truncated PDF sent with status 200.
+
+Each category has a page builder taking (center, results in that center,
+context) and returning the center's flowables. Every center already starts
+on a new page, so the streamed document paginates exactly as one big build.
+"""
+import os
+import tempfile
+from io import BytesIO
+from itertools import groupby
+
+from django.conf import settings
+from django.http import FileResponse
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from emis.pdf_assembly import stream_pdf
+
+from .photos import sized_photo
+
+# Results fetched per round trip while streaming
+RESULT_CHUNK_SIZE = 2000
+
+# Output kept in memory before the spooled file moves to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def _logo_path():
+    # Note: filename is uvtab-logo.png with hyphen
+    logo_path = os.path.join(settings.STATIC_ROOT or settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
+    if not os.path.exists(logo_path):
+        logo_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
+    return logo_path if os.path.exists(logo_path) else None
+
+
+def _styles(category):
+    styles = getSampleStyleSheet()
+    if category == 'workers_pas':
+        return {
+            'title': ParagraphStyle(
+                'CustomTitle', parent=styles['Heading1'], fontSize=14, textColor=colors.HexColor('#1a1a1a'),
+                spaceAfter=6, alignment=TA_CENTER, fontName='Helvetica-Bold'
+            ),
+            'subtitle': ParagraphStyle(
+                'CustomSubtitle', parent=styles['Normal'], fontSize=10, textColor=colors.HexColor('#1a1a1a'),
+                spaceAfter=12, alignment=TA_CENTER, fontName='Helvetica-Bold'
+            ),
+            'info': ParagraphStyle(
+                'InfoStyle', parent=styles['Normal'], fontSize=9, textColor=colors.HexColor('#1a1a1a'),
+                spaceAfter=3, fontName='Helvetica'
+            ),
+            'section': ParagraphStyle(
+                'SectionStyle', parent=styles['Normal'], fontSize=10, textColor=colors.whitesmoke,
+                alignment=TA_CENTER, fontName='Helvetica-Bold', backColor=colors.HexColor('#4472C4')
+            ),
+            'small': ParagraphStyle('Small', fontSize=6, alignment=TA_CENTER),
+        }
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle', parent=styles['Heading1'], fontSize=14, textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=6, alignment=TA_CENTER, fontName='Helvetica-Bold'
+        ),
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle', parent=styles['Heading2'], fontSize=11, textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=6, alignment=TA_CENTER, fontName='Helvetica-Bold'
+        ),
+        'info': ParagraphStyle(
+            'InfoStyle', parent=styles['Normal'], fontSize=10, textColor=colors.black,
+            spaceAfter=4, fontName='Helvetica'
+        ),
+        'small': ParagraphStyle('Small', fontSize=6, alignment=TA_CENTER),
+        'fail_grade': ParagraphStyle('FailGrade', fontSize=8, alignment=TA_CENTER),
+    }
+
+
+def _header(context):
+    """Contact details either side of the UVTAB logo."""
+    info_style = context['styles']['info']
+    logo_path = context['logo_path']
+    header_table = Table([[
+        Paragraph("P.O.Box 1499<br/>Email: info@uvtab.go.ug", info_style),
+        Image(logo_path, width=0.8*inch, height=0.8*inch) if logo_path else '',
+        Paragraph("Tel: +256392002468", info_style)
+    ]], colWidths=[3*inch, 3*inch, 3*inch])
+    header_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+        ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    return header_table
+
+
+def _photo_cell(candidate, context, width, height):
+    photo_path = sized_photo(candidate.passport_photo, width, height)
+    if photo_path:
+        return Image(photo_path, width=width, height=height)
+    return Paragraph("NO PHOTO", context['styles']['small'])
+
+
+def _title_block(context):
+    styles = context['styles']
+    return [
+        _header(context),
+        Spacer(1, 0.2*inch),
+        Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", styles['title']),
+        Paragraph("PROVISIONAL ASSESSMENT RESULTS FOR", styles['subtitle']),
+        Paragraph(f"ASSESSMENT PERIOD: {context['assessment_series'].name}", styles['subtitle']),
+        Spacer(1, 0.1*inch),
+    ]
+
+
+def modular_pages(center, results, context):
+    """One page per module taken at the center: practical grade and comment per candidate."""
+    info_style = context['styles']['info']
+    elements = []
+    for index, (module, module_results) in enumerate(groupby(results, key=lambda r: r.module)):
+        # Add page break between sections (except first)
+        if index:
+            elements.append(PageBreak())
+        elements.extend(_title_block(context))
+
+        # Category, Occupation, Center, Module info
+        elements.append(Paragraph(f"Category: {context['category_display']}", info_style))
+        elements.append(Paragraph(f"Occupation: {context['occupation'].occ_name}", info_style))
+        elements.append(Paragraph(f"Assessment Center: {center.center_name}", info_style))
+        elements.append(Paragraph(f"Module: {module.module_name} ({module.module_code})", info_style))
+        elements.append(Spacer(1, 0.2*inch))
+
+        table_data = [['S/N', 'Photo', 'Reg No', 'Name', 'Gender', 'Practical', 'Comment']]
+        for idx, result in enumerate(module_results, start=1):
+            candidate = result.candidate
+            table_data.append([
+                str(idx),
+                _photo_cell(candidate, context, 0.6*inch, 0.75*inch),
+                candidate.registration_number or '',
+                candidate.full_name or '',
+                candidate.gender.capitalize() if candidate.gender else '',
+                result.grade or '',
+                result.comment or ''
+            ])
+
+        # Create table with landscape-optimized widths
+        col_widths = [0.4*inch, 0.9*inch, 1.5*inch, 2.8*inch, 0.8*inch, 1.2*inch, 2.5*inch]
+        table = Table(table_data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            # Header styling
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('TOPPADDING', (0, 0), (-1, 0), 8),
+
+            # Body styling
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # S/N center
+            ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Photo center
+            ('ALIGN', (4, 1), (4, -1), 'CENTER'),  # Gender center
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 1), (-1, -1), 4),
+            ('RIGHTPADDING', (0, 1), (-1, -1), 4),
+            ('TOPPADDING', (0, 1), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+
+            # Grid
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')]),
+        ]))
+        elements.append(table)
+    return elements
+
+
+def _is_passing_grade(grade, grade_type):
+    """Pass mark: 50% in theory, 65% in practical."""
+    if not grade:
+        return False
+    grade_upper = grade.upper().strip()
+
+    if grade_type == 'theory':
+        # Theory failing grades (below 50%): C-, D, E
+        failing_grades = ['C-', 'D', 'E', 'F', 'U', 'FAIL']
+    else:  # practical
+        # Practical failing grades (below 65%): B-, C, C-, D, D-, E
+        failing_grades = ['B-', 'C', 'C-', 'D', 'D-', 'E', 'F', 'U', 'FAIL']
+
+    return grade_upper not in failing_grades
+
+
+def formal_pages(center, results, context):
+    """The center's candidates with their theory and practical grades at the level."""
+    info_style = context['styles']['info']
+    fail_style = context['styles']['fail_grade']
+    elements = _title_block(context)
+
+    # Category, Occupation, Level, Center info
+    elements.append(Paragraph(f"Category: {context['category_display']}", info_style))
+    elements.append(Paragraph(f"Occupation: {context['occupation'].occ_name}", info_style))
+    elements.append(Paragraph(f"Level: {context['level'].level_name}", info_style))
+    elements.append(Paragraph(f"Assessment Center: {center.center_name}", info_style))
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Always use simple Theory/Practical columns
+    table_data = [['S/N', 'Photo', 'Reg No', 'Name', 'Gender', 'Theory', 'Practical', 'Comment']]
+
+    # Results arrive ordered by registration number, then module/paper code
+    for idx, (candidate, candidate_results) in enumerate(groupby(results, key=lambda r: r.candidate), start=1):
+        # Results by type, keyed by module or paper code (a later result for a code replaces it)
+        by_type = {'theory': {}, 'practical': {}}
+        for result in candidate_results:
+            if result.exam:
+                key = result.exam.module_code
+            elif result.paper:
+                key = result.paper.paper_code
+            else:
+                key = 'default'
+            if result.type in by_type:
+                by_type[result.type][key] = result
+
+        theory_result = next(iter(by_type['theory'].values()), None)
+        practical_result = next(iter(by_type['practical'].values()), None)
+
+        row = [
+            str(idx),
+            _photo_cell(candidate, context, 0.6*inch, 0.75*inch),
+            candidate.registration_number or '',
+            candidate.full_name or '',
+            candidate.gender.capitalize() if candidate.gender else '',
+        ]
+
+        # Grades - red text if unsuccessful
+        comment_parts = []
+        for grade_type, result in (('theory', theory_result), ('practical', practical_result)):
+            grade = result.grade if result else ''
+            is_pass = _is_passing_grade(grade, grade_type)
+            if grade and not is_pass:
+                row.append(Paragraph(f'<font color="red"><b>{grade}</b></font>', fail_style))
+            else:
+                row.append(grade or '')
+            if result:
+                comment_parts.append(f"{'Successful' if is_pass else 'Not Successful'} ({grade_type.capitalize()})")
+
+        row.append(', '.join(comment_parts))
+        table_data.append(row)
+
+    # Fixed column widths for consistent layout
+    col_widths = [0.4*inch, 0.8*inch, 1.5*inch, 2.5*inch, 0.8*inch, 1.2*inch, 1.2*inch, 2*inch]
+    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        ('TOPPADDING', (0, 0), (-1, 0), 6),
+
+        # Body styling
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # S/N center
+        ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Photo center
+        ('ALIGN', (4, 1), (4, -1), 'CENTER'),  # Gender center
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 7),
+        ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 1), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 1), (-1, -1), 3),
+        ('TOPPADDING', (0, 1), (-1, -1), 3),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 3),
+
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')]),
+    ]))
+    elements.append(table)
+    return elements
+
+
+def workers_pas_pages(center, results, context):
+    """One section per level, module and paper taken at the center."""
+    styles = context['styles']
+    info_style = styles['info']
+    elements = [
+        _header(context),
+        Spacer(1, 0.2*inch),
+        Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", styles['title']),
+        Spacer(1, 0.1*inch),
+        Paragraph("PROVISIONAL ASSESSMENT RESULTS FOR", styles['subtitle']),
+        Spacer(1, 0.1*inch),
+        Paragraph(f"ASSESSMENT PERIOD: {context['assessment_series'].name}", styles['subtitle']),
+        Spacer(1, 0.2*inch),
+    ]
+
+    # Category, Occupation, Level, Center info
+    elements.append(Paragraph(f"<b>Category:</b> {context['category_display']}", info_style))
+    elements.append(Paragraph(f"<b>Occupation:</b> {context['occupation'].occ_name}", info_style))
+    if context['level']:
+        elements.append(Paragraph(f"<b>Level:</b> {context['level'].level_name}", info_style))
+    elements.append(Paragraph(f"<b>Assessment Center:</b> {center.center_name}", info_style))
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Results arrive ordered by level name, module code, paper code, registration number
+    for (level, module, paper), section_results in groupby(results, key=lambda r: (r.level, r.module, r.paper)):
+        # Section header: MODULE - PAPER
+        section_title = f"{module.module_code} - {module.module_name} and {paper.paper_code} - {paper.paper_name}"
+        elements.append(Paragraph(section_title, styles['section']))
+        elements.append(Spacer(1, 0.1*inch))
+
+        table_data = [['S/N', 'Photo', 'Reg No', 'Name', 'Gender', 'Level', 'Practical', 'Comment']]
+        for idx, result in enumerate(section_results, start=1):
+            candidate = result.candidate
+            table_data.append([
+                str(idx),
+                _photo_cell(candidate, context, 0.6*inch, 0.6*inch),
+                candidate.registration_number or '',
+                candidate.full_name or '',
+                candidate.gender.capitalize() if candidate.gender else '',
+                level.level_name if level else '',
+                result.grade or '',
+                result.comment if result.comment else 'Successful'
+            ])
+
+        col_widths = [0.4*inch, 0.8*inch, 1.5*inch, 2.5*inch, 0.8*inch, 1*inch, 0.8*inch, 1.5*inch]
+        table = Table(table_data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            # Header styling
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+
+            # Body styling
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # S/N
+            ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Photo
+            ('ALIGN', (4, 1), (4, -1), 'CENTER'),  # Gender
+            ('ALIGN', (5, 1), (5, -1), 'CENTER'),  # Level
+            ('ALIGN', (6, 1), (6, -1), 'CENTER'),  # Mark
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f0f0')]),
+        ]))
+        elements.append(table)
+        elements.append(Spacer(1, 0.2*inch))
+    return elements
+
+
+PAGE_BUILDERS = {
+    'modular': modular_pages,
+    'formal': formal_pages,
+    'workers_pas': workers_pas_pages,
+}
+
+
+def _render(elements):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), topMargin=0.5*inch, bottomMargin=0.5*inch)
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def _center_documents(results, context):
+    build_pages = PAGE_BUILDERS[context['category']]
+    rows = results.iterator(chunk_size=RESULT_CHUNK_SIZE)
+    for center, center_results in groupby(rows, key=lambda r: r.candidate.assessment_center):
+        yield _render(build_pages(center, list(center_results), context))
+
+
+def result_list_response(results, category, filename, **context):
+    """
+    Build the result list PDF for `results`, a queryset ordered by center
+    first and then as the category's page builder expects (see the view),
+    and return it once complete. `context` carries assessment_series,
+    occupation and level.
+    """
+    from candidates.models import Candidate
+
+    context.update(
+        category=category,
+        category_display=dict(Candidate.REGISTRATION_CATEGORY_CHOICES).get(category, category),
+        styles=_styles(category),
+        logo_path=_logo_path(),
+    )
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        for part in stream_pdf(_center_documents(results, context)):
+            output.write(part)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    # FileResponse closes the file once sent and sets Content-Length from it
+    return FileResponse(output, content_type='application/pdf', as_attachment=True, filename=filename)
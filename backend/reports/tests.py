@@ -0,0 +1,86 @@
+from datetime import date
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from pypdf import PdfReader
+from rest_framework.test import APIClient
+
+from assessment_centers.models import AssessmentCenter
+from assessment_series.models import AssessmentSeries
+from candidates.models import Candidate
+from configurations.models import District
+from occupations.models import Occupation, OccupationLevel, OccupationModule, Sector
+from results.models import ModularResult
+
+from . import result_list
+
+
+class ResultListResponseTests(TestCase):
+    """The result list is only sent once the whole PDF has been built."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        cls.series = AssessmentSeries.objects.create(
+            name='Nov 2025', start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+            date_of_release=date(2025, 12, 15), results_released=True,
+        )
+        sector = Sector.objects.create(name='Building')
+        cls.occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector, has_modular=True,
+        )
+        level = OccupationLevel.objects.create(
+            occupation=cls.occupation, level_name='Level 1', structure_type='modules',
+        )
+        module = OccupationModule.objects.create(
+            module_code='MVM-M1', module_name='Module 1', occupation=cls.occupation, level=level, credit_units=4,
+        )
+        for number in (1, 2, 3):
+            center = AssessmentCenter.objects.create(
+                center_number=f'UVT00{number}', center_name=f'Center {number}', assessment_category='vti',
+                district=district,
+            )
+            candidate = Candidate.objects.create(
+                full_name=f'Candidate {number}', date_of_birth=date(2000, 1, 1), gender='male',
+                contact='0700000000', district=district, assessment_center=center, entry_year=2025, intake='M',
+                registration_category='modular', occupation=cls.occupation,
+            )
+            ModularResult.objects.create(
+                candidate=candidate, assessment_series=cls.series, module=module, type='practical', mark=80,
+            )
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _get(self):
+        return self.client.get('/api/reports/result-list/', {
+            'assessment_series': self.series.pk, 'registration_category': 'modular', 'occupation': self.occupation.pk,
+        })
+
+    def test_complete_pdf_is_sent_with_its_length(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        content = b''.join(response.streaming_content)
+        self.assertEqual(int(response['Content-Length']), len(content))
+        # One page per center
+        self.assertEqual(len(PdfReader(BytesIO(content)).pages), 3)
+
+    def test_failure_part_way_raises_instead_of_sending_part_of_the_pdf(self):
+        build_pages = result_list.modular_pages
+        built = []
+
+        def fail_on_second_center(center, results, context):
+            built.append(center)
+            if len(built) == 2:
+                raise RuntimeError('render failed')
+            return build_pages(center, results, context)
+
+        with mock.patch.dict(result_list.PAGE_BUILDERS, modular=fail_on_second_center):
+            with self.assertRaises(RuntimeError):
+                self._get()
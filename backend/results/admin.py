@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ModularResult, FormalResult, WorkersPasResult
+from .models import ModularResult, FormalResult, WorkersPasResult, ResultProgress
 
 
 @admin.register(ModularResult)
@@ -241,3 +241,26 @@ class WorkersPasResultAdmin(admin.ModelAdmin):
             'paper',
             'entered_by'
         )
+
+
+@admin.register(ResultProgress)
+class ResultProgressAdmin(admin.ModelAdmin):
+    """Read-only view of the progress index (maintained by result signals)"""
+    list_display = [
+        'candidate',
+        'item_key',
+        'attempts',
+        'best_mark',
+        'is_passed',
+        'has_failed',
+        'updated_at'
+    ]
+    list_filter = ['category', 'is_passed', 'has_failed']
+    search_fields = ['candidate__registration_number', 'item_key']
+    readonly_fields = [field.name for field in ResultProgress._meta.fields]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('candidate')
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class ResultsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'results'
-    verbose_name = 'Results Management'
\ No newline at end of file
+    verbose_name = 'Results Management'
+
+    def ready(self):
+        import results.signals
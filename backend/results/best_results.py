@@ -0,0 +1,220 @@
+"""
+Best result per assessed item, for many candidates at once.
+
+A candidate may sit the same module, exam or paper several times. Transcripts
+and awards count one result per item and type: a passing attempt beats a
+failing one, otherwise the higher mark wins (then the most recent series).
+
+best_results() selects those rows for a whole batch of candidates in one
+query, using ROW_NUMBER() OVER (PARTITION BY candidate, item, type) where the
+database supports window functions and a single streaming pass over the
+attempts otherwise. modular_standings() / formal_standings() add the
+transcript qualification checks on top, with one extra query for the credit
+units each candidate needs.
+"""
+from datetime import date
+
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When, Window
+from django.db.models.functions import RowNumber
+
+from occupations.models import OccupationModule, OccupationPaper
+
+from .models import ModularResult, FormalResult
+
+# Fields identifying the assessed item, per result model (the type is always added)
+ITEM_FIELDS = {
+    ModularResult: ('module_id',),
+    FormalResult: ('level_id', 'exam_id', 'paper_id'),
+}
+
+
+def _passing():
+    """SQL equivalent of the result models' is_passing (65% practical, 50% theory)."""
+    return Case(
+        When(type='practical', mark__gte=65, then=Value(1)),
+        When(~Q(type='practical'), mark__gte=50, then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _rank(result):
+    """Python equivalent of the window ordering: the highest key is the best attempt."""
+    series_date = result.assessment_series.start_date
+    return (
+        result.is_passing,
+        result.mark is not None, result.mark or 0,
+        series_date is not None, series_date or date.min,
+        result.pk,
+    )
+
+
+def _windowed(queryset, partition):
+    return queryset.annotate(
+        best_rank=Window(
+            RowNumber(),
+            partition_by=[F(field) for field in partition],
+            order_by=[
+                _passing().desc(),
+                F('mark').desc(nulls_last=True),
+                F('assessment_series__start_date').desc(nulls_last=True),
+                F('pk').desc(),
+            ],
+        )
+    ).filter(best_rank=1)
+
+
+def _reduced(queryset, partition):
+    """Fallback: stream the attempts once, keeping the best per partition in query order."""
+    best = {}
+    for position, result in enumerate(queryset.iterator(chunk_size=2000)):
+        key = tuple(getattr(result, field) for field in partition)
+        current = best.get(key)
+        if current is None or _rank(result) > _rank(current[1]):
+            best[key] = (position, result)
+    return [result for _, result in sorted(best.values(), key=lambda entry: entry[0])]
+
+
+def best_results(model, candidate_ids, order_by=None, select_related=()):
+    """
+    Best ModularResult/FormalResult per (candidate, item, type) for the given
+    candidates: {candidate_id: [result, ...]}, every requested candidate
+    present. Each list follows `order_by` (the model's ordering by default).
+    """
+    candidate_ids = list(candidate_ids)
+    partition = ('candidate_id',) + ITEM_FIELDS[model] + ('type',)
+    queryset = model.objects.filter(candidate_id__in=candidate_ids).select_related(
+        'assessment_series', *select_related
+    ).order_by(*(order_by or model._meta.ordering), 'pk')
+
+    if connections[queryset.db].features.supports_over_clause:
+        rows = _windowed(queryset, partition)
+    else:
+        rows = _reduced(queryset, partition)
+
+    grouped = {candidate_id: [] for candidate_id in candidate_ids}
+    for result in rows:
+        grouped[result.candidate_id].append(result)
+    return grouped
+
+
+class Standing:
+    """A candidate's best results and whether they qualify for a transcript/award."""
+
+    def __init__(self, results, qualifies, message, earned_units=0, required_units=0, level=None):
+        self.results = results
+        self.qualifies = qualifies
+        self.message = message
+        self.earned_units = earned_units
+        self.required_units = required_units
+        self.level = level
+
+
+def _modular_standing(results, required_units):
+    if not results:
+        return Standing(results, False, "No results found", required_units=required_units)
+    # Transcripts list modules, so theory/practical attempts collapse to one row per module
+    per_module = {}
+    for result in results:
+        current = per_module.get(result.module_id)
+        if current is None or _rank(result) > _rank(current):
+            per_module[result.module_id] = result
+    results = [result for result in results if per_module[result.module_id] is result]
+
+    earned_units = sum(r.module.credit_units or 0 for r in results if r.is_passing)
+    failed = [r.module.module_name for r in results if not r.is_passing]
+    if failed:
+        return Standing(
+            results, False, f"Failed modules: {', '.join(failed)}", earned_units, required_units,
+        )
+    return Standing(results, True, "Qualified", earned_units, required_units)
+
+
+def modular_standings(candidate_ids):
+    """
+    Transcript standing of modular candidates: {candidate_id: Standing} with
+    one best result per module. Qualifies when every module is passed;
+    required units are the credit units of the candidate's occupation.
+    """
+    candidate_ids = list(candidate_ids)
+    grouped = best_results(
+        ModularResult, candidate_ids,
+        order_by=('assessment_series', 'module'), select_related=('module',),
+    )
+    required = dict(
+        OccupationModule.objects.filter(occupation__candidates__id__in=candidate_ids)
+        .values_list('occupation__candidates__id')
+        .annotate(total=Sum('credit_units'))
+    )
+    return {
+        candidate_id: _modular_standing(results, required.get(candidate_id) or 0)
+        for candidate_id, results in grouped.items()
+    }
+
+
+def _formal_standing(results, required_by_level):
+    if not results:
+        return Standing(results, False, "No results found")
+    # Level of the most recent result
+    level = results[0].level
+    if not level:
+        return Standing(results, False, "No level found")
+
+    if level.structure_type == 'modules':
+        # Formal candidates on module-based levels need Theory and Practical passed
+        passed_types = {r.type for r in results if r.is_passing}
+        missing = [label for kind, label in (('theory', 'Theory'), ('practical', 'Practical'))
+                   if kind not in passed_types]
+        if missing:
+            return Standing(results, False, f"Missing successful results for: {', '.join(missing)}", level=level)
+        return Standing(results, True, "Qualified", level=level)
+
+    earned_units = sum(r.paper.credit_units for r in results if r.is_passing and r.paper and r.paper.credit_units)
+    required_units = required_by_level.get(level.id) or 0
+    if earned_units < required_units:
+        return Standing(
+            results, False,
+            f"Earned credit units ({earned_units}) are less than required ({required_units})",
+            earned_units, required_units, level,
+        )
+    return Standing(results, True, "Qualified", earned_units, required_units, level)
+
+
+def formal_standings(candidate_ids):
+    """
+    Transcript standing of formal candidates: {candidate_id: Standing}, best
+    results newest series first. Module-based levels need Theory and
+    Practical passed; paper-based levels need the level's active papers'
+    credit units.
+    """
+    grouped = best_results(
+        FormalResult, candidate_ids,
+        order_by=('-assessment_series__start_date',), select_related=('level', 'paper', 'exam', 'exam__level'),
+    )
+    level_ids = {results[0].level_id for results in grouped.values() if results}
+    required_by_level = dict(
+        OccupationPaper.objects.filter(level_id__in=level_ids, is_active=True)
+        .values_list('level_id')
+        .annotate(total=Sum('credit_units'))
+    )
+    return {
+        candidate_id: _formal_standing(results, required_by_level)
+        for candidate_id, results in grouped.items()
+    }
+
+
+def standings_for(candidates):
+    """
+    Standings for candidate instances in at most two batches: modular
+    candidates by module, everyone else by their formal results.
+    """
+    modular_ids, formal_ids = [], []
+    for candidate in candidates:
+        (modular_ids if candidate.registration_category == 'modular' else formal_ids).append(candidate.pk)
+    standings = {}
+    if modular_ids:
+        standings.update(modular_standings(modular_ids))
+    if formal_ids:
+        standings.update(formal_standings(formal_ids))
+    return standings
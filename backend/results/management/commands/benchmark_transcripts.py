@@ -0,0 +1,109 @@
+"""
+Management command to micro-benchmark transcript PDF rendering.
+
+Renders transcripts through the real viewset actions in this single process
+(one core) and reports renders per second, so the effect of changes to the
+transcript template layer can be tracked between releases. The first render
+per category is reported separately: it pays for the per-process template
+work (styles, logo/signature image objects).
+
+Usage:
+    python manage.py benchmark_transcripts                        # All categories, 50 renders each
+    python manage.py benchmark_transcripts --category formal
+    python manage.py benchmark_transcripts --candidate 42 --iterations 200
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from candidates.models import Candidate
+from results.models import ModularResult, FormalResult, WorkersPasResult
+from results.views import ModularResultViewSet, FormalResultViewSet, WorkersPasResultViewSet
+
+CATEGORIES = {
+    'modular': (ModularResultViewSet, ModularResult),
+    'formal': (FormalResultViewSet, FormalResult),
+    'workers_pas': (WorkersPasResultViewSet, WorkersPasResult),
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure transcript PDF renders per second (single process / core).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--category',
+            choices=sorted(CATEGORIES),
+            action='append',
+            help='Only benchmark this registration category (may be repeated).',
+        )
+        parser.add_argument(
+            '--candidate',
+            type=int,
+            help='Candidate id to render (defaults to the first candidate with results in each category).',
+        )
+        parser.add_argument('--iterations', type=int, default=50, help='Timed renders per category (default 50).')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1.')
+
+        user = get_user_model().objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('A superuser is required to authenticate the benchmark requests.')
+
+        categories = options['category'] or list(CATEGORIES)
+        if options['candidate']:
+            try:
+                candidate = Candidate.objects.get(pk=options['candidate'])
+            except Candidate.DoesNotExist:
+                raise CommandError(f"Candidate {options['candidate']} not found.")
+            categories = [candidate.registration_category]
+            if candidate.registration_category not in CATEGORIES:
+                raise CommandError(f'Unsupported registration category: {candidate.registration_category}')
+
+        factory = APIRequestFactory()
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Transcript render benchmark ({options['iterations']} renders per category)"
+        ))
+
+        for category in categories:
+            viewset, result_model = CATEGORIES[category]
+            candidate_id = options['candidate'] or result_model.objects.values_list(
+                'candidate_id', flat=True
+            ).order_by('candidate_id').first()
+            if candidate_id is None:
+                self.stdout.write(self.style.WARNING(f'   • {category}: no results to render, skipped'))
+                continue
+
+            view = viewset.as_view({'get': 'transcript_pdf'})
+
+            def render():
+                request = factory.get('/transcript-pdf/', {'candidate_id': candidate_id})
+                force_authenticate(request, user=user)
+                response = view(request)
+                if response.status_code != 200:
+                    raise CommandError(
+                        f'{category} transcript for candidate {candidate_id} returned {response.status_code}.'
+                    )
+                return len(response.content)
+
+            started = time.perf_counter()
+            size = render()
+            first_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            for _ in range(options['iterations']):
+                render()
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"   • {category:<12} candidate {candidate_id}: "
+                f"{options['iterations'] / elapsed:.1f} renders/s, "
+                f"{elapsed / options['iterations'] * 1000:.1f} ms/render "
+                f"(first {first_ms:.1f} ms, {size / 1024:.0f} KiB)"
+            )
+
+        self.stdout.write(self.style.SUCCESS('Done.'))
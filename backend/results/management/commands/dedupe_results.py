@@ -0,0 +1,120 @@
+"""
+Management command to remove duplicate result rows before the unique
+constraints on the result tables are migrated in.
+
+Usage:
+    python manage.py dedupe_results              # Dry-run: shows what would be removed
+    python manage.py dedupe_results --fix        # Actually delete duplicates
+    python manage.py dedupe_results --fix -v 2   # Verbose output
+
+Within each duplicate group the most recently updated row is kept.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from results.models import ModularResult, FormalResult, WorkersPasResult
+
+
+# (label, model, key fields, extra filter) — one entry per unique constraint
+DUPLICATE_KEYS = [
+    (
+        'Modular results',
+        ModularResult,
+        ['candidate_id', 'assessment_series_id', 'module_id', 'type'],
+        {},
+    ),
+    (
+        'Formal results (module-based)',
+        FormalResult,
+        ['candidate_id', 'assessment_series_id', 'level_id', 'exam_id', 'type'],
+        {'exam__isnull': False},
+    ),
+    (
+        'Formal results (paper-based)',
+        FormalResult,
+        ['candidate_id', 'assessment_series_id', 'level_id', 'paper_id', 'type'],
+        {'paper__isnull': False},
+    ),
+    (
+        'Formal results (level-wide)',
+        FormalResult,
+        ['candidate_id', 'assessment_series_id', 'level_id', 'type'],
+        {'exam__isnull': True, 'paper__isnull': True},
+    ),
+    (
+        "Worker's PAS results",
+        WorkersPasResult,
+        ['candidate_id', 'assessment_series_id', 'paper_id'],
+        {},
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = 'Remove duplicate result rows (keeps the most recently updated row per key).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            default=False,
+            help='Actually delete duplicates. Without this flag, only a dry-run report is printed.',
+        )
+
+    def handle(self, *args, **options):
+        fix = options['fix']
+        verbosity = options['verbosity']
+
+        self.stdout.write(self.style.NOTICE(
+            f"{'🔧 FIX MODE' if fix else '👀 DRY-RUN MODE (use --fix to apply changes)'}"
+        ))
+        self.stdout.write('')
+
+        total_removed = 0
+        for index, (label, model, key_fields, extra_filter) in enumerate(DUPLICATE_KEYS, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{index}. {label}'))
+
+            dupes = (
+                model.objects
+                .filter(**extra_filter)
+                .values(*key_fields)
+                .annotate(cnt=Count('id'))
+                .filter(cnt__gt=1)
+            )
+
+            group_count = 0
+            extra_ids = []
+            for dupe in dupes:
+                group_count += 1
+                key = {field: dupe[field] for field in key_fields}
+                ids = list(
+                    model.objects.filter(**extra_filter, **key)
+                    .order_by('-updated_at', '-id')
+                    .values_list('id', flat=True)
+                )
+                extra_ids.extend(ids[1:])
+                if verbosity >= 2:
+                    self.stdout.write(f'     • {key}: keeping id={ids[0]}, removing {ids[1:]}')
+
+            if not group_count:
+                self.stdout.write(self.style.SUCCESS('   ✓ No duplicates found'))
+                self.stdout.write('')
+                continue
+
+            self.stdout.write(self.style.WARNING(
+                f'   Found {group_count} duplicate group(s), {len(extra_ids)} extra row(s)'
+            ))
+            if fix:
+                with transaction.atomic():
+                    deleted, _ = model.objects.filter(id__in=extra_ids).delete()
+                total_removed += deleted
+                self.stdout.write(self.style.SUCCESS(f'   ✓ Deleted {deleted} duplicate row(s)'))
+            else:
+                self.stdout.write('   (no changes — dry run)')
+            self.stdout.write('')
+
+        if fix:
+            self.stdout.write(self.style.SUCCESS(f'Done. Removed {total_removed} row(s).'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Done.'))
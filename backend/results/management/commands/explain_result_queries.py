@@ -0,0 +1,103 @@
+"""
+Management command to capture query plans for the hot result/enrollment/fee
+lookups, so plans can be compared before and after index changes.
+
+Usage:
+    python manage.py explain_result_queries                      # Uses the latest series
+    python manage.py explain_result_queries --series 12
+    python manage.py explain_result_queries --analyze            # EXPLAIN ANALYZE (Postgres)
+    python manage.py explain_result_queries > plans_after.txt    # Save a capture
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+
+from assessment_series.models import AssessmentSeries
+from candidates.models import Candidate, CandidateEnrollment
+from fees.models import CandidateFee
+from results.models import ModularResult, FormalResult, WorkersPasResult
+
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN output for the hot result, enrollment and fee queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--series', type=int, help='Assessment series id (defaults to the latest series)')
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            default=False,
+            help='Run EXPLAIN ANALYZE (PostgreSQL only — executes the queries).',
+        )
+
+    def handle(self, *args, **options):
+        if options['series']:
+            series = AssessmentSeries.objects.filter(pk=options['series']).first()
+        else:
+            series = AssessmentSeries.objects.order_by('-start_date').first()
+        if not series:
+            raise CommandError('No assessment series found')
+
+        candidate = Candidate.objects.filter(formal_results__assessment_series=series).first()
+        candidate_id = candidate.id if candidate else 0
+        level_id = (
+            FormalResult.objects.filter(candidate_id=candidate_id)
+            .values_list('level_id', flat=True).first()
+        ) or 0
+
+        queries = [
+            (
+                'Formal upsert lookup (results upload / update_or_create)',
+                FormalResult.objects.filter(
+                    candidate_id=candidate_id, assessment_series=series,
+                    level_id=level_id, paper__isnull=False, type='theory',
+                ),
+            ),
+            (
+                'Formal results per candidate + level (formal_candidate_qualifies, retakes)',
+                FormalResult.objects.filter(candidate_id=candidate_id, level_id=level_id),
+            ),
+            (
+                'Modular pass counts per series (stats)',
+                ModularResult.objects.filter(assessment_series=series)
+                .values('assessment_series_id')
+                .annotate(total=Count('id'), passing=Count('id', filter=Q(mark__gte=65))),
+            ),
+            (
+                'Formal theory pass counts per series (stats)',
+                FormalResult.objects.filter(assessment_series=series, type='theory')
+                .values('assessment_series_id')
+                .annotate(total=Count('id'), passing=Count('id', filter=Q(mark__gte=50))),
+            ),
+            (
+                "Worker's PAS passing results per series (awards)",
+                WorkersPasResult.objects.filter(assessment_series=series, mark__gte=65),
+            ),
+            (
+                'Active enrollments per series (reports)',
+                CandidateEnrollment.objects.filter(assessment_series=series, is_active=True),
+            ),
+            (
+                'Enrollment per candidate + series (fees signals, de-enroll)',
+                CandidateEnrollment.objects.filter(candidate_id=candidate_id, assessment_series=series),
+            ),
+            (
+                'Candidate fee per candidate + series (fees signals)',
+                CandidateFee.objects.filter(candidate_id=candidate_id, assessment_series=series),
+            ),
+        ]
+
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL')
+            explain_options = {'analyze': True, 'buffers': True}
+
+        self.stdout.write(self.style.NOTICE(
+            f'Backend: {connection.vendor} | Series: {series.name} (id={series.id})'
+        ))
+        self.stdout.write('')
+        for index, (label, queryset) in enumerate(queries, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{index}. {label}'))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
@@ -0,0 +1,48 @@
+"""
+Management command to (re)build the candidate progress index from the
+result tables. Run once after the ResultProgress migration, and any time the
+index is suspected to have drifted (e.g. after raw SQL fixes to results).
+
+Usage:
+    python manage.py rebuild_result_progress                  # All candidates with results
+    python manage.py rebuild_result_progress --candidate 42   # A single candidate
+"""
+from django.core.management.base import BaseCommand
+
+from results.models import ModularResult, FormalResult, WorkersPasResult
+from results.progress import rebuild_candidate_progress
+
+CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ResultProgress index from the result tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--candidate',
+            type=int,
+            action='append',
+            help='Only rebuild this candidate id (may be repeated).',
+        )
+
+    def handle(self, *args, **options):
+        candidate_ids = options['candidate']
+        if not candidate_ids:
+            candidate_ids = set()
+            for model in (ModularResult, FormalResult, WorkersPasResult):
+                candidate_ids.update(model.objects.values_list('candidate_id', flat=True).distinct())
+        candidate_ids = sorted(candidate_ids)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Rebuilding progress for {len(candidate_ids)} candidate(s)'
+        ))
+
+        total_rows = 0
+        for start in range(0, len(candidate_ids), CHUNK_SIZE):
+            chunk = candidate_ids[start:start + CHUNK_SIZE]
+            total_rows += rebuild_candidate_progress(chunk)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'   • {start + len(chunk)}/{len(candidate_ids)} candidates')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. Wrote {total_rows} progress row(s).'))
@@ -4,7 +4,6 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated, BasePermission
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.http import HttpResponse
-from django.db import transaction
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
@@ -16,7 +15,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from io import BytesIO
 
-from candidates.models import EnrollmentModule, Candidate, CandidateEnrollment, EnrollmentPaper, CandidateActivity
+from candidates import audit
+from candidates.models import EnrollmentModule, Candidate, CandidateEnrollment, EnrollmentPaper
 from occupations.models import OccupationModule, OccupationLevel, OccupationPaper
 from assessment_series.models import AssessmentSeries
 from results.models import ModularResult
@@ -474,7 +474,7 @@ class MarksheetViewSet(viewsets.ViewSet):
         updated_count = 0
         skipped_count = 0
         
-        with transaction.atomic():
+        with audit.batch():
             for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
                 if not row[1]:  # Skip empty rows
                     continue
@@ -556,11 +556,9 @@ class MarksheetViewSet(viewsets.ViewSet):
                 updated_count += 1
                 
                 # Log activity for this candidate
-                actor = request.user if request.user and request.user.is_authenticated else None
-                CandidateActivity.objects.create(
-                    candidate=candidate,
-                    actor=actor,
-                    action='modular_marks_uploaded',
+                audit.record(
+                    candidate,
+                    'modular_marks_uploaded',
                     description=f'Marks uploaded via Excel for module {module.module_code}',
                     details={
                         'module_id': module.id,
@@ -569,7 +567,8 @@ class MarksheetViewSet(viewsets.ViewSet):
                         'assessment_series_name': assessment_series.name,
                         'mark': float(practical_mark),
                         'upload_method': 'excel'
-                    }
+                    },
+                    actor=audit.actor_of(request),
                 )
         
         # Prepare response
@@ -650,7 +649,7 @@ class MarksheetViewSet(viewsets.ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            with transaction.atomic():
+            with audit.batch():
                 for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
                     if not row[1]:  # Skip empty rows
                         continue
@@ -704,16 +703,18 @@ class MarksheetViewSet(viewsets.ViewSet):
                                     candidate=candidate,
                                     assessment_series=assessment_series,
                                     level=level,
+                                    exam=None,
+                                    paper=None,
                                     type='theory',
                                     defaults=defaults_data
                                 )
                                 updated_count += 1
                                 # Log activity
-                                actor = request.user if request.user and request.user.is_authenticated else None
-                                CandidateActivity.objects.create(
-                                    candidate=candidate, actor=actor, action='formal_marks_uploaded',
+                                audit.record(
+                                    candidate, 'formal_marks_uploaded',
                                     description=f'Theory marks uploaded via Excel for level {level.level_name}',
-                                    details={'level_id': level.id, 'type': 'theory', 'mark': theory_mark, 'upload_method': 'excel'}
+                                    details={'level_id': level.id, 'type': 'theory', 'mark': theory_mark, 'upload_method': 'excel'},
+                                    actor=audit.actor_of(request),
                                 )
                         except (ValueError, TypeError):
                             errors.append(f'Row {row_num}: Invalid theory mark value "{theory_mark}"')
@@ -732,16 +733,18 @@ class MarksheetViewSet(viewsets.ViewSet):
                                     candidate=candidate,
                                     assessment_series=assessment_series,
                                     level=level,
+                                    exam=None,
+                                    paper=None,
                                     type='practical',
                                     defaults=defaults_data
                                 )
                                 updated_count += 1
                                 # Log activity
-                                actor = request.user if request.user and request.user.is_authenticated else None
-                                CandidateActivity.objects.create(
-                                    candidate=candidate, actor=actor, action='formal_marks_uploaded',
+                                audit.record(
+                                    candidate, 'formal_marks_uploaded',
                                     description=f'Practical marks uploaded via Excel for level {level.level_name}',
-                                    details={'level_id': level.id, 'type': 'practical', 'mark': practical_mark, 'upload_method': 'excel'}
+                                    details={'level_id': level.id, 'type': 'practical', 'mark': practical_mark, 'upload_method': 'excel'},
+                                    actor=audit.actor_of(request),
                                 )
                         except (ValueError, TypeError):
                             errors.append(f'Row {row_num}: Invalid practical mark value "{practical_mark}"')
@@ -773,7 +776,7 @@ class MarksheetViewSet(viewsets.ViewSet):
                 if header:
                     paper_columns[header] = idx
             
-            with transaction.atomic():
+            with audit.batch():
                 for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
                     if not row[1]:  # Skip empty rows
                         continue
@@ -842,11 +845,11 @@ class MarksheetViewSet(viewsets.ViewSet):
                     if row_updated:
                         updated_count += 1
                         # Log activity for paper-based upload
-                        actor = request.user if request.user and request.user.is_authenticated else None
-                        CandidateActivity.objects.create(
-                            candidate=candidate, actor=actor, action='formal_marks_uploaded',
+                        audit.record(
+                            candidate, 'formal_marks_uploaded',
                             description=f'Marks uploaded via Excel for level {level.level_name}',
-                            details={'level_id': level.id, 'upload_method': 'excel'}
+                            details={'level_id': level.id, 'upload_method': 'excel'},
+                            actor=audit.actor_of(request),
                         )
         
         # Prepare response
@@ -937,7 +940,7 @@ class MarksheetViewSet(viewsets.ViewSet):
         updated_count = 0
         skipped_count = 0
         
-        with transaction.atomic():
+        with audit.batch():
             for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
                 if not row[1]:  # Skip empty rows
                     continue
@@ -1026,11 +1029,11 @@ class MarksheetViewSet(viewsets.ViewSet):
                 if row_updated:
                     updated_count += 1
                     # Log activity
-                    actor = request.user if request.user and request.user.is_authenticated else None
-                    CandidateActivity.objects.create(
-                        candidate=candidate, actor=actor, action='workers_pas_marks_uploaded',
+                    audit.record(
+                        candidate, 'workers_pas_marks_uploaded',
                         description=f'Marks uploaded via Excel for level {level.level_name}',
-                        details={'level_id': level.id, 'upload_method': 'excel'}
+                        details={'level_id': level.id, 'upload_method': 'excel'},
+                        actor=audit.actor_of(request),
                     )
                 elif not any(f'Row {row_num}:' in err for err in errors):
                     skipped_count += 1
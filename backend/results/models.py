@@ -69,6 +69,12 @@ class ModularResult(models.Model):
         verbose_name = 'Modular Result'
         verbose_name_plural = 'Modular Results'
         unique_together = ['candidate', 'assessment_series', 'module', 'type']
+        indexes = [
+            # Stats/awards: per-series pass counts filtered on mark thresholds
+            models.Index(fields=['assessment_series', 'type', 'mark'], name='modres_series_type_mark_idx'),
+            # Transcripts/retakes: all results for a candidate and module
+            models.Index(fields=['candidate', 'module'], name='modres_cand_module_idx'),
+        ]
     
     def __str__(self):
         return f"{self.candidate.full_name} - {self.module.module_name} ({self.type})"
@@ -232,6 +238,32 @@ class FormalResult(models.Model):
         ordering = ['assessment_series', 'level']
         verbose_name = 'Formal Result'
         verbose_name_plural = 'Formal Results'
+        constraints = [
+            # One result per exam/paper and type within a series. exam and paper are
+            # mutually exclusive, so each structure gets its own partial constraint;
+            # level-wide marks (marksheet upload) have neither.
+            models.UniqueConstraint(
+                fields=['candidate', 'assessment_series', 'level', 'exam', 'type'],
+                condition=models.Q(exam__isnull=False),
+                name='uniq_formal_result_exam',
+            ),
+            models.UniqueConstraint(
+                fields=['candidate', 'assessment_series', 'level', 'paper', 'type'],
+                condition=models.Q(paper__isnull=False),
+                name='uniq_formal_result_paper',
+            ),
+            models.UniqueConstraint(
+                fields=['candidate', 'assessment_series', 'level', 'type'],
+                condition=models.Q(exam__isnull=True, paper__isnull=True),
+                name='uniq_formal_result_level',
+            ),
+        ]
+        indexes = [
+            # formal_candidate_qualifies / retake checks: candidate results per level
+            models.Index(fields=['candidate', 'level', 'type'], name='formres_cand_level_type_idx'),
+            # Stats/awards: per-series pass counts filtered on mark thresholds
+            models.Index(fields=['assessment_series', 'type', 'mark'], name='formres_series_type_mark_idx'),
+        ]
     
     def __str__(self):
         if self.exam:
@@ -388,6 +420,12 @@ class WorkersPasResult(models.Model):
         verbose_name = "Worker's PAS Result"
         verbose_name_plural = "Worker's PAS Results"
         unique_together = ['candidate', 'assessment_series', 'paper']
+        indexes = [
+            # Stats/awards: per-series pass counts filtered on mark thresholds
+            models.Index(fields=['assessment_series', 'mark'], name='wpres_series_mark_idx'),
+            # Transcripts/retakes: all results for a candidate and paper
+            models.Index(fields=['candidate', 'paper'], name='wpres_cand_paper_idx'),
+        ]
     
     def __str__(self):
         return f"{self.candidate.full_name} - {self.paper.paper_name} (Practical)"
@@ -442,3 +480,90 @@ class WorkersPasResult(models.Model):
             return 'Missing'
         
         return 'Successful' if self.is_passing else 'Not Successful'
+
+
+class ResultProgress(models.Model):
+    """
+    Per-candidate progress index: one row per assessed item (module, exam or
+    paper, and result type) summarising every attempt at it. Maintained by
+    the result signals (see results/progress.py) so enrollment options,
+    retake checks and retake fees read one indexed query instead of scanning
+    the result tables per level/module/paper.
+    """
+    CATEGORY_CHOICES = (
+        ('modular', 'Modular'),
+        ('formal', 'Formal'),
+        ('workers_pas', "Worker's PAS"),
+    )
+    
+    candidate = models.ForeignKey(
+        'candidates.Candidate',
+        on_delete=models.CASCADE,
+        related_name='result_progress'
+    )
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    item_key = models.CharField(
+        max_length=100,
+        help_text='Identifies the assessed item, e.g. formal:3:paper:12:theory'
+    )
+    level = models.ForeignKey(
+        'occupations.OccupationLevel',
+        on_delete=models.CASCADE,
+        related_name='result_progress',
+        null=True,
+        blank=True
+    )
+    module = models.ForeignKey(
+        'occupations.OccupationModule',
+        on_delete=models.CASCADE,
+        related_name='result_progress',
+        null=True,
+        blank=True,
+        help_text='Modular module, formal exam or Worker\'s PAS module'
+    )
+    paper = models.ForeignKey(
+        'occupations.OccupationPaper',
+        on_delete=models.CASCADE,
+        related_name='result_progress',
+        null=True,
+        blank=True
+    )
+    type = models.CharField(max_length=20)
+    attempts = models.PositiveIntegerField(default=0)
+    best_mark = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    is_passed = models.BooleanField(default=False, help_text='At least one attempt passed')
+    has_failed = models.BooleanField(default=False, help_text='At least one attempt did not pass')
+    last_failed_mark = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    last_failed_series = models.ForeignKey(
+        'assessment_series.AssessmentSeries',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        null=True,
+        blank=True
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['candidate', 'item_key']
+        verbose_name = 'Result Progress'
+        verbose_name_plural = 'Result Progress'
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'item_key'], name='uniq_result_progress_item'),
+        ]
+        indexes = [
+            models.Index(fields=['candidate', 'category', 'level'], name='resprog_cand_cat_level_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.candidate_id} - {self.item_key}"
+    
+    @property
+    def is_retake(self):
+        """Failed and never passed: eligible for retake at the reduced fee"""
+        return self.has_failed and not self.is_passed
+    
+    @property
+    def last_failed_grade(self):
+        """Grade of the most recent failed attempt, using the result model's grading"""
+        model = {'modular': ModularResult, 'formal': FormalResult}.get(self.category, WorkersPasResult)
+        return model(mark=self.last_failed_mark, type=self.type).grade
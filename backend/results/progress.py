@@ -0,0 +1,236 @@
+"""
+Candidate progress index.
+
+ResultProgress keeps one summary row per candidate and assessed item
+(modular module, formal exam/paper, Worker's PAS paper — per result type).
+The result signals call refresh_item_progress() after every save/delete, so
+the row always reflects all attempts at that item; a save that moves a
+result to another item (candidate, module, paper, ...) refreshes the item
+it left as well. Readers load a
+candidate's rows once with get_progress() and answer "passed?", "retake?"
+and "which papers failed in this level?" from memory.
+
+Existing data is backfilled with `python manage.py rebuild_result_progress`.
+Until it has run, a candidate with results but no progress rows would look
+never assessed, so get_progress() and get_progress_for_candidates() build
+such candidates' rows from the result tables in memory instead.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+
+from .models import ModularResult, FormalResult, WorkersPasResult, ResultProgress
+
+# Result fields that decide which progress row a result feeds
+ITEM_FIELDS = frozenset(('candidate', 'module', 'type', 'level', 'exam', 'paper'))
+
+
+def _item_spec(result):
+    """(category, item_key, item filter, index fields) for the item a result belongs to."""
+    if isinstance(result, ModularResult):
+        return (
+            'modular',
+            f'modular:module:{result.module_id}:{result.type}',
+            {'module_id': result.module_id, 'type': result.type},
+            {'module_id': result.module_id},
+        )
+    if isinstance(result, FormalResult):
+        if result.exam_id:
+            kind, item_id, item_filter = 'exam', result.exam_id, {'exam_id': result.exam_id}
+        else:
+            kind, item_id, item_filter = 'paper', result.paper_id, {'paper_id': result.paper_id}
+        return (
+            'formal',
+            f'formal:{result.level_id}:{kind}:{item_id}:{result.type}',
+            dict(item_filter, level_id=result.level_id, type=result.type),
+            {'level_id': result.level_id, 'module_id': result.exam_id, 'paper_id': result.paper_id},
+        )
+    return (
+        'workers_pas',
+        f'workers_pas:paper:{result.paper_id}:practical',
+        {'paper_id': result.paper_id},
+        {'level_id': result.level_id, 'module_id': result.module_id, 'paper_id': result.paper_id},
+    )
+
+
+def _summarise(results):
+    """Fold every attempt at one item (oldest first) into ResultProgress field values."""
+    summary = {
+        'attempts': 0,
+        'best_mark': None,
+        'is_passed': False,
+        'has_failed': False,
+        'last_failed_mark': None,
+        'last_failed_series_id': None,
+    }
+    for result in results:
+        summary['attempts'] += 1
+        if result.mark is not None and (summary['best_mark'] is None or result.mark > summary['best_mark']):
+            summary['best_mark'] = result.mark
+        if result.is_passing:
+            summary['is_passed'] = True
+        else:
+            summary['has_failed'] = True
+            summary['last_failed_mark'] = result.mark
+            summary['last_failed_series_id'] = result.assessment_series_id
+    return summary
+
+
+def _failed_series_date(row):
+    return row.last_failed_series.start_date if row.last_failed_series_id else date.min
+
+
+def _attempt_order():
+    return ('assessment_series__start_date', 'entered_at', 'id')
+
+
+def progress_item(result):
+    """(candidate_id, item_key) of the progress row `result` feeds."""
+    return result.candidate_id, _item_spec(result)[1]
+
+
+def refresh_item_progress(result):
+    """Recompute the progress row for the item `result` belongs to (after save or delete)."""
+    category, item_key, item_filter, index_fields = _item_spec(result)
+    attempts = list(
+        type(result).objects.filter(candidate_id=result.candidate_id, **item_filter).order_by(*_attempt_order())
+    )
+    if not attempts:
+        ResultProgress.objects.filter(candidate_id=result.candidate_id, item_key=item_key).delete()
+        return
+    ResultProgress.objects.update_or_create(
+        candidate_id=result.candidate_id,
+        item_key=item_key,
+        defaults=dict(_summarise(attempts), category=category, type=attempts[0].type, **index_fields),
+    )
+
+
+def _progress_rows(candidate_ids):
+    """Unsaved progress rows for the given candidates, built from the result tables in three queries."""
+    grouped = defaultdict(list)
+    for model in (ModularResult, FormalResult, WorkersPasResult):
+        for result in model.objects.filter(candidate_id__in=candidate_ids).order_by(*_attempt_order()):
+            category, item_key, _, index_fields = _item_spec(result)
+            grouped[(result.candidate_id, item_key)].append((category, index_fields, result))
+
+    rows = []
+    for (candidate_id, item_key), attempts in grouped.items():
+        category, index_fields, first = attempts[0]
+        rows.append(ResultProgress(
+            candidate_id=candidate_id,
+            item_key=item_key,
+            category=category,
+            type=first.type,
+            **index_fields,
+            **_summarise(result for _, _, result in attempts),
+        ))
+    return rows
+
+
+def rebuild_candidate_progress(candidate_ids):
+    """
+    Rebuild all progress rows for the given candidates from the result tables
+    (three queries per call). Used by the backfill command. Returns the number
+    of rows written.
+    """
+    candidate_ids = list(candidate_ids)
+    rows = _progress_rows(candidate_ids)
+    with transaction.atomic():
+        ResultProgress.objects.filter(candidate_id__in=candidate_ids).delete()
+        ResultProgress.objects.bulk_create(rows)
+    return len(rows)
+
+
+class CandidateProgress:
+    """A candidate's progress rows, loaded in one query, with the lookups the views need."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def _rows(self, **filters):
+        return [
+            row for row in self.rows
+            if all(getattr(row, field) == value for field, value in filters.items())
+        ]
+
+    def module_status(self, module_id):
+        """
+        Modular module status across theory/practical attempts:
+        (is_passed, is_failed) where is_failed means failed and never passed.
+        """
+        rows = self._rows(category='modular', module_id=module_id)
+        is_passed = any(row.is_passed for row in rows)
+        return is_passed, not is_passed and any(row.has_failed for row in rows)
+
+    def paper_status(self, paper_id):
+        """Worker's PAS paper status: (is_passed, is_failed, failed row or None)."""
+        rows = self._rows(category='workers_pas', paper_id=paper_id)
+        is_passed = any(row.is_passed for row in rows)
+        failed = next((row for row in rows if row.has_failed), None)
+        return is_passed, not is_passed and failed is not None, failed
+
+    def level_rows(self, level_id):
+        """Formal progress rows for one level."""
+        return self._rows(category='formal', level_id=level_id)
+
+    def level_has_failures(self, level_id):
+        """True if any formal attempt in the level did not pass (retaker)."""
+        return any(row.has_failed for row in self.level_rows(level_id))
+
+    def failed_level_rows(self, level_id):
+        """Formal rows in the level with at least one failed attempt."""
+        return [row for row in self.level_rows(level_id) if row.has_failed]
+
+    def failed_module_rows(self):
+        """
+        One row per modular module that was failed and never passed: the type
+        whose failed attempt is most recent. Load with
+        select_related('last_failed_series') to avoid a query per module.
+        """
+        by_module = defaultdict(list)
+        for row in self._rows(category='modular'):
+            by_module[row.module_id].append(row)
+        failed = []
+        for rows in by_module.values():
+            if any(row.is_passed for row in rows):
+                continue
+            failing = [row for row in rows if row.has_failed]
+            if failing:
+                failed.append(max(failing, key=_failed_series_date))
+        return failed
+
+
+def get_progress(candidate, select_related=()):
+    """
+    Load a candidate's progress index in a single query (four if the
+    candidate has no progress rows and they are built from the results).
+    """
+    candidate_id = getattr(candidate, 'pk', candidate)
+    rows = ResultProgress.objects.filter(candidate_id=candidate_id)
+    if select_related:
+        rows = rows.select_related(*select_related)
+    rows = list(rows)
+    if not rows:
+        # Not backfilled yet, or never assessed
+        rows = _progress_rows([candidate_id])
+        prefetch_related_objects(rows, *select_related)
+    return CandidateProgress(rows)
+
+
+def get_progress_for_candidates(candidate_ids):
+    """
+    Progress indexes for many candidates in one query (four if some have no
+    progress rows): {candidate_id: CandidateProgress}.
+    """
+    candidate_ids = list(candidate_ids)
+    grouped = defaultdict(list)
+    for row in ResultProgress.objects.filter(candidate_id__in=candidate_ids):
+        grouped[row.candidate_id].append(row)
+    missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in grouped]
+    if missing:
+        # Not backfilled yet, or never assessed
+        for row in _progress_rows(missing):
+            grouped[row.candidate_id].append(row)
+    return {candidate_id: CandidateProgress(grouped.get(candidate_id, [])) for candidate_id in candidate_ids}
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from emis.http_cache import bump_version, candidate_version_name
+from .models import ModularResult, FormalResult, WorkersPasResult
+from .progress import ITEM_FIELDS, progress_item, refresh_item_progress
+
+
+@receiver([post_save, post_delete], sender=ModularResult)
+@receiver([post_save, post_delete], sender=FormalResult)
+@receiver([post_save, post_delete], sender=WorkersPasResult)
+def bump_result_versions(sender, instance, **kwargs):
+    """Invalidate ETags for the candidate's result views and the results aggregates."""
+    bump_version(candidate_version_name(instance.candidate_id), 'results')
+
+
+@receiver(pre_save, sender=ModularResult)
+@receiver(pre_save, sender=FormalResult)
+@receiver(pre_save, sender=WorkersPasResult)
+def remember_result_item(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Load the stored row of an existing result so a move can refresh the item it leaves."""
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not ITEM_FIELDS.intersection(update_fields):
+        return
+    instance._progress_previous = sender.objects.filter(pk=instance.pk).first()
+
+
+@receiver([post_save, post_delete], sender=ModularResult)
+@receiver([post_save, post_delete], sender=FormalResult)
+@receiver([post_save, post_delete], sender=WorkersPasResult)
+def update_result_progress(sender, instance, **kwargs):
+    """Keep the candidate's progress index in step with its results."""
+    refresh_item_progress(instance)
+    previous = instance.__dict__.pop('_progress_previous', None)
+    if previous is not None and progress_item(previous) != progress_item(instance):
+        # The result moved to another item; the one it left loses an attempt
+        refresh_item_progress(previous)
+        if previous.candidate_id != instance.candidate_id:
+            bump_version(candidate_version_name(previous.candidate_id))
@@ -0,0 +1,154 @@
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from assessment_centers.models import AssessmentCenter
+from assessment_series.models import AssessmentSeries
+from candidates.models import Candidate
+from configurations.models import District
+from occupations.models import Occupation, OccupationLevel, OccupationModule, Sector
+
+from .models import FormalResult, ModularResult, ResultProgress
+from .progress import get_progress, get_progress_for_candidates
+
+
+class ResultProgressMoveTests(TestCase):
+    """A result moved to another item must leave no stale progress behind."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        cls.series = AssessmentSeries.objects.create(
+            name='Nov 2025', start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+            date_of_release=date(2025, 12, 15),
+        )
+        sector = Sector.objects.create(name='Building')
+        occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector, has_modular=True,
+        )
+        level = OccupationLevel.objects.create(occupation=occupation, level_name='Level 1', structure_type='modules')
+        cls.module_a = OccupationModule.objects.create(
+            module_code='MVM-M1', module_name='Module 1', occupation=occupation, level=level, credit_units=4,
+        )
+        cls.module_b = OccupationModule.objects.create(
+            module_code='MVM-M2', module_name='Module 2', occupation=occupation, level=level, credit_units=4,
+        )
+        cls.candidates = [
+            Candidate.objects.create(
+                full_name=f'Candidate {i}', date_of_birth=date(2000, 1, 1), gender='male', contact='0700000000',
+                district=district, assessment_center=center, entry_year=2025, intake='M',
+                registration_category='modular', occupation=occupation,
+            )
+            for i in range(2)
+        ]
+
+    def _failed_result(self, module):
+        return ModularResult.objects.create(
+            candidate=self.candidates[0], assessment_series=self.series, module=module, type='practical', mark=20,
+        )
+
+    def test_moving_to_another_module_clears_the_old_item(self):
+        result = self._failed_result(self.module_a)
+        self.assertEqual(get_progress(self.candidates[0]).module_status(self.module_a.pk), (False, True))
+
+        result.module = self.module_b
+        result.save()
+
+        progress = get_progress(self.candidates[0])
+        self.assertEqual(progress.module_status(self.module_a.pk), (False, False))
+        self.assertEqual(progress.module_status(self.module_b.pk), (False, True))
+        self.assertEqual([row.module_id for row in progress.failed_module_rows()], [self.module_b.pk])
+
+    def test_moving_to_another_candidate_clears_the_old_candidate(self):
+        result = self._failed_result(self.module_a)
+
+        result.candidate = self.candidates[1]
+        result.save()
+
+        self.assertFalse(ResultProgress.objects.filter(candidate=self.candidates[0]).exists())
+        self.assertEqual(get_progress(self.candidates[1]).module_status(self.module_a.pk), (False, True))
+
+    def test_candidate_without_progress_rows_reads_the_results(self):
+        # As before rebuild_result_progress has run
+        self._failed_result(self.module_a)
+        ResultProgress.objects.all().delete()
+
+        progress = get_progress(self.candidates[0], select_related=('module', 'last_failed_series'))
+
+        self.assertEqual(progress.module_status(self.module_a.pk), (False, True))
+        self.assertEqual([row.module.module_code for row in progress.failed_module_rows()], ['MVM-M1'])
+        by_candidate = get_progress_for_candidates([self.candidates[0].pk, self.candidates[1].pk])
+        self.assertEqual(by_candidate[self.candidates[0].pk].module_status(self.module_a.pk), (False, True))
+        self.assertEqual(by_candidate[self.candidates[1].pk].rows, [])
+        self.assertFalse(ResultProgress.objects.exists())
+
+    def test_mark_only_update_refreshes_the_item(self):
+        result = self._failed_result(self.module_a)
+
+        result.mark = 80
+        result.save(update_fields=['mark'])
+
+        self.assertEqual(get_progress(self.candidates[0]).module_status(self.module_a.pk), (True, False))
+
+
+class FormalResultUniquenessTests(TestCase):
+    """Each formal result structure allows one row per candidate, series, level and type."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        cls.series = AssessmentSeries.objects.create(
+            name='Nov 2025', start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+            date_of_release=date(2025, 12, 15),
+        )
+        sector = Sector.objects.create(name='Building')
+        occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector,
+        )
+        cls.level = OccupationLevel.objects.create(
+            occupation=occupation, level_name='Level 1', structure_type='modules',
+        )
+        cls.exam = OccupationModule.objects.create(
+            module_code='MVM-M1', module_name='Module 1', occupation=occupation, level=cls.level, credit_units=4,
+        )
+        cls.candidate = Candidate.objects.create(
+            full_name='Candidate', date_of_birth=date(2000, 1, 1), gender='male', contact='0700000000',
+            district=district, assessment_center=center, entry_year=2025, intake='M',
+            registration_category='formal', occupation=occupation,
+        )
+
+    def _result(self, **fields):
+        return FormalResult.objects.create(
+            candidate=self.candidate, assessment_series=self.series, level=self.level, type='theory', mark=70,
+            **fields,
+        )
+
+    def test_level_wide_result_is_unique(self):
+        self._result()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._result()
+
+    def test_level_wide_and_exam_results_coexist(self):
+        self._result()
+        self._result(exam=self.exam)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._result(exam=self.exam)
+
+    def test_marksheet_lookup_leaves_exam_results_alone(self):
+        exam_result = self._result(exam=self.exam)
+
+        FormalResult.objects.update_or_create(
+            candidate=self.candidate, assessment_series=self.series, level=self.level,
+            exam=None, paper=None, type='theory', defaults={'mark': 40},
+        )
+
+        exam_result.refresh_from_db()
+        self.assertEqual(exam_result.mark, 70)
+        self.assertEqual(FormalResult.objects.filter(exam__isnull=True, mark=40).count(), 1)
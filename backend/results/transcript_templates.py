@@ -0,0 +1,312 @@
+"""
+Transcript template layer.
+
+The modular, formal and Worker's PAS transcripts differ only in the
+candidate block and the results table. Everything else is invariant and is
+prepared once per process here:
+
+- paragraph styles (per layout variant),
+- the logo and signature image XObjects: decoded and stream-encoded once,
+  then registered into each new document instead of re-reading and
+  re-encoding the files on every render,
+- the page templates and their callbacks (signature, DUPLICATE watermark,
+  rotated back page),
+- the static back page (key to grades, duplicate notice, copyright).
+
+Per-candidate rendering only lays out the variable content.
+"""
+import copy
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.utils import _digester
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+from reportlab.platypus import (
+    SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
+    PageBreak, Frame, PageTemplate, NextPageTemplate, Flowable
+)
+
+LOGO_PATH = os.path.join(settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
+SIGNATURE_PATH = os.path.join(settings.BASE_DIR, 'static', 'images', 'es_signature.jpg')
+
+# Font sizes per layout: modular/formal use the compact layout, Worker's PAS the larger one
+STYLE_VARIANTS = {
+    'compact': {
+        'title_size': 14, 'title_space_after': 10,
+        'body_size': 9,
+        'section_size': 11, 'section_space_after': 8, 'section_space_before': 10,
+    },
+    'workers_pas': {
+        'title_size': 18, 'title_space_after': 20,
+        'body_size': 11,
+        'section_size': 14, 'section_space_after': 10, 'section_space_before': 15,
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def transcript_styles(variant='compact'):
+    """Paragraph styles used on transcripts, built once per process per layout variant."""
+    sizes = STYLE_VARIANTS[variant]
+    base = getSampleStyleSheet()
+    normal = base['Normal']
+
+    info_value = ParagraphStyle(
+        'InfoValue',
+        parent=normal,
+        fontSize=sizes['body_size'],
+        fontName='Times-Roman',
+        alignment=TA_LEFT
+    )
+    return {
+        'title': ParagraphStyle(
+            'TranscriptTitle',
+            parent=base['Heading1'],
+            fontSize=sizes['title_size'],
+            textColor=colors.black,
+            spaceAfter=sizes['title_space_after'],
+            spaceBefore=0,
+            alignment=TA_CENTER,
+            fontName='Times-Bold'
+        ),
+        'info_label': ParagraphStyle(
+            'InfoLabel',
+            parent=normal,
+            fontSize=sizes['body_size'],
+            fontName='Times-Bold',
+            alignment=TA_LEFT
+        ),
+        'info_value': info_value,
+        'section_heading': ParagraphStyle(
+            'SectionHeading',
+            parent=base['Heading2'],
+            fontSize=sizes['section_size'],
+            textColor=colors.black,
+            spaceAfter=sizes['section_space_after'],
+            spaceBefore=sizes['section_space_before'],
+            alignment=TA_CENTER,
+            fontName='Times-Bold'
+        ),
+        'photo_caption': ParagraphStyle('PhotoCaption', parent=normal, fontSize=6, fontName='Times-Roman', alignment=TA_LEFT),
+        'sub_heading': ParagraphStyle('SubHeading', parent=normal, fontName='Times-Roman', fontSize=9),
+        'lwa': ParagraphStyle('LWA', parent=normal, fontName='Times-Roman', fontSize=9),
+        'cu_right': ParagraphStyle('CURight', parent=info_value, alignment=TA_RIGHT),
+        'table_header': ParagraphStyle('TableHeader', parent=normal, fontSize=10, fontName='Times-Bold', alignment=TA_CENTER),
+        'col_header': ParagraphStyle('ColHeader', parent=normal, fontSize=9, fontName='Times-Bold', alignment=TA_CENTER),
+        'data': ParagraphStyle('DataStyle', parent=normal, fontSize=9, fontName='Times-Roman'),
+        'data_center': ParagraphStyle('DataCenterStyle', parent=normal, fontSize=9, fontName='Times-Roman', alignment=TA_CENTER),
+        'page2_title': ParagraphStyle(
+            'Page2Title', parent=base['Heading1'], fontSize=12, alignment=TA_CENTER, fontName='Times-Bold', spaceAfter=10
+        ),
+        'heading2_center': ParagraphStyle(
+            'Heading2Center',
+            parent=base['Heading2'],
+            alignment=TA_CENTER,
+            fontName='Times-Bold',
+            fontSize=16,
+            spaceAfter=15
+        ),
+        'pass_mark': ParagraphStyle('PassMark', parent=normal, alignment=TA_CENTER, fontName='Times-Bold', fontSize=12),
+        'dup': ParagraphStyle('Dup', parent=normal, textColor=colors.white, alignment=TA_CENTER, fontName='Times-Bold', fontSize=10),
+        'copyright': ParagraphStyle('Copyright', parent=normal, alignment=TA_CENTER, fontName='Times-Bold', fontSize=9),
+        'slogan': ParagraphStyle('Slogan', parent=normal, alignment=TA_CENTER, fontName='Times-Italic', fontSize=9, textColor=colors.black),
+    }
+
+
+# --- Static images ---------------------------------------------------------
+
+def _image_name(path, mask):
+    """The XObject name canvas.drawImage derives for an image file."""
+    return _digester(('%s%s' % (path, mask)).encode('utf-8'))
+
+
+@lru_cache(maxsize=None)
+def _image_xobject(path, mask):
+    """Decode and stream-encode a static image file once per process."""
+    return PDFImageXObject(_image_name(path, mask), path, mask=mask)
+
+
+def draw_static_image(canvas, path, x, y, width, height, mask=None, preserveAspectRatio=False):
+    """
+    canvas.drawImage for an unchanging image file. The encoded XObject is
+    registered into the canvas' document first, so drawImage finds it and
+    skips loading the file.
+    """
+    name = _image_name(path, mask)
+    doc = canvas._doc
+    reg_name = doc.getXObjectName(name)
+    if reg_name not in doc.idToObject:
+        # Mirrors canvas.drawImage's first-use registration, with a per-document copy
+        image = copy.copy(_image_xobject(path, mask))
+        canvas._setXObjects(image)
+        doc.Reference(image, reg_name)
+        doc.addForm(name, image)
+        smask = getattr(image, '_smask', None)
+        if smask is not None:
+            smask = copy.copy(smask)
+            canvas._setXObjects(smask)
+            image.smask = doc.Reference(smask, doc.getXObjectName(smask.name))
+            del image._smask
+    return canvas.drawImage(
+        path, x, y, width=width, height=height, mask=mask, preserveAspectRatio=preserveAspectRatio
+    )
+
+
+class StaticImage(Flowable):
+    """Platypus image backed by the per-process XObject cache (see draw_static_image)."""
+
+    def __init__(self, path, width, height, mask='auto'):
+        super().__init__()
+        self.hAlign = 'CENTER'
+        self.path = path
+        self.drawWidth = width
+        self.drawHeight = height
+        self.mask = mask
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        draw_static_image(self.canv, self.path, 0, 0, self.drawWidth, self.drawHeight, mask=self.mask)
+
+
+# --- Page templates --------------------------------------------------------
+
+def _draw_duplicate_watermark(canvas):
+    """Draw diagonal DUPLICATE watermark across the page"""
+    canvas.saveState()
+    canvas.setFont('Helvetica-Bold', 72)
+    canvas.setFillColor(colors.Color(1, 0, 0, alpha=0.3))  # Semi-transparent red
+    canvas.translate(A4[0]/2, A4[1]/2)
+    canvas.rotate(45)
+    canvas.drawCentredString(0, 0, "DUPLICATE")
+    canvas.restoreState()
+
+
+def build_transcript_doc(buffer, title, bottom_margin=2.5*cm, duplicate_watermark=False, signature_caption=None):
+    """
+    SimpleDocTemplate with the transcript page templates: 'portrait' (front,
+    signature at the bottom right) and 'portrait_back' (landscape content
+    rotated onto a portrait page).
+    """
+    signature_available = os.path.exists(SIGNATURE_PATH)
+
+    def on_first_page(canvas, doc):
+        canvas.saveState()
+        if duplicate_watermark:
+            _draw_duplicate_watermark(canvas)
+        # Signature at bottom right
+        if signature_available:
+            try:
+                draw_static_image(canvas, SIGNATURE_PATH, A4[0] - 6*cm, 0.4*cm, 4*cm, 2*cm, mask='auto', preserveAspectRatio=True)
+            except Exception:
+                pass
+        if signature_caption:
+            canvas.setFont("Times-Bold", 10)
+            canvas.drawCentredString(A4[0] - 4*cm, 1.3*cm, signature_caption)
+        canvas.restoreState()
+
+    def on_portrait_back(canvas, doc):
+        if duplicate_watermark:
+            _draw_duplicate_watermark(canvas)
+        # Rotate content 90 degrees (Counter-Clockwise)
+        canvas.translate(A4[0], 0)
+        canvas.rotate(90)
+
+    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=bottom_margin, leftMargin=1.5*cm, rightMargin=1.5*cm,
+                            title=title, author='UVTAB')
+
+    frame_portrait = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='portrait')
+    frame_landscape = Frame(doc.leftMargin, doc.bottomMargin, landscape(A4)[0]-2*doc.leftMargin, landscape(A4)[1]-doc.bottomMargin-doc.topMargin, id='landscape')
+
+    doc.addPageTemplates([
+        PageTemplate(id='portrait', frames=frame_portrait, onPage=on_first_page),
+        # Landscape content frame on Portrait page with -90 rotation
+        PageTemplate(id='portrait_back', frames=frame_landscape, onPage=on_portrait_back, pagesize=A4)
+    ])
+    return doc
+
+
+# --- Static back page ------------------------------------------------------
+
+THEORY_GRADES = [
+    ["A+", "A", "B", "B-", "C", "C-", "D", "E"],
+    ["85-100", "80-84", "70-79", "60-69", "50-59", "40-49", "30-39", "0-29"],
+]
+PRACTICAL_GRADES = [
+    ["A+", "A", "B+", "B", "B-", "C", "C-", "D", "D-", "E"],
+    ["90-100", "85-89", "75-84", "65-74", "60-64", "55-59", "50-54", "40-49", "30-39", "0-29"],
+]
+DUPLICATE_NOTICE = "Any transcript issued as a replacement shall bear a watermark with the word \"Duplicate\" on the front face."
+COPYRIGHT_TEXT = "© 2026 Uganda Vocational and Technical Assessment Board, Plot 891, Kigobe Road, Kyambogo Hill, P.O.Box 1499 Kampala - Uganda"
+
+
+def _grades_table(heading, grades, label_style, value_style, grid_width):
+    data = [
+        [Paragraph(f"<b>{heading}</b>", label_style)] + [""] * len(grades[0]),
+        [Paragraph("<b>Grade</b>", value_style)] + grades[0],
+        [Paragraph("<b>Score %</b>", value_style)] + grades[1],
+    ]
+    table = Table(data, colWidths=[2.7*cm] + [2.4*cm]*len(grades[0]), hAlign='LEFT')
+    table.setStyle(TableStyle([
+        # Header
+        ('SPAN', (0, 0), (-1, 0)),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+        # Grid and Borders
+        ('GRID', (0, 0), (-1, -1), grid_width, colors.black),
+        # Fonts and Alignment
+        ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    return table
+
+
+def back_page_flowables(variant='compact'):
+    """
+    Page break onto the rotated back page plus its static content. Flowables
+    are stateful once laid out, so a fresh list is returned per document; the
+    styles and logo XObject behind them are shared.
+    """
+    styles = transcript_styles(variant)
+    elements = [NextPageTemplate('portrait_back'), PageBreak()]
+
+    # Header (Logo + Title)
+    if os.path.exists(LOGO_PATH):
+        elements.append(StaticImage(LOGO_PATH, 1.5*cm, 1.5*cm))
+        elements.append(Spacer(1, 0.1*cm))
+    elements.append(Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", styles['page2_title']))
+
+    # Key to Grades
+    elements.append(Paragraph("KEY TO GRADES", styles['heading2_center']))
+    elements.append(Spacer(1, 0.2*cm))
+    elements.append(_grades_table("THEORY SCORES", THEORY_GRADES, styles['info_label'], styles['info_value'], 1))
+    elements.append(Spacer(1, 0.4*cm))
+    elements.append(_grades_table("PRACTICAL SCORES", PRACTICAL_GRADES, styles['info_label'], styles['info_value'], 0.5))
+    elements.append(Spacer(1, 0.4*cm))
+    elements.append(Paragraph("Pass mark is 50% in theory and 65% in practical assessment", styles['pass_mark']))
+    elements.append(Spacer(1, 2*cm))
+
+    # Duplicate warning (Black bar)
+    dup_table = Table([[Paragraph(f"<b>{DUPLICATE_NOTICE}</b>", styles['dup'])]], colWidths=[17*cm])
+    dup_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.black),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ]))
+    elements.append(dup_table)
+    elements.append(Spacer(1, 0.5*cm))
+
+    # Copyright and Address
+    elements.append(Paragraph(COPYRIGHT_TEXT, styles['copyright']))
+    elements.append(Paragraph("\"Assessment for Employable Skills\"", styles['slogan']))
+    return elements
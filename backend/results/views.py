@@ -8,12 +8,12 @@ from datetime import datetime
 import qrcode
 from PIL import Image as PILImage
 from PIL import ImageOps
-from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import cm, inch
 from reportlab.platypus import (
     SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, 
-    Image, PageBreak, Frame, PageTemplate, NextPageTemplate
+    Image, PageBreak
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
@@ -29,8 +29,12 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 
 # Local app imports
 from .models import ModularResult, WorkersPasResult, FormalResult
+from .progress import get_progress
+from .best_results import formal_standings, modular_standings
+from .transcript_templates import build_transcript_doc, transcript_styles, back_page_flowables
 from .serializers import WorkersPasResultSerializer, WorkersPasResultCreateUpdateSerializer
-from candidates.models import Candidate, EnrollmentModule, EnrollmentPaper, CandidateActivity
+from candidates import audit
+from candidates.models import Candidate, EnrollmentModule, EnrollmentPaper
 from occupations.models import (
     OccupationModule, ModuleLWA, OccupationPaper, 
     OccupationLevel
@@ -40,14 +44,7 @@ from utils.nationality_helper import get_nationality_from_country
 
 
 def _log_candidate_activity(request, candidate, action, description='', details=None):
-    actor = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
-    CandidateActivity.objects.create(
-        candidate=candidate,
-        actor=actor,
-        action=action,
-        description=description or '',
-        details=details,
-    )
+    audit.record(candidate, action, description, details, actor=audit.actor_of(request))
 
 
 class ModularResultViewSet(viewsets.ViewSet):
@@ -271,39 +268,21 @@ class ModularResultViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all results for this candidate
-        results = ModularResult.objects.filter(
-            candidate=candidate
-        ).select_related('module', 'assessment_series')
-        
-        # Find failed modules (not passed yet)
-        module_status = {}
-        for result in results:
-            module_id = result.module_id
-            if module_id not in module_status:
-                module_status[module_id] = {'passed': False, 'failed': False, 'result': None}
-            
-            if result.is_passing:
-                module_status[module_id]['passed'] = True
-            else:
-                if not module_status[module_id]['passed']:
-                    module_status[module_id]['failed'] = True
-                    module_status[module_id]['result'] = result
+        # Failed and never passed, from the candidate's progress index
+        progress = get_progress(candidate, select_related=('module', 'last_failed_series'))
         
         failed_items = []
-        for module_id, status_info in module_status.items():
-            if status_info['failed'] and not status_info['passed']:
-                result = status_info['result']
-                failed_items.append({
-                    'id': module_id,
-                    'module_id': module_id,
-                    'code': result.module.module_code,
-                    'name': result.module.module_name,
-                    'result_type': result.type,
-                    'mark': float(result.mark) if result.mark else None,
-                    'grade': result.grade,
-                    'assessment_series': result.assessment_series.name,
-                })
+        for row in progress.failed_module_rows():
+            failed_items.append({
+                'id': row.module_id,
+                'module_id': row.module_id,
+                'code': row.module.module_code,
+                'name': row.module.module_name,
+                'result_type': row.type,
+                'mark': float(row.last_failed_mark) if row.last_failed_mark else None,
+                'grade': row.last_failed_grade,
+                'assessment_series': row.last_failed_series.name if row.last_failed_series else None,
+            })
         
         return Response({
             'is_retake': len(failed_items) > 0,
@@ -995,8 +974,11 @@ class ModularResultViewSet(viewsets.ViewSet):
         return response
 
     @action(detail=False, methods=['get'], url_path='transcript-pdf')
-    def transcript_pdf(self, request):
-        """Generate official transcript PDF for candidate"""
+    def transcript_pdf(self, request, standing=None):
+        """
+        Generate official transcript PDF for candidate. Batch callers pass the
+        candidate's precomputed `standing` (results.best_results).
+        """
         
         candidate_id = request.query_params.get('candidate_id')
         duplicate_watermark = request.query_params.get('duplicate_watermark', 'false').lower() == 'true'
@@ -1016,38 +998,19 @@ class ModularResultViewSet(viewsets.ViewSet):
             )
         
         # Check if candidate qualifies for transcript
-        # For each module, use the BEST result (passed overrides failed)
+        # For each module, use the BEST result (passed overrides failed, higher mark wins)
         # This handles retakes - if candidate failed then passed, they qualify
-        modular_results = ModularResult.objects.filter(candidate=candidate).select_related('module')
-        if not modular_results.exists():
+        if standing is None:
+            standing = modular_standings([candidate.id])[candidate.id]
+        if not standing.results:
             return Response(
                 {'error': 'Candidate does not qualify for transcript. No results found.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Group results by module and get best result per module
-        module_best_results = {}
-        for result in modular_results:
-            module_id = result.module_id
-            if module_id not in module_best_results:
-                module_best_results[module_id] = result
-            else:
-                # If current result is passing and existing is not, replace
-                existing = module_best_results[module_id]
-                if result.is_passing and not existing.is_passing:
-                    module_best_results[module_id] = result
-                # If both passing, keep the one with higher mark
-                elif result.is_passing and existing.is_passing:
-                    if (result.mark or 0) > (existing.mark or 0):
-                        module_best_results[module_id] = result
-        
-        # Check if all modules have a passing result
-        all_successful = all(r.is_passing for r in module_best_results.values())
-        
-        if not all_successful:
-            failed_modules = [r.module.module_name for r in module_best_results.values() if not r.is_passing]
+        if not standing.qualifies:
             return Response(
-                {'error': f'Candidate does not qualify for transcript. Failed modules: {", ".join(failed_modules)}'},
+                {'error': f'Candidate does not qualify for transcript. {standing.message}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
@@ -1069,97 +1032,13 @@ class ModularResultViewSet(viewsets.ViewSet):
         qr_img.save(qr_buffer, format='PNG')
         qr_buffer.seek(0)
         
-        # Define Page Templates for mixed orientation
-        def draw_duplicate_watermark(canvas):
-            """Draw diagonal DUPLICATE watermark across the page"""
-            if duplicate_watermark:
-                canvas.saveState()
-                canvas.setFont('Helvetica-Bold', 72)
-                canvas.setFillColor(colors.Color(1, 0, 0, alpha=0.3))  # Semi-transparent red
-                canvas.translate(A4[0]/2, A4[1]/2)
-                canvas.rotate(45)
-                canvas.drawCentredString(0, 0, "DUPLICATE")
-                canvas.restoreState()
-        
-        def onFirstPage(canvas, doc):
-            canvas.saveState()
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-            
-            # Signature at bottom right (moved down by 2cm)
-            signature_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'es_signature.jpg')
-            if os.path.exists(signature_path):
-                try:
-                    canvas.drawImage(signature_path, A4[0] - 6*cm, 0.4*cm, width=4*cm, height=2*cm, mask='auto', preserveAspectRatio=True)
-                except:
-                    pass
-            canvas.restoreState()
-
-        def onLaterPages(canvas, doc):
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-
-        def onPortraitBack(canvas, doc):
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-            # Rotate content 90 degrees (Counter-Clockwise)
-            canvas.translate(A4[0], 0)
-            canvas.rotate(90)
-
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=2.5*cm, leftMargin=1.5*cm, rightMargin=1.5*cm,
-                                 title=f'Transcript - {candidate.full_name}', author='UVTAB')
-        
-        # Create Frames
-        frame_portrait = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='portrait')
-        frame_landscape = Frame(doc.leftMargin, doc.bottomMargin, landscape(A4)[0]-2*doc.leftMargin, landscape(A4)[1]-doc.bottomMargin-doc.topMargin, id='landscape')
-        
-        doc.addPageTemplates([
-            PageTemplate(id='portrait', frames=frame_portrait, onPage=onFirstPage),
-            # Landscape content frame on Portrait page with -90 rotation
-            PageTemplate(id='portrait_back', frames=frame_landscape, onPage=onPortraitBack, pagesize=A4)
-        ])
+        doc = build_transcript_doc(buffer, f'Transcript - {candidate.full_name}', duplicate_watermark=duplicate_watermark)
 
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles with Serif font (Times-Roman) - smaller fonts for neat layout
-        title_style = ParagraphStyle(
-            'TranscriptTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            textColor=colors.black,
-            spaceAfter=10,
-            spaceBefore=0,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
-        
-        info_label_style = ParagraphStyle(
-            'InfoLabel',
-            parent=styles['Normal'],
-            fontSize=9,
-            fontName='Times-Bold',
-            alignment=TA_LEFT
-        )
-        
-        info_value_style = ParagraphStyle(
-            'InfoValue',
-            parent=styles['Normal'],
-            fontSize=9,
-            fontName='Times-Roman',
-            alignment=TA_LEFT
-        )
-
-        section_heading_style = ParagraphStyle(
-            'SectionHeading',
-            parent=styles['Heading2'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=8,
-            spaceBefore=10,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
+        styles = transcript_styles('compact')
+        info_label_style = styles['info_label']
+        info_value_style = styles['info_value']
+        section_heading_style = styles['section_heading']
 
         # Content - Page 1 (No TRANSCRIPT title - paper already has it printed)
         elements.append(Spacer(1, 3.5*cm))
@@ -1177,7 +1056,7 @@ class ModularResultViewSet(viewsets.ViewSet):
                     img_buffer.seek(0)
                     candidate_photo = Image(img_buffer, width=2.8*cm, height=3.5*cm)
                     # Photo with reg no below in smaller font
-                    photo_caption_style = ParagraphStyle('PhotoCaption', parent=styles['Normal'], fontSize=6, fontName='Times-Roman', alignment=TA_LEFT)
+                    photo_caption_style = styles['photo_caption']
                     photo_data = [[candidate_photo], [Paragraph(candidate.registration_number or "", photo_caption_style)]]
                     photo_cell = Table(photo_data, colWidths=[4.2*cm])
                     photo_cell.setStyle(TableStyle([
@@ -1246,11 +1125,11 @@ class ModularResultViewSet(viewsets.ViewSet):
 
         # Results Table - Modular (Code, Module Name, CU, Grade)
         # Use only the BEST result per module (passed overrides failed, higher mark wins)
-        # This is already calculated in module_best_results above
-        results = list(module_best_results.values())
+        # This is already calculated in the candidate's standing above
+        results = standing.results
         
         candidate_total_cus = 0
-        level_total_cus = 0
+        level_total_cus = standing.required_units
         completion_date = None
         
         if results:
@@ -1296,13 +1175,6 @@ class ModularResultViewSet(viewsets.ViewSet):
         else:
             elements.append(Paragraph("No results found.", info_value_style))
 
-        # Calculate level total CUs
-        if candidate.occupation:
-            level_modules = OccupationModule.objects.filter(occupation=candidate.occupation)
-            for mod in level_modules:
-                if mod.credit_units:
-                    level_total_cus += mod.credit_units
-
         # LWAs - Candidate trained in the following
         elements.append(Spacer(1, 0.3*cm))
         enrollment_modules = EnrollmentModule.objects.filter(
@@ -1310,7 +1182,7 @@ class ModularResultViewSet(viewsets.ViewSet):
         ).select_related('module').distinct()
         
         if enrollment_modules.exists():
-            elements.append(Paragraph("<b>Candidate trained in the following:</b>", ParagraphStyle('SubHeading', parent=styles['Normal'], fontName='Times-Roman', fontSize=9)))
+            elements.append(Paragraph("<b>Candidate trained in the following:</b>", styles['sub_heading']))
             
             lwa_list = []
             for em in enrollment_modules:
@@ -1320,11 +1192,11 @@ class ModularResultViewSet(viewsets.ViewSet):
                         lwa_list.append(lwa.lwa_name)
             
             lwa_text = ", ".join(lwa_list) if lwa_list else "-"
-            elements.append(Paragraph(lwa_text, ParagraphStyle('LWA', parent=styles['Normal'], fontName='Times-Roman', fontSize=9)))
+            elements.append(Paragraph(lwa_text, styles['lwa']))
 
         # Credit Units summary - Total Credit Units left, Credit Units right
         elements.append(Spacer(1, 0.2*cm))
-        cu_right_style = ParagraphStyle('CURight', parent=info_value_style, alignment=TA_RIGHT)
+        cu_right_style = styles['cu_right']
         cu_summary = Table([
             [Paragraph(f"<b>Total Credit Units:</b> {level_total_cus}", info_value_style),
              Paragraph(f"<b>Credit Units:</b> {candidate_total_cus}", cu_right_style)]
@@ -1365,121 +1237,8 @@ class ModularResultViewSet(viewsets.ViewSet):
 
         elements.append(Spacer(1, 0.5*cm))
 
-        # Page Break (Starts using portrait_back template)
-        elements.append(NextPageTemplate('portrait_back'))
-        elements.append(PageBreak())
-        
-        # Page 2 - Header (Logo + Title)
-        logo_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
-        if os.path.exists(logo_path):
-            try:
-                logo = Image(logo_path, width=1.5*cm, height=1.5*cm)
-                elements.append(logo)
-                elements.append(Spacer(1, 0.1*cm))
-            except:
-                pass
-        
-        elements.append(Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", ParagraphStyle(
-            'Page2Title', parent=styles['Heading1'], fontSize=12, alignment=TA_CENTER, fontName='Times-Bold', spaceAfter=10
-        )))
-
-        # Key to Grades Title
-        heading2_style = ParagraphStyle(
-            'Heading2Center', 
-            parent=styles['Heading2'], 
-            alignment=TA_CENTER, 
-            fontName='Times-Bold',
-            fontSize=16,
-            spaceAfter=15
-        )
-        
-        elements.append(Paragraph("KEY TO GRADES", heading2_style))
-        elements.append(Spacer(1, 0.2*cm))
-
-        # Grading Table (Horizontal)
-        # Theory: A+, A, B, B-, C, C-, D, E (8 grades)
-        # Practical: A+, A, B+, B, B-, C, C-, D, D-, E (10 grades)
-        
-        # We need 11 columns (Label + 10 Data)
-        # Total width available ~ 26.7cm
-        # Label: 2.7cm, Data: 2.4cm * 10 = 24cm. Total 26.7cm
-        
-        # Theory Section (8 grades)
-        theory_data = [
-            [Paragraph("<b>THEORY SCORES</b>", info_label_style)] + [""] * 8,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B", "B-", "C", "C-", "D", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "85-100", "80-84", "70-79", "60-69", "50-59", "40-49", "30-39", "0-29"],
-        ]
-        
-        theory_col_widths = [2.7*cm] + [2.4*cm]*8
-        
-        theory_table = Table(theory_data, colWidths=theory_col_widths, hAlign='LEFT')
-        theory_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(theory_table)
-        elements.append(Spacer(1, 0.4*cm))
-        
-        # Practical Section (10 grades)
-        practical_data = [
-            [Paragraph("<b>PRACTICAL SCORES</b>", info_label_style)] + [""] * 10,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B+", "B", "B-", "C", "C-", "D", "D-", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "90-100", "85-89", "75-84", "65-74", "60-64", "55-59", "50-54", "40-49", "30-39", "0-29"],
-        ]
-        
-        practical_col_widths = [2.7*cm] + [2.4*cm]*10
-        
-        practical_table = Table(practical_data, colWidths=practical_col_widths, hAlign='LEFT')
-        practical_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(practical_table)
-        elements.append(Spacer(1, 0.4*cm))
-        elements.append(Paragraph("Pass mark is 50% in theory and 65% in practical assessment", ParagraphStyle('PassMark', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=12)))
-        
-        elements.append(Spacer(1, 2*cm))
-        
-
-        
-        # Duplicate warning (Black bar)
-        dup_text = "Any transcript issued as a replacement shall bear a watermark with the word \"Duplicate\" on the front face."
-        dup_table = Table([[Paragraph(f"<b>{dup_text}</b>", ParagraphStyle('Dup', parent=styles['Normal'], textColor=colors.white, alignment=TA_CENTER, fontName='Times-Bold', fontSize=10))]], colWidths=[17*cm])
-        dup_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.black),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ]))
-        elements.append(dup_table)
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Copyright and Address
-        elements.append(Paragraph("© 2026 Uganda Vocational and Technical Assessment Board, Plot 891, Kigobe Road, Kyambogo Hill, P.O.Box 1499 Kampala - Uganda", ParagraphStyle('Copyright', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=9)))
-        elements.append(Paragraph("\"Assessment for Employable Skills\"", ParagraphStyle('Slogan', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Italic', fontSize=9, textColor=colors.black)))
+        # Page 2 - static back page (logo, key to grades, duplicate notice)
+        elements.extend(back_page_flowables('compact'))
 
         doc.build(elements)
         pdf = buffer.getvalue()
@@ -1522,38 +1281,33 @@ class FormalResultViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get all results for this candidate in this level
-        results = FormalResult.objects.filter(
-            candidate=candidate,
-            level=level
-        ).select_related('paper', 'exam')
+        # Failed papers/exams in this level, from the candidate's progress index
+        progress = get_progress(candidate, select_related=('paper', 'module'))
         
-        # Find failed papers/exams
         failed_items = []
-        for result in results:
-            if not result.is_passing:
-                if result.paper:
-                    failed_items.append({
-                        'type': 'paper',
-                        'id': result.paper_id,
-                        'paper_id': result.paper_id,
-                        'code': result.paper.paper_code,
-                        'name': result.paper.paper_name,
-                        'result_type': result.type,
-                        'mark': float(result.mark) if result.mark else None,
-                        'grade': result.grade,
-                    })
-                elif result.exam:
-                    failed_items.append({
-                        'type': 'exam',
-                        'id': result.exam_id,
-                        'exam_id': result.exam_id,
-                        'code': result.exam.module_code,
-                        'name': result.exam.module_name,
-                        'result_type': result.type,
-                        'mark': float(result.mark) if result.mark else None,
-                        'grade': result.grade,
-                    })
+        for row in progress.failed_level_rows(level.id):
+            if row.paper_id:
+                failed_items.append({
+                    'type': 'paper',
+                    'id': row.paper_id,
+                    'paper_id': row.paper_id,
+                    'code': row.paper.paper_code,
+                    'name': row.paper.paper_name,
+                    'result_type': row.type,
+                    'mark': float(row.last_failed_mark) if row.last_failed_mark else None,
+                    'grade': row.last_failed_grade,
+                })
+            elif row.module_id:
+                failed_items.append({
+                    'type': 'exam',
+                    'id': row.module_id,
+                    'exam_id': row.module_id,
+                    'code': row.module.module_code,
+                    'name': row.module.module_name,
+                    'result_type': row.type,
+                    'mark': float(row.last_failed_mark) if row.last_failed_mark else None,
+                    'grade': row.last_failed_grade,
+                })
         
         # Check if there are any failed items (is_retake)
         is_retake = len(failed_items) > 0
@@ -1944,8 +1698,11 @@ class FormalResultViewSet(viewsets.ViewSet):
         return Response(results_data, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'], url_path='transcript-pdf')
-    def transcript_pdf(self, request):
-        """Generate official transcript PDF for formal candidate"""
+    def transcript_pdf(self, request, standing=None):
+        """
+        Generate official transcript PDF for formal candidate. Batch callers
+        pass the candidate's precomputed `standing` (results.best_results).
+        """
         
         candidate_id = request.query_params.get('candidate_id')
         duplicate_watermark = request.query_params.get('duplicate_watermark', 'false').lower() == 'true'
@@ -1965,36 +1722,16 @@ class FormalResultViewSet(viewsets.ViewSet):
             )
         
         # Check if candidate qualifies for transcript (best result per paper/exam must be successful)
-        all_formal_results = FormalResult.objects.filter(candidate=candidate).select_related(
-            'paper', 'exam', 'level', 'assessment_series'
-        ).order_by('-assessment_series__start_date')
+        if standing is None:
+            standing = formal_standings([candidate.id])[candidate.id]
+        formal_results = standing.results
         
-        if not all_formal_results.exists():
+        if not formal_results:
             return Response(
                 {'error': 'Candidate does not qualify for transcript. No results found.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get best result per paper/exam and type (successful retake overrides failed)
-        first_result = all_formal_results.first()
-        is_paper_based = first_result.paper is not None
-        
-        best_results = {}
-        for result in all_formal_results:
-            if is_paper_based:
-                key = (result.paper_id, result.type)
-            else:
-                key = (result.exam_id, result.type)
-            
-            if key not in best_results:
-                best_results[key] = result
-            else:
-                existing = best_results[key]
-                if result.is_passing and not existing.is_passing:
-                    best_results[key] = result
-        
-        formal_results = list(best_results.values())
-        
         # Check if all best results are successful
         all_successful = all(r.comment == 'Successful' for r in formal_results)
         
@@ -2004,37 +1741,12 @@ class FormalResultViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check qualification based on level structure type
-        if first_result and first_result.level:
-            level = first_result.level
-            
-            if level.structure_type == 'modules':
-                # For module-based levels, formal candidates just need Theory + Practical passed
-                has_theory_passed = any(r.type == 'theory' and r.comment == 'Successful' for r in formal_results)
-                has_practical_passed = any(r.type == 'practical' and r.comment == 'Successful' for r in formal_results)
-                
-                if not (has_theory_passed and has_practical_passed):
-                    missing = []
-                    if not has_theory_passed:
-                        missing.append("Theory")
-                    if not has_practical_passed:
-                        missing.append("Practical")
-                    return Response(
-                        {'error': f'Candidate does not qualify for transcript. Missing successful results for: {", ".join(missing)}.'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            else:
-                # For paper-based levels, check credit units
-                earned_cus = sum(r.paper.credit_units for r in formal_results if r.comment == 'Successful' and r.paper and r.paper.credit_units)
-                
-                level_papers = OccupationPaper.objects.filter(level=level, is_active=True)
-                required_cus = sum(p.credit_units for p in level_papers if p.credit_units)
-                
-                if earned_cus < required_cus:
-                    return Response(
-                        {'error': f'Candidate does not qualify for transcript. Earned credit units ({earned_cus}) are less than required ({required_cus}).'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+        # Module-based levels need Theory + Practical passed, paper-based levels the credit units
+        if standing.level and not standing.qualifies:
+            return Response(
+                {'error': f'Candidate does not qualify for transcript. {standing.message}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Create PDF buffer
         buffer = BytesIO()
@@ -2060,97 +1772,13 @@ class FormalResultViewSet(viewsets.ViewSet):
         qr_img.save(qr_buffer, format='PNG')
         qr_buffer.seek(0)
         
-        # Define Page Templates for mixed orientation
-        def draw_duplicate_watermark(canvas):
-            """Draw diagonal DUPLICATE watermark across the page"""
-            if duplicate_watermark:
-                canvas.saveState()
-                canvas.setFont('Helvetica-Bold', 72)
-                canvas.setFillColor(colors.Color(1, 0, 0, alpha=0.3))  # Semi-transparent red
-                canvas.translate(A4[0]/2, A4[1]/2)
-                canvas.rotate(45)
-                canvas.drawCentredString(0, 0, "DUPLICATE")
-                canvas.restoreState()
-        
-        def onFirstPage(canvas, doc):
-            canvas.saveState()
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-            
-            # Signature at bottom right (moved down by 2cm)
-            signature_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'es_signature.jpg')
-            if os.path.exists(signature_path):
-                try:
-                    canvas.drawImage(signature_path, A4[0] - 6*cm, 0.4*cm, width=4*cm, height=2*cm, mask='auto', preserveAspectRatio=True)
-                except:
-                    pass
-            canvas.restoreState()
-
-        def onLaterPages(canvas, doc):
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-
-        def onPortraitBack(canvas, doc):
-            # Draw DUPLICATE watermark if needed
-            draw_duplicate_watermark(canvas)
-            # Rotate content 90 degrees (Counter-Clockwise)
-            canvas.translate(A4[0], 0)
-            canvas.rotate(90)
-
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=2.5*cm, leftMargin=1.5*cm, rightMargin=1.5*cm,
-                                 title=f'Transcript - {candidate.full_name}', author='UVTAB')
-        
-        # Create Frames
-        frame_portrait = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='portrait')
-        frame_landscape = Frame(doc.leftMargin, doc.bottomMargin, landscape(A4)[0]-2*doc.leftMargin, landscape(A4)[1]-doc.bottomMargin-doc.topMargin, id='landscape')
-        
-        doc.addPageTemplates([
-            PageTemplate(id='portrait', frames=frame_portrait, onPage=onFirstPage),
-            # Landscape content frame on Portrait page with -90 rotation
-            PageTemplate(id='portrait_back', frames=frame_landscape, onPage=onPortraitBack, pagesize=A4)
-        ])
+        doc = build_transcript_doc(buffer, f'Transcript - {candidate.full_name}', duplicate_watermark=duplicate_watermark)
 
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles - smaller fonts for neat layout
-        title_style = ParagraphStyle(
-            'TranscriptTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            textColor=colors.black,
-            spaceAfter=10,
-            spaceBefore=0,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
-        
-        info_label_style = ParagraphStyle(
-            'InfoLabel',
-            parent=styles['Normal'],
-            fontSize=9,
-            fontName='Times-Bold',
-            alignment=TA_LEFT
-        )
-        
-        info_value_style = ParagraphStyle(
-            'InfoValue',
-            parent=styles['Normal'],
-            fontSize=9,
-            fontName='Times-Roman',
-            alignment=TA_LEFT
-        )
-
-        section_heading_style = ParagraphStyle(
-            'SectionHeading',
-            parent=styles['Heading2'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=8,
-            spaceBefore=10,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
+        styles = transcript_styles('compact')
+        info_label_style = styles['info_label']
+        info_value_style = styles['info_value']
+        section_heading_style = styles['section_heading']
 
         # Content - Page 1 (No TRANSCRIPT title - paper already has it printed)
         elements.append(Spacer(1, 3.5*cm))
@@ -2168,7 +1796,7 @@ class FormalResultViewSet(viewsets.ViewSet):
                     img_buffer.seek(0)
                     candidate_photo = Image(img_buffer, width=2.8*cm, height=3.5*cm)
                     # Photo with reg no below in smaller font
-                    photo_caption_style = ParagraphStyle('PhotoCaption', parent=styles['Normal'], fontSize=6, fontName='Times-Roman', alignment=TA_LEFT)
+                    photo_caption_style = styles['photo_caption']
                     photo_data = [[candidate_photo], [Paragraph(candidate.registration_number or "", photo_caption_style)]]
                     photo_cell = Table(photo_data, colWidths=[4.2*cm])
                     photo_cell.setStyle(TableStyle([
@@ -2236,34 +1864,16 @@ class FormalResultViewSet(viewsets.ViewSet):
         elements.append(Spacer(1, 0.1*cm))
 
         # Formal Results - check level structure type
-        all_results = FormalResult.objects.filter(candidate=candidate).select_related(
-            'level', 'exam', 'exam__level', 'paper', 'assessment_series'
-        ).order_by('-assessment_series__start_date')
-        
         completion_date = None
         level_total_cus = 0
         
-        if all_results.exists():
+        if formal_results:
             # Get first result to determine structure type
-            first_result = all_results.first()
+            first_result = formal_results[0]
             is_paper_based = first_result.level and first_result.level.structure_type == 'papers'
             
-            # Get best result per paper/exam and type (successful retake overrides failed)
-            best_results = {}
-            for result in all_results:
-                if is_paper_based:
-                    key = (result.paper_id, result.type)
-                else:
-                    key = (result.exam_id, result.type)
-                
-                if key not in best_results:
-                    best_results[key] = result
-                else:
-                    existing = best_results[key]
-                    if result.is_passing and not existing.is_passing:
-                        best_results[key] = result
-            
-            results = list(best_results.values())
+            # Best result per paper/exam and type (successful retake overrides failed)
+            results = formal_results
             
             # Get completion date from most recent series in best results
             latest_series = None
@@ -2302,10 +1912,10 @@ class FormalResultViewSet(viewsets.ViewSet):
                 # Row 1: Code, Module, CU, Grade | Code, Module, CU, Grade
                 # Row 2+: Data rows
                 
-                header_style = ParagraphStyle('TableHeader', parent=styles['Normal'], fontSize=10, fontName='Times-Bold', alignment=TA_CENTER)
-                col_header_style = ParagraphStyle('ColHeader', parent=styles['Normal'], fontSize=9, fontName='Times-Bold', alignment=TA_CENTER)
-                data_style = ParagraphStyle('DataStyle', parent=styles['Normal'], fontSize=9, fontName='Times-Roman')
-                data_center_style = ParagraphStyle('DataCenterStyle', parent=styles['Normal'], fontSize=9, fontName='Times-Roman', alignment=TA_CENTER)
+                header_style = styles['table_header']
+                col_header_style = styles['col_header']
+                data_style = styles['data']
+                data_center_style = styles['data_center']
                 
                 table_data = []
                 
@@ -2473,118 +2083,8 @@ class FormalResultViewSet(viewsets.ViewSet):
             
         elements.append(Spacer(1, 0.5*cm))
 
-        # Page Break (Stays Portrait but uses portrait_back template with rotation)
-        elements.append(NextPageTemplate('portrait_back'))
-        elements.append(PageBreak())
-        
-        # Page 2 - Header (Logo + Title)
-        logo_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
-        if os.path.exists(logo_path):
-            try:
-                logo = Image(logo_path, width=1.5*cm, height=1.5*cm)
-                elements.append(logo)
-                elements.append(Spacer(1, 0.1*cm))
-            except:
-                pass
-        
-        elements.append(Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", ParagraphStyle(
-            'Page2Title', parent=styles['Heading1'], fontSize=12, alignment=TA_CENTER, fontName='Times-Bold', spaceAfter=10
-        )))
-
-        # Key to Grades Title
-        heading2_style = ParagraphStyle(
-            'Heading2Center', 
-            parent=styles['Heading2'], 
-            alignment=TA_CENTER, 
-            fontName='Times-Bold',
-            fontSize=16,
-            spaceAfter=15
-        )
-        
-        elements.append(Paragraph("KEY TO GRADES", heading2_style))
-        elements.append(Spacer(1, 0.2*cm))
-
-        # Grading Table (Horizontal)
-        # Theory: A+, A, B, B-, C, C-, D, E (8 grades)
-        # Practical: A+, A, B+, B, B-, C, C-, D, D-, E (10 grades)
-        
-        # We need 11 columns (Label + 10 Data)
-        # Theory Section (8 grades)
-        theory_data = [
-            [Paragraph("<b>THEORY SCORES</b>", info_label_style)] + [""] * 8,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B", "B-", "C", "C-", "D", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "85-100", "80-84", "70-79", "60-69", "50-59", "40-49", "30-39", "0-29"],
-        ]
-        
-        theory_col_widths = [2.7*cm] + [2.4*cm]*8
-        
-        theory_table = Table(theory_data, colWidths=theory_col_widths, hAlign='LEFT')
-        theory_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(theory_table)
-        elements.append(Spacer(1, 0.4*cm))
-        
-        # Practical Section (10 grades)
-        practical_data = [
-            [Paragraph("<b>PRACTICAL SCORES</b>", info_label_style)] + [""] * 10,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B+", "B", "B-", "C", "C-", "D", "D-", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "90-100", "85-89", "75-84", "65-74", "60-64", "55-59", "50-54", "40-49", "30-39", "0-29"],
-        ]
-        
-        practical_col_widths = [2.7*cm] + [2.4*cm]*10
-        
-        practical_table = Table(practical_data, colWidths=practical_col_widths, hAlign='LEFT')
-        practical_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(practical_table)
-        elements.append(Spacer(1, 0.4*cm))
-        elements.append(Paragraph("Pass mark is 50% in theory and 65% in practical assessment", ParagraphStyle('PassMark', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=12)))
-        
-        elements.append(Spacer(1, 2*cm))
-        
-
-        
-        # Duplicate warning (Black bar)
-        dup_text = "Any transcript issued as a replacement shall bear a watermark with the word \"Duplicate\" on the front face."
-        dup_table = Table([[Paragraph(f"<b>{dup_text}</b>", ParagraphStyle('Dup', parent=styles['Normal'], textColor=colors.white, alignment=TA_CENTER, fontName='Times-Bold', fontSize=10))]], colWidths=[17*cm])
-        dup_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.black),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ]))
-        elements.append(dup_table)
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Copyright and Address
-        elements.append(Paragraph("© 2026 Uganda Vocational and Technical Assessment Board, Plot 891, Kigobe Road, Kyambogo Hill, P.O.Box 1499 Kampala - Uganda", ParagraphStyle('Copyright', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=9)))
-        elements.append(Paragraph("\"Assessment for Employable Skills\"", ParagraphStyle('Slogan', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Italic', fontSize=9, textColor=colors.black)))
+        # Page 2 - static back page (logo, key to grades, duplicate notice)
+        elements.extend(back_page_flowables('compact'))
 
         doc.build(elements)
         pdf = buffer.getvalue()
@@ -3264,85 +2764,15 @@ class WorkersPasResultViewSet(viewsets.ViewSet):
         # Create PDF buffer
         buffer = BytesIO()
         
-        # Define Page Templates for mixed orientation
-        def onFirstPage(canvas, doc):
-            canvas.saveState()
-            # Signature at absolute bottom (moved down by 2cm)
-            signature_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'es_signature.jpg')
-            if os.path.exists(signature_path):
-                try:
-                    # Draw signature image
-                    canvas.drawImage(signature_path, A4[0] - 6*cm, 0.4*cm, width=4*cm, height=2*cm, mask='auto', preserveAspectRatio=True)
-                except:
-                    pass
-            
-            # Draw "EXECUTIVE SECRETARY" text centered under signature
-            canvas.setFont("Times-Bold", 10)
-            canvas.drawCentredString(A4[0] - 4*cm, 1.3*cm, "EXECUTIVE SECRETARY")
-            canvas.restoreState()
-
-        def onLaterPages(canvas, doc):
-            pass
-
-        def onPortraitBack(canvas, doc):
-            # Rotate content 90 degrees (Counter-Clockwise)
-            canvas.translate(A4[0], 0)
-            canvas.rotate(90)
-
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*cm, bottomMargin=3*cm, leftMargin=1.5*cm, rightMargin=1.5*cm,
-                                 title=f'Transcript - {candidate.full_name}', author='UVTAB')
-        
-        # Create Frames
-        frame_portrait = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='portrait')
-        frame_landscape = Frame(doc.leftMargin, doc.bottomMargin, landscape(A4)[0]-2*doc.leftMargin, landscape(A4)[1]-doc.bottomMargin-doc.topMargin, id='landscape')
-        
-        doc.addPageTemplates([
-            PageTemplate(id='portrait', frames=frame_portrait, onPage=onFirstPage),
-            # Landscape content frame on Portrait page with -90 rotation
-            PageTemplate(id='portrait_back', frames=frame_landscape, onPage=onPortraitBack, pagesize=A4)
-        ])
+        doc = build_transcript_doc(buffer, f'Transcript - {candidate.full_name}', bottom_margin=3*cm,
+                                   signature_caption="EXECUTIVE SECRETARY")
 
         elements = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'TranscriptTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.black,
-            spaceAfter=20,
-            spaceBefore=0,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
-        
-        info_label_style = ParagraphStyle(
-            'InfoLabel',
-            parent=styles['Normal'],
-            fontSize=11,
-            fontName='Times-Bold',
-            alignment=TA_LEFT
-        )
-        
-        info_value_style = ParagraphStyle(
-            'InfoValue',
-            parent=styles['Normal'],
-            fontSize=11,
-            fontName='Times-Roman',
-            alignment=TA_LEFT
-        )
-
-        section_heading_style = ParagraphStyle(
-            'SectionHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.black,
-            spaceAfter=10,
-            spaceBefore=15,
-            alignment=TA_CENTER,
-            fontName='Times-Bold'
-        )
+        styles = transcript_styles('workers_pas')
+        title_style = styles['title']
+        info_label_style = styles['info_label']
+        info_value_style = styles['info_value']
+        section_heading_style = styles['section_heading']
 
         # Content - Page 1
         elements.append(Spacer(1, 5*cm))
@@ -3442,118 +2872,8 @@ class WorkersPasResultViewSet(viewsets.ViewSet):
         # Footer - Removed (handled in onFirstPage)
         elements.append(Spacer(1, 1*cm))
 
-        # Page Break (Stays Portrait)
-        elements.append(NextPageTemplate('portrait_back'))
-        elements.append(PageBreak())
-
-        # Page 2 - Header (Logo + Title)
-        logo_path = os.path.join(settings.BASE_DIR, 'static', 'images', 'uvtab-logo.png')
-        if os.path.exists(logo_path):
-            try:
-                logo = Image(logo_path, width=1.5*cm, height=1.5*cm)
-                elements.append(logo)
-                elements.append(Spacer(1, 0.1*cm))
-            except:
-                pass
-        
-        elements.append(Paragraph("UGANDA VOCATIONAL AND TECHNICAL ASSESSMENT BOARD", ParagraphStyle(
-            'Page2Title', parent=styles['Heading1'], fontSize=12, alignment=TA_CENTER, fontName='Times-Bold', spaceAfter=10
-        )))
-
-        # Page 2 - Key to Grades
-        heading2_style = ParagraphStyle(
-            'Heading2Center', 
-            parent=styles['Heading2'], 
-            alignment=TA_CENTER, 
-            fontName='Times-Bold',
-            fontSize=16,
-            spaceAfter=15
-        )
-        
-        elements.append(Paragraph("KEY TO GRADES", heading2_style))
-        elements.append(Spacer(1, 0.2*cm))
-
-        # Grading Table (Horizontal)
-        # Theory: A+, A, B, B-, C, C-, D, E (8 grades)
-        # Practical: A+, A, B+, B, B-, C, C-, D, D-, E (10 grades)
-        
-        # We need 11 columns (Label + 10 Data)
-        # Theory Section (8 grades)
-        theory_data = [
-            [Paragraph("<b>THEORY SCORES</b>", info_label_style)] + [""] * 8,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B", "B-", "C", "C-", "D", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "85-100", "80-84", "70-79", "60-69", "50-59", "40-49", "30-39", "0-29"],
-        ]
-        
-        theory_col_widths = [2.7*cm] + [2.4*cm]*8
-        
-        theory_table = Table(theory_data, colWidths=theory_col_widths, hAlign='LEFT')
-        theory_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(theory_table)
-        elements.append(Spacer(1, 0.4*cm))
-        
-        # Practical Section (10 grades)
-        practical_data = [
-            [Paragraph("<b>PRACTICAL SCORES</b>", info_label_style)] + [""] * 10,
-            [Paragraph("<b>Grade</b>", info_value_style), "A+", "A", "B+", "B", "B-", "C", "C-", "D", "D-", "E"],
-            [Paragraph("<b>Score %</b>", info_value_style), "90-100", "85-89", "75-84", "65-74", "60-64", "55-59", "50-54", "40-49", "30-39", "0-29"],
-        ]
-        
-        practical_col_widths = [2.7*cm] + [2.4*cm]*10
-        
-        practical_table = Table(practical_data, colWidths=practical_col_widths, hAlign='LEFT')
-        practical_table.setStyle(TableStyle([
-            # Header
-            ('SPAN', (0, 0), (-1, 0)),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            
-            # Grid and Borders
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            # Fonts and Alignment
-            ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(practical_table)
-        elements.append(Spacer(1, 0.4*cm))
-        elements.append(Paragraph("Pass mark is 50% in theory and 65% in practical assessment", ParagraphStyle('PassMark', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=12)))
-        
-        elements.append(Spacer(1, 2*cm))
-        
-
-        
-        # Duplicate warning (Black bar)
-        dup_text = "Any transcript issued as a replacement shall bear a watermark with the word \"Duplicate\" on the front face."
-        dup_table = Table([[Paragraph(f"<b>{dup_text}</b>", ParagraphStyle('Dup', parent=styles['Normal'], textColor=colors.white, alignment=TA_CENTER, fontName='Times-Bold', fontSize=10))]], colWidths=[17*cm])
-        dup_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.black),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ]))
-        elements.append(dup_table)
-        elements.append(Spacer(1, 0.5*cm))
-        
-        # Copyright and Address
-        elements.append(Paragraph("© 2026 Uganda Vocational and Technical Assessment Board, Plot 891, Kigobe Road, Kyambogo Hill, P.O.Box 1499 Kampala - Uganda", ParagraphStyle('Copyright', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Bold', fontSize=9)))
-        elements.append(Paragraph("\"Assessment for Employable Skills\"", ParagraphStyle('Slogan', parent=styles['Normal'], alignment=TA_CENTER, fontName='Times-Italic', fontSize=9, textColor=colors.black)))
+        # Page 2 - static back page (logo, key to grades, duplicate notice)
+        elements.extend(back_page_flowables('workers_pas'))
 
         doc.build(elements)
         pdf = buffer.getvalue()
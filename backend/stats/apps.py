@@ -5,3 +5,6 @@ class StatsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stats'
     verbose_name = 'Statistics Management'
+
+    def ready(self):
+        import stats.signals
@@ -0,0 +1,124 @@
+"""
+Dashboard counters.
+
+The statistics landing widgets (overall totals, candidates by gender,
+category and special needs) read named DashboardCounter rows instead of
+counting the candidate and result tables on every page load.
+
+Each counter is defined by a model and the field values a row must have to
+be counted. The signals in stats/signals.py turn saves and deletes into
++1/-1 deltas, applied once the surrounding transaction commits (rolled-back
+writes never touch the counters). Writes that bypass signals (bulk_create,
+queryset.update, raw SQL) are corrected by reconcile(), run periodically
+by `python manage.py reconcile_dashboard_counters`.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
+
+from assessment_centers.models import AssessmentCenter
+from candidates.models import Candidate
+from occupations.models import Occupation
+from results.models import ModularResult, FormalResult, WorkersPasResult
+
+from .models import DashboardCounter
+
+# model -> {counter name: field values a row needs to be counted}
+COUNTERS = {
+    Candidate: {
+        'candidates': {},
+        'candidates_male': {'gender': 'male'},
+        'candidates_female': {'gender': 'female'},
+        'candidates_other': {'gender': 'other'},
+        'candidates_modular': {'registration_category': 'modular'},
+        'candidates_formal': {'registration_category': 'formal'},
+        'candidates_workers_pas': {'registration_category': 'workers_pas'},
+        'candidates_with_special_needs': {'has_disability': True},
+        'candidates_without_special_needs': {'has_disability': False},
+        'male_with_special_needs': {'has_disability': True, 'gender': 'male'},
+        'female_with_special_needs': {'has_disability': True, 'gender': 'female'},
+    },
+    Occupation: {'occupations': {}},
+    AssessmentCenter: {'centers': {}},
+    ModularResult: {'modular_results': {}},
+    FormalResult: {'formal_results': {}},
+    WorkersPasResult: {'workers_pas_results': {}},
+}
+
+COUNTER_NAMES = [name for counters in COUNTERS.values() for name in counters]
+
+
+# model -> fields whose changes can move its rows between counters
+TRACKED_FIELDS = {
+    model: tuple(sorted({field for conditions in counters.values() for field in conditions}))
+    for model, counters in COUNTERS.items()
+}
+
+
+def tracked_fields(model):
+    """Fields whose changes can move `model` rows between counters."""
+    return TRACKED_FIELDS[model]
+
+
+def matching(instance):
+    """Names of the counters `instance` is currently counted in."""
+    return frozenset(
+        name for name, conditions in COUNTERS[type(instance)].items()
+        if all(getattr(instance, field) == value for field, value in conditions.items())
+    )
+
+
+def _apply(deltas):
+    DashboardCounter.objects.filter(name__in=deltas).update(
+        value=F('value') + Case(*(When(name=name, then=Value(delta)) for name, delta in deltas.items())),
+        updated_at=timezone.now(),
+    )
+
+
+def record(before=frozenset(), after=frozenset()):
+    """Queue the move of one row from the `before` counters to the `after` counters."""
+    deltas = {name: 1 for name in after - before}
+    deltas.update((name, -1) for name in before - after)
+    if deltas:
+        transaction.on_commit(lambda: _apply(deltas))
+
+
+def count_all():
+    """Recount every counter from the source tables (one aggregate per model)."""
+    values = {}
+    for model, counters in COUNTERS.items():
+        values.update(model.objects.aggregate(**{
+            name: Count('pk', filter=Q(**conditions)) for name, conditions in counters.items()
+        }))
+    return values
+
+
+@transaction.atomic
+def reconcile():
+    """
+    Overwrite the counters with fresh counts. Returns {name: (stored, actual)}
+    for every counter that was missing or had drifted.
+    """
+    stored = dict(
+        DashboardCounter.objects.select_for_update().values_list('name', 'value')
+    )
+    actual = count_all()
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(name=name, value=value) for name, value in actual.items()],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['value', 'updated_at'],
+    )
+    return {
+        name: (stored.get(name), value) for name, value in actual.items()
+        if stored.get(name) != value
+    }
+
+
+def read_counters():
+    """All counter values in one query; reconciles first if any counter is missing."""
+    values = dict(DashboardCounter.objects.filter(name__in=COUNTER_NAMES).values_list('name', 'value'))
+    if len(values) < len(COUNTER_NAMES):
+        reconcile()
+        values = dict(DashboardCounter.objects.filter(name__in=COUNTER_NAMES).values_list('name', 'value'))
+    return values
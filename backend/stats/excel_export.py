@@ -14,6 +14,7 @@ from rest_framework.response import Response
 
 from assessment_series.models import AssessmentSeries
 from occupations.models import Sector
+from .fact_cube import special_needs_analytics_data
 
 
 def create_formatted_excel(series, overview, category_stats, sector_stats, occupation_stats, grade_dist, centers_by_sector, centers_summary):
@@ -645,176 +646,19 @@ def export_special_needs_excel(request):
     Export special needs statistics to Excel file
     """
     try:
-        # We need to recreate the logic from special_needs_analytics to avoid request type issues
-        from results.models import ModularResult, FormalResult, WorkersPasResult
-        from configurations.models import NatureOfDisability
-        
         series_id = request.query_params.get('series_id')
+        series_filter = AssessmentSeries.objects.get(id=series_id).name if series_id else None
         
-        # Get all results (optionally filtered by series)
-        if series_id:
-            all_results = list(ModularResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability')) + \
-                          list(FormalResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability')) + \
-                          list(WorkersPasResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability'))
-            series = AssessmentSeries.objects.get(id=series_id)
-            series_filter = series.name
-        else:
-            all_results = list(ModularResult.objects.all().select_related('candidate', 'candidate__nature_of_disability')) + \
-                          list(FormalResult.objects.all().select_related('candidate', 'candidate__nature_of_disability')) + \
-                          list(WorkersPasResult.objects.all().select_related('candidate', 'candidate__nature_of_disability'))
-            series_filter = None
-        
-        # Filter to only special needs candidates
-        special_needs_results = [r for r in all_results if r.candidate.has_disability]
-        
-        # Calculate overview
-        special_needs_male = [r for r in special_needs_results if r.candidate.gender == 'male']
-        special_needs_female = [r for r in special_needs_results if r.candidate.gender == 'female']
-        
-        def is_passed(result):
-            # Skip results without marks
-            if result.mark is None:
-                return False
-                
-            if isinstance(result, ModularResult):
-                return result.mark >= 65
-            elif isinstance(result, FormalResult):
-                return (result.type == 'theory' and result.mark >= 50) or (result.type == 'practical' and result.mark >= 65)
-            elif isinstance(result, WorkersPasResult):
-                return result.mark >= 65
-            return False
-        
-        male_passed = sum(1 for r in special_needs_male if is_passed(r))
-        female_passed = sum(1 for r in special_needs_female if is_passed(r))
-        total_passed = male_passed + female_passed
-        
-        overview = {
-            'total': len(special_needs_results),
-            'male': len(special_needs_male),
-            'female': len(special_needs_female),
-            'male_passed': male_passed,
-            'female_passed': female_passed,
-            'total_passed': total_passed,
-            'male_pass_rate': round((male_passed / len(special_needs_male) * 100), 2) if len(special_needs_male) > 0 else 0,
-            'female_pass_rate': round((female_passed / len(special_needs_female) * 100), 2) if len(special_needs_female) > 0 else 0,
-            'pass_rate': round((total_passed / len(special_needs_results) * 100), 2) if len(special_needs_results) > 0 else 0
-        }
-        
-        # By disability type
-        disability_breakdown = []
-        for disability in NatureOfDisability.objects.all():
-            disability_results = [r for r in special_needs_results if r.candidate.nature_of_disability == disability]
-            
-            if not disability_results:
-                continue
-            
-            dis_male = [r for r in disability_results if r.candidate.gender == 'male']
-            dis_female = [r for r in disability_results if r.candidate.gender == 'female']
-            
-            dis_male_passed = sum(1 for r in dis_male if is_passed(r))
-            dis_female_passed = sum(1 for r in dis_female if is_passed(r))
-            dis_total_passed = dis_male_passed + dis_female_passed
-            
-            disability_breakdown.append({
-                'name': disability.name,
-                'total': len(disability_results),
-                'male': len(dis_male),
-                'female': len(dis_female),
-                'male_passed': dis_male_passed,
-                'female_passed': dis_female_passed,
-                'total_passed': dis_total_passed,
-                'male_pass_rate': round((dis_male_passed / len(dis_male) * 100), 2) if len(dis_male) > 0 else 0,
-                'female_pass_rate': round((dis_female_passed / len(dis_female) * 100), 2) if len(dis_female) > 0 else 0,
-                'pass_rate': round((dis_total_passed / len(disability_results) * 100), 2) if len(disability_results) > 0 else 0
-            })
-        
-        # By sector
-        from occupations.models import Sector
-        sector_breakdown = []
-        for sector in Sector.objects.all():
-            sector_results = [r for r in special_needs_results if 
-                             r.candidate.occupation and r.candidate.occupation.sector == sector]
-            
-            if not sector_results:
-                continue
-            
-            sector_male = [r for r in sector_results if r.candidate.gender == 'male']
-            sector_female = [r for r in sector_results if r.candidate.gender == 'female']
-            
-            sector_male_passed = sum(1 for r in sector_male if is_passed(r))
-            sector_female_passed = sum(1 for r in sector_female if is_passed(r))
-            sector_total_passed = sector_male_passed + sector_female_passed
-            
-            sector_breakdown.append({
-                'sector_name': sector.name,
-                'total': len(sector_results),
-                'male': len(sector_male),
-                'female': len(sector_female),
-                'male_passed': sector_male_passed,
-                'female_passed': sector_female_passed,
-                'total_passed': sector_total_passed,
-                'male_pass_rate': round((sector_male_passed / len(sector_male) * 100), 2) if len(sector_male) > 0 else 0,
-                'female_pass_rate': round((sector_female_passed / len(sector_female) * 100), 2) if len(sector_female) > 0 else 0,
-                'pass_rate': round((sector_total_passed / len(sector_results) * 100), 2) if len(sector_results) > 0 else 0
-            })
-        
-        # REFUGEE STATISTICS
-        refugee_results = [r for r in all_results if r.candidate.is_refugee]
-        refugee_male = [r for r in refugee_results if r.candidate.gender == 'male']
-        refugee_female = [r for r in refugee_results if r.candidate.gender == 'female']
-        
-        refugee_male_passed = sum(1 for r in refugee_male if is_passed(r))
-        refugee_female_passed = sum(1 for r in refugee_female if is_passed(r))
-        refugee_total_passed = refugee_male_passed + refugee_female_passed
-        
-        refugee_overview = {
-            'total': len(refugee_results),
-            'male': len(refugee_male),
-            'female': len(refugee_female),
-            'male_passed': refugee_male_passed,
-            'female_passed': refugee_female_passed,
-            'total_passed': refugee_total_passed,
-            'male_pass_rate': round((refugee_male_passed / len(refugee_male) * 100), 2) if len(refugee_male) > 0 else 0,
-            'female_pass_rate': round((refugee_female_passed / len(refugee_female) * 100), 2) if len(refugee_female) > 0 else 0,
-            'pass_rate': round((refugee_total_passed / len(refugee_results) * 100), 2) if len(refugee_results) > 0 else 0
-        }
-        
-        # Refugee by sector
-        refugee_sector = []
-        for sector in Sector.objects.all():
-            sector_results = [r for r in refugee_results if 
-                             r.candidate.occupation and r.candidate.occupation.sector == sector]
-            
-            if not sector_results:
-                continue
-            
-            sector_male = [r for r in sector_results if r.candidate.gender == 'male']
-            sector_female = [r for r in sector_results if r.candidate.gender == 'female']
-            
-            sector_male_passed = sum(1 for r in sector_male if is_passed(r))
-            sector_female_passed = sum(1 for r in sector_female if is_passed(r))
-            sector_total_passed = sector_male_passed + sector_female_passed
-            
-            refugee_sector.append({
-                'sector_name': sector.name,
-                'total': len(sector_results),
-                'male': len(sector_male),
-                'female': len(sector_female),
-                'male_passed': sector_male_passed,
-                'female_passed': sector_female_passed,
-                'total_passed': sector_total_passed,
-                'male_pass_rate': round((sector_male_passed / len(sector_male) * 100), 2) if len(sector_male) > 0 else 0,
-                'female_pass_rate': round((sector_female_passed / len(sector_female) * 100), 2) if len(sector_female) > 0 else 0,
-                'pass_rate': round((sector_total_passed / len(sector_results) * 100), 2) if len(sector_results) > 0 else 0
-            })
+        # Same figures as special_needs_analytics, from the cached results cube
+        analytics = special_needs_analytics_data(series_id)
         
         # Create Excel workbook with both special needs and refugee data
         wb = create_special_needs_excel(
-            special_needs_overview=overview,
-            disability_breakdown=disability_breakdown,
-            special_needs_sector=sector_breakdown,
-            refugee_overview=refugee_overview,
-            refugee_sector=refugee_sector,
+            special_needs_overview=analytics['special_needs']['overview'],
+            disability_breakdown=analytics['special_needs']['by_disability_type'],
+            special_needs_sector=analytics['special_needs']['by_sector'],
+            refugee_overview=analytics['refugee']['overview'],
+            refugee_sector=analytics['refugee']['by_sector'],
             series_filter=series_filter
         )
         
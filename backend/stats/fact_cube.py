@@ -0,0 +1,189 @@
+"""
+Columnar results fact cube for the special-needs, refugee and sector analytics.
+
+Every result row (modular, formal and Worker's PAS) is reduced to a handful
+of small integer codes held in parallel `array` columns: candidate gender,
+disability flag and type, refugee flag, sector and pass flag. The cube is
+built from one `.values_list()` stream per result table and cached per
+series (or for all series) under the current results/candidates versions,
+so any result or candidate write moves readers to a fresh cube. Without a
+shared cache other workers would never see those versions move, so the cube
+is then built on every call instead.
+
+Group-by questions are answered with one counting pass over a composite
+code (group, gender, passed) instead of rescanning model instances once
+per disability type or sector.
+"""
+from array import array
+from itertools import compress, repeat
+
+from django.core.cache import cache
+
+from emis.http_cache import get_version, shared_cache_enabled
+
+CUBE_CACHE_TIMEOUT = 60 * 60
+
+# Gender codes; 0 covers anything else (counted in totals only)
+GENDER_CODES = {'male': 1, 'female': 2}
+GENDER_BINS = 3
+
+CATEGORY_CODES = {'modular': 0, 'formal': 1, 'workers_pas': 2}
+
+
+def _modular_passed(mark, result_type):
+    return mark is not None and mark >= 65
+
+
+def _formal_passed(mark, result_type):
+    if mark is None:
+        return False
+    return (result_type == 'theory' and mark >= 50) or (result_type == 'practical' and mark >= 65)
+
+
+def _workers_pas_passed(mark, result_type):
+    return mark is not None and mark >= 65
+
+
+class ResultsCube:
+    """Parallel columns, one entry per result row."""
+
+    def __init__(self):
+        self.gender = array('b')
+        self.has_disability = array('b')
+        self.disability = array('l')   # NatureOfDisability id, 0 if none
+        self.refugee = array('b')
+        self.sector = array('l')       # Sector id, 0 if the candidate has no occupation/sector
+        self.category = array('b')
+        self.passed = array('b')
+
+    def __len__(self):
+        return len(self.passed)
+
+    def extend(self, category, rows, is_passed):
+        """Append rows of (gender, has_disability, disability_id, is_refugee, sector_id, mark, type)."""
+        category_code = CATEGORY_CODES[category]
+        for gender, has_disability, disability_id, is_refugee, sector_id, mark, result_type in rows:
+            self.gender.append(GENDER_CODES.get(gender, 0))
+            self.has_disability.append(1 if has_disability else 0)
+            self.disability.append(disability_id or 0)
+            self.refugee.append(1 if is_refugee else 0)
+            self.sector.append(sector_id or 0)
+            self.category.append(category_code)
+            self.passed.append(1 if is_passed(mark, result_type) else 0)
+
+    def counts(self, where=None, group_by=None):
+        """
+        Bin-count (group, gender, passed) over the rows selected by the `where`
+        flag column. Returns {group_id: [n(gender, passed) for gender bins × {0, 1}]};
+        without `group_by` everything falls into group 0.
+        """
+        gender, passed = self.gender, self.passed
+        groups = getattr(self, group_by) if group_by else repeat(0)
+        codes = zip(groups, gender, passed)
+        if where is not None:
+            codes = compress(codes, getattr(self, where))
+
+        bins = {}
+        for group, gender_code, passed_flag in codes:
+            group_bins = bins.get(group)
+            if group_bins is None:
+                group_bins = bins[group] = [0] * (GENDER_BINS * 2)
+            group_bins[gender_code * 2 + passed_flag] += 1
+        return bins
+
+
+def summarise(group_bins):
+    """Turn one group's bins into the totals/pass-rate dict used by the analytics endpoints."""
+    if group_bins is None:
+        group_bins = [0] * (GENDER_BINS * 2)
+    male = group_bins[2] + group_bins[3]
+    female = group_bins[4] + group_bins[5]
+    total = sum(group_bins)
+    male_passed = group_bins[3]
+    female_passed = group_bins[5]
+    total_passed = male_passed + female_passed
+    return {
+        'total': total,
+        'male': male,
+        'female': female,
+        'male_passed': male_passed,
+        'female_passed': female_passed,
+        'total_passed': total_passed,
+        'male_pass_rate': round((male_passed / male * 100), 2) if male > 0 else 0,
+        'female_pass_rate': round((female_passed / female * 100), 2) if female > 0 else 0,
+        'pass_rate': round((total_passed / total * 100), 2) if total > 0 else 0
+    }
+
+
+def build_results_cube(series_id=None):
+    """Build the cube from the three result tables (one streamed query each)."""
+    from results.models import ModularResult, FormalResult, WorkersPasResult
+
+    fields = (
+        'candidate__gender', 'candidate__has_disability', 'candidate__nature_of_disability_id',
+        'candidate__is_refugee', 'candidate__occupation__sector_id', 'mark', 'type',
+    )
+    cube = ResultsCube()
+    for category, model, is_passed in (
+        ('modular', ModularResult, _modular_passed),
+        ('formal', FormalResult, _formal_passed),
+        ('workers_pas', WorkersPasResult, _workers_pas_passed),
+    ):
+        queryset = model.objects.order_by()
+        if series_id:
+            queryset = queryset.filter(assessment_series_id=series_id)
+        cube.extend(category, queryset.values_list(*fields).iterator(chunk_size=5000), is_passed)
+    return cube
+
+
+def get_results_cube(series_id=None):
+    """Cached cube for a series (or all series), rebuilt when results or candidates change."""
+    if not shared_cache_enabled():
+        return build_results_cube(series_id)
+    key = 'stats:results_cube:%s:%s:%s' % (
+        series_id or 'all', get_version('results'), get_version('candidates')
+    )
+    cube = cache.get(key)
+    if cube is None:
+        cube = build_results_cube(series_id)
+        cache.set(key, cube, CUBE_CACHE_TIMEOUT)
+    return cube
+
+
+def special_needs_analytics_data(series_id=None):
+    """
+    Special-needs and refugee breakdowns (overall, by disability type and by
+    sector) from the results cube. Groups without results are omitted.
+    """
+    from configurations.models import NatureOfDisability
+    from occupations.models import Sector
+
+    cube = get_results_cube(series_id)
+    sectors = list(Sector.objects.values_list('id', 'name'))
+
+    special_needs_by_disability = cube.counts(where='has_disability', group_by='disability')
+    special_needs_by_sector = cube.counts(where='has_disability', group_by='sector')
+    refugee_by_sector = cube.counts(where='refugee', group_by='sector')
+
+    disability_breakdown = []
+    for disability_id, name in NatureOfDisability.objects.values_list('id', 'name'):
+        if disability_id in special_needs_by_disability:
+            disability_breakdown.append(dict(name=name, **summarise(special_needs_by_disability[disability_id])))
+
+    def by_sector(bins):
+        return [
+            dict(sector_name=name, **summarise(bins[sector_id]))
+            for sector_id, name in sectors if sector_id in bins
+        ]
+
+    return {
+        'special_needs': {
+            'overview': summarise(cube.counts(where='has_disability').get(0)),
+            'by_disability_type': disability_breakdown,
+            'by_sector': by_sector(special_needs_by_sector),
+        },
+        'refugee': {
+            'overview': summarise(cube.counts(where='refugee').get(0)),
+            'by_sector': by_sector(refugee_by_sector),
+        },
+    }
@@ -0,0 +1,34 @@
+"""
+Management command that recounts the dashboard counters (DashboardCounter)
+from the source tables and overwrites any that drifted, e.g. after bulk
+imports, queryset updates or raw SQL fixes that bypass the signals. Run it
+periodically (systemd/emis-counters.timer runs it nightly) or by hand after
+a data migration.
+
+Usage:
+    python manage.py reconcile_dashboard_counters
+    python manage.py reconcile_dashboard_counters -v 2    # Also list the counters that were correct
+"""
+from django.core.management.base import BaseCommand
+
+from stats.counters import COUNTER_NAMES, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recount the dashboard counters and correct any drift.'
+
+    def handle(self, *args, **options):
+        drift = reconcile()
+
+        for name, (stored, actual) in sorted(drift.items()):
+            if stored is None:
+                self.stdout.write(f'   • {name}: created ({actual})')
+            else:
+                self.stdout.write(self.style.WARNING(f'   • {name}: {stored} -> {actual}'))
+
+        if options['verbosity'] >= 2:
+            for name in COUNTER_NAMES:
+                if name not in drift:
+                    self.stdout.write(f'   • {name}: ok')
+
+        self.stdout.write(self.style.SUCCESS(f'Done. {len(drift)} counter(s) corrected.'))
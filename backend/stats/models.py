@@ -33,3 +33,22 @@ class SystemStatistic(models.Model):
     
     def __str__(self):
         return f"{self.get_statistic_type_display()} - {self.value} ({self.recorded_at.strftime('%Y-%m-%d')})"
+
+
+class DashboardCounter(models.Model):
+    """
+    A named running total behind the statistics landing widgets. Kept
+    current by the deltas in stats/counters.py and corrected by the
+    `reconcile_dashboard_counters` command.
+    """
+    name = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Dashboard Counter'
+        verbose_name_plural = 'Dashboard Counters'
+    
+    def __str__(self):
+        return f"{self.name} = {self.value}"
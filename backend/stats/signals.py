@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from . import counters
+
+
+def load_counted(sender, instance, update_fields=None, **kwargs):
+    """Before an update, read which counters the stored row is in, to diff against after the save."""
+    if instance._state.adding or getattr(instance, '_counted_in', None) is not None:
+        return
+    fields = counters.tracked_fields(sender)
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if stored is not None:
+        instance._counted_in = counters.matching(sender(**stored))
+
+
+def load_counted_for_delete(sender, instance, **kwargs):
+    """
+    Deletes count the row by its loaded values (queryset deletes load them
+    fresh), so only rows with deferred tracked fields need the query. A row
+    edited in memory and deleted without saving is counted as edited.
+    """
+    if getattr(instance, '_counted_in', None) is not None:
+        return
+    if all(field in instance.__dict__ for field in counters.tracked_fields(sender)):
+        instance._counted_in = counters.matching(instance)
+    else:
+        load_counted(sender, instance)
+
+
+def count_saved(sender, instance, created, **kwargs):
+    if created:
+        instance._counted_in = counters.matching(instance)
+        counters.record(after=instance._counted_in)
+        return
+    before = getattr(instance, '_counted_in', None)
+    if before is not None:
+        instance._counted_in = counters.matching(instance)
+        counters.record(before, instance._counted_in)
+
+
+def count_deleted(sender, instance, **kwargs):
+    before = getattr(instance, '_counted_in', None)
+    if before is None and not counters.tracked_fields(sender):
+        before = counters.matching(instance)
+    if before is not None:
+        counters.record(before=before)
+
+
+for model in counters.COUNTERS:
+    name = model.__name__
+    post_save.connect(count_saved, sender=model, dispatch_uid=f'dashboard_counters_save_{name}')
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f'dashboard_counters_delete_{name}')
+    if counters.tracked_fields(model):
+        pre_save.connect(load_counted, sender=model, dispatch_uid=f'dashboard_counters_pre_save_{name}')
+        pre_delete.connect(load_counted_for_delete, sender=model, dispatch_uid=f'dashboard_counters_pre_delete_{name}')
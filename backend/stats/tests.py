@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from candidates.models import Candidate
+
+from . import counters, fact_cube
+from .models import DashboardCounter
+
+
+class DashboardCounterSignalTests(TestCase):
+
+    def setUp(self):
+        counters.reconcile()
+
+    def _counter(self, name):
+        return DashboardCounter.objects.get(name=name).value
+
+    def _create(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Candidate.objects.create(
+                full_name='Candidate', date_of_birth=date(2000, 1, 1), contact='0700000000',
+                entry_year=2025, intake='M', **fields,
+            )
+
+    def test_loading_rows_takes_no_snapshot(self):
+        self._create(gender='male', registration_category='modular')
+        candidate = Candidate.objects.get()
+        self.assertNotIn('_counted_in', candidate.__dict__)
+
+    def test_save_moves_the_row_between_counters(self):
+        self._create(gender='male', registration_category='modular')
+        self.assertEqual(self._counter('candidates_male'), 1)
+
+        candidate = Candidate.objects.get()
+        candidate.gender = 'female'
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate.save()
+
+        self.assertEqual(self._counter('candidates'), 1)
+        self.assertEqual(self._counter('candidates_male'), 0)
+        self.assertEqual(self._counter('candidates_female'), 1)
+
+    def test_update_fields_without_tracked_fields_skips_the_lookup(self):
+        self._create(gender='male', registration_category='modular')
+        candidate = Candidate.objects.get()
+        candidate.full_name = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            candidate.save(update_fields=['full_name'])
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'candidates_candidate' in query['sql']
+        ])
+
+    def test_deferred_row_is_counted_from_the_stored_values(self):
+        self._create(gender='male', registration_category='formal', has_disability=True)
+        candidate = Candidate.objects.only('pk', 'full_name').get()
+        candidate.gender = 'female'
+        with self.captureOnCommitCallbacks(execute=True):
+            candidate.save(update_fields=['gender'])
+        self.assertEqual(self._counter('male_with_special_needs'), 0)
+        self.assertEqual(self._counter('female_with_special_needs'), 1)
+
+    def test_delete_removes_the_row_from_its_counters(self):
+        self._create(gender='female', registration_category='workers_pas')
+        with self.captureOnCommitCallbacks(execute=True):
+            Candidate.objects.all().delete()
+        self.assertEqual(self._counter('candidates'), 0)
+        self.assertEqual(self._counter('candidates_female'), 0)
+        self.assertEqual(self._counter('candidates_workers_pas'), 0)
+        self.assertEqual(counters.reconcile(), {})
+
+
+class ResultsCubeCacheTests(TestCase):
+    """The cube is only cached when the results/candidates versions are shared by every worker."""
+
+    def setUp(self):
+        cache.clear()
+
+    def _builds(self):
+        with mock.patch.object(fact_cube, 'build_results_cube', wraps=fact_cube.build_results_cube) as build:
+            fact_cube.get_results_cube()
+            fact_cube.get_results_cube()
+        return build.call_count
+
+    def test_process_local_cache_builds_every_time(self):
+        self.assertEqual(self._builds(), 2)
+
+    def test_shared_cache_reuses_the_cube(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        with override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertEqual(self._builds(), 1)
@@ -7,36 +7,29 @@ Provides aggregated statistics and analytics for the EMIS system
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from django.db.models import Count, Q
-from candidates.models import Candidate
-from occupations.models import Occupation
-from assessment_centers.models import AssessmentCenter
 from results.models import ModularResult, FormalResult, WorkersPasResult
+from emis.http_cache import PUBLIC_SHORT, conditional_get, get_version, make_etag
+from .counters import read_counters
+from .fact_cube import special_needs_analytics_data
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def overall_statistics(request):
     """
-    Get overall system statistics
+    Get overall system statistics (from the dashboard counters)
     """
-    # Count totals
-    total_candidates = Candidate.objects.count()
-    total_occupations = Occupation.objects.count()
-    total_centers = AssessmentCenter.objects.count()
-    
-    # Count all results
-    total_results = (
-        ModularResult.objects.count() +
-        FormalResult.objects.count() +
-        WorkersPasResult.objects.count()
-    )
+    counters = read_counters()
     
     return Response({
-        'total_candidates': total_candidates,
-        'total_occupations': total_occupations,
-        'total_centers': total_centers,
-        'total_results': total_results,
+        'total_candidates': counters['candidates'],
+        'total_occupations': counters['occupations'],
+        'total_centers': counters['centers'],
+        'total_results': (
+            counters['modular_results'] +
+            counters['formal_results'] +
+            counters['workers_pas_results']
+        ),
     })
 
 
@@ -44,61 +37,59 @@ def overall_statistics(request):
 @permission_classes([AllowAny])
 def candidates_by_gender(request):
     """
-    Get candidates grouped by gender
+    Get candidates grouped by gender (from the dashboard counters)
     """
-    stats = Candidate.objects.aggregate(
-        male=Count('id', filter=Q(gender='male')),
-        female=Count('id', filter=Q(gender='female')),
-        other=Count('id', filter=Q(gender='other')),
-    )
+    counters = read_counters()
     
-    return Response(stats)
+    return Response({
+        'male': counters['candidates_male'],
+        'female': counters['candidates_female'],
+        'other': counters['candidates_other'],
+    })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def candidates_by_category(request):
     """
-    Get candidates grouped by registration category
+    Get candidates grouped by registration category (from the dashboard counters)
     """
-    stats = Candidate.objects.aggregate(
-        modular=Count('id', filter=Q(registration_category='modular')),
-        formal=Count('id', filter=Q(registration_category='formal')),
-        workers_pas=Count('id', filter=Q(registration_category='workers_pas')),
-    )
+    counters = read_counters()
     
-    return Response(stats)
+    return Response({
+        'modular': counters['candidates_modular'],
+        'formal': counters['candidates_formal'],
+        'workers_pas': counters['candidates_workers_pas'],
+    })
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def candidates_by_special_needs(request):
     """
-    Get candidates grouped by special needs status
+    Get candidates grouped by special needs status, with a gender breakdown
+    (from the dashboard counters)
     """
-    stats = Candidate.objects.aggregate(
-        with_special_needs=Count('id', filter=Q(has_disability=True)),
-        without_special_needs=Count('id', filter=Q(has_disability=False)),
-    )
-    
-    # Break down by gender
-    gender_stats = {
-        'male_with_special_needs': Candidate.objects.filter(
-            has_disability=True, gender='male'
-        ).count(),
-        'female_with_special_needs': Candidate.objects.filter(
-            has_disability=True, gender='female'
-        ).count(),
-    }
+    counters = read_counters()
     
     return Response({
-        **stats,
-        **gender_stats
+        'with_special_needs': counters['candidates_with_special_needs'],
+        'without_special_needs': counters['candidates_without_special_needs'],
+        'male_with_special_needs': counters['male_with_special_needs'],
+        'female_with_special_needs': counters['female_with_special_needs'],
     })
 
 
+def _assessment_series_list_etag(request):
+    return make_etag(
+        'series-stats', get_version('assessment_series'),
+        get_version('results'), get_version('enrollments'),
+    )
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(etag_func=_assessment_series_list_etag, cache_control=PUBLIC_SHORT)
 def assessment_series_list(request):
     """
     Get all assessment series with basic statistics - OPTIMIZED VERSION
@@ -234,182 +225,9 @@ def special_needs_analytics(request):
     Comprehensive analytics for special needs candidates with gender-based pass rates
     Optional query params: series_id
     """
-    from assessment_series.models import AssessmentSeries
-    from configurations.models import NatureOfDisability
-    from results.models import ModularResult, FormalResult, WorkersPasResult
-    
     series_id = request.query_params.get('series_id')
     
-    # Get all results (optionally filtered by series)
-    if series_id:
-        all_results = list(ModularResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability')) + \
-                      list(FormalResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability')) + \
-                      list(WorkersPasResult.objects.filter(assessment_series_id=series_id).select_related('candidate', 'candidate__nature_of_disability'))
-    else:
-        all_results = list(ModularResult.objects.all().select_related('candidate', 'candidate__nature_of_disability')) + \
-                      list(FormalResult.objects.all().select_related('candidate', 'candidate__nature_of_disability')) + \
-                      list(WorkersPasResult.objects.all().select_related('candidate', 'candidate__nature_of_disability'))
-    
-    # Filter to only special needs candidates
-    special_needs_results = [r for r in all_results if r.candidate.has_disability]
-    
-    # Calculate overall special needs statistics
-    special_needs_male = [r for r in special_needs_results if r.candidate.gender == 'male']
-    special_needs_female = [r for r in special_needs_results if r.candidate.gender == 'female']
-    
-    # Count passed results (only count results with actual marks)
-    def is_passed(result):
-        # Skip results without marks
-        if result.mark is None:
-            return False
-            
-        if isinstance(result, ModularResult):
-            return result.mark >= 65
-        elif isinstance(result, FormalResult):
-            return (result.type == 'theory' and result.mark >= 50) or (result.type == 'practical' and result.mark >= 65)
-        elif isinstance(result, WorkersPasResult):
-            return result.mark >= 65
-        return False
-    
-    male_passed = sum(1 for r in special_needs_male if is_passed(r))
-    female_passed = sum(1 for r in special_needs_female if is_passed(r))
-    total_passed = male_passed + female_passed
-    
-    overview = {
-        'total': len(special_needs_results),
-        'male': len(special_needs_male),
-        'female': len(special_needs_female),
-        'male_passed': male_passed,
-        'female_passed': female_passed,
-        'total_passed': total_passed,
-        'male_pass_rate': round((male_passed / len(special_needs_male) * 100), 2) if len(special_needs_male) > 0 else 0,
-        'female_pass_rate': round((female_passed / len(special_needs_female) * 100), 2) if len(special_needs_female) > 0 else 0,
-        'pass_rate': round((total_passed / len(special_needs_results) * 100), 2) if len(special_needs_results) > 0 else 0
-    }
-    
-    # By disability type with comprehensive metrics
-    disability_breakdown = []
-    for disability in NatureOfDisability.objects.all():
-        disability_results = [r for r in special_needs_results if r.candidate.nature_of_disability == disability]
-        
-        if not disability_results:
-            continue
-        
-        dis_male = [r for r in disability_results if r.candidate.gender == 'male']
-        dis_female = [r for r in disability_results if r.candidate.gender == 'female']
-        
-        dis_male_passed = sum(1 for r in dis_male if is_passed(r))
-        dis_female_passed = sum(1 for r in dis_female if is_passed(r))
-        dis_total_passed = dis_male_passed + dis_female_passed
-        
-        disability_breakdown.append({
-            'name': disability.name,
-            'total': len(disability_results),
-            'male': len(dis_male),
-            'female': len(dis_female),
-            'male_passed': dis_male_passed,
-            'female_passed': dis_female_passed,
-            'total_passed': dis_total_passed,
-            'male_pass_rate': round((dis_male_passed / len(dis_male) * 100), 2) if len(dis_male) > 0 else 0,
-            'female_pass_rate': round((dis_female_passed / len(dis_female) * 100), 2) if len(dis_female) > 0 else 0,
-            'pass_rate': round((dis_total_passed / len(disability_results) * 100), 2) if len(disability_results) > 0 else 0
-        })
-    
-    # By sector with comprehensive metrics
-    from occupations.models import Sector
-    special_needs_by_sector = []
-    for sector in Sector.objects.all():
-        # Get results where candidate's occupation belongs to this sector
-        sector_results = [r for r in special_needs_results if 
-                         r.candidate.occupation and r.candidate.occupation.sector == sector]
-        
-        if not sector_results:
-            continue
-        
-        sector_male = [r for r in sector_results if r.candidate.gender == 'male']
-        sector_female = [r for r in sector_results if r.candidate.gender == 'female']
-        
-        sector_male_passed = sum(1 for r in sector_male if is_passed(r))
-        sector_female_passed = sum(1 for r in sector_female if is_passed(r))
-        sector_total_passed = sector_male_passed + sector_female_passed
-        
-        special_needs_by_sector.append({
-            'sector_name': sector.name,
-            'total': len(sector_results),
-            'male': len(sector_male),
-            'female': len(sector_female),
-            'male_passed': sector_male_passed,
-            'female_passed': sector_female_passed,
-            'total_passed': sector_total_passed,
-            'male_pass_rate': round((sector_male_passed / len(sector_male) * 100), 2) if len(sector_male) > 0 else 0,
-            'female_pass_rate': round((sector_female_passed / len(sector_female) * 100), 2) if len(sector_female) > 0 else 0,
-            'pass_rate': round((sector_total_passed / len(sector_results) * 100), 2) if len(sector_results) > 0 else 0
-        })
-    
-    # REFUGEE STATISTICS
-    # Filter to only refugee candidates
-    refugee_results = [r for r in all_results if r.candidate.is_refugee]
-    
-    # Calculate overall refugee statistics
-    refugee_male = [r for r in refugee_results if r.candidate.gender == 'male']
-    refugee_female = [r for r in refugee_results if r.candidate.gender == 'female']
-    
-    refugee_male_passed = sum(1 for r in refugee_male if is_passed(r))
-    refugee_female_passed = sum(1 for r in refugee_female if is_passed(r))
-    refugee_total_passed = refugee_male_passed + refugee_female_passed
-    
-    refugee_overview = {
-        'total': len(refugee_results),
-        'male': len(refugee_male),
-        'female': len(refugee_female),
-        'male_passed': refugee_male_passed,
-        'female_passed': refugee_female_passed,
-        'total_passed': refugee_total_passed,
-        'male_pass_rate': round((refugee_male_passed / len(refugee_male) * 100), 2) if len(refugee_male) > 0 else 0,
-        'female_pass_rate': round((refugee_female_passed / len(refugee_female) * 100), 2) if len(refugee_female) > 0 else 0,
-        'pass_rate': round((refugee_total_passed / len(refugee_results) * 100), 2) if len(refugee_results) > 0 else 0
-    }
-    
-    # Refugee by sector
-    refugee_by_sector = []
-    for sector in Sector.objects.all():
-        # Get results where candidate's occupation belongs to this sector
-        sector_results = [r for r in refugee_results if 
-                         r.candidate.occupation and r.candidate.occupation.sector == sector]
-        
-        if not sector_results:
-            continue
-        
-        sector_male = [r for r in sector_results if r.candidate.gender == 'male']
-        sector_female = [r for r in sector_results if r.candidate.gender == 'female']
-        
-        sector_male_passed = sum(1 for r in sector_male if is_passed(r))
-        sector_female_passed = sum(1 for r in sector_female if is_passed(r))
-        sector_total_passed = sector_male_passed + sector_female_passed
-        
-        refugee_by_sector.append({
-            'sector_name': sector.name,
-            'total': len(sector_results),
-            'male': len(sector_male),
-            'female': len(sector_female),
-            'male_passed': sector_male_passed,
-            'female_passed': sector_female_passed,
-            'total_passed': sector_total_passed,
-            'male_pass_rate': round((sector_male_passed / len(sector_male) * 100), 2) if len(sector_male) > 0 else 0,
-            'female_pass_rate': round((sector_female_passed / len(sector_female) * 100), 2) if len(sector_female) > 0 else 0,
-            'pass_rate': round((sector_total_passed / len(sector_results) * 100), 2) if len(sector_results) > 0 else 0
-        })
-    
-    return Response({
-        'special_needs': {
-            'overview': overview,
-            'by_disability_type': disability_breakdown,
-            'by_sector': special_needs_by_sector
-        },
-        'refugee': {
-            'overview': refugee_overview,
-            'by_sector': refugee_by_sector
-        }
-    })
+    # Grouped counts come from the cached columnar results cube (stats/fact_cube.py)
+    return Response(special_needs_analytics_data(series_id))
 
 
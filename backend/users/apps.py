@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
-    verbose_name = 'User Management'
\ No newline at end of file
+    verbose_name = 'User Management'
+
+    def ready(self):
+        import users.authentication  # Auth cache invalidation receivers
+        import users.scope  # Scope cache invalidation receivers
@@ -0,0 +1,163 @@
+"""
+Token and Basic authentication with a short-lived cache of verified
+credentials.
+
+DRF's BasicAuthentication runs the full PBKDF2 password check on every
+request, and TokenAuthentication looks up the token and its user every
+time. The classes here do that once and then accept the same credentials
+from the cache for AUTH_CACHE_TTL seconds:
+
+- cache keys are HMACs of the credentials under SECRET_KEY, and entries
+  hold the user's fields without the password hash (it is loaded from the
+  database if a view needs it), so the cache contains no passwords, hashes
+  or token keys;
+- only successful checks are cached, so wrong passwords always pay the
+  full hash;
+- every entry records the user's auth generation, a counter bumped when
+  the user is saved (password change, deactivation, permission changes) or
+  deleted, logs out of a session, or loses their token (logout, password
+  change). Entries from an older generation are ignored;
+- a miss reads the generation before re-reading the user (and token), so a
+  change racing with the check can never be cached as valid.
+
+Invalidation reaches other gunicorn workers only through a shared cache.
+With a process-local backend (LocMemCache, the default) the cache stays off
+and both classes behave exactly like DRF's.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.crypto import salted_hmac
+from rest_framework import authentication
+from rest_framework.authtoken.models import Token
+
+from emis.http_cache import shared_cache_enabled
+
+from .models import User
+
+AUTH_CACHE_TTL = getattr(settings, 'AUTH_CACHE_TTL', 60)
+
+KEY_PREFIX = 'auth:'
+
+# User fields kept in cache entries; the password hash is left out
+_CACHED_FIELDS = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def cache_enabled():
+    return AUTH_CACHE_TTL > 0 and shared_cache_enabled()
+
+
+def _generation_key(user_id):
+    return f'{KEY_PREFIX}generation:{user_id}'
+
+
+def current_generation(user_id):
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so a cache flush never reissues an old generation
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_user(user_id):
+    """Stop accepting cached credentials of the user."""
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _credential_key(scheme, *credentials):
+    digest = salted_hmac(
+        'users.authentication', '\0'.join((scheme, *credentials)), algorithm='sha256'
+    ).hexdigest()
+    return f'{KEY_PREFIX}{scheme}:{digest}'
+
+
+def _cached_user(key):
+    entry = cache.get(key)
+    if entry is None:
+        return None, None
+    user = User.from_db(None, _CACHED_FIELDS, entry['values'])
+    if not user.is_active or entry['generation'] != cache.get(_generation_key(user.pk)):
+        return None, None
+    return user, entry
+
+
+def _remember(key, user, reload, **extra):
+    """
+    Cache the verified `user` under `key`. `reload` fetches the user again
+    (or raises DoesNotExist); nothing is cached unless that still matches.
+    """
+    generation = current_generation(user.pk)
+    try:
+        fresh = reload()
+    except (User.DoesNotExist, Token.DoesNotExist):
+        return
+    if fresh.pk != user.pk or fresh.password != user.password or not fresh.is_active:
+        return
+    cache.set(key, {
+        'generation': generation,
+        'values': [getattr(fresh, name) for name in _CACHED_FIELDS],
+        **extra,
+    }, AUTH_CACHE_TTL)
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """TokenAuthentication that skips the token and user lookup for recently seen tokens."""
+
+    def authenticate_credentials(self, key):
+        if not cache_enabled():
+            return super().authenticate_credentials(key)
+        cache_key = _credential_key('token', key)
+        user, entry = _cached_user(cache_key)
+        if user is not None:
+            return user, Token(key=key, user=user, created=entry['created'])
+
+        user, token = super().authenticate_credentials(key)
+        _remember(
+            cache_key, user,
+            lambda: Token.objects.select_related('user').get(key=key).user,
+            created=token.created,
+        )
+        return user, token
+
+
+class CachedBasicAuthentication(authentication.BasicAuthentication):
+    """BasicAuthentication that skips the password hash for recently verified credentials."""
+
+    def authenticate_credentials(self, userid, password, request=None):
+        if not cache_enabled():
+            return super().authenticate_credentials(userid, password, request)
+        cache_key = _credential_key('basic', userid, password)
+        user, _ = _cached_user(cache_key)
+        if user is not None:
+            return user, None
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        _remember(cache_key, user, lambda: User.objects.get(pk=user.pk))
+        return user, auth
+
+
+@receiver(post_save, sender=User, dispatch_uid='auth_cache_user_saved')
+@receiver(post_delete, sender=User, dispatch_uid='auth_cache_user_deleted')
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='auth_cache_token_deleted')
+def _token_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+@receiver(user_logged_out, dispatch_uid='auth_cache_logged_out')
+def _logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
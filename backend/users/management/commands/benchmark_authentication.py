@@ -0,0 +1,82 @@
+"""
+Management command to benchmark Token and Basic authentication.
+
+Authenticates the same request repeatedly with DRF's TokenAuthentication
+and BasicAuthentication and with the cached classes in
+users.authentication, and reports time and queries per request. Uses a
+temporary user that is deleted afterwards. The cached classes only cache
+with a shared cache backend (see CACHES); with LocMemCache both columns
+show the same cost.
+
+Usage:
+    python manage.py benchmark_authentication                  # 50 requests per class
+    python manage.py benchmark_authentication --requests 200
+"""
+import base64
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import authentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+from users import authentication as cached_authentication
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request cost of DRF and cached Token/Basic authentication.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Requests authenticated per class (default 50).',
+        )
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        if count < 1:
+            raise CommandError('--requests must be at least 1.')
+
+        username = f'benchmark-{uuid.uuid4().hex[:12]}'
+        password = uuid.uuid4().hex
+        user = User.objects.create_user(username, password=password, user_type='staff')
+        token = Token.objects.create(user=user)
+        factory = APIRequestFactory()
+        basic_header = 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+
+        def measure(backend, header):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(count):
+                    result = backend().authenticate(factory.get('/', HTTP_AUTHORIZATION=header))
+                    if result is None or result[0].pk != user.pk:
+                        raise CommandError(f'{backend.__name__} did not authenticate the benchmark user.')
+                elapsed = (time.perf_counter() - started) * 1000
+            return elapsed / count, len(queries) / count
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Authentication benchmark ({count} requests each, cache '
+            f'{"on" if cached_authentication.cache_enabled() else "off"})'
+        ))
+        try:
+            for label, drf_backend, cached_backend, header in (
+                ('Token', authentication.TokenAuthentication,
+                 cached_authentication.CachedTokenAuthentication, f'Token {token.key}'),
+                ('Basic', authentication.BasicAuthentication,
+                 cached_authentication.CachedBasicAuthentication, basic_header),
+            ):
+                drf_ms, drf_queries = measure(drf_backend, header)
+                cached_ms, cached_queries = measure(cached_backend, header)
+                self.stdout.write(
+                    f'   • {label}: DRF {drf_ms:.2f} ms, {drf_queries:.2f} queries; '
+                    f'cached {cached_ms:.2f} ms, {cached_queries:.2f} queries per request'
+                )
+        finally:
+            user.delete()
+        self.stdout.write(self.style.SUCCESS('Done.'))
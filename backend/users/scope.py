@@ -0,0 +1,146 @@
+"""
+What a request's user may see, resolved once.
+
+Views used to work out a center representative's center and branch on their
+own, each reading request.user.center_rep_profile again (and some more than
+once per request). get_scope(request) resolves the user's role, center and
+branch in at most one query, keeps the result on the request, and
+Scope.restrict() derives every center-scoped queryset from it.
+
+With a shared cache (see users.authentication.cache_enabled) the scope is
+also cached per user for AUTH_CACHE_TTL seconds. Entries carry the user's
+auth generation, so they are dropped whenever the user's cached credentials
+are (user saved or deleted, logout, token deleted), and the receivers below
+bump the generation when a representative profile, or the center or branch
+it points at, changes.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from assessment_centers.models import AssessmentCenter, CenterBranch
+
+from . import authentication
+from .models import CenterRepresentative
+
+KEY_PREFIX = 'scope:'
+
+# Attribute of the Django HttpRequest the resolved scope is kept on
+REQUEST_ATTRIBUTE = '_emis_scope'
+
+
+class Scope:
+    """A user's role and, for center representatives, their center and branch."""
+
+    def __init__(self, user, has_profile=False, center=None, branch=None):
+        self.user_id = user.pk
+        self.is_center_rep = user.is_authenticated and getattr(user, 'user_type', None) == 'center_representative'
+        self.has_profile = has_profile
+        self.center = center
+        self.branch = branch
+
+    @property
+    def center_id(self):
+        return self.center.pk if self.center is not None else None
+
+    @property
+    def branch_id(self):
+        return self.branch.pk if self.branch is not None else None
+
+    def restrict(self, queryset, center='assessment_center', branch='assessment_center_branch'):
+        """
+        Limit `queryset` to the user's center and branch, given the lookups
+        that lead from its model to them (branch=None if it has no branch).
+        Center representatives without a profile or center get nothing;
+        other users are not restricted.
+        """
+        if not self.is_center_rep:
+            return queryset
+        if self.center is None:
+            return queryset.none()
+        queryset = queryset.filter(**{center: self.center_id})
+        if branch and self.branch is not None:
+            queryset = queryset.filter(**{branch: self.branch_id})
+        return queryset
+
+
+def _cache_key(user_id):
+    return f'{KEY_PREFIX}{user_id}'
+
+
+def _load(user):
+    """Read the scope from the database: one query for center representatives, none otherwise."""
+    scope = Scope(user)
+    if not scope.is_center_rep:
+        return scope
+    profile = CenterRepresentative.objects.select_related(
+        'assessment_center', 'assessment_center_branch'
+    ).filter(user_id=user.pk).first()
+    if profile is not None:
+        scope.has_profile = True
+        scope.center = profile.assessment_center
+        scope.branch = profile.assessment_center_branch
+    return scope
+
+
+def _resolve(user):
+    if not user.is_authenticated or not authentication.cache_enabled():
+        return _load(user)
+    key = _cache_key(user.pk)
+    entry = cache.get(key)
+    generation = authentication.current_generation(user.pk)
+    if entry is not None and entry['generation'] == generation:
+        return entry['scope']
+    # The generation was read before the profile, so a change racing with
+    # this load bumps it and the entry is ignored
+    scope = _load(user)
+    cache.set(key, {'generation': generation, 'scope': scope}, authentication.AUTH_CACHE_TTL)
+    return scope
+
+
+def get_scope(request):
+    """The scope of `request`'s user, resolved on first use and kept on the request."""
+    holder = getattr(request, '_request', request)
+    user = request.user
+    scope = getattr(holder, REQUEST_ATTRIBUTE, None)
+    if scope is None or scope.user_id != user.pk:
+        scope = _resolve(user)
+        setattr(holder, REQUEST_ATTRIBUTE, scope)
+    return scope
+
+
+def _invalidate(user_ids):
+    for user_id in user_ids:
+        if user_id is not None:
+            authentication.invalidate_user(user_id)
+
+
+@receiver(pre_save, sender=CenterRepresentative, dispatch_uid='scope_rep_reassigned')
+def _rep_reassigned(sender, instance, raw=False, **kwargs):
+    # A profile moved to another user leaves the previous user's scope stale
+    if raw or instance.pk is None:
+        return
+    previous = CenterRepresentative.objects.filter(pk=instance.pk).values_list('user_id', flat=True).first()
+    if previous != instance.user_id:
+        _invalidate([previous])
+
+
+@receiver(post_save, sender=CenterRepresentative, dispatch_uid='scope_rep_saved')
+@receiver(post_delete, sender=CenterRepresentative, dispatch_uid='scope_rep_deleted')
+def _rep_changed(sender, instance, **kwargs):
+    _invalidate([instance.user_id])
+
+
+@receiver(post_save, sender=AssessmentCenter, dispatch_uid='scope_center_saved')
+def _center_changed(sender, instance, **kwargs):
+    _invalidate(CenterRepresentative.objects.filter(assessment_center=instance).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=CenterBranch, dispatch_uid='scope_branch_saved')
+@receiver(pre_delete, sender=CenterBranch, dispatch_uid='scope_branch_deleted')
+def _branch_changed(sender, instance, **kwargs):
+    # Deleting a branch clears representatives' branch with an UPDATE that
+    # sends no signals, so their users are found before the delete
+    _invalidate(
+        CenterRepresentative.objects.filter(assessment_center_branch=instance).values_list('user_id', flat=True)
+    )
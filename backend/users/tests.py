@@ -0,0 +1,154 @@
+import shutil
+import tempfile
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from assessment_centers.models import AssessmentCenter, CenterBranch
+from assessment_series.models import AssessmentSeries
+from candidates.models import Candidate
+from complaints.models import Complaint, ComplaintCategory
+from configurations.models import District
+from occupations.models import Occupation, Sector
+
+from . import authentication
+from .models import CenterRepresentative
+
+SCOPED_URLS = [
+    '/api/candidates/',
+    '/api/fees/candidate-fees/',
+    '/api/fees/center-fees/',
+    '/api/complaints/complaints/',
+    # Reads the center and then the branch before rejecting the missing parameters
+    '/api/reports/candidate-album/',
+]
+
+
+class CenterRepScopeTests(TestCase):
+    """A center representative's profile is read at most once per request, and not at all from a warm cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        district = District.objects.create(name='Kampala', region='central')
+        cls.center = AssessmentCenter.objects.create(
+            center_number='UVT001', center_name='Center 1', assessment_category='vti', district=district,
+        )
+        cls.other_center = AssessmentCenter.objects.create(
+            center_number='UVT002', center_name='Center 2', assessment_category='vti', district=district,
+        )
+        cls.branch = CenterBranch.objects.create(
+            branch_code='UVT001-B1', assessment_center=cls.center, district=district,
+        )
+        series = AssessmentSeries.objects.create(
+            name='Nov 2025', start_date=date(2025, 11, 1), end_date=date(2025, 11, 30),
+            date_of_release=date(2025, 12, 15),
+        )
+        sector = Sector.objects.create(name='Building')
+        occupation = Occupation.objects.create(
+            occ_code='MVM', occ_name='Motor', occ_category='formal', sector=sector,
+        )
+        for i, (center, branch) in enumerate([
+            (cls.center, None), (cls.center, cls.branch), (cls.center, cls.branch), (cls.other_center, None),
+        ]):
+            Candidate.objects.create(
+                full_name=f'Candidate {i}', date_of_birth=date(2000, 1, 1), gender='male', contact='0700000000',
+                district=district, assessment_center=center, assessment_center_branch=branch, entry_year=2025,
+                intake='M', registration_category='formal', occupation=occupation,
+            )
+        cls.rep = CenterRepresentative.objects.create(
+            fullname='Center Rep', contact='0700000000', assessment_center=cls.center,
+        )
+        category = ComplaintCategory.objects.create(name='General')
+        for center in (cls.center, cls.other_center):
+            Complaint.objects.create(
+                category=category, exam_center=center, exam_series=series, program=occupation,
+                created_by=cls.rep.user, issue_description='Missing marks',
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.rep.user)
+
+    def _get(self, url):
+        """GET `url` and return the response and the number of profile queries it made."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertLess(response.status_code, 500, url)
+        return response, sum('users_centerrepresentative' in query['sql'] for query in queries.captured_queries)
+
+    def _candidate_count(self):
+        response, _ = self._get('/api/candidates/')
+        return response.data['count']
+
+    def test_profile_is_read_once_per_request(self):
+        for url in SCOPED_URLS:
+            for _ in range(2):
+                _, profile_queries = self._get(url)
+                self.assertEqual(profile_queries, 1, url)
+
+    def test_lists_are_limited_to_the_center(self):
+        self.assertEqual(self._candidate_count(), 3)
+        response, _ = self._get('/api/complaints/complaints/')
+        self.assertEqual([row['exam_center'] for row in response.data['results']], [self.center.pk])
+
+
+class SharedCacheScopeTests(CenterRepScopeTests):
+    """The same requests with a cache shared between processes, which caches the scope per user."""
+
+    def setUp(self):
+        super().setUp()
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.enterContext(override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }))
+        self.assertTrue(authentication.cache_enabled())
+        cache.clear()
+
+    def test_profile_is_read_once_per_request(self):
+        for url in SCOPED_URLS:
+            _, profile_queries = self._get(url)
+            self.assertLessEqual(profile_queries, 1, url)
+            _, profile_queries = self._get(url)
+            self.assertEqual(profile_queries, 0, url)
+
+    def test_profile_change_takes_effect(self):
+        self.assertEqual(self._candidate_count(), 3)
+
+        self.rep.assessment_center_branch = self.branch
+        self.rep.save()
+        self.assertEqual(self._candidate_count(), 2)
+
+        self.rep.assessment_center = self.other_center
+        self.rep.assessment_center_branch = None
+        self.rep.save()
+        self.assertEqual(self._candidate_count(), 1)
+
+    def test_branch_change_takes_effect(self):
+        self.rep.assessment_center_branch = self.branch
+        self.rep.save()
+        self.assertEqual(self._candidate_count(), 2)
+        generation = authentication.current_generation(self.rep.user.pk)
+
+        # Clears the profile's branch with an UPDATE that sends no signals
+        self.branch.delete()
+
+        self.assertNotEqual(authentication.current_generation(self.rep.user.pk), generation)
+        response, profile_queries = self._get('/api/candidates/')
+        self.assertEqual(profile_queries, 1)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_center_change_takes_effect(self):
+        self._get('/api/candidates/')
+        generation = authentication.current_generation(self.rep.user.pk)
+
+        self.center.center_name = 'Renamed'
+        self.center.save()
+
+        self.assertNotEqual(authentication.current_generation(self.rep.user.pk), generation)
+        _, profile_queries = self._get('/api/candidates/')
+        self.assertEqual(profile_queries, 1)
@@ -1,6 +1,8 @@
 """
 Utility functions for handling nationality/country conversions
 """
+from utils import reference_data
+
 
 # Mapping from ISO 3166-1 alpha-2 country codes to nationality demonyms
 COUNTRY_CODE_TO_DEMONYM = {
@@ -130,24 +132,8 @@ def get_nationality_from_country(country_code):
     if not country_code:
         return 'Ugandan'
     
-    # Convert to string in case it's a Country object
-    code = str(country_code).upper()
-    
-    # Return demonym if we have a mapping
-    if code in COUNTRY_CODE_TO_DEMONYM:
-        return COUNTRY_CODE_TO_DEMONYM[code]
-        
-    # If it's a Country object from django-countries, it has a name property
-    if hasattr(country_code, 'name') and country_code.name:
-        return country_code.name
-        
-    # If passed as a string code, try to resolve it using django-countries
-    try:
-        from django_countries import countries
-        country_name = dict(countries).get(code)
-        if country_name:
-            return str(country_name)
-    except ImportError:
-        pass
-        
-    return 'Ugandan'
+    return (
+        reference_data.demonym(country_code)
+        or reference_data.country_name(country_code)
+        or 'Ugandan'
+    )
@@ -1,3 +1,5 @@
+from utils import reference_data
+
 
 COUNTRY_TO_DEMONYM = {
     # East Africa
@@ -71,4 +73,8 @@ def get_demonym(country_name):
     if not country_name:
         return 'Ugandan'  # Default to Ugandan if not provided
         
-    return COUNTRY_TO_DEMONYM.get(country_name, country_name)
+    return (
+        COUNTRY_TO_DEMONYM.get(country_name)
+        or reference_data.demonym(reference_data.country_code(country_name))
+        or country_name
+    )
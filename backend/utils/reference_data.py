@@ -0,0 +1,104 @@
+"""
+Country and nationality reference data, built once per process.
+
+django-countries serves its list as lazily translated names, so the
+nationalities endpoint rebuilt and sorted all ~250 countries on every call,
+and get_nationality_from_country built dict(countries) for every code it had
+no demonym for. Everything here is built once (CandidatesConfig.ready()
+warms it) into read-only tables:
+
+- nationalities_json() / nationalities_etag(): the nationality picker list
+  (East Africa first, then the rest by name, then 'Other') as JSON bytes
+  with a matching ETag;
+- country_name(), demonym() and country_code(): dictionary lookups between
+  ISO codes, country names and demonyms for imports and exports. Names and
+  demonyms match case-insensitively.
+
+The site has no per-request language (no LocaleMiddleware), so names are
+built in LANGUAGE_CODE.
+"""
+import json
+from functools import lru_cache
+from types import MappingProxyType
+
+from django_countries import countries
+
+from emis.http_cache import make_etag
+
+# Listed first in the nationality picker, in this order
+EAST_AFRICA_CODES = ('UG', 'KE', 'TZ', 'RW', 'BI', 'SS')
+
+OTHER_OPTION = ('OTHER', 'Other')
+
+# Country names found in legacy data that django-countries spells differently
+NAME_ALIASES = {
+    'DR Congo': 'CD',
+    'Ivory Coast': 'CI',
+    'United States': 'US',
+}
+
+
+class ReferenceData:
+    """Read-only country tables; build with reference_data() rather than directly."""
+
+    def __init__(self):
+        from utils.nationality_helper import COUNTRY_CODE_TO_DEMONYM
+
+        names = {code: str(name) for code, name in countries}
+        east_africa = [(code, names[code]) for code in EAST_AFRICA_CODES]
+        remaining = sorted(
+            ((code, name) for code, name in names.items() if code not in EAST_AFRICA_CODES),
+            key=lambda option: option[1],
+        )
+        self.nationality_options = tuple(east_africa + remaining + [OTHER_OPTION])
+        self.nationalities_json = json.dumps(
+            [{'value': code, 'label': label} for code, label in self.nationality_options],
+            ensure_ascii=False,
+            separators=(',', ':'),
+        ).encode('utf-8')
+        self.nationalities_etag = make_etag('nationalities', self.nationalities_json.decode('utf-8'))
+
+        self.code_to_name = MappingProxyType(names)
+        self.code_to_demonym = MappingProxyType(dict(COUNTRY_CODE_TO_DEMONYM))
+
+        # Codes, names, aliases and demonyms to codes. A demonym shared by
+        # several countries ('Congolese') keeps the first one listed.
+        to_code = {}
+        for code, demonym in COUNTRY_CODE_TO_DEMONYM.items():
+            to_code.setdefault(demonym.casefold(), code)
+        for alias, code in NAME_ALIASES.items():
+            to_code[alias.casefold()] = code
+        for code, name in names.items():
+            to_code[name.casefold()] = code
+            to_code[code.casefold()] = code
+        self.to_code = MappingProxyType(to_code)
+
+
+@lru_cache(maxsize=None)
+def reference_data():
+    """The process-wide ReferenceData, built on first use."""
+    return ReferenceData()
+
+
+def nationalities_json():
+    """The nationality picker list as UTF-8 JSON bytes."""
+    return reference_data().nationalities_json
+
+
+def nationalities_etag():
+    return reference_data().nationalities_etag
+
+
+def country_name(code):
+    """Country name for an ISO 3166-1 alpha-2 code (or Country), or ''."""
+    return reference_data().code_to_name.get(str(code).upper(), '') if code else ''
+
+
+def demonym(code):
+    """Nationality demonym for an ISO code (or Country), or None if there is none on record."""
+    return reference_data().code_to_demonym.get(str(code).upper()) if code else None
+
+
+def country_code(value):
+    """ISO code for a code, country name, legacy name or demonym, or None."""
+    return reference_data().to_code.get(str(value).strip().casefold()) if value else None
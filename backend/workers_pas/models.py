@@ -96,8 +96,12 @@ class WorkersPasBook(models.Model):
 
     @classmethod
     @transaction.atomic
-    def allocate_sequence(cls, occupation):
-        """Atomically allocate the next per-occupation sequence number."""
+    def allocate_sequences(cls, occupation, count):
+        """Atomically reserve ``count`` consecutive per-occupation sequence numbers.
+
+        Returns a range. The occupation's highest row is locked, so concurrent
+        allocations queue behind the caller's transaction until its books exist.
+        """
         last = (
             cls.objects.select_for_update()
             .filter(occupation=occupation)
@@ -105,7 +109,13 @@ class WorkersPasBook(models.Model):
             .values_list('sequence_number', flat=True)
             .first()
         )
-        return (last or 0) + 1
+        start = (last or 0) + 1
+        return range(start, start + count)
+
+    @classmethod
+    def allocate_sequence(cls, occupation):
+        """Atomically allocate the next per-occupation sequence number."""
+        return cls.allocate_sequences(occupation, 1)[0]
 
     @staticmethod
     def format_book_number(wp_code, wp_occ_code, sequence_number):
@@ -8,37 +8,22 @@ dashed guide lines, yields two pocket-sized booklets.
 """
 from io import BytesIO
 
-from pypdf import PdfReader, PdfWriter, Transformation, PageObject
-from pypdf.generic import FloatObject, RectangleObject
+from pypdf import Transformation
 from reportlab.lib.pagesizes import A4, A5, landscape
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas as rl_canvas
 
-from .constants import BOOKLET_W, BOOKLET_H
-
+from emis.pdf_assembly import PdfAssembly, read_pages
 
-def _a5_blank():
-    w, h = A5
-    p = PageObject.create_blank_page(width=w, height=h)
-    for box in ("mediabox", "cropbox", "trimbox"):
-        setattr(p, box, RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(w), FloatObject(h))
-        ))
-    return p
+from .constants import BOOKLET_W, BOOKLET_H
 
 
-def _booklet_blank():
-    """Blank page at the booklet page size (passport-sized)."""
-    w, h = BOOKLET_W, BOOKLET_H
-    p = PageObject.create_blank_page(width=w, height=h)
-    for box in ("mediabox", "cropbox", "trimbox"):
-        setattr(p, box, RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(w), FloatObject(h))
-        ))
-    return p
+def _pad(pages, n):
+    """Pad a page list to n entries; None marks a blank slot (nothing is placed)."""
+    return pages + [None] * (n - len(pages))
 
 
-def impose_2up_a4(pdf_a_bytes, pdf_b_bytes=None):
+def impose_2up_a4(pdf_a, pdf_b=None, into=None):
     """Sequential 2-up duplex imposition with odd/even alignment on A4 portrait.
 
     Each A4 portrait sheet is split into 2 horizontal rows (top = Candidate A,
@@ -65,6 +50,10 @@ def impose_2up_a4(pdf_a_bytes, pdf_b_bytes=None):
 
     Input expectation: each candidate's booklet PDF is in A5 portrait with
     pages in normal reading order (page 1 = cover, page N = trailing blank).
+
+    Booklets may be given as bytes or as already-parsed pages (anything
+    ``read_pages`` accepts). Sheets are appended to ``into`` (a new
+    PdfAssembly by default), which is returned.
     """
     a4_w, a4_h = A4
     a5_w, a5_h = A5
@@ -78,40 +67,22 @@ def impose_2up_a4(pdf_a_bytes, pdf_b_bytes=None):
     scaled_w = a5_w * scale
     scaled_h = a5_h * scale
 
-    def _load_pages(pdf_bytes):
-        if not pdf_bytes:
-            return []
-        return list(PdfReader(BytesIO(pdf_bytes)).pages)
-
-    pages_a = _load_pages(pdf_a_bytes)
-    pages_b = _load_pages(pdf_b_bytes) if pdf_b_bytes else []
+    pages_a = read_pages(pdf_a)
+    pages_b = read_pages(pdf_b)
 
     # Equalise lengths (Candidate B may be missing or shorter).
     n = max(len(pages_a), len(pages_b))
-    while len(pages_a) < n:
-        pages_a.append(_a5_blank())
-    while len(pages_b) < n:
-        pages_b.append(_a5_blank())
+    pages_a = _pad(pages_a, n)
+    pages_b = _pad(pages_b, n)
 
-    writer = PdfWriter()
+    assembly = into if into is not None else PdfAssembly()
 
     def _place(target, src_page, q_x, q_y):
         """Place src_page into the quadrant whose lower-left is (q_x, q_y)."""
         ox = q_x + (q_w - scaled_w) / 2
         oy = q_y + (q_h - scaled_h) / 2
-        src_page.add_transformation(
-            Transformation().scale(scale, scale).translate(ox, oy)
-        )
-        src_page.mediabox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-        src_page.cropbox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-        src_page.trimbox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-        target.merge_page(src_page)
+        if src_page is not None:
+            assembly.place(target, src_page, Transformation().scale(scale, scale).translate(ox, oy))
 
     # One imposed PDF page per booklet page. PDF page (k+1) is odd when k is
     # even (k starts at 0), so the right column is used; otherwise left column.
@@ -119,15 +90,12 @@ def impose_2up_a4(pdf_a_bytes, pdf_b_bytes=None):
         is_odd_pdf_page = (k % 2 == 0)
         col_x = q_w if is_odd_pdf_page else 0  # right slot for odd, left for even
 
-        writer.add_blank_page(width=a4_w, height=a4_h)
-        page = writer.pages[-1]
+        page = assembly.new_page(a4_w, a4_h)
         # Top row = Candidate A, bottom row = Candidate B
         _place(page, pages_a[k], col_x, q_h)
         _place(page, pages_b[k], col_x, 0)
 
-    out = BytesIO()
-    writer.write(out)
-    return out.getvalue()
+    return assembly
 
 
 def _cut_line_overlay():
@@ -179,7 +147,7 @@ def _cut_line_overlay():
     return buf.getvalue()
 
 
-def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
+def impose_2up_a6_booklet_a4(pdf_c1, pdf_c2=None, into=None, sheets=None):
     """2-up passport-size saddle-stitch booklet imposition on A4 portrait.
 
     Two candidates are imposed on a single A4 portrait sheet — Candidate 1 on
@@ -198,7 +166,12 @@ def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
         7. Saddle-stitch (staple).
     Result: two independent ~100 × 118.5 mm portrait booklets per A4 sheet.
 
-    If pdf_c2_bytes is None the bottom half of every page is left blank.
+    If pdf_c2 is None the bottom half of every page is left blank. Both
+    booklets may be the same document (the inner-pages master imposes one
+    candidate twice). ``sheets`` optionally selects physical sheets (a slice,
+    e.g. ``slice(0, 1)`` for the covers); each sheet is a front + back page.
+    Pages are appended to ``into`` (a new PdfAssembly by default), which is
+    returned.
     """
     a4_w, a4_h = A4
 
@@ -213,30 +186,18 @@ def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
     scaled_w = src_w
     scaled_h = src_h
 
-    def _load(pdf_bytes):
-        return list(PdfReader(BytesIO(pdf_bytes)).pages)
-
-    pages_c1 = _load(pdf_c1_bytes)
-    pages_c2 = _load(pdf_c2_bytes) if pdf_c2_bytes else []
+    pages_c1 = read_pages(pdf_c1)
+    pages_c2 = read_pages(pdf_c2)
 
     # Pad both to the same multiple of 4
     n = max(len(pages_c1), len(pages_c2), 1)
     while n % 4:
         n += 1
-    while len(pages_c1) < n:
-        pages_c1.append(_booklet_blank())
-    while len(pages_c2) < n:
-        pages_c2.append(_booklet_blank())
+    pages_c1 = _pad(pages_c1, n)
+    pages_c2 = _pad(pages_c2, n)
 
     n_sheets = n // 4
-    writer = PdfWriter()
-
-    def _set_a4_boxes(p):
-        r = RectangleObject((FloatObject(0), FloatObject(0),
-                              FloatObject(a4_w), FloatObject(a4_h)))
-        p.mediabox = r
-        p.cropbox = r
-        p.trimbox = r
+    assembly = into if into is not None else PdfAssembly()
 
     def _place(target, src, cell_x, cell_y, rotated=False):
         """Place src into the A6 cell, flushed to the outer edge.
@@ -269,11 +230,10 @@ def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
                   .translate(ox + scaled_w, oy + scaled_h))
         else:
             tf = Transformation().scale(scale, scale).translate(ox, oy)
-        src.add_transformation(tf)
-        _set_a4_boxes(src)
-        target.merge_page(src)
+        if src is not None:
+            assembly.place(target, src, tf)
 
-    for s in range(n_sheets):
+    for s in range(n_sheets)[sheets or slice(None)]:
         # Saddle-stitch page indices (0-based).
         # C1 front/back use standard formula.
         # C2 back has left/right swapped vs C1 because the 180° operator
@@ -289,8 +249,7 @@ def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
         c2_br = 2 * s + 1        # C2 back-right  (swapped vs C1)
 
         # --- FRONT page ---
-        writer.add_blank_page(width=a4_w, height=a4_h)
-        front = writer.pages[-1]
+        front = assembly.new_page(a4_w, a4_h)
         _place(front, pages_c1[c1_fl], 0,     a6_h, rotated=False)
         _place(front, pages_c1[c1_fr], a6_w,  a6_h, rotated=False)
         _place(front, pages_c2[c2_fl], 0,     0,    rotated=True)
@@ -298,19 +257,16 @@ def impose_2up_a6_booklet_a4(pdf_c1_bytes, pdf_c2_bytes=None):
 
         # --- BACK page (placed in normal PDF coords; printer flip-on-long-edge
         #     will mirror left/right, which is accounted for in the formula) ---
-        writer.add_blank_page(width=a4_w, height=a4_h)
-        back = writer.pages[-1]
+        back = assembly.new_page(a4_w, a4_h)
         _place(back, pages_c1[c1_bl], 0,     a6_h, rotated=False)
         _place(back, pages_c1[c1_br], a6_w,  a6_h, rotated=False)
         _place(back, pages_c2[c2_bl], 0,     0,    rotated=True)
         _place(back, pages_c2[c2_br], a6_w,  0,    rotated=True)
 
-    out = BytesIO()
-    writer.write(out)
-    return out.getvalue()
+    return assembly
 
 
-def impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=True):
+def impose_booklet_a4_landscape(pdf, rotate_back_side=True, into=None, sheets=None):
     """Impose a single A5 booklet PDF into an A4 LANDSCAPE duplex booklet.
 
     Output is designed for fold + staple (saddle stitch).
@@ -325,39 +281,34 @@ def impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=True):
       - Most printers want "flip on short edge" for landscape booklet output.
       - If your environment insists on "flip on long edge", set rotate_back_side=True (default),
         which rotates the back side by 180° to compensate on many drivers.
+
+    ``sheets`` optionally selects physical sheets (a slice over sheet indexes;
+    each sheet is a front + back page). Pages are appended to ``into`` (a new
+    PdfAssembly by default), which is returned.
     """
     a5_w, a5_h = A5
     a4_w, a4_h = landscape(A4)  # (842, 595) points
 
-    reader = PdfReader(BytesIO(pdf_bytes))
-    pages = list(reader.pages)
+    pages = read_pages(pdf)
 
     # Pad to a multiple of 4 pages for saddle-stitch.
-    while len(pages) % 4 != 0:
-        pages.append(_a5_blank())
+    n = len(pages) + (-len(pages) % 4)
+    pages = _pad(pages, n)
 
-    n = len(pages)
     n_sheets = n // 4
-    writer = PdfWriter()
-
-    def _set_a4_boxes(p):
-        p.mediabox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-        p.cropbox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-        p.trimbox = RectangleObject(
-            (FloatObject(0), FloatObject(0), FloatObject(a4_w), FloatObject(a4_h))
-        )
-
-    def _place(target_page, src_page, x, y):
+    assembly = into if into is not None else PdfAssembly()
+
+    def _place(target_page, src_page, x, y, rotated=False):
         # translate only (A5 fits A4 landscape halves without scaling)
-        src_page.add_transformation(Transformation().translate(x, y))
-        _set_a4_boxes(src_page)
-        target_page.merge_page(src_page)
+        if rotated:
+            # 180° about the page's origin, then shifted back into its half.
+            tf = Transformation().rotate(180).translate(x + a5_w, y + a5_h)
+        else:
+            tf = Transformation().translate(x, y)
+        if src_page is not None:
+            assembly.place(target_page, src_page, tf)
 
-    for s in range(n_sheets):
+    for s in range(n_sheets)[sheets or slice(None)]:
         # Indices (0-based) for this sheet in booklet order
         # Front: [last, first]
         front_left = n - 1 - 2 * s
@@ -367,29 +318,14 @@ def impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=True):
         back_right = n - 2 - 2 * s
 
         # Front side
-        writer.add_blank_page(width=a4_w, height=a4_h)
-        front = writer.pages[-1]
+        front = assembly.new_page(a4_w, a4_h)
         _place(front, pages[front_left], 0, 0)
         _place(front, pages[front_right], a5_w, 0)
 
-        # Back side
-        writer.add_blank_page(width=a4_w, height=a4_h)
-        back = writer.pages[-1]
-
-        left_page = pages[back_left]
-        right_page = pages[back_right]
-
-        if rotate_back_side:
-            # Rotate each A5 by 180° around its origin; then place it into its half.
-            # This often makes "flip on long edge" behave like booklet printing.
-            left_page = left_page.copy()
-            right_page = right_page.copy()
-            left_page.rotate(180)
-            right_page.rotate(180)
-
-        _place(back, left_page, 0, 0)
-        _place(back, right_page, a5_w, 0)
+        # Back side. With rotate_back_side each A5 is turned 180° in its
+        # half; this often makes "flip on long edge" behave like booklet printing.
+        back = assembly.new_page(a4_w, a4_h)
+        _place(back, pages[back_left], 0, 0, rotated=rotate_back_side)
+        _place(back, pages[back_right], a5_w, 0, rotated=rotate_back_side)
 
-    out = BytesIO()
-    writer.write(out)
-    return out.getvalue()
+    return assembly
@@ -20,7 +20,6 @@ from reportlab.platypus import (
     Flowable, Frame, Paragraph, Spacer,
 )
 from reportlab.platypus.flowables import HRFlowable
-from pypdf import PdfReader, PdfWriter
 from reportlab.lib import colors
 
 from .constants import BOOKLET_W, BOOKLET_H
@@ -1166,25 +1165,24 @@ def _draw_blank_page(c, pg, occ_name):
 
 
 # -----------------------------------------------------------------------------
-# Canvas-based per-part PDF builders
+# Booklet parts, drawn in sequence onto one canvas
 # -----------------------------------------------------------------------------
+# Every part is drawn on the same canvas so the booklet is a single ReportLab
+# document: fonts and images are embedded once, and page numbers are tracked
+# here instead of being recovered by re-parsing intermediate PDFs.
 
-def _build_front_matter_pdf(book_data):
-    """Pages 1-6 via canvas (all existing functions, zero change)."""
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
-    c.setTitle(f"Worker's PAS - {book_data.get('candidate_name', '')}")
+def _draw_front_matter(c, book_data):
+    """Pages 1-6. Returns the next page number."""
     _draw_cover(c, book_data);           c.showPage()
     _draw_page2_intro(c, book_data);     c.showPage()
     _draw_page3_biodata(c, book_data);   c.showPage()
     _draw_page4_levels(c, book_data);    c.showPage()
     _draw_page5_certified(c, book_data); c.showPage()
     _draw_page6_sections(c, book_data);  c.showPage()
-    c.save()
-    return buf.getvalue()
+    return 7
 
 
-def _build_sections_pdf(book_data):
+def _draw_sections(c, book_data, pg):
     """Pure-canvas section renderer - no double-wide pages, no cropbox tricks.
 
     Layout rules
@@ -1195,14 +1193,12 @@ def _build_sections_pdf(book_data):
     * Multiple modules share one spread when they fit within _CONTENT_H.
     * Each stamp is drawn at the SAME y_top as its corresponding test area so
       the two columns are perfectly vertically aligned.
+
+    ``pg`` is the physical page number of the first section page (front
+    matter occupies pages 1-6). Returns the next page number.
     """
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
     occ_name = book_data['occupation_name']
 
-    # Physical page counter: front matter occupies pages 1-6.
-    pg = 7
-
     for level_idx, lvl in enumerate(book_data['levels'], start=1):
         # --- Section Index page must land on an ODD page (right-hand side) ---
         if pg % 2 == 0:
@@ -1274,16 +1270,12 @@ def _build_sections_pdf(book_data):
             c.showPage()
             pg += 1
 
-    c.save()
-    return buf.getvalue()
+    return pg
 
 
-def _build_back_matter_pdf(book_data, start_page):
-    """Grading + employment history via canvas (existing functions unchanged)."""
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
+def _draw_back_matter(c, book_data, pg):
+    """Grading + employment history; page numbers continue. Returns the next page number."""
     occ_name = book_data['occupation_name']
-    pg = start_page
 
     _draw_grading(c, pg, occ_name);  c.showPage();  pg += 1
 
@@ -1294,65 +1286,28 @@ def _build_back_matter_pdf(book_data, start_page):
                                  rows_per_page=rows_per_page, page_index=i)
         c.showPage();  pg += 1
 
-    c.save()
-    return buf.getvalue()
+    return pg
 
 
-def _build_back_covers_pdf(book_data):
+def _draw_padding_pages(c, occ_name, pg):
+    """Numbered blank pages so that, with the 2 cover pages, the total page
+    count is a multiple of 4 (saddle-stitch requirement). The printed page
+    sequence has no gaps. Returns the next page number.
+    """
+    n_content = pg - 1
+    padding = (4 - (n_content + 2) % 4) % 4  # 2 cover pages
+    for _ in range(padding):
+        _draw_blank_page(c, pg, occ_name)
+        pg += 1
+    return pg
+
+
+def _draw_back_covers(c, book_data):
     """UVTAB info page + outer back cover (existing functions unchanged)."""
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
     _draw_back_cover(c, book_data['occupation_name'], book_data.get('uvtab_logo_path'))
     c.showPage()
     _draw_outer_back_cover(c, book_data)
     c.showPage()
-    c.save()
-    return buf.getvalue()
-
-
-def _count_pages(pdf_bytes):
-    return len(PdfReader(BytesIO(pdf_bytes)).pages)
-
-
-def _build_padding_pages_pdf(occ_name, start_page, count):
-    """Build a small PDF of *count* pages that carry a header and page number
-    but are otherwise blank.  Used for saddle-stitch tail padding so the
-    printed page sequence has no gaps.
-    """
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
-    for i in range(count):
-        _draw_page_header(c, occ_name)
-        _draw_page_number(c, start_page + i)
-        c.showPage()
-    c.save()
-    return buf.getvalue()
-
-
-def _merge_all(front_pdf, sections_pdf, back_matter_pdf, covers_pdf, occ_name):
-    """Merge all parts, inserting numbered padding pages before covers so that
-    the total page count is a multiple of 4 (saddle-stitch requirement).
-    Padding pages carry a page number so the sequence is never broken.
-    """
-    n_content = (_count_pages(front_pdf)
-                 + _count_pages(sections_pdf)
-                 + _count_pages(back_matter_pdf))
-    padding = (4 - (n_content + 2) % 4) % 4  # 2 cover pages
-
-    writer = PdfWriter()
-    for pdf in (front_pdf, sections_pdf, back_matter_pdf):
-        for page in PdfReader(BytesIO(pdf)).pages:
-            writer.add_page(page)
-    if padding:
-        pad_pdf = _build_padding_pages_pdf(occ_name, n_content + 1, padding)
-        for page in PdfReader(BytesIO(pad_pdf)).pages:
-            writer.add_page(page)
-    for page in PdfReader(BytesIO(covers_pdf)).pages:
-        writer.add_page(page)
-
-    out = BytesIO()
-    writer.write(out)
-    return out.getvalue()
 
 
 # -----------------------------------------------------------------------------
@@ -1380,19 +1335,22 @@ def generate_book_pdf(book_data):
     for lvl in levels:
         lvl['section_start_page'] = ''
 
-    # Part 1: fixed front matter (pages 1–6) — canvas, unchanged
-    front_pdf = _build_front_matter_pdf(book_data)
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=(PAGE_W, PAGE_H))
+    c.setTitle(f"Worker's PAS - {book_data.get('candidate_name', '')}")
+
+    # Part 1: fixed front matter (pages 1–6)
+    pg = _draw_front_matter(c, book_data)
 
-    # Part 2: dynamic section content — Platypus, modules flow freely
-    sections_pdf = _build_sections_pdf(book_data)
+    # Part 2: dynamic section content — modules flow freely
+    pg = _draw_sections(c, book_data, pg)
 
-    # Part 3: grading + employment history — canvas, page numbers continue
-    back_start = 6 + _count_pages(sections_pdf) + 1
-    back_matter_pdf = _build_back_matter_pdf(book_data, start_page=back_start)
+    # Part 3: grading + employment history — page numbers continue
+    pg = _draw_back_matter(c, book_data, pg)
 
-    # Part 4: outer back covers — canvas, unchanged
-    covers_pdf = _build_back_covers_pdf(book_data)
+    # Part 4: saddle-stitch padding, then the outer back covers
+    _draw_padding_pages(c, book_data['occupation_name'], pg)
+    _draw_back_covers(c, book_data)
 
-    # Merge all parts with saddle-stitch padding before the covers
-    return _merge_all(front_pdf, sections_pdf, back_matter_pdf, covers_pdf,
-                      book_data['occupation_name'])
+    c.save()
+    return buf.getvalue()
@@ -10,6 +10,7 @@ Public endpoints:
   - GET    /api/workers-pas/books/               List issued books
   - GET    /api/workers-pas/books/{id}/download/ Download a book's PDF
 """
+import functools
 import io
 import os
 import re
@@ -19,9 +20,11 @@ from datetime import date
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import transaction
-from django.db.models import Exists, OuterRef
+from django.db.models import Exists, OuterRef, Prefetch
 from django.http import HttpResponse, FileResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
@@ -29,11 +32,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from assessment_series.models import AssessmentSeries
+from emis.http_cache import PRIVATE_REVALIDATE, conditional_get, make_etag
 from candidates.models import Candidate, CandidateEnrollment
+from emis.pdf_assembly import PdfAssembly, read_pages
 from occupations.models import Occupation, OccupationLevel, OccupationModule
 
-from pypdf import PdfReader, PdfWriter
-
 from .models import WorkersPasBook
 from .pdf import generate_book_pdf, impose_2up_a4, impose_booklet_a4_landscape, impose_2up_a6_booklet_a4
 from .serializers import (
@@ -41,6 +44,14 @@ from .serializers import (
     WPCandidateSerializer, WorkersPasBookSerializer,
 )
 
+# Physical sheets printed by each split mode (each sheet = front + back page):
+# the cover sheet, the second sheet, and everything inside them.
+SPLIT_MODE_SHEETS = {
+    'split_cover': slice(0, 1),
+    'split_second': slice(1, 2),
+    'split_inner': slice(2, None),
+}
+
 
 # ---------------------------------------------------------------------------
 # Lookup endpoints
@@ -128,12 +139,21 @@ class WorkersPasCandidateListView(APIView):
 # Book generation
 # ---------------------------------------------------------------------------
 
-def _build_book_data(candidate, occupation, levels_qs, signatures, request=None):
-    """Assemble the dict consumed by ``generate_book_pdf``."""
-    levels = []
-    for lvl in levels_qs:
-        modules = list(lvl.modules.filter(is_active=True).order_by('module_code'))
-        levels.append({
+def _occupation_levels(occupation):
+    """The occupation's active levels and modules as consumed by the renderer.
+
+    Loaded once per request (two queries) and shared by every booklet of the
+    occupation.
+    """
+    levels_qs = occupation.levels.filter(is_active=True).order_by('level_name').prefetch_related(
+        Prefetch(
+            'modules',
+            queryset=OccupationModule.objects.filter(is_active=True).order_by('module_code'),
+            to_attr='active_modules',
+        )
+    )
+    return [
+        {
             'level_name': lvl.wp_level_name or lvl.level_name,
             'level_description': lvl.level_description or '',
             'competence_description': lvl.competence_description or '',
@@ -144,9 +164,20 @@ def _build_book_data(candidate, occupation, levels_qs, signatures, request=None)
                     'wp_description': m.wp_description or '',
                     'wp_competence_items': m.wp_competence_items or '',
                 }
-                for m in modules
+                for m in lvl.active_modules
             ],
-        })
+        }
+        for lvl in levels_qs
+    ]
+
+
+def _build_book_data(candidate, occupation, levels, signatures, request=None):
+    """Assemble the dict consumed by ``generate_book_pdf``.
+
+    ``levels`` comes from ``_occupation_levels``; the renderer annotates the
+    level dicts, so each booklet gets its own copies.
+    """
+    levels = [dict(lvl) for lvl in levels]
 
     photo_path = None
     if candidate.passport_photo:
@@ -186,11 +217,13 @@ def _build_book_data(candidate, occupation, levels_qs, signatures, request=None)
     }
 
 
+@functools.lru_cache(maxsize=None)
 def _signature_paths():
     """Resolve the paths of the static assets used in the Worker's PAS booklet.
 
     Accepts a couple of historical filename variants so the caller does not
-    need to rename the files on disk.
+    need to rename the files on disk. Resolved once per process (restart the
+    workers after adding or renaming an asset); treat the result as read-only.
     """
     base = os.path.join(settings.BASE_DIR, 'static', 'images')
 
@@ -213,13 +246,37 @@ def _signature_paths():
     }
 
 
+def _require_wp_codes(occupation):
+    if not occupation.wp_code:
+        raise ValueError(
+            f"Occupation '{occupation.occ_name}' has no Worker's PAS code (wp_code) configured."
+        )
+    if not occupation.wp_occ_code:
+        raise ValueError(
+            f"Occupation '{occupation.occ_name}' has no Worker's PAS Occupation Number "
+            f"(wp_occ_code) configured."
+        )
+
+
 @transaction.atomic
-def _get_or_create_book(candidate, occupation, series, generated_by=None):
-    """Return an existing WorkersPasBook (and bump reprint_count) or create a new one."""
-    book = WorkersPasBook.objects.select_for_update().filter(
-        candidate=candidate, occupation=occupation, assessment_series=series,
-    ).first()
-    if book is not None:
+def _get_or_create_books(candidates, occupation, series, generated_by=None):
+    """Batch form of ``_get_or_create_book``: one (book, created) pair per candidate, in order.
+
+    Existing books are locked and updated in one statement (reprint_count
+    bumped, book number refreshed if the occupation config changed); the
+    missing ones get a block of sequence numbers from one allocation and are
+    bulk-created. Raises ValueError if books are needed but the occupation has
+    no Worker's PAS codes; nothing is written in that case.
+    """
+    existing = {
+        book.candidate_id: book
+        for book in WorkersPasBook.objects.select_for_update().filter(
+            candidate__in=candidates, occupation=occupation, assessment_series=series,
+        )
+    }
+
+    now = timezone.now()
+    for book in existing.values():
         # If occupation config changed (e.g. wp_occ_code added), refresh the number
         if occupation.wp_code and occupation.wp_occ_code:
             expected = WorkersPasBook.format_book_number(
@@ -228,43 +285,65 @@ def _get_or_create_book(candidate, occupation, series, generated_by=None):
             if book.book_number != expected:
                 book.book_number = expected
                 book.full_label = WorkersPasBook.format_full_label(expected)
-                book.save(update_fields=['book_number', 'full_label', 'updated_at'])
         book.reprint_count = (book.reprint_count or 0) + 1
-        book.save(update_fields=['reprint_count', 'updated_at'])
-        return book, False
-
-    if not occupation.wp_code:
-        raise ValueError(
-            f"Occupation '{occupation.occ_name}' has no Worker's PAS code (wp_code) configured."
+        book.updated_at = now
+    if existing:
+        WorkersPasBook.objects.bulk_update(
+            existing.values(), ['book_number', 'full_label', 'reprint_count', 'updated_at'],
         )
-    if not occupation.wp_occ_code:
-        raise ValueError(
-            f"Occupation '{occupation.occ_name}' has no Worker's PAS Occupation Number "
-            f"(wp_occ_code) configured."
+
+    # Unique by pk: a candidate listed twice gets one book
+    missing = list({c.pk: c for c in candidates if c.pk not in existing}.values())
+    if missing:
+        _require_wp_codes(occupation)
+        new_books = []
+        for candidate, seq in zip(missing, WorkersPasBook.allocate_sequences(occupation, len(missing))):
+            book_number = WorkersPasBook.format_book_number(
+                occupation.wp_code, occupation.wp_occ_code, seq,
+            )
+            new_books.append(WorkersPasBook(
+                candidate=candidate,
+                occupation=occupation,
+                assessment_series=series,
+                sequence_number=seq,
+                book_number=book_number,
+                full_label=WorkersPasBook.format_full_label(book_number),
+                generated_by=generated_by,
+            ))
+        WorkersPasBook.objects.bulk_create(new_books)
+        # Re-read for primary keys (not every backend returns them from bulk_create)
+        created = WorkersPasBook.objects.filter(
+            candidate__in=missing, occupation=occupation, assessment_series=series,
         )
+    else:
+        created = []
+
+    pairs = {book.candidate_id: (book, False) for book in existing.values()}
+    pairs.update((book.candidate_id, (book, True)) for book in created)
+    result = []
+    for candidate in candidates:
+        book, was_created = pairs[candidate.pk]
+        book.candidate, book.occupation, book.assessment_series = candidate, occupation, series
+        result.append((book, was_created))
+    return result
 
-    seq = WorkersPasBook.allocate_sequence(occupation)
-    book_number = WorkersPasBook.format_book_number(
-        occupation.wp_code, occupation.wp_occ_code, seq,
-    )
-    book = WorkersPasBook.objects.create(
-        candidate=candidate,
-        occupation=occupation,
-        assessment_series=series,
-        sequence_number=seq,
-        book_number=book_number,
-        full_label=WorkersPasBook.format_full_label(book_number),
-        generated_by=generated_by,
-    )
-    return book, True
+
+def _get_or_create_book(candidate, occupation, series, generated_by=None):
+    """Return an existing WorkersPasBook (and bump reprint_count) or create a new one."""
+    [(book, created)] = _get_or_create_books([candidate], occupation, series, generated_by)
+    return book, created
 
 
-def _render_pdf_for_book(book, request=None):
-    """Render and save the PDF for ``book``, returning bytes."""
+def _render_pdf_for_book(book, request=None, levels=None, save=True):
+    """Render and store the PDF for ``book``, returning bytes.
+
+    Batch callers pass the occupation's ``levels`` (``_occupation_levels``)
+    and ``save=False``, then persist every book with ``_save_book_files``.
+    """
     occupation = book.occupation
-    levels_qs = list(occupation.levels.filter(is_active=True).order_by('level_name'))
-    sigs = _signature_paths()
-    data = _build_book_data(book.candidate, occupation, levels_qs, sigs)
+    if levels is None:
+        levels = _occupation_levels(occupation)
+    data = _build_book_data(book.candidate, occupation, levels, _signature_paths())
     data['full_label'] = book.full_label
     if request is not None:
         book_slug = book.book_number.replace('/', '-')
@@ -273,11 +352,48 @@ def _render_pdf_for_book(book, request=None):
 
     book.pdf_file.save(
         f"workers_pas_{book.book_number.replace('/', '_')}.pdf",
-        ContentFile(pdf_bytes), save=True,
+        ContentFile(pdf_bytes), save=save,
     )
     return pdf_bytes
 
 
+def _save_book_files(books):
+    """Persist the pdf_file set by ``_render_pdf_for_book(..., save=False)`` in one statement."""
+    now = timezone.now()
+    for book in books:
+        book.updated_at = now
+    WorkersPasBook.objects.bulk_update(books, ['pdf_file', 'updated_at'])
+
+
+def _render_books(candidates, occupation, series, request):
+    """Get or create the books for ``candidates`` and render them. Returns [(book, pdf_bytes)].
+
+    The level/module tree is loaded once and the book rows are written in
+    bulk; only the render itself runs per candidate. Raises ValueError like
+    ``_get_or_create_books``.
+    """
+    books = _get_or_create_books(
+        candidates, occupation, series,
+        generated_by=request.user if request.user.is_authenticated else None,
+    )
+    levels = _occupation_levels(occupation)
+    generated = [
+        (book, _render_pdf_for_book(book, request, levels=levels, save=False))
+        for book, _created in books
+    ]
+    _save_book_files([book for book, _pdf in generated])
+    return generated
+
+
+def _book_download_etag(request, pk=None):
+    row = WorkersPasBook.objects.filter(pk=pk).values_list('updated_at', 'pdf_file').first()
+    return make_etag('workers-pas-book', pk, *row) if row else None
+
+
+def _book_download_last_modified(request, pk=None):
+    return WorkersPasBook.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+
+
 class WorkersPasBookViewSet(viewsets.ReadOnlyModelViewSet):
     """List and download generated books."""
     queryset = WorkersPasBook.objects.select_related(
@@ -290,6 +406,11 @@ class WorkersPasBookViewSet(viewsets.ReadOnlyModelViewSet):
                      'candidate__registration_number']
 
     @action(detail=True, methods=['get'])
+    @method_decorator(conditional_get(
+        etag_func=_book_download_etag,
+        last_modified_func=_book_download_last_modified,
+        cache_control=PRIVATE_REVALIDATE,
+    ))
     def download(self, request, pk=None):
         book = self.get_object()
         if not book.pdf_file or not os.path.exists(book.pdf_file.path):
@@ -334,7 +455,7 @@ class WorkersPasGenerateView(APIView):
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         if mode == 'booklet_a4':
-            pdf_bytes = impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=False)
+            pdf_bytes = impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=False).to_bytes()
 
         resp = HttpResponse(pdf_bytes, content_type='application/pdf')
         resp['Content-Disposition'] = (
@@ -383,7 +504,7 @@ class WorkersPasBulkGenerateView(APIView):
                 is_active=True,
             ).values_list('candidate_id', flat=True)
             candidates_qs = candidates_qs.filter(id__in=list(set(enrollments)))
-        candidates = list(candidates_qs.order_by('full_name'))
+        candidates = list(candidates_qs.select_related('assessment_center').order_by('full_name'))
 
         if not candidates:
             return Response(
@@ -396,20 +517,13 @@ class WorkersPasBulkGenerateView(APIView):
             candidates = candidates[:1]
 
         # Generate per-candidate PDFs (A5)
-        generated = []
-        for cand in candidates:
-            try:
-                book, _ = _get_or_create_book(
-                    cand, occupation, series,
-                    generated_by=request.user if request.user.is_authenticated else None,
-                )
-                pdf_bytes = _render_pdf_for_book(book, request)
-                generated.append((book, pdf_bytes))
-            except ValueError as e:
-                return Response(
-                    {'detail': str(e)},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        try:
+            generated = _render_books(candidates, occupation, series, request)
+        except ValueError as e:
+            return Response(
+                {'detail': str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # Friendly base name: "Builder January 2026 Series"
         base_label = f"{occupation.occ_name} {series.name}".strip()
@@ -421,31 +535,15 @@ class WorkersPasBulkGenerateView(APIView):
 
         # booklet_a4_print and split modes: merge booklets into one PDF for direct printing
         if mode in ('booklet_a4_print', 'split_cover', 'split_second', 'split_inner'):
-            from pypdf import PdfReader, PdfWriter
-            merger = PdfWriter()
-            
+            # Every booklet is imposed straight onto one assembly (only the
+            # sheets the mode prints) and the result is serialised once.
+            assembly = PdfAssembly()
             for book, pdf_bytes in generated:
-                imposed = impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=False)
-                reader = PdfReader(io.BytesIO(imposed))
-                
-                if mode == 'split_cover':
-                    if len(reader.pages) >= 2:
-                        merger.add_page(reader.pages[0])
-                        merger.add_page(reader.pages[1])
-                elif mode == 'split_second':
-                    if len(reader.pages) >= 4:
-                        merger.add_page(reader.pages[2])
-                        merger.add_page(reader.pages[3])
-                elif mode == 'split_inner':
-                    for i in range(4, len(reader.pages)):
-                        merger.add_page(reader.pages[i])
-                else:  # booklet_a4_print
-                    for page in reader.pages:
-                        merger.add_page(page)
-                        
-            out_buf = io.BytesIO()
-            merger.write(out_buf)
-            resp = HttpResponse(out_buf.getvalue(), content_type='application/pdf')
+                impose_booklet_a4_landscape(
+                    pdf_bytes, rotate_back_side=False,
+                    into=assembly, sheets=SPLIT_MODE_SHEETS.get(mode),
+                )
+            resp = HttpResponse(assembly.to_bytes(), content_type='application/pdf')
             
             if mode == 'split_cover':
                 filename_suffix = "Cover Papers"
@@ -477,7 +575,7 @@ class WorkersPasBulkGenerateView(APIView):
                 for idx, (a, b) in enumerate(pairs, start=1):
                     pdf_a = a[1]
                     pdf_b = b[1] if b else None
-                    imposed = impose_2up_a4(pdf_a, pdf_b)
+                    imposed = impose_2up_a4(pdf_a, pdf_b).to_bytes()
                     name = f"Sheet {idx:0{width}d}.pdf"
                     zf.writestr(name, imposed)
             elif mode == 'booklet_a4':
@@ -485,7 +583,7 @@ class WorkersPasBulkGenerateView(APIView):
                 # Produces A4 LANDSCAPE sheets ready for duplex print + fold + staple.
                 width = max(2, len(str(n_cand)))
                 for idx, (book, pdf_bytes) in enumerate(generated, start=1):
-                    imposed = impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=True)
+                    imposed = impose_booklet_a4_landscape(pdf_bytes, rotate_back_side=True).to_bytes()
                     cand_name = re.sub(r'[\\/:*?"<>|]+', '',
                                         book.candidate.full_name or '').strip()
                     name = (
@@ -553,25 +651,19 @@ class WorkersPas2upA6PrintView(APIView):
         candidates = [get_object_or_404(Candidate, pk=cid) for cid in candidate_ids]
 
         # Render a PDF for every candidate.
-        pdf_bytes_map = {}
-        for cand in candidates:
-            try:
-                book, _ = _get_or_create_book(
-                    cand, occupation, series,
-                    generated_by=request.user if request.user.is_authenticated else None,
-                )
-                pdf_bytes_map[cand.id] = _render_pdf_for_book(book, request)
-            except ValueError as exc:
-                return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            generated = _render_books(candidates, occupation, series, request)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        pdf_bytes_map = {book.candidate_id: pdf_bytes for book, pdf_bytes in generated}
+
+        assembly = PdfAssembly()
+        sheets = SPLIT_MODE_SHEETS.get(mode)
 
-        merged_writer = PdfWriter()
-        
         if mode == 'split_inner':
-            c1_pdf = pdf_bytes_map[candidates[0].id]
-            sheet = impose_2up_a6_booklet_a4(c1_pdf, c1_pdf)
-            reader = PdfReader(io.BytesIO(sheet))
-            for i in range(4, len(reader.pages)):
-                merged_writer.add_page(reader.pages[i])
+            # Parsed once, imposed in both halves of the master sheet
+            c1_pages = read_pages(pdf_bytes_map[candidates[0].id])
+            impose_2up_a6_booklet_a4(c1_pages, c1_pages, into=assembly, sheets=sheets)
         else:
             pairs = [
                 (candidate_ids[i], candidate_ids[i + 1] if i + 1 < len(candidate_ids) else None)
@@ -580,24 +672,9 @@ class WorkersPas2upA6PrintView(APIView):
             for cid1, cid2 in pairs:
                 c1_pdf = pdf_bytes_map[cid1]
                 c2_pdf = pdf_bytes_map[cid2] if cid2 is not None else None
-                sheet = impose_2up_a6_booklet_a4(c1_pdf, c2_pdf)
-                reader = PdfReader(io.BytesIO(sheet))
-                
-                if mode == 'split_cover':
-                    if len(reader.pages) >= 2:
-                        merged_writer.add_page(reader.pages[0])
-                        merged_writer.add_page(reader.pages[1])
-                elif mode == 'split_second':
-                    if len(reader.pages) >= 4:
-                        merged_writer.add_page(reader.pages[2])
-                        merged_writer.add_page(reader.pages[3])
-                else:  # full
-                    for page in reader.pages:
-                        merged_writer.add_page(page)
-
-        out = io.BytesIO()
-        merged_writer.write(out)
-        result = out.getvalue()
+                impose_2up_a6_booklet_a4(c1_pdf, c2_pdf, into=assembly, sheets=sheets)
+
+        result = assembly.to_bytes()
 
         def _safe(name):
             return re.sub(r'[\\/:*?"<>|]+', '', name or '').strip()
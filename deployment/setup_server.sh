@@ -28,6 +28,7 @@ apt-get install -y \
     python3-venv \
     postgresql \
     postgresql-contrib \
+    redis-server \
     nginx \
     git \
     curl \